@@ -0,0 +1,141 @@
+# app_Libreria/almacenamiento.py
+"""
+Almacenamiento de archivos subidos por contenido.
+
+Cada archivo se guarda con el SHA-256 de sus bytes como nombre::
+
+    MEDIA_ROOT/archivos/ab/cd/abcd....png
+
+Dos subidas idénticas (la misma captura como portada y como imagen de un
+evento, o un archivo subido dos veces) comparten un solo archivo en disco.
+Como el nombre depende del contenido, un nombre nunca cambia de contenido y
+se puede servir con ``Cache-Control: immutable`` (ver ``medios.py``).
+
+La tabla ``ArchivoMedia`` guarda un contador de referencias que las señales
+de los modelos con imágenes mantienen al día; los archivos que quedan en 0
+los borra el comando ``compactar_medios``, no el borrado del registro, para
+no perder un archivo que otra subida en curso acaba de reutilizar. Reutilizar
+un archivo le actualiza la fecha de modificación (la recolección respeta un
+periodo de gracia) y se hace con su registro bloqueado, igual que el borrado.
+
+``EstaticosComprimidos`` es el almacenamiento de ``collectstatic``: nombres
+con hash (``ManifestStaticFilesStorage``) más copias ``.gz`` y ``.br``
+precomprimidas que ``medios.servir_estatico`` entrega según
+``Accept-Encoding``. Brotli es opcional (paquete ``brotli``).
+"""
+import gzip
+import hashlib
+import os
+import posixpath
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependencia opcional
+    brotli = None
+
+from .models import ArchivoMedia
+
+CARPETA = 'archivos'
+
+
+def es_ruta_por_contenido(nombre):
+    return bool(nombre) and nombre.startswith(CARPETA + '/')
+
+
+def hash_de(contenido):
+    """SHA-256 de un archivo de Django leído por bloques"""
+    suma = hashlib.sha256()
+    if hasattr(contenido, 'seek'):
+        contenido.seek(0)
+    for bloque in contenido.chunks():
+        suma.update(bloque)
+    if hasattr(contenido, 'seek'):
+        contenido.seek(0)
+    return suma.hexdigest()
+
+
+def ruta_para(digest, nombre):
+    extension = posixpath.splitext(nombre)[1].lower()
+    return posixpath.join(CARPETA, digest[:2], digest[2:4], digest + extension)
+
+
+def sumar_referencias(ruta, cantidad):
+    if es_ruta_por_contenido(ruta):
+        ArchivoMedia.objects.filter(ruta=ruta).update(referencias=F('referencias') + cantidad)
+
+
+class AlmacenamientoPorContenido(FileSystemStorage):
+    """``FileSystemStorage`` que deduplica las subidas por su hash"""
+
+    def _save(self, name, content):
+        digest = hash_de(content)
+        ruta = ruta_para(digest, name)
+        # El registro bloqueado (y en SQLite el BEGIN IMMEDIATE) excluye a
+        # compactar_medios entre decidir reutilizar el archivo y tocarlo
+        with transaction.atomic():
+            existente = ArchivoMedia.objects.select_for_update().filter(ruta=ruta).first()
+            if not self._reutilizar(ruta):
+                guardado = super()._save(ruta, content)
+                if guardado != ruta:
+                    # Otro proceso escribió el mismo contenido al mismo tiempo
+                    super().delete(guardado)
+            if existente is None:
+                ArchivoMedia.objects.get_or_create(ruta=ruta, defaults={'hash': digest, 'tamano': content.size})
+        return ruta
+
+    def _reutilizar(self, ruta):
+        """
+        Si el archivo ya existe le actualiza la fecha de modificación, para
+        que la recolección lo vea reciente aunque aún tenga 0 referencias.
+        """
+        try:
+            os.utime(self.path(ruta))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def delete(self, name):
+        # Un archivo por contenido puede estar compartido: lo borra
+        # ``compactar_medios`` cuando su contador llega a 0
+        if es_ruta_por_contenido(name):
+            return
+        super().delete(name)
+
+
+# =============================================
+# ARCHIVOS ESTÁTICOS
+# =============================================
+
+EXTENSIONES_COMPRIMIBLES = ('.css', '.js', '.svg', '.json', '.txt', '.html', '.map')
+TAMANO_MINIMO_COMPRESION = 1024
+
+
+class EstaticosComprimidos(ManifestStaticFilesStorage):
+    """``ManifestStaticFilesStorage`` que además deja variantes gzip y brotli"""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for nombre in self.hashed_files.values():
+            if nombre.endswith(EXTENSIONES_COMPRIMIBLES):
+                self._comprimir(nombre)
+
+    def _comprimir(self, nombre):
+        with self.open(nombre) as archivo:
+            datos = archivo.read()
+        if len(datos) < TAMANO_MINIMO_COMPRESION:
+            return
+        variantes = {'.gz': gzip.compress(datos, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variantes['.br'] = brotli.compress(datos, quality=11)
+        for extension, comprimido in variantes.items():
+            # Sólo vale la pena si ahorra al menos un 5 %
+            if len(comprimido) < len(datos) * 0.95:
+                with open(self.path(nombre + extension), 'wb') as destino:
+                    destino.write(comprimido)
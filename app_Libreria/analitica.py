@@ -0,0 +1,268 @@
+# app_Libreria/analitica.py
+"""
+Analítica de ventas: series de unidades e ingresos por día, semana o mes,
+desglosadas por género, autor, editorial o método de pago.
+
+Dos niveles de agregación:
+
+1. **Bloques mensuales** en la caché ``analitica``: para cada dimensión y
+   mes, las filas ``(día, clave, unidades, ingresos)``, agregadas en SQL
+   por venta y clave sobre ``DetalleVenta`` unido a ``Venta`` y ``Libro``
+   (rango por el índice de ``fechaventa``) y después por día. Los meses que faltan en caché se calculan con una sola
+   consulta para todos, no una por mes.
+2. **Periodos** pedidos: los días de los bloques se suman en Python a días,
+   semanas (que empiezan en lunes) o meses.
+
+Un año por género son a lo sumo 365 × 8 filas en 12 bloques: con la caché
+caliente la respuesta no toca la base de datos salvo para los nombres de
+autores o editoriales.
+
+La llave de cada bloque lleva dos sellos de versión guardados en la caché
+``default`` (compartida entre procesos en producción, como los sellos de
+``tarjetas``): uno del mes y uno general. Al cambiar las ventas de un mes
+``resumenes`` avisa con los días tocados (venta nueva, cancelación,
+devolución, edición) y se cambia el sello del mes; las señales de ``Libro``
+cambian el general, porque cambiar el género, el autor o la editorial de un
+libro reparte de otro modo su historial. Así todos los procesos dejan de
+encontrar los bloques viejos, no sólo el que atendió la escritura; éstos
+salen de su caché por antigüedad.
+
+Ingresos = unidades no devueltas × precio unitario, sin IVA y antes del
+descuento de la venta. Las ventas canceladas no aportan porque todas sus
+unidades quedan devueltas.
+"""
+import datetime
+import time
+from collections import defaultdict
+from decimal import Decimal
+
+from django.core.cache import caches
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum, Value
+
+from . import resumenes
+from .carrito import redondear
+from .models import Autor, DetalleVenta, Editorial, Libro, Venta
+
+ALIAS_CACHE = 'analitica'
+ALIAS_SELLOS = 'default'
+CLAVE_BLOQUE = 'analitica:{}:{}:{}'
+CLAVE_SELLO_MES = 'analitica:sello:{}'
+CLAVE_SELLO_TODO = 'analitica:sello'
+TTL_BLOQUE = 60 * 60 * 24
+MAXIMO_DIAS = 366 * 3
+LIMITE_DEFAULT = 10
+PERIODOS = ('dia', 'semana', 'mes')
+
+# dimensión -> campo de DetalleVenta que la agrupa
+DIMENSIONES = {
+    'total': None,
+    'genero': 'libroid__genero',
+    'autor': 'libroid__autorid',
+    'editorial': 'libroid__editorialid',
+    'metodo': 'ventaid__metodopago',
+}
+
+
+class ConsultaInvalida(ValueError):
+    """Parámetros de la serie fuera de lo permitido"""
+
+
+def _cache():
+    return caches[ALIAS_CACHE]
+
+
+# =============================================
+# BLOQUES MENSUALES
+# =============================================
+
+def _mes(dia):
+    return dia.replace(day=1)
+
+
+def _mes_siguiente(mes):
+    return (mes + datetime.timedelta(days=32)).replace(day=1)
+
+
+def _meses(desde, hasta):
+    mes = _mes(desde)
+    while mes <= hasta:
+        yield mes
+        mes = _mes_siguiente(mes)
+
+
+def _nuevo_sello():
+    # Un sello nuevo nunca coincide con uno anterior, aunque la caché se vacíe
+    return format(time.time_ns(), 'x')
+
+
+def _sellos(meses):
+    """``{mes: 'general.mes'}`` con los sellos actuales; crea los que falten"""
+    claves = {CLAVE_SELLO_MES.format(mes.strftime('%Y-%m')): mes for mes in meses}
+    cache = caches[ALIAS_SELLOS]
+    sellos = cache.get_many([CLAVE_SELLO_TODO, *claves])
+    for clave in (CLAVE_SELLO_TODO, *claves):
+        if clave not in sellos:
+            sello = _nuevo_sello()
+            # add() respeta el sello que otro proceso haya creado primero
+            sellos[clave] = sello if cache.add(clave, sello, None) else cache.get(clave, sello)
+    return {mes: f'{sellos[CLAVE_SELLO_TODO]}.{sellos[clave]}' for clave, mes in claves.items()}
+
+
+def _clave_bloque(dimension, mes, sello):
+    return CLAVE_BLOQUE.format(dimension, mes.strftime('%Y-%m'), sello)
+
+
+def _filas(dimension, desde, hasta):
+    """``(día, clave, unidades, ingresos)`` de ``desde`` (incluido) a ``hasta`` (excluido)"""
+    campo = DIMENSIONES[dimension]
+    netas = F('cantidad') - F('cantidaddevuelta')
+    # Se agrupa por el instante de la venta y no por TruncDate: en SQLite
+    # TruncDate es una función de Python por fila y triplica el tiempo. Las
+    # filas llegan ordenadas y el día local se calcula sólo al cruzar de día.
+    filas = (DetalleVenta.objects
+             .filter(ventaid__fechaventa__gte=resumenes.limites_dia(desde)[0],
+                     ventaid__fechaventa__lt=resumenes.limites_dia(hasta)[0],
+                     cantidaddevuelta__lt=F('cantidad'))
+             .values('ventaid__fechaventa', clave=F(campo) if campo else Value(''))
+             .annotate(unidades=Sum(netas),
+                       ingresos=Sum(ExpressionWrapper(netas * F('preciounitario'),
+                                                      output_field=DecimalField(max_digits=14, decimal_places=2))))
+             .order_by('ventaid__fechaventa')
+             .values_list('ventaid__fechaventa', 'clave', 'unidades', 'ingresos'))
+
+    acumulado = {}
+    fin = None
+    for fechaventa, clave, unidades, ingresos in filas.iterator(chunk_size=5000):
+        if fin is None or fechaventa >= fin:
+            dia = resumenes.dia_de(fechaventa)
+            fin = resumenes.limites_dia(dia)[1]
+        totales = acumulado.get((dia, clave))
+        if totales is None:
+            acumulado[(dia, clave)] = [unidades, ingresos]
+        else:
+            totales[0] += unidades
+            totales[1] += ingresos
+    return [(dia, clave, unidades, ingresos) for (dia, clave), (unidades, ingresos) in acumulado.items()]
+
+
+def bloques(dimension, desde, hasta):
+    """Filas de los meses que cubren ``desde``..``hasta``, desde caché o de una consulta"""
+    sellos = _sellos(_meses(desde, hasta))
+    claves = {_clave_bloque(dimension, mes, sello): mes for mes, sello in sellos.items()}
+    guardados = _cache().get_many(claves)
+    faltan = [mes for clave, mes in claves.items() if clave not in guardados]
+    if faltan:
+        nuevos = {mes: [] for mes in faltan}
+        for dia, clave, unidades, ingresos in _filas(dimension, faltan[0], _mes_siguiente(faltan[-1])):
+            bloque = nuevos.get(_mes(dia))
+            # Los meses ya en caché que quedan en medio del rango se descartan
+            if bloque is not None:
+                bloque.append((dia, clave, unidades, ingresos))
+        nuevos = {_clave_bloque(dimension, mes, sellos[mes]): filas for mes, filas in nuevos.items()}
+        _cache().set_many(nuevos, TTL_BLOQUE)
+        guardados.update(nuevos)
+    return [fila for clave in claves for fila in guardados[clave] if desde <= fila[0] <= hasta]
+
+
+def invalidar_dias(*dias):
+    """Descarta, en todos los procesos, los bloques de los meses de ``dias``"""
+    sello = _nuevo_sello()
+    caches[ALIAS_SELLOS].set_many(
+        {CLAVE_SELLO_MES.format(_mes(dia).strftime('%Y-%m')): sello for dia in dias}, None)
+
+
+def invalidar_todo():
+    caches[ALIAS_SELLOS].set(CLAVE_SELLO_TODO, _nuevo_sello(), None)
+
+
+# =============================================
+# SERIES
+# =============================================
+
+def inicio_periodo(dia, periodo):
+    if periodo == 'semana':
+        return dia - datetime.timedelta(days=dia.weekday())
+    if periodo == 'mes':
+        return _mes(dia)
+    return dia
+
+
+def periodos_entre(desde, hasta, periodo):
+    inicio = inicio_periodo(desde, periodo)
+    while inicio <= hasta:
+        yield inicio
+        if periodo == 'mes':
+            inicio = _mes_siguiente(inicio)
+        else:
+            inicio += datetime.timedelta(days=7 if periodo == 'semana' else 1)
+
+
+def _etiqueta(inicio, periodo):
+    return inicio.strftime('%Y-%m') if periodo == 'mes' else inicio.isoformat()
+
+
+def _nombres(dimension, claves):
+    if dimension == 'genero':
+        return dict(Libro.GENEROS)
+    if dimension == 'metodo':
+        return dict(Venta.METODOS_PAGO)
+    if dimension == 'autor':
+        return {autorid: f'{nombre} {apellido}' for autorid, nombre, apellido
+                in Autor.objects.filter(autorid__in=claves).values_list('autorid', 'nombre', 'apellido')}
+    if dimension == 'editorial':
+        return dict(Editorial.objects.filter(editorialid__in=claves).values_list('editorialid', 'nombre'))
+    return {'': 'Total'}
+
+
+def serie_ventas(desde, hasta, periodo='dia', dimension='total', limite=LIMITE_DEFAULT):
+    """
+    Unidades e ingresos de ``desde`` a ``hasta`` (incluidos) agrupados por
+    ``periodo`` y desglosados por ``dimension``. Sólo las ``limite`` claves
+    con más ingresos van por separado; el resto se suma en ``'otros'``.
+
+    Devuelve ``{'periodos': [...], 'series': [{'clave', 'nombre', 'unidades',
+    'ingresos', 'total_unidades', 'total_ingresos'}, ...]}`` con una posición
+    por periodo en cada lista, también para los periodos sin ventas.
+    """
+    if periodo not in PERIODOS:
+        raise ConsultaInvalida(f'Periodo desconocido: {periodo}')
+    if dimension not in DIMENSIONES:
+        raise ConsultaInvalida(f'Dimensión desconocida: {dimension}')
+    if hasta < desde or (hasta - desde).days >= MAXIMO_DIAS:
+        raise ConsultaInvalida(f'El rango debe ser de 1 a {MAXIMO_DIAS} días')
+
+    inicios = list(periodos_entre(desde, hasta, periodo))
+    posicion = {inicio: i for i, inicio in enumerate(inicios)}
+    unidades = defaultdict(lambda: [0] * len(inicios))
+    ingresos = defaultdict(lambda: [Decimal('0')] * len(inicios))
+    for dia, clave, cantidad, importe in bloques(dimension, desde, hasta):
+        i = posicion[inicio_periodo(dia, periodo)]
+        unidades[clave][i] += cantidad
+        ingresos[clave][i] += importe
+
+    ordenadas = sorted(ingresos, key=lambda clave: sum(ingresos[clave]), reverse=True)
+    principales, resto = ordenadas[:limite], ordenadas[limite:]
+    nombres = _nombres(dimension, principales)
+    series = [(clave, nombres.get(clave, str(clave)), unidades[clave], ingresos[clave]) for clave in principales]
+    if resto:
+        series.append((
+            'otros', 'Otros',
+            [sum(unidades[clave][i] for clave in resto) for i in range(len(inicios))],
+            [sum((ingresos[clave][i] for clave in resto), Decimal('0')) for i in range(len(inicios))],
+        ))
+
+    return {
+        'desde': desde.isoformat(),
+        'hasta': hasta.isoformat(),
+        'periodo': periodo,
+        'dimension': dimension,
+        'periodos': [_etiqueta(inicio, periodo) for inicio in inicios],
+        'series': [{
+            'clave': clave,
+            'nombre': nombre,
+            'unidades': lista_unidades,
+            'ingresos': [str(redondear(importe)) for importe in lista_ingresos],
+            'total_unidades': sum(lista_unidades),
+            'total_ingresos': str(redondear(sum(lista_ingresos, Decimal('0')))),
+        } for clave, nombre, lista_unidades, lista_ingresos in series],
+    }
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AppLibreriaConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app_Libreria'
+
+    def ready(self):
+        # Registrar los receptores de señales
+        from . import signals  # noqa: F401
@@ -0,0 +1,177 @@
+# app_Libreria/auditoria.py
+"""
+Auditoría de planes de consulta (``manage.py auditar_consultas``).
+
+Pide cada ruta una vez con los escenarios de ``rendimiento`` y captura el
+SQL que emite (con sus parámetros). Cada consulta distinta, por huella
+(``huella_sql``), se pasa por el planificador del motor:
+
+* SQLite: ``EXPLAIN QUERY PLAN``. Se marcan los ``SCAN tabla`` sin índice
+  (recorrido completo) y los ``USE TEMP B-TREE`` (ordenar, agrupar o
+  ``DISTINCT`` sin índice que ya dé el orden).
+* PostgreSQL: ``EXPLAIN (FORMAT JSON)``. Se marcan los ``Seq Scan`` y los
+  ``Sort``.
+
+Recorrer u ordenar una tabla pequeña no es problema: los recorridos de
+tablas con menos de ``minimo_filas`` filas, y los ordenamientos de consultas
+que sólo tocan tablas así, no se reportan. En otros motores ``auditar``
+devuelve ``None`` (sin pedir ninguna ruta). Sólo se explican ``SELECT``;
+las escrituras del checkout se ejecutan (crean ventas de ``medicion_cliente``)
+pero no se auditan.
+"""
+import json
+import re
+from dataclasses import dataclass, field
+
+from django.db import connection
+
+from . import rendimiento
+from .middleware import huella_sql
+
+MINIMO_FILAS = 1000
+
+_SCAN = re.compile(r'^SCAN (?:TABLE )?(\S+)(?: AS \S+)?$')
+_TABLA = re.compile(r'^(?:SCAN|SEARCH) (?:TABLE )?(\S+)')
+_TEMPORAL = re.compile(r'USE TEMP B-TREE FOR (.+)$')
+
+
+@dataclass
+class Consulta:
+    sql: str
+    params: tuple
+    rutas: list = field(default_factory=list)
+    veces: int = 0
+    hallazgos: list = field(default_factory=list)
+    plan: list = field(default_factory=list)
+
+
+class Captura:
+    """``execute_wrapper`` que guarda el SQL de lectura, una vez por huella"""
+
+    def __init__(self):
+        self.consultas = {}
+        self.ruta = None
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip()[:6].upper() in ('SELECT', 'WITH R'):
+            huella = huella_sql(sql)
+            consulta = self.consultas.get(huella)
+            if consulta is None:
+                consulta = self.consultas[huella] = Consulta(sql, tuple(params or ()))
+            consulta.veces += 1
+            if self.ruta not in consulta.rutas:
+                consulta.rutas.append(self.ruta)
+        return execute(sql, params, many, context)
+
+
+def capturar(rutas=None, solo_lectura=False):
+    """``{huella: Consulta}`` de una pasada por los escenarios"""
+    captura = Captura()
+    ctx = rendimiento.preparar_contexto()
+    clientes = rendimiento.clientes_http(ctx)
+    for escenario in rendimiento.ESCENARIOS:
+        if rutas and escenario.nombre not in rutas and escenario.clave not in rutas:
+            continue
+        if solo_lectura and escenario.escribe:
+            continue
+        captura.ruta = escenario.clave
+        cliente_http = clientes[escenario.rol]
+        try:
+            if escenario.preparar:
+                escenario.preparar(cliente_http, ctx)
+            with connection.execute_wrapper(captura):
+                rendimiento._pedir(cliente_http, escenario, ctx)
+        except rendimiento.SinDatos:
+            continue
+    return captura.consultas
+
+
+# =============================================
+# PLANES
+# =============================================
+
+def _plan_sqlite(cursor, sql, params):
+    """``(líneas del plan, tablas que toca, hallazgos)``"""
+    cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+    lineas, tablas, hallazgos = [], set(), []
+    for _, _, _, detalle in cursor.fetchall():
+        lineas.append(detalle)
+        tabla = _TABLA.match(detalle)
+        if tabla:
+            tablas.add(tabla.group(1).strip('"'))
+        escaneo = _SCAN.match(detalle)
+        if escaneo:
+            hallazgos.append(('recorrido', escaneo.group(1).strip('"')))
+        temporal = _TEMPORAL.search(detalle)
+        if temporal:
+            hallazgos.append(('temporal', temporal.group(1)))
+    return lineas, tablas, hallazgos
+
+
+def _nodos(nodo):
+    yield nodo
+    for hijo in nodo.get('Plans', []):
+        yield from _nodos(hijo)
+
+
+def _plan_postgresql(cursor, sql, params):
+    cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    lineas, tablas, hallazgos = [], set(), []
+    for nodo in _nodos(plan[0]['Plan']):
+        tipo = nodo['Node Type']
+        lineas.append(f'{tipo} {nodo.get("Relation Name", "")}'.strip())
+        if 'Relation Name' in nodo:
+            tablas.add(nodo['Relation Name'])
+        if tipo == 'Seq Scan':
+            hallazgos.append(('recorrido', nodo['Relation Name']))
+        elif tipo in ('Sort', 'Incremental Sort'):
+            hallazgos.append(('temporal', 'ORDER BY ' + ', '.join(nodo.get('Sort Key', []))))
+    return lineas, tablas, hallazgos
+
+
+PLANIFICADORES = {'sqlite': _plan_sqlite, 'postgresql': _plan_postgresql}
+
+
+def explicar(consultas, minimo_filas=MINIMO_FILAS):
+    """
+    Llena ``plan`` y ``hallazgos`` de cada consulta, descartando lo que sólo
+    afecta a tablas de menos de ``minimo_filas`` filas. Devuelve ``None`` si
+    el motor no está en ``PLANIFICADORES``.
+    """
+    planificador = PLANIFICADORES.get(connection.vendor)
+    if planificador is None:
+        return None
+    existentes = set(connection.introspection.table_names())
+    filas = {}
+
+    def contar(cursor, tabla):
+        # Tablas virtuales (FTS) o subconsultas materializadas no cuentan
+        if tabla not in existentes:
+            return 0
+        if tabla not in filas:
+            cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(tabla)}')
+            filas[tabla] = cursor.fetchone()[0]
+        return filas[tabla]
+
+    with connection.cursor() as cursor:
+        for consulta in consultas.values():
+            consulta.plan, tablas, hallazgos = planificador(cursor, consulta.sql, consulta.params)
+            mayor = max((contar(cursor, tabla) for tabla in tablas), default=0)
+            for tipo, objeto in hallazgos:
+                if tipo == 'recorrido' and contar(cursor, objeto) >= minimo_filas:
+                    consulta.hallazgos.append(f'recorrido completo de {objeto} ({filas[objeto]} filas)')
+                elif tipo == 'temporal' and mayor >= minimo_filas:
+                    consulta.hallazgos.append(f'B-tree temporal para {objeto}')
+    return consultas
+
+
+def auditar(rutas=None, solo_lectura=False, minimo_filas=MINIMO_FILAS):
+    """Consultas con hallazgos, las de más rutas primero; ``None`` si el motor no tiene EXPLAIN"""
+    if connection.vendor not in PLANIFICADORES:
+        return None
+    consultas = explicar(capturar(rutas, solo_lectura), minimo_filas)
+    return sorted((consulta for consulta in consultas.values() if consulta.hallazgos),
+                  key=lambda consulta: (-len(consulta.rutas), consulta.rutas))
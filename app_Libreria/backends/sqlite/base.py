@@ -0,0 +1,80 @@
+# app_Libreria/backends/sqlite/base.py
+"""
+Motor SQLite para producción: el de Django más PRAGMAs al conectar,
+transacciones ``BEGIN IMMEDIATE`` y conexiones persistentes con revisión.
+
+* ``journal_mode=WAL``: los lectores no bloquean al escritor ni al revés;
+  con el diario por defecto (``DELETE``) una compra en curso bloqueaba las
+  lecturas del catálogo y dos compras simultáneas terminaban en
+  ``database is locked``.
+* ``synchronous=NORMAL``: con WAL no se pierde consistencia, sólo las
+  últimas transacciones si se va la luz; evita un fsync por commit.
+* ``busy_timeout``: un escritor espera al otro en lugar de fallar al
+  instante.
+* ``mmap_size``, ``cache_size`` y ``temp_store=MEMORY``: lecturas y
+  ordenamientos temporales en memoria.
+
+``transaction_mode=IMMEDIATE`` (el default de este motor) toma el candado de
+escritura al abrir ``atomic()``. Con ``BEGIN`` a secas, dos transacciones que
+leen y luego escriben (el checkout) chocan al escribir y una falla sin que
+``busy_timeout`` ayude, porque SQLite no puede esperar sin romper lo que la
+otra ya leyó.
+
+Con ``CONN_MAX_AGE`` la conexión se reutiliza entre peticiones del mismo
+hilo; ``is_usable`` hace un ``SELECT 1`` para que ``CONN_HEALTH_CHECKS``
+descarte una conexión rota en lugar de fallar la petición.
+
+``OPTIONS['pragmas']`` cambia o agrega PRAGMAs::
+
+    'OPTIONS': {'pragmas': {'mmap_size': 0, 'busy_timeout': 10000}}
+"""
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+PRAGMAS = {
+    # Primero el tiempo de espera: pasar a WAL necesita el candado
+    'busy_timeout': 5000,
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+MODO_TRANSACCION = 'IMMEDIATE'
+
+_NOMBRE = re.compile(r'^[a-z_]+$')
+_VALOR = re.compile(r'^-?\w+$')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        opciones = self.settings_dict['OPTIONS']
+        pragmas = {**PRAGMAS, **opciones.get('pragmas', {})}
+        for nombre, valor in pragmas.items():
+            if not _NOMBRE.match(nombre) or not _VALOR.match(str(valor)):
+                raise ImproperlyConfigured(f'PRAGMA inválido en OPTIONS: {nombre} = {valor!r}')
+        self.pragmas = pragmas
+
+        parametros = super().get_connection_params()
+        parametros.pop('pragmas', None)
+        if 'transaction_mode' not in opciones:
+            self.transaction_mode = MODO_TRANSACCION
+        # La espera del módulo sqlite3 (5 s por defecto) se alinea con busy_timeout
+        parametros.setdefault('timeout', int(pragmas['busy_timeout']) / 1000)
+        return parametros
+
+    def get_new_connection(self, conn_params):
+        conexion = super().get_new_connection(conn_params)
+        for nombre, valor in self.pragmas.items():
+            conexion.execute(f'PRAGMA {nombre} = {valor}')
+        return conexion
+
+    def is_usable(self):
+        try:
+            self.connection.execute('SELECT 1')
+        except self.Database.Error:
+            return False
+        return True
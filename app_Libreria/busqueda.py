@@ -0,0 +1,268 @@
+# app_Libreria/busqueda.py
+"""
+Búsqueda de texto completo sobre libros, autores y editoriales.
+
+En SQLite se usa una tabla virtual FTS5 (``app_libreria_libro_fts``) cuyo
+``rowid`` es el ``libroid``. El tokenizador ``unicode61`` con
+``remove_diacritics 2`` hace que "Garcia" encuentre "García" y los índices de
+prefijo permiten buscar "novel" y obtener "novela" o "novelas".
+
+En PostgreSQL la tabla del mismo nombre guarda, por ``libroid``, un
+``tsvector`` con pesos por columna (configuración ``simple`` más
+``unaccent``) bajo un índice GIN; la consulta usa prefijos (``novel:*``) y
+se ordena con ``ts_rank``. La crea la migración 0014.
+
+En ambos casos la tabla se mantiene al día con las señales de
+``signals.py``. Otros motores no tienen índice: se busca con ``icontains``
+sobre título, ISBN, autor y editorial, ordenado por título, sin relevancia
+ni prefijos.
+
+Los conteos de facetas no cargan todas las coincidencias de una búsqueda
+amplia: ``ids_para_conteo`` trae como mucho ``BUSQUEDA_LIMITE_CONTEO`` ids
+(los más relevantes) e indica si los conteos quedan aproximados.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import Libro
+
+TABLA_FTS = 'app_libreria_libro_fts'
+
+# Pesos bm25 por columna: titulo, descripcion, isbn, autor, editorial
+PESOS = (10.0, 1.0, 8.0, 5.0, 2.0)
+
+SQL_CREAR_TABLA = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {TABLA_FTS} USING fts5(
+        titulo, descripcion, isbn, autor, editorial,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+"""
+SQL_BORRAR_TABLA = f'DROP TABLE IF EXISTS {TABLA_FTS}'
+
+# Pesos ts_rank de PostgreSQL para las etiquetas D, C, B y A (ver _SQL_GUARDAR_POSTGRESQL)
+PESOS_POSTGRESQL = '{0.1, 0.2, 0.5, 1.0}'
+
+_SQL_GUARDAR_POSTGRESQL = f"""
+    INSERT INTO {TABLA_FTS} (libroid, documento) VALUES (%s,
+        setweight(to_tsvector('simple', unaccent(%s)), 'A') ||
+        setweight(to_tsvector('simple', unaccent(%s)), 'D') ||
+        setweight(to_tsvector('simple', unaccent(%s)), 'A') ||
+        setweight(to_tsvector('simple', unaccent(%s)), 'B') ||
+        setweight(to_tsvector('simple', unaccent(%s)), 'C'))
+    ON CONFLICT (libroid) DO UPDATE SET documento = EXCLUDED.documento
+"""
+
+# Ids de búsqueda que se cruzan con las facetas; por encima los conteos son aproximados
+LIMITE_CONTEO = 5000
+
+# Columna del índice con el libroid, por motor
+COLUMNA_ID = {'sqlite': 'rowid', 'postgresql': 'libroid'}
+
+_PALABRA = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_disponible(conexion=None):
+    """Hay índice de texto completo en SQLite (FTS5) y en PostgreSQL (tsvector)"""
+    return (conexion or connection).vendor in COLUMNA_ID
+
+
+def _fila_indice(libro):
+    """Valores de las columnas del índice para un libro"""
+    autor = libro.autorid
+    isbn = libro.isbn or ''
+    return (
+        libro.libroid,
+        libro.titulo or '',
+        libro.descripcion or '',
+        # El ISBN se guarda con y sin guiones para encontrarlo de ambas formas
+        f"{isbn} {isbn.replace('-', '')}",
+        f"{autor.nombre} {autor.apellido}",
+        libro.editorialid.nombre,
+    )
+
+
+def _escribir_filas(filas):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.executemany(_SQL_GUARDAR_POSTGRESQL, filas)
+            return
+        cursor.executemany(
+            f'DELETE FROM {TABLA_FTS} WHERE rowid = %s',
+            [(fila[0],) for fila in filas],
+        )
+        cursor.executemany(
+            f'INSERT INTO {TABLA_FTS} (rowid, titulo, descripcion, isbn, autor, editorial) '
+            f'VALUES (%s, %s, %s, %s, %s, %s)',
+            filas,
+        )
+
+
+def indexar_libros(libros):
+    """Inserta o reemplaza en el índice los libros dados"""
+    if not fts_disponible():
+        return
+    filas = [_fila_indice(libro) for libro in libros]
+    if not filas:
+        return
+    _escribir_filas(filas)
+
+
+def indexar_consulta(libros):
+    """
+    Como ``indexar_libros`` pero desde un queryset, leyendo sólo las columnas
+    del índice con ``values_list`` (sin instancias; para importaciones
+    masivas). Devuelve los ``libroid`` del queryset.
+    """
+    valores = list(libros.values_list(
+        'libroid', 'titulo', 'descripcion', 'isbn', 'autorid__nombre', 'autorid__apellido', 'editorialid__nombre',
+    ))
+    if fts_disponible() and valores:
+        _escribir_filas([
+            (libroid, titulo or '', descripcion or '', f"{isbn or ''} {(isbn or '').replace('-', '')}",
+             f'{nombre} {apellido}', editorial)
+            for libroid, titulo, descripcion, isbn, nombre, apellido, editorial in valores
+        ])
+    return [fila[0] for fila in valores]
+
+
+def desindexar_libro(libroid):
+    """Quita un libro del índice"""
+    if not fts_disponible():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLA_FTS} WHERE {COLUMNA_ID[connection.vendor]} = %s', [libroid])
+
+
+def reindexar_libros_de(**filtro):
+    """Reindexa los libros que cumplen el filtro (p. ej. ``autorid_id=3``)"""
+    libros = Libro.objects.filter(**filtro).select_related('autorid', 'editorialid')
+    indexar_libros(libros.iterator(chunk_size=2000))
+
+
+def reconstruir_indice(tamano_lote=2000):
+    """
+    Vacía y vuelve a llenar el índice completo. Devuelve cuántos libros indexó.
+
+    Todo en una transacción: las búsquedas no ven el índice a medias y la base
+    no confirma (ni sincroniza a disco) cada fila por separado.
+    """
+    if not fts_disponible():
+        return 0
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            # En PostgreSQL la tabla y su índice GIN los crea la migración
+            if connection.vendor == 'sqlite':
+                cursor.execute(SQL_CREAR_TABLA)
+            cursor.execute(f'DELETE FROM {TABLA_FTS}')
+
+        total = 0
+        lote = []
+        libros = Libro.objects.select_related('autorid', 'editorialid').order_by('libroid')
+        for libro in libros.iterator(chunk_size=tamano_lote):
+            lote.append(libro)
+            if len(lote) >= tamano_lote:
+                indexar_libros(lote)
+                total += len(lote)
+                lote = []
+        indexar_libros(lote)
+    return total + len(lote)
+
+
+def _consulta_fts(texto):
+    """
+    Convierte el texto del usuario en una consulta FTS5 segura: cada palabra
+    va entre comillas (sin operadores) y con comodín de prefijo.
+    """
+    palabras = _PALABRA.findall(texto or '')
+    return ' '.join(f'"{palabra}"*' for palabra in palabras)
+
+
+def _consulta_tsquery(texto):
+    """Lo mismo para ``to_tsquery``: palabras con prefijo unidas con AND"""
+    palabras = _PALABRA.findall(texto or '')
+    return ' & '.join(f'{palabra}:*' for palabra in palabras)
+
+
+def _ejecutar_busqueda(texto, filtrados=None, limite=None, inicio=0):
+    """
+    ``libroid`` que coinciden con el texto, del más al menos relevante;
+    ``filtrados`` es un queryset de libros con el que se cruza el índice en
+    la misma consulta.
+    """
+    motor = connection.vendor
+    if motor not in COLUMNA_ID:
+        return _busqueda_respaldo(texto, filtrados, limite, inicio)
+    if motor == 'sqlite':
+        consulta = _consulta_fts(texto)
+        pesos = ', '.join(str(peso) for peso in PESOS)
+        sql = f'SELECT rowid FROM {TABLA_FTS} WHERE {TABLA_FTS} MATCH %s'
+        orden = f'bm25({TABLA_FTS}, {pesos}), rowid'
+    else:
+        consulta = _consulta_tsquery(texto)
+        sql = (f"SELECT f.libroid FROM {TABLA_FTS} f, to_tsquery('simple', unaccent(%s)) q "
+               f'WHERE f.documento @@ q')
+        orden = f"ts_rank('{PESOS_POSTGRESQL}', f.documento, q) DESC, f.libroid"
+    if not consulta:
+        return []
+
+    parametros = [consulta]
+    if filtrados is not None:
+        subconsulta, parametros_filtro = filtrados.values('libroid').query.sql_with_params()
+        sql += f' AND {COLUMNA_ID[motor]} IN ({subconsulta})'
+        parametros += parametros_filtro
+    # LIMIT -1 (SQLite) y LIMIT NULL (PostgreSQL) no limitan
+    sql += f' ORDER BY {orden} LIMIT %s OFFSET %s'
+    parametros += [limite if limite is not None else (-1 if motor == 'sqlite' else None), inicio]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, parametros)
+        return [fila[0] for fila in cursor.fetchall()]
+
+
+def _busqueda_respaldo(texto, filtrados, limite, inicio):
+    """Motores sin índice de texto completo: cada palabra en alguna columna, por título"""
+    palabras = _PALABRA.findall(texto or '')
+    if not palabras:
+        return []
+    libros = filtrados if filtrados is not None else Libro.objects.all()
+    for palabra in palabras:
+        libros = libros.filter(
+            Q(titulo__icontains=palabra) | Q(isbn__icontains=palabra) | Q(autorid__nombre__icontains=palabra)
+            | Q(autorid__apellido__icontains=palabra) | Q(editorialid__nombre__icontains=palabra)
+        )
+    ids = libros.order_by('titulo', 'libroid').values_list('libroid', flat=True)
+    return list(ids[inicio:inicio + limite] if limite is not None else ids[inicio:])
+
+
+def buscar_ids(texto, limite=None):
+    """
+    Lista de ``libroid`` que coinciden con el texto, del más al menos
+    relevante. Sin ``limite`` devuelve todas las coincidencias.
+    """
+    return _ejecutar_busqueda(texto, limite=limite)
+
+
+def ids_para_conteo(texto):
+    """
+    ``(ids, aproximado)`` para los conteos de facetas: como mucho
+    ``BUSQUEDA_LIMITE_CONTEO`` ids, los más relevantes. ``aproximado`` es
+    ``True`` si hay más coincidencias y los conteos son un mínimo.
+    """
+    tope = getattr(settings, 'BUSQUEDA_LIMITE_CONTEO', LIMITE_CONTEO)
+    ids = buscar_ids(texto, limite=tope + 1)
+    return ids[:tope], len(ids) > tope
+
+
+def buscar_pagina(texto, libros, inicio, cantidad):
+    """
+    ``libroid`` de las posiciones ``[inicio, inicio + cantidad)`` de la
+    búsqueda, por relevancia, entre los libros del queryset ``libros`` (los
+    filtros del catálogo). El índice y los filtros se cruzan en una sola
+    consulta, así que ninguna coincidencia se pierde por estar lejos en el
+    orden de relevancia.
+    """
+    return _ejecutar_busqueda(texto, libros, cantidad, inicio)
@@ -0,0 +1,172 @@
+# app_Libreria/carrito.py
+"""
+Servicios del carrito de compras.
+
+``resumen_carrito`` da el número de artículos, unidades y subtotal del
+carrito de un usuario para la barra de navegación. Se guarda en la caché
+``default`` por usuario: las páginas lo leen sin consultar la base de datos
+y las señales de ``Carrito`` (y los cambios de precio de ``Libro``) lo
+invalidan al confirmarse la transacción, así que ``agregar_al_carrito``,
+``actualizar_carrito``, ``eliminar_del_carrito`` y ``procesar_compra`` no
+tienen que recordarlo. Tras invalidarse, la siguiente página lo recalcula
+con una sola consulta.
+
+``cotizar_carrito`` es el carrito con precios que usan ``ver_carrito`` y
+``procesar_compra``: lee los artículos con sus libros en una consulta y
+calcula subtotales por línea, descuento, IVA y total en una sola pasada.
+Devuelve un ``CarritoCotizado`` inmutable.
+"""
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.core.cache import caches
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+
+from .models import Carrito
+
+TASA_IVA = Decimal('0.16')
+CENTAVO = Decimal('0.01')
+
+ALIAS_CACHE = 'default'
+# Acota cuánto podría durar un resumen viejo si una lectura se cruza con una invalidación
+TTL_RESUMEN = 60 * 10
+
+RESUMEN_VACIO = {'items': 0, 'unidades': 0, 'subtotal': Decimal('0.00')}
+
+
+def _clave_resumen(usuario_id):
+    return f'carrito:resumen:{usuario_id}'
+
+
+def calcular_resumen(usuario_id):
+    """Resumen leído de la base de datos (una consulta)"""
+    resumen = Carrito.objects.filter(usuario_id=usuario_id).aggregate(
+        items=Count('carritoid'),
+        unidades=Sum('cantidad'),
+        subtotal=Sum(ExpressionWrapper(
+            F('cantidad') * F('libro__precioventa'),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        )),
+    )
+    return {
+        'items': resumen['items'],
+        'unidades': resumen['unidades'] or 0,
+        'subtotal': (resumen['subtotal'] or Decimal('0')).quantize(CENTAVO),
+    }
+
+
+def resumen_carrito(user):
+    """``{'items', 'unidades', 'subtotal'}`` del carrito de ``user``"""
+    if not user.is_authenticated:
+        return RESUMEN_VACIO
+    cache = caches[ALIAS_CACHE]
+    clave = _clave_resumen(user.pk)
+    resumen = cache.get(clave)
+    if resumen is None:
+        resumen = calcular_resumen(user.pk)
+        cache.set(clave, resumen, TTL_RESUMEN)
+    return resumen
+
+
+def guardar_resumen(usuario_id, resumen):
+    caches[ALIAS_CACHE].set(_clave_resumen(usuario_id), resumen, TTL_RESUMEN)
+
+
+def invalidar_resumen(*usuarios_ids):
+    caches[ALIAS_CACHE].delete_many([_clave_resumen(usuario_id) for usuario_id in usuarios_ids])
+
+
+# =============================================
+# CARRITO CON PRECIOS
+# =============================================
+
+def redondear(monto):
+    return monto.quantize(CENTAVO, rounding=ROUND_HALF_UP)
+
+
+@dataclass(frozen=True)
+class LineaCarrito:
+    carritoid: int
+    libro: object
+    cantidad: int
+    precio_unitario: Decimal
+    subtotal: Decimal
+
+    @property
+    def hay_stock(self):
+        return self.cantidad <= self.libro.stock
+
+    @property
+    def item_subtotal(self):
+        # Nombre que ya usaba la plantilla del carrito
+        return self.subtotal
+
+
+@dataclass(frozen=True)
+class CarritoCotizado:
+    lineas: tuple
+    unidades: int
+    subtotal: Decimal
+    descuento: Decimal
+    iva: Decimal
+    total: Decimal
+
+    def __iter__(self):
+        return iter(self.lineas)
+
+    def __len__(self):
+        return len(self.lineas)
+
+    def __bool__(self):
+        return bool(self.lineas)
+
+    @property
+    def sin_stock(self):
+        """Líneas que piden más unidades de las disponibles"""
+        return tuple(linea for linea in self.lineas if not linea.hay_stock)
+
+    def resumen(self):
+        """El mismo diccionario que ``resumen_carrito``"""
+        return {'items': len(self.lineas), 'unidades': self.unidades, 'subtotal': self.subtotal}
+
+
+def cotizar(items, descuento=Decimal('0')):
+    """
+    ``CarritoCotizado`` de un iterable de ``Carrito`` con ``libro`` ya
+    cargado. ``descuento`` es un monto que se resta antes del IVA.
+    """
+    lineas = []
+    unidades = 0
+    subtotal = Decimal('0')
+    for item in items:
+        precio = item.libro.precioventa
+        importe = precio * item.cantidad
+        lineas.append(LineaCarrito(item.carritoid, item.libro, item.cantidad, precio, importe))
+        unidades += item.cantidad
+        subtotal += importe
+
+    subtotal = redondear(subtotal)
+    descuento = min(redondear(Decimal(descuento)), subtotal)
+    iva = redondear((subtotal - descuento) * TASA_IVA)
+    return CarritoCotizado(
+        lineas=tuple(lineas),
+        unidades=unidades,
+        subtotal=subtotal,
+        descuento=descuento,
+        iva=iva,
+        total=subtotal - descuento + iva,
+    )
+
+
+def cotizar_carrito(usuario, descuento=Decimal('0'), queryset=None):
+    """
+    Carrito con precios de ``usuario`` en una consulta. ``queryset`` permite
+    leerlo con bloqueo (``select_for_update``) dentro de una transacción.
+    """
+    if queryset is None:
+        queryset = Carrito.objects.all()
+    items = queryset.filter(usuario=usuario).select_related('libro__autorid').order_by('carritoid')
+    cotizado = cotizar(items, descuento)
+    # Ya se leyó todo el carrito: el resumen de la barra sale gratis
+    guardar_resumen(usuario.pk, cotizado.resumen())
+    return cotizado
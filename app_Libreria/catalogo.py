@@ -0,0 +1,194 @@
+# app_Libreria/catalogo.py
+"""
+Consultas del catálogo público de libros.
+
+Los filtros (género, editorial, década, rango de precio y disponibilidad) se aplican en la base
+de datos y los resultados se paginan por cursor (keyset) sobre el campo de
+orden más ``libroid``, de modo que cada página cuesta lo mismo sin importar
+cuántos libros haya en el catálogo.
+
+Cuando hay texto de búsqueda (``q``) los resultados salen del índice de texto
+completo, cruzado con los filtros en la misma consulta, ordenados por
+relevancia; el cursor es la posición en ese orden.
+
+Las páginas sólo traen los ids de cada fila; el HTML de las tarjetas sale de
+la caché de fragmentos (``tarjetas.py``).
+"""
+import base64
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Q
+
+from .busqueda import buscar_pagina
+from .models import Libro
+
+TAMANO_PAGINA = 24
+
+# orden -> (campo, descendente)
+ORDENES = {
+    'titulo_asc': ('titulo', False),
+    'titulo_desc': ('titulo', True),
+    'precio_asc': ('precioventa', False),
+    'precio_desc': ('precioventa', True),
+}
+ORDEN_DEFAULT = 'titulo_asc'
+
+DISPONIBILIDADES = ('con_stock', 'sin_stock', 'todos')
+
+
+def _leer_decimal(valor):
+    """Convierte un parámetro GET en Decimal no negativo, o None si no es válido"""
+    if valor is None or not str(valor).strip():
+        return None
+    try:
+        numero = Decimal(str(valor).strip())
+    except (InvalidOperation, ValueError):
+        return None
+    if not numero.is_finite() or numero < 0:
+        return None
+    return numero
+
+
+def leer_filtros(params):
+    """
+    Normaliza los parámetros GET del catálogo en un diccionario de filtros.
+    Acepta también el parámetro antiguo ``sin_stock=true``.
+    """
+    generos_validos = {codigo for codigo, _ in Libro.GENEROS}
+    genero = params.get('genero', '')
+    if genero not in generos_validos:
+        genero = ''
+
+    disponibilidad = params.get('disponibilidad', '')
+    if disponibilidad not in DISPONIBILIDADES:
+        disponibilidad = 'sin_stock' if params.get('sin_stock', 'false') == 'true' else 'con_stock'
+
+    try:
+        editorial = int(params.get('editorial', ''))
+    except ValueError:
+        editorial = None
+
+    try:
+        decada = int(params.get('decada', ''))
+        decada -= decada % 10
+    except ValueError:
+        decada = None
+
+    orden = params.get('orden', ORDEN_DEFAULT)
+    if orden not in ORDENES:
+        orden = ORDEN_DEFAULT
+
+    return {
+        'q': params.get('q', '').strip()[:200],
+        'genero': genero,
+        'editorial': editorial,
+        'decada': decada,
+        'precio_min': _leer_decimal(params.get('precio_min')),
+        'precio_max': _leer_decimal(params.get('precio_max')),
+        'disponibilidad': disponibilidad,
+        'orden': orden,
+    }
+
+
+def filtrar_libros(filtros):
+    """QuerySet de libros que cumplen los filtros, sin ordenar ni paginar"""
+    libros = Libro.objects.all()
+
+    if filtros['disponibilidad'] == 'con_stock':
+        libros = libros.filter(stock__gt=0)
+    elif filtros['disponibilidad'] == 'sin_stock':
+        libros = libros.filter(stock__lte=0)
+
+    if filtros['genero']:
+        libros = libros.filter(genero=filtros['genero'])
+    if filtros['editorial']:
+        libros = libros.filter(editorialid=filtros['editorial'])
+    if filtros['decada'] is not None:
+        libros = libros.filter(aniopublicacion__gte=filtros['decada'], aniopublicacion__lt=filtros['decada'] + 10)
+    if filtros['precio_min'] is not None:
+        libros = libros.filter(precioventa__gte=filtros['precio_min'])
+    if filtros['precio_max'] is not None:
+        libros = libros.filter(precioventa__lte=filtros['precio_max'])
+
+    return libros
+
+
+def codificar_cursor(valor, libroid):
+    """Cursor opaco para la URL a partir de la última fila de una página"""
+    crudo = json.dumps([str(valor), libroid]).encode()
+    return base64.urlsafe_b64encode(crudo).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor):
+    """Devuelve (valor, libroid) o None si el cursor está vacío o manipulado"""
+    if not cursor:
+        return None
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        valor, libroid = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        return str(valor), int(libroid)
+    except (ValueError, TypeError):
+        return None
+
+
+def pagina_catalogo(filtros, cursor=None, tamano=TAMANO_PAGINA):
+    """
+    Devuelve una página del catálogo como diccionario con las llaves
+    ``filas`` (lista de ``(libroid, autorid_id, editorialid_id)``) y
+    ``siguiente`` (cursor de la próxima página o None).
+    """
+    if filtros.get('q'):
+        return _pagina_busqueda(filtros, cursor, tamano)
+
+    campo, descendente = ORDENES[filtros['orden']]
+    libros = filtrar_libros(filtros)
+
+    posicion = decodificar_cursor(cursor)
+    if posicion is not None:
+        valor, libroid = posicion
+        if campo == 'precioventa':
+            valor = _leer_decimal(valor)
+        if valor is not None:
+            if descendente:
+                libros = libros.filter(
+                    Q(**{f'{campo}__lt': valor}) | Q(**{campo: valor, 'libroid__lt': libroid})
+                )
+            else:
+                libros = libros.filter(
+                    Q(**{f'{campo}__gt': valor}) | Q(**{campo: valor, 'libroid__gt': libroid})
+                )
+
+    if descendente:
+        libros = libros.order_by(f'-{campo}', '-libroid')
+    else:
+        libros = libros.order_by(campo, 'libroid')
+
+    # Se pide una fila extra sólo para saber si existe otra página
+    filas = list(libros.values_list('libroid', 'autorid', 'editorialid', campo)[:tamano + 1])
+    siguiente = None
+    if len(filas) > tamano:
+        filas = filas[:tamano]
+        libroid, _, _, valor = filas[-1]
+        siguiente = codificar_cursor(valor, libroid)
+
+    return {'filas': [fila[:3] for fila in filas], 'siguiente': siguiente}
+
+
+def _pagina_busqueda(filtros, cursor, tamano):
+    """Página de resultados de búsqueda, respetando el orden por relevancia"""
+    posicion = decodificar_cursor(cursor)
+    inicio = max(posicion[1], 0) if posicion is not None else 0
+
+    # Se pide un id extra sólo para saber si existe otra página
+    pagina_ids = buscar_pagina(filtros['q'], filtrar_libros(filtros), inicio, tamano + 1)
+    siguiente = None
+    if len(pagina_ids) > tamano:
+        pagina_ids = pagina_ids[:tamano]
+        siguiente = codificar_cursor('q', inicio + tamano)
+
+    por_id = {
+        fila[0]: fila
+        for fila in Libro.objects.filter(libroid__in=pagina_ids).values_list('libroid', 'autorid', 'editorialid')
+    }
+    return {'filas': [por_id[libroid] for libroid in pagina_ids if libroid in por_id], 'siguiente': siguiente}
@@ -0,0 +1,14 @@
+# app_Libreria/context_processors.py
+"""Procesadores de contexto de la aplicación (ver TEMPLATES en settings)"""
+from django.utils.functional import SimpleLazyObject
+
+from .carrito import resumen_carrito
+
+
+def carrito(request):
+    """
+    ``resumen_carrito`` para la barra de navegación: ``items``, ``unidades``
+    y ``subtotal``. Perezoso, así que las páginas que no lo usan no tocan
+    la caché.
+    """
+    return {'resumen_carrito': SimpleLazyObject(lambda: resumen_carrito(request.user))}
@@ -0,0 +1,88 @@
+# app_Libreria/enrutador.py
+"""
+Lecturas en una réplica de PostgreSQL (perfil ``settings_postgres``).
+
+``LecturaReplicaMiddleware`` marca las peticiones ``GET``/``HEAD`` a las
+vistas públicas de sólo lectura (``VISTAS_REPLICA``, por nombre de URL) y,
+mientras dura la petición, ``EnrutadorReplica`` manda sus lecturas al alias
+``replica``. Todo lo demás (checkout, carrito, panel de administración,
+login) lee y escribe en ``default``; las escrituras siempre van a
+``default``, y dentro de ``transaction.atomic()`` también las lecturas.
+
+La réplica va unos milisegundos atrás de la primaria. Para que quien acaba
+de escribir vea lo que escribió, toda petición que no es ``GET``/``HEAD``
+deja la cookie ``primaria_hasta``: durante ``REPLICA_PEGADO_SEGUNDOS`` las
+vistas públicas de ese navegador también leen de la primaria.
+
+Sin alias ``replica`` en ``DATABASES`` el enrutador no cambia nada.
+"""
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA = 'replica'
+VISTAS_REPLICA = frozenset({'inicio', 'libros', 'eventos', 'blog', 'detalle_blog'})
+PEGADO_SEGUNDOS = 5
+COOKIE_PEGADO = 'primaria_hasta'
+
+_en_replica = ContextVar('lectura_en_replica', default=False)
+
+
+def leer_de_replica():
+    """``True`` si la petición en curso puede leer de la réplica"""
+    return _en_replica.get()
+
+
+def _pegado_a_primaria(request):
+    try:
+        return float(request.COOKIES.get(COOKIE_PEGADO, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class LecturaReplicaMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._lectura_replica = None
+        try:
+            response = self.get_response(request)
+        finally:
+            if request._lectura_replica is not None:
+                _en_replica.reset(request._lectura_replica)
+
+        if request.method not in ('GET', 'HEAD'):
+            segundos = getattr(settings, 'REPLICA_PEGADO_SEGUNDOS', PEGADO_SEGUNDOS)
+            response.set_cookie(COOKIE_PEGADO, f'{time.time() + segundos:.3f}', max_age=segundos,
+                                httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        vistas = getattr(settings, 'VISTAS_REPLICA', VISTAS_REPLICA)
+        if (request.method in ('GET', 'HEAD') and request.resolver_match.url_name in vistas
+                and not _pegado_a_primaria(request)):
+            request._lectura_replica = _en_replica.set(True)
+
+
+class EnrutadorReplica:
+
+    def db_for_read(self, model, **hints):
+        if (leer_de_replica() and REPLICA in connections.settings
+                and not connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return REPLICA
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplica y primaria tienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La réplica recibe el esquema por replicación
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,305 @@
+# app_Libreria/exportar.py
+"""
+Exportación de ventas y líneas de venta a CSV y XLSX en streaming.
+
+Las filas se leen por páginas con paginación por clave (``WHERE id > último
+ORDER BY id LIMIT n``) en lugar de un cursor abierto durante toda la
+descarga: cada página es una consulta corta, así una exportación de
+millones de líneas no mantiene un bloqueo de lectura que en SQLite frenaría
+las escrituras de las demás peticiones. Se piden tuplas con ``values_list``
+(con los JOIN de libro, autor, editorial y cliente), nunca instancias.
+
+Los escritores producen ``bytes`` a medida que llegan las filas, para
+``StreamingHttpResponse`` o para un archivo: la memoria usada no depende del
+número de filas.
+
+* CSV: UTF-8 con BOM (Excel reconoce los acentos). Los textos que empiezan
+  con ``=``, ``+``, ``-`` o ``@`` llevan un apóstrofo delante para que una
+  hoja de cálculo no los interprete como fórmulas.
+* XLSX: un libro de una sola hoja escrito a mano (SpreadsheetML con cadenas
+  en línea) dentro de un ZIP que ``zipfile`` comprime sobre la marcha; no
+  necesita openpyxl ni un archivo temporal.
+"""
+import csv
+import datetime
+import re
+import zipfile
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from django.db.models import F, Value
+from django.db.models.functions import Concat
+from django.utils import timezone
+
+from .models import DetalleVenta, Venta
+
+TAMANO_PAGINA = 2000
+TAMANO_TROZO = 64 * 1024
+FORMATOS = ('csv', 'xlsx')
+
+# tabla -> (modelo, clave primaria, [(encabezado, expresión o campo)])
+TABLAS = {
+    'ventas': (Venta, 'ventaid', [
+        ('Venta', 'ventaid'),
+        ('Fecha', 'fechaventa'),
+        ('Cliente', 'clienteid__username'),
+        ('Email', 'clienteid__email'),
+        ('Método de pago', 'metodopago'),
+        ('Estado', 'estadoventa'),
+        ('Total', 'montototal'),
+        ('Descuento', 'descuentoaplicado'),
+        ('Pago recibido', 'pagorecibido'),
+        ('Cambio', 'cambio'),
+        ('Devuelto', 'montodevuelto'),
+    ]),
+    'detalles': (DetalleVenta, 'detalleventaid', [
+        ('Línea', 'detalleventaid'),
+        ('Venta', 'ventaid_id'),
+        ('Fecha', 'ventaid__fechaventa'),
+        ('Cliente', 'ventaid__clienteid__username'),
+        ('Estado', 'ventaid__estadoventa'),
+        ('Método de pago', 'ventaid__metodopago'),
+        ('ISBN', 'libroid__isbn'),
+        ('Título', 'libroid__titulo'),
+        ('Autor', Concat(F('libroid__autorid__nombre'), Value(' '), F('libroid__autorid__apellido'))),
+        ('Editorial', 'libroid__editorialid__nombre'),
+        ('Género', 'libroid__genero'),
+        ('Cantidad', 'cantidad'),
+        ('Devueltas', 'cantidaddevuelta'),
+        ('Precio unitario', 'preciounitario'),
+        ('IVA', 'iva'),
+        ('Subtotal', 'subtotal'),
+    ]),
+}
+
+_FORMULA = ('=', '+', '-', '@')
+# Caracteres de control que XML 1.0 no admite
+_NO_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+class ExportacionInvalida(ValueError):
+    """Tabla, formato o filtro desconocidos"""
+
+
+# =============================================
+# FILAS
+# =============================================
+
+def encabezados(tabla):
+    return [encabezado for encabezado, _ in TABLAS[tabla][2]]
+
+
+def consulta(tabla, desde=None, hasta=None, estado=None, metodo=None):
+    """Queryset de la tabla con los filtros; ``desde`` y ``hasta`` son fechas incluidas"""
+    if tabla not in TABLAS:
+        raise ExportacionInvalida(f'Tabla desconocida: {tabla}')
+    modelo, _, _ = TABLAS[tabla]
+    prefijo = '' if modelo is Venta else 'ventaid__'
+    filtros = {}
+    if desde:
+        filtros[f'{prefijo}fechaventa__gte'] = timezone.make_aware(datetime.datetime.combine(desde, datetime.time.min))
+    if hasta:
+        siguiente = hasta + datetime.timedelta(days=1)
+        filtros[f'{prefijo}fechaventa__lt'] = timezone.make_aware(datetime.datetime.combine(siguiente, datetime.time.min))
+    if estado:
+        if estado not in dict(Venta.ESTADOS_VENTA):
+            raise ExportacionInvalida(f'Estado desconocido: {estado}')
+        filtros[f'{prefijo}estadoventa'] = estado
+    if metodo:
+        if metodo not in dict(Venta.METODOS_PAGO):
+            raise ExportacionInvalida(f'Método de pago desconocido: {metodo}')
+        filtros[f'{prefijo}metodopago'] = metodo
+    return modelo.objects.filter(**filtros)
+
+
+def filas(queryset, tabla, tamano_pagina=TAMANO_PAGINA):
+    """Tuplas de la tabla, página por página según la clave primaria"""
+    _, clave, columnas = TABLAS[tabla]
+    campos = []
+    anotaciones = {}
+    for i, (_, columna) in enumerate(columnas):
+        if isinstance(columna, str):
+            campos.append(columna)
+        else:
+            anotaciones[f'_columna{i}'] = columna
+            campos.append(f'_columna{i}')
+    base = queryset.annotate(**anotaciones).order_by(clave).values_list(*campos)
+    posicion_clave = campos.index(clave)
+
+    ultimo = None
+    while True:
+        pagina = base if ultimo is None else base.filter(**{f'{clave}__gt': ultimo})
+        pagina = list(pagina[:tamano_pagina])
+        yield from pagina
+        if len(pagina) < tamano_pagina:
+            return
+        ultimo = pagina[-1][posicion_clave]
+
+
+def _fecha(valor, zona):
+    if valor.tzinfo is not None:
+        valor = valor.astimezone(zona)
+    return valor.isoformat(' ', 'seconds')[:19]
+
+
+def _texto(valor, zona):
+    if valor is None:
+        return ''
+    if isinstance(valor, datetime.datetime):
+        return _fecha(valor, zona)
+    return str(valor)
+
+
+# =============================================
+# CSV
+# =============================================
+
+class _Eco:
+    """Archivo falso: ``csv.writer`` devuelve lo que escribiría"""
+
+    def write(self, valor):
+        return valor
+
+
+def _celda_csv(valor, zona):
+    # csv.writer ya escribe None como vacío y los números con str()
+    if valor.__class__ is str:
+        return "'" + valor if valor.startswith(_FORMULA) else valor
+    if valor.__class__ is datetime.datetime:
+        return _fecha(valor, zona)
+    return valor
+
+
+def escribir_csv(cabecera, filas, tamano_trozo=TAMANO_TROZO):
+    """Trozos de ``bytes`` del CSV de ``filas``"""
+    zona = timezone.get_current_timezone()
+    escritor = csv.writer(_Eco())
+    trozo = ['\ufeff', escritor.writerow(cabecera)]
+    tamano = 0
+    for fila in filas:
+        linea = escritor.writerow([_celda_csv(valor, zona) for valor in fila])
+        trozo.append(linea)
+        tamano += len(linea)
+        if tamano >= tamano_trozo:
+            yield ''.join(trozo).encode('utf-8')
+            trozo, tamano = [], 0
+    if trozo:
+        yield ''.join(trozo).encode('utf-8')
+
+
+# =============================================
+# XLSX
+# =============================================
+
+_TIPOS = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+</Types>'''
+
+_RELACIONES = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>'''
+
+_LIBRO = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="{}" sheetId="1" r:id="rId1"/></sheets>
+</workbook>'''
+
+_RELACIONES_LIBRO = '''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+</Relationships>'''
+
+_INICIO_HOJA = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+_FIN_HOJA = '</sheetData></worksheet>'
+
+
+class _Salida:
+    """Destino del ZIP sin ``seek``: acumula lo escrito hasta que se recoge"""
+
+    def __init__(self):
+        self._partes = []
+
+    def write(self, datos):
+        self._partes.append(bytes(datos))
+        return len(datos)
+
+    def flush(self):
+        pass
+
+    def recoger(self):
+        datos = b''.join(self._partes)
+        self._partes = []
+        return datos
+
+
+def _celda_xlsx(valor, zona):
+    if valor.__class__ in (int, float, Decimal):
+        return f'<c><v>{valor}</v></c>'
+    texto = escape(_NO_XML.sub('', _texto(valor, zona)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{texto}</t></is></c>'
+
+
+def _fila_xlsx(valores, zona):
+    return '<row>' + ''.join([_celda_xlsx(valor, zona) for valor in valores]) + '</row>'
+
+
+def escribir_xlsx(cabecera, filas, hoja='Datos', tamano_trozo=TAMANO_TROZO):
+    """Trozos de ``bytes`` de un .xlsx con ``filas`` en una hoja"""
+    zona = timezone.get_current_timezone()
+    salida = _Salida()
+    with zipfile.ZipFile(salida, 'w', compression=zipfile.ZIP_DEFLATED) as archivo:
+        archivo.writestr('[Content_Types].xml', _TIPOS)
+        archivo.writestr('_rels/.rels', _RELACIONES)
+        archivo.writestr('xl/workbook.xml', _LIBRO.format(escape(hoja)))
+        archivo.writestr('xl/_rels/workbook.xml.rels', _RELACIONES_LIBRO)
+        yield salida.recoger()
+
+        # force_zip64: el tamaño de la hoja no se conoce al empezar
+        with archivo.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as hoja_xml:
+            trozo = [_INICIO_HOJA, _fila_xlsx(cabecera, zona)]
+            tamano = 0
+            for fila in filas:
+                xml = _fila_xlsx(fila, zona)
+                trozo.append(xml)
+                tamano += len(xml)
+                if tamano >= tamano_trozo:
+                    hoja_xml.write(''.join(trozo).encode('utf-8'))
+                    trozo, tamano = [], 0
+                    datos = salida.recoger()
+                    if datos:
+                        yield datos
+            trozo.append(_FIN_HOJA)
+            hoja_xml.write(''.join(trozo).encode('utf-8'))
+    yield salida.recoger()
+
+
+# =============================================
+# PUNTO DE ENTRADA
+# =============================================
+
+TIPOS_CONTENIDO = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def exportar(tabla, formato, tamano_pagina=TAMANO_PAGINA, **filtros):
+    """Trozos de ``bytes`` de la exportación de ``tabla`` en ``formato``"""
+    if formato not in FORMATOS:
+        raise ExportacionInvalida(f'Formato desconocido: {formato}')
+    # Valida los filtros antes de empezar a producir bytes
+    queryset = consulta(tabla, **filtros)
+    datos = filas(queryset, tabla, tamano_pagina)
+    if formato == 'csv':
+        return escribir_csv(encabezados(tabla), datos)
+    return escribir_xlsx(encabezados(tabla), datos, hoja=tabla.capitalize())
+
+
+def nombre_archivo(tabla, formato):
+    return f'{tabla}_{timezone.localdate():%Y%m%d}.{formato}'
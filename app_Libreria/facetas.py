@@ -0,0 +1,378 @@
+# app_Libreria/facetas.py
+"""
+Conteos de facetas del catálogo (género, editorial, década, rango de precio y
+disponibilidad).
+
+Cada valor de faceta guarda un mapa de bits de ``libroid`` (un ``int`` de
+Python donde el bit *n* representa al libro *n*). Contar cuántos libros hay
+por valor con los filtros actuales es intersectar mapas de bits en memoria y
+contar bits, sin ``GROUP BY`` por petición.
+
+El índice se construye una vez por proceso y se actualiza con las señales de
+``Libro``. Para que los demás procesos se enteren, cada cambio se anota en la
+caché (``facetas:version`` más una entrada por cambio); al leer, un proceso
+atrasado aplica sólo los cambios que le faltan y reconstruye todo únicamente
+si se perdió parte del registro. Otros índices en memoria (el de ISBN del
+punto de venta) leen el mismo registro con ``cambios_desde``.
+"""
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from .models import Libro, Editorial
+
+FACETAS = ('genero', 'editorial', 'decada', 'precio', 'disponibilidad')
+
+# (mínimo, máximo exclusivo) en pesos; None = sin límite superior
+RANGOS_PRECIO = [
+    (0, 100),
+    (100, 250),
+    (250, 500),
+    (500, 1000),
+    (1000, None),
+]
+
+# Editoriales con mapa de bits propio (las de más títulos)
+MAX_EDITORIALES = 30
+
+CLAVE_VERSION = 'facetas:version'
+CLAVE_CAMBIO = 'facetas:cambio:{}'
+TTL_CAMBIOS = 60 * 60
+# Si un proceso está más atrasado que esto, reconstruye en lugar de ponerse al día
+MAX_CAMBIOS_PENDIENTES = 500
+RECONSTRUIR = '*'
+
+MAX_MASCARAS_CACHE = 64
+
+
+def _centavos(valor, redondeo=ROUND_FLOOR):
+    return int((Decimal(str(valor)) * 100).to_integral_value(rounding=redondeo))
+
+
+def rango_precio_de(precio):
+    """Índice del rango de precio al que pertenece un precio"""
+    pesos = Decimal(str(precio))
+    for indice, (minimo, maximo) in enumerate(RANGOS_PRECIO):
+        if pesos >= minimo and (maximo is None or pesos < maximo):
+            return indice
+    return 0
+
+
+def etiqueta_rango(indice):
+    minimo, maximo = RANGOS_PRECIO[indice]
+    if maximo is None:
+        return f'${minimo} o más'
+    return f'${minimo} – ${maximo - Decimal("0.01")}'
+
+
+def _bits_desde_ids(ids, tamano):
+    """Mapa de bits a partir de una colección de ids, sin crear enteros intermedios"""
+    crudo = bytearray(tamano // 8 + 1)
+    for libroid in ids:
+        if libroid < tamano:
+            crudo[libroid >> 3] |= 1 << (libroid & 7)
+    return int.from_bytes(crudo, 'little')
+
+
+class IndiceFacetas:
+    """Mapas de bits por valor de faceta, en memoria del proceso"""
+
+    def __init__(self):
+        self._candado = threading.RLock()
+        self._listo = False
+        self.version = None
+
+    # ---------------------------------------------
+    # Construcción y actualización
+    # ---------------------------------------------
+
+    def construir(self):
+        """Lee todo el catálogo (una consulta) y arma los mapas de bits"""
+        with self._candado:
+            version = cache.get(CLAVE_VERSION, 0)
+            maximo = Libro.objects.aggregate(m=Max('libroid'))['m'] or 0
+            tamano = maximo + 1
+
+            top = list(
+                Libro.objects.values('editorialid')
+                .annotate(n=Count('libroid'))
+                .order_by('-n', 'editorialid')
+                .values_list('editorialid', flat=True)[:MAX_EDITORIALES]
+            )
+            self.editoriales = dict(
+                Editorial.objects.filter(editorialid__in=top).values_list('editorialid', 'nombre')
+            )
+
+            crudos = {faceta: {} for faceta in FACETAS}
+            todos = bytearray(tamano // 8 + 1)
+            self._precio = array('q', bytes(8 * tamano))
+            pares_precio = []
+
+            filas = Libro.objects.values_list(
+                'libroid', 'genero', 'editorialid', 'aniopublicacion', 'precioventa', 'stock'
+            ).order_by()
+            for libroid, genero, editorialid, anio, precio, stock in filas.iterator(chunk_size=5000):
+                byte, bit = libroid >> 3, 1 << (libroid & 7)
+                todos[byte] |= bit
+                for faceta, valor in self._valores(genero, editorialid, anio, precio, stock):
+                    if faceta == 'editorial' and valor not in self.editoriales:
+                        continue
+                    crudo = crudos[faceta].get(valor)
+                    if crudo is None:
+                        crudo = crudos[faceta][valor] = bytearray(tamano // 8 + 1)
+                    crudo[byte] |= bit
+                centavos = _centavos(precio)
+                self._precio[libroid] = centavos
+                pares_precio.append((centavos, libroid))
+
+            self.bits = {
+                faceta: {valor: int.from_bytes(crudo, 'little') for valor, crudo in valores.items()}
+                for faceta, valores in crudos.items()
+            }
+            self.todos = int.from_bytes(todos, 'little')
+
+            # Precios ordenados para resolver rangos arbitrarios con bisect
+            pares_precio.sort()
+            self._precios_ordenados = array('q', (c for c, _ in pares_precio))
+            self._ids_por_precio = array('q', (i for _, i in pares_precio))
+
+            self._mascaras = OrderedDict()
+            self.version = version
+            self._listo = True
+
+    @staticmethod
+    def _valores(genero, editorialid, anio, precio, stock):
+        anio = int(anio or 0)
+        return (
+            ('genero', genero),
+            ('editorial', int(editorialid)),
+            ('decada', anio - anio % 10),
+            ('precio', rango_precio_de(precio)),
+            ('disponibilidad', 'con_stock' if int(stock or 0) > 0 else 'sin_stock'),
+        )
+
+    def _quitar(self, libroid):
+        if not (self.todos >> libroid) & 1:
+            return
+        apagar = ~(1 << libroid)
+        self.todos &= apagar
+        for valores in self.bits.values():
+            for valor, bits in valores.items():
+                if (bits >> libroid) & 1:
+                    valores[valor] = bits & apagar
+
+        centavos = self._precio[libroid] if libroid < len(self._precio) else None
+        if centavos is not None:
+            inicio = bisect_left(self._precios_ordenados, centavos)
+            fin = bisect_right(self._precios_ordenados, centavos)
+            for posicion in range(inicio, fin):
+                if self._ids_por_precio[posicion] == libroid:
+                    del self._precios_ordenados[posicion]
+                    del self._ids_por_precio[posicion]
+                    break
+
+    def _poner(self, libroid, genero, editorialid, anio, precio, stock):
+        encender = 1 << libroid
+        self.todos |= encender
+        for faceta, valor in self._valores(genero, editorialid, anio, precio, stock):
+            if faceta == 'editorial' and valor not in self.editoriales:
+                continue
+            self.bits[faceta][valor] = self.bits[faceta].get(valor, 0) | encender
+
+        centavos = _centavos(precio)
+        if libroid >= len(self._precio):
+            self._precio.extend([0] * (libroid + 1 - len(self._precio)))
+        self._precio[libroid] = centavos
+        posicion = bisect_right(self._precios_ordenados, centavos)
+        self._precios_ordenados.insert(posicion, centavos)
+        self._ids_por_precio.insert(posicion, libroid)
+
+    def aplicar(self, libroids):
+        """Vuelve a leer de la base de datos los libros dados y actualiza sus bits"""
+        libroids = list(libroids)
+        filas = Libro.objects.filter(libroid__in=libroids).values_list(
+            'libroid', 'genero', 'editorialid', 'aniopublicacion', 'precioventa', 'stock'
+        )
+        with self._candado:
+            for libroid in libroids:
+                self._quitar(libroid)
+            for fila in filas:
+                self._poner(*fila)
+            self._mascaras.clear()
+
+    def sincronizar(self):
+        """Se pone al día con los cambios hechos por otros procesos"""
+        if self._listo and cache.get(CLAVE_VERSION, 0) == self.version:
+            return
+        with self._candado:
+            version, cambios = cambios_desde(self.version if self._listo else None)
+            if cambios is None:
+                self.construir()
+                return
+            self.aplicar(cambios)
+            self.version = version
+
+    # ---------------------------------------------
+    # Consulta
+    # ---------------------------------------------
+
+    def _mascara_precio(self, minimo, maximo):
+        """Mapa de bits de los libros con precio dentro de [minimo, maximo]"""
+        for indice, (a, b) in enumerate(RANGOS_PRECIO):
+            if minimo == a and (
+                (b is None and maximo is None) or (b is not None and maximo == b - Decimal('0.01'))
+            ):
+                return self.bits['precio'].get(indice, 0)
+
+        llave = ('precio', minimo, maximo)
+        if llave in self._mascaras:
+            self._mascaras.move_to_end(llave)
+            return self._mascaras[llave]
+
+        inicio = 0 if minimo is None else bisect_left(self._precios_ordenados, _centavos(minimo, ROUND_CEILING))
+        fin = len(self._precios_ordenados) if maximo is None else bisect_right(self._precios_ordenados, _centavos(maximo))
+        mascara = _bits_desde_ids(self._ids_por_precio[inicio:fin], len(self._precio))
+        self._guardar_mascara(llave, mascara)
+        return mascara
+
+    def _mascara_editorial(self, editorialid):
+        if editorialid in self.editoriales:
+            return self.bits['editorial'].get(editorialid, 0)
+        llave = ('editorial', editorialid)
+        if llave not in self._mascaras:
+            ids = Libro.objects.filter(editorialid=editorialid).values_list('libroid', flat=True)
+            self._guardar_mascara(llave, _bits_desde_ids(ids, len(self._precio)))
+        self._mascaras.move_to_end(llave)
+        return self._mascaras[llave]
+
+    def _guardar_mascara(self, llave, mascara):
+        self._mascaras[llave] = mascara
+        while len(self._mascaras) > MAX_MASCARAS_CACHE:
+            self._mascaras.popitem(last=False)
+
+    def contar(self, filtros, ids_busqueda=None):
+        """
+        Conteos por valor de cada faceta. Cada faceta se cuenta aplicando todos
+        los filtros activos excepto el suyo, para poder cambiar de valor.
+        """
+        self.sincronizar()
+        with self._candado:
+            base = self.todos
+            if ids_busqueda is not None:
+                base &= _bits_desde_ids(ids_busqueda, len(self._precio))
+
+            activos = {}
+            if filtros.get('genero'):
+                activos['genero'] = self.bits['genero'].get(filtros['genero'], 0)
+            if filtros.get('editorial'):
+                activos['editorial'] = self._mascara_editorial(filtros['editorial'])
+            if filtros.get('decada') is not None:
+                activos['decada'] = self.bits['decada'].get(filtros['decada'], 0)
+            if filtros.get('precio_min') is not None or filtros.get('precio_max') is not None:
+                activos['precio'] = self._mascara_precio(filtros.get('precio_min'), filtros.get('precio_max'))
+            if filtros.get('disponibilidad') in ('con_stock', 'sin_stock'):
+                activos['disponibilidad'] = self.bits['disponibilidad'].get(filtros['disponibilidad'], 0)
+
+            conteos = {}
+            for faceta in FACETAS:
+                mascara = base
+                for otra, bits in activos.items():
+                    if otra != faceta:
+                        mascara &= bits
+                valores = dict(self.bits[faceta])
+                if faceta == 'editorial' and filtros.get('editorial') and filtros['editorial'] not in valores:
+                    valores[filtros['editorial']] = activos['editorial']
+                conteos[faceta] = {valor: (mascara & bits).bit_count() for valor, bits in valores.items()}
+
+            total = base
+            for bits in activos.values():
+                total &= bits
+            return {'conteos': conteos, 'total': total.bit_count()}
+
+
+indice = IndiceFacetas()
+
+
+def registrar_cambio(libroid=RECONSTRUIR):
+    """
+    Anota en la caché que un libro cambió (o que hay que reconstruir todo).
+    Todos los procesos, incluido éste, lo aplican en su siguiente lectura.
+    """
+    cache.add(CLAVE_VERSION, 0, timeout=None)
+    try:
+        version = cache.incr(CLAVE_VERSION)
+    except ValueError:
+        cache.set(CLAVE_VERSION, 1, timeout=None)
+        version = 1
+    cache.set(CLAVE_CAMBIO.format(version), libroid, TTL_CAMBIOS)
+
+
+def cambios_desde(version):
+    """
+    ``(versión actual, libroids cambiados desde version)`` según el registro
+    de cambios. En lugar de los ids devuelve ``None`` si hay que reconstruir:
+    sin versión previa, con demasiados cambios o con parte del registro perdida.
+    """
+    actual = cache.get(CLAVE_VERSION, 0)
+    if version is None or actual < version or actual - version > MAX_CAMBIOS_PENDIENTES:
+        return actual, None
+    if actual == version:
+        return actual, set()
+    claves = [CLAVE_CAMBIO.format(n) for n in range(version + 1, actual + 1)]
+    cambios = cache.get_many(claves)
+    if len(cambios) < len(claves) or RECONSTRUIR in cambios.values():
+        return actual, None
+    return actual, set(cambios.values())
+
+
+def facetas_catalogo(filtros, ids_busqueda=None):
+    """
+    Facetas listas para la plantilla: por cada faceta, una lista de
+    diccionarios con ``valor``, ``etiqueta``, ``total`` y ``activo``.
+    """
+    resultado = indice.contar(filtros, ids_busqueda)
+    conteos = resultado['conteos']
+    nombres_genero = dict(Libro.GENEROS)
+
+    facetas = {
+        'genero': [
+            {'valor': codigo, 'etiqueta': nombres_genero[codigo],
+             'total': conteos['genero'].get(codigo, 0), 'activo': filtros.get('genero') == codigo}
+            for codigo, _ in Libro.GENEROS
+        ],
+        'editorial': sorted(
+            (
+                {'valor': editorialid, 'etiqueta': indice.editoriales.get(editorialid, f'Editorial #{editorialid}'),
+                 'total': total, 'activo': filtros.get('editorial') == editorialid}
+                for editorialid, total in conteos['editorial'].items()
+            ),
+            key=lambda f: (-f['total'], f['etiqueta']),
+        ),
+        'decada': [
+            {'valor': decada, 'etiqueta': f'{decada}–{decada + 9}',
+             'total': total, 'activo': filtros.get('decada') == decada}
+            for decada, total in sorted(conteos['decada'].items(), reverse=True)
+        ],
+        'precio': [
+            {'valor': indice_rango, 'etiqueta': etiqueta_rango(indice_rango),
+             'total': conteos['precio'].get(indice_rango, 0),
+             'minimo': minimo, 'maximo': None if maximo is None else maximo - Decimal('0.01'),
+             'activo': filtros.get('precio_min') == minimo and filtros.get('precio_max') == (
+                 None if maximo is None else maximo - Decimal('0.01'))}
+            for indice_rango, (minimo, maximo) in enumerate(RANGOS_PRECIO)
+        ],
+        'disponibilidad': [
+            {'valor': 'con_stock', 'etiqueta': 'Disponible',
+             'total': conteos['disponibilidad'].get('con_stock', 0),
+             'activo': filtros.get('disponibilidad') == 'con_stock'},
+            {'valor': 'sin_stock', 'etiqueta': 'AGOTADO',
+             'total': conteos['disponibilidad'].get('sin_stock', 0),
+             'activo': filtros.get('disponibilidad') == 'sin_stock'},
+        ],
+    }
+    return {'facetas': facetas, 'total': resultado['total']}
@@ -0,0 +1,455 @@
+# app_Libreria/generador.py
+"""
+Generador de datos sintéticos con la forma de producción, para pruebas de
+rendimiento (``manage.py generar_datos``).
+
+Por unidad de ``escala`` se generan ``POR_ESCALA`` filas de cada tabla; con
+``--escala=100`` son 200 000 libros, 4000 autores, 1000 editoriales, 50 000
+clientes y un millón de ventas. La forma imita una librería real:
+
+* géneros con pesos distintos, autores y editoriales con pocos muy
+  prolíficos (sesgo cuadrático/cúbico sobre el índice),
+* canastas de 1 a 8 líneas, casi siempre de una unidad, concentradas en
+  pocos libros muy vendidos (sesgo cúbico) y en clientes recurrentes,
+* ventas repartidas en los últimos ``dias`` entre las 9 y las 21 h, con
+  algunas canceladas (todo devuelto) y pendientes.
+
+Determinista: cada trozo de filas usa su propio ``random.Random`` sembrado
+con ``(semilla, tabla, trozo)``, así que el resultado es el mismo con uno o
+con varios procesos. Los trozos se generan en procesos de trabajo
+(``ProcessPoolExecutor``) y el proceso principal los escribe en orden; los
+ids de autores, editoriales, libros, clientes y ventas se asignan por
+rango desde el máximo actual, así que ninguna fila necesita leer otra.
+
+Escritura: en SQLite ``executemany`` directo con ``synchronous=OFF`` y el
+diario en memoria mientras dura la carga; en otros motores
+``bulk_create`` por lotes. Las claves foráneas no se revisan fila a fila.
+Al final se recalculan el resumen diario y el índice de búsqueda y se
+avisa a las facetas y a la analítica.
+"""
+import datetime
+import math
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import analitica, busqueda, facetas, resumenes
+from .models import (Autor, Blog, Carrito, ClaveIdempotencia, DetalleVenta, Editorial, Evento, Libro, Reserva,
+                     Venta, VentaResumenDiario)
+
+POR_ESCALA = {
+    'editoriales': 10,
+    'autores': 40,
+    'libros': 2000,
+    'clientes': 500,
+    'ventas': 10000,
+    'carritos': 100,
+    'eventos': 2,
+    'blog': 5,
+}
+TAMANO_TROZO = 5000
+CONTRASENA = 'libreria123'
+
+PESOS_GENERO = {'FIC': 30, 'ROM': 15, 'TER': 8, 'CIE': 10, 'FAN': 12, 'HIS': 8, 'BIO': 7, 'INF': 10}
+PESOS_METODO = {'TARJETA': 60, 'EFECTIVO': 30, 'TRANSFERENCIA': 10}
+PESOS_ESTADO = {'COMPLETADA': 94, 'CANCELADA': 4, 'PENDIENTE': 2}
+# Líneas por venta: 1 a 8, la mayoría de una o dos
+PESOS_LINEAS = [55, 25, 10, 4, 3, 1.5, 1, 0.5]
+PESOS_CANTIDAD = [85, 12, 3]
+
+NOMBRES = ['Ana', 'Luis', 'María', 'José', 'Lucía', 'Carlos', 'Sofía', 'Javier', 'Elena', 'Miguel',
+           'Paula', 'Diego', 'Carmen', 'Andrés', 'Valeria', 'Jorge', 'Isabel', 'Raúl', 'Teresa', 'Pablo']
+APELLIDOS = ['García', 'Martínez', 'López', 'Hernández', 'González', 'Pérez', 'Sánchez', 'Ramírez',
+             'Torres', 'Flores', 'Rivera', 'Gómez', 'Díaz', 'Cruz', 'Morales', 'Reyes', 'Ortiz',
+             'Castillo', 'Vargas', 'Romero', 'Mendoza', 'Ruiz', 'Aguilar', 'Medina', 'Herrera']
+NACIONALIDADES = ['Mexicana', 'Española', 'Argentina', 'Colombiana', 'Chilena', 'Peruana', 'Estadounidense',
+                  'Británica', 'Francesa', 'Japonesa']
+EDITORIAL_1 = ['Ediciones', 'Editorial', 'Grupo', 'Casa', 'Libros', 'Prensa', 'Sello', 'Taller']
+EDITORIAL_2 = ['Aurora', 'Quimera', 'Atlántida', 'Minerva', 'Horizonte', 'Faro', 'Alba', 'Laberinto',
+               'Océano', 'Cometa', 'Brújula', 'Tinta', 'Papiro', 'Pegaso', 'Sirena']
+PAISES = ['México', 'España', 'Argentina', 'Colombia', 'Chile', 'Estados Unidos']
+SUSTANTIVOS = ['sombra', 'casa', 'ciudad', 'noche', 'memoria', 'isla', 'jardín', 'río', 'voz', 'tiempo',
+               'viento', 'espejo', 'camino', 'silencio', 'fuego', 'mar', 'bosque', 'sueño', 'puerta', 'luz']
+ADJETIVOS = ['perdida', 'eterno', 'secreta', 'último', 'dormida', 'lejano', 'invisible', 'antiguo',
+             'rota', 'salvaje', 'quieta', 'oscuro', 'blanca', 'infinito', 'olvidada']
+
+_PRECIOS = None
+
+
+def _rng(semilla, tabla, trozo):
+    return random.Random(f'{semilla}:{tabla}:{trozo}')
+
+
+def _elegir(rng, pesos):
+    return rng.choices(list(pesos), weights=list(pesos.values()))[0]
+
+
+def _sesgado(rng, total, exponente):
+    """Índice en ``range(total)`` con los primeros mucho más probables"""
+    return min(int(total * rng.random() ** exponente), total - 1)
+
+
+def isbn_de(libroid):
+    """ISBN-13 válido con prefijo 979-8 derivado del id del libro"""
+    cuerpo = f'9798{libroid % 10 ** 8:08d}'
+    suma = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(cuerpo))
+    return cuerpo + str((10 - suma % 10) % 10)
+
+
+def precio_de(semilla, indice):
+    """Precio en centavos del libro ``indice``: log-normal entre $49 y $2500, en múltiplos de 50 centavos"""
+    rng = random.Random(f'{semilla}:precio:{indice}')
+    return max(4900, min(250000, round(rng.lognormvariate(5.6, 0.5) * 2) * 50))
+
+
+# =============================================
+# FILAS (procesos de trabajo)
+# =============================================
+
+def _iniciar_trabajador(precios):
+    global _PRECIOS
+    django.setup()
+    _PRECIOS = precios
+
+
+class _Fechas:
+    """Fechas UTC sin zona para SQLite o con zona para los demás motores"""
+
+    def __init__(self, con_zona):
+        self.zona = datetime.timezone.utc if con_zona else None
+
+    def __call__(self, *args):
+        return datetime.datetime(*args, tzinfo=self.zona)
+
+    def desde_segundos(self, segundos):
+        return datetime.datetime.fromtimestamp(segundos, datetime.timezone.utc).replace(tzinfo=self.zona)
+
+
+def filas_editoriales(semilla, trozo, inicio, fin, plan):
+    combinaciones = len(EDITORIAL_1) * len(EDITORIAL_2)
+    filas = []
+    for i in range(inicio, fin):
+        nombre = f'{EDITORIAL_1[i % len(EDITORIAL_1)]} {EDITORIAL_2[(i // len(EDITORIAL_1)) % len(EDITORIAL_2)]}'
+        if i >= combinaciones:
+            nombre = f'{nombre} {i // combinaciones + 1}'
+        editorialid = plan['base']['editoriales'] + i
+        filas.append((editorialid, nombre, f'Calle {i % 300 + 1}', f'55{i:08d}',
+                      f'contacto{editorialid}@editorial.example', '', PAISES[i % len(PAISES)]))
+    return filas
+
+
+def filas_autores(semilla, trozo, inicio, fin, plan):
+    rng = _rng(semilla, 'autores', trozo)
+    return [
+        (plan['base']['autores'] + i, rng.choice(NOMBRES), f'{rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}',
+         rng.choice(NACIONALIDADES), datetime.date(rng.randint(1900, 2000), rng.randint(1, 12), rng.randint(1, 28)),
+         '', '')
+        for i in range(inicio, fin)
+    ]
+
+
+def filas_libros(semilla, trozo, inicio, fin, plan):
+    rng = _rng(semilla, 'libros', trozo)
+    base = plan['base']
+    anio = plan['anio']
+    filas = []
+    for i in range(inicio, fin):
+        libroid = base['libros'] + i
+        titulo = f'{rng.choice(SUSTANTIVOS).capitalize()} {rng.choice(ADJETIVOS)}'
+        if rng.random() < 0.5:
+            titulo = f'La {titulo.lower()} de {rng.choice(NOMBRES)}'
+        filas.append((
+            libroid, titulo,
+            base['autores'] + _sesgado(rng, plan['autores'], 2),
+            base['editoriales'] + _sesgado(rng, plan['editoriales'], 3),
+            isbn_de(libroid),
+            anio - _sesgado(rng, 70, 2),
+            _elegir(rng, PESOS_GENERO),
+            Decimal(precio_de(semilla, i)) / 100,
+            0 if rng.random() < 0.05 else rng.randint(1, 50),
+            f'Una historia sobre {rng.choice(SUSTANTIVOS)} y {rng.choice(SUSTANTIVOS)}.',
+        ))
+    return filas
+
+
+def filas_clientes(semilla, trozo, inicio, fin, plan):
+    rng = _rng(semilla, 'clientes', trozo)
+    fechas = _Fechas(plan['con_zona'])
+    filas = []
+    for i in range(inicio, fin):
+        userid = plan['base']['clientes'] + i
+        nombre, apellido = rng.choice(NOMBRES), rng.choice(APELLIDOS)
+        filas.append((userid, plan['contrasena'], f'cliente_{userid}', nombre, apellido,
+                      f'cliente_{userid}@correo.example', False, True, False,
+                      fechas.desde_segundos(plan['desde'] - rng.randint(0, 3 * 365 * 86400))))
+    return filas
+
+
+def filas_ventas(semilla, trozo, inicio, fin, plan):
+    """``(ventas, detalles)``; las ventas del trozo caen en su tramo del periodo, en orden"""
+    rng = _rng(semilla, 'ventas', trozo)
+    fechas = _Fechas(plan['con_zona'])
+    base = plan['base']
+    dias = plan['dias']
+    ventas, detalles = [], []
+    for i in range(inicio, fin):
+        ventaid = base['ventas'] + i
+        dia = int(dias * i / plan['ventas'])
+        segundos = plan['desde'] + dia * 86400 + rng.randint(9 * 3600, 21 * 3600)
+        estado = _elegir(rng, PESOS_ESTADO)
+        subtotal = 0
+        libros = set()
+        for _ in range(rng.choices(range(1, 9), weights=PESOS_LINEAS)[0]):
+            indice = _sesgado(rng, plan['libros'], 3)
+            if indice in libros:
+                continue
+            libros.add(indice)
+            cantidad = rng.choices((1, 2, 3), weights=PESOS_CANTIDAD)[0]
+            precio = _PRECIOS[indice]
+            subtotal += precio * cantidad
+            detalles.append((ventaid, base['libros'] + indice, cantidad, Decimal(precio) / 100, Decimal('0.16'),
+                             Decimal(precio * cantidad) / 100, cantidad if estado == 'CANCELADA' else 0))
+        total = Decimal(round(subtotal * 1.16)) / 100
+        metodo = _elegir(rng, PESOS_METODO)
+        # En efectivo se paga redondeando a los siguientes $50
+        pagado = Decimal(math.ceil(total / 50) * 50) if metodo == 'EFECTIVO' else total
+        ventas.append((ventaid, base['clientes'] + _sesgado(rng, plan['clientes'], 2),
+                       fechas.desde_segundos(segundos), total, metodo, estado, Decimal('0'), pagado,
+                       pagado - total, total if estado == 'CANCELADA' else Decimal('0')))
+    return ventas, detalles
+
+
+def filas_carritos(semilla, trozo, inicio, fin, plan):
+    """Hasta tres libros distintos por cliente: el par (cliente, libro) es único"""
+    fechas = _Fechas(plan['con_zona'])
+    por_cliente = min(3, plan['libros'])
+    filas = []
+    for i in range(inicio, fin):
+        cliente, posicion = divmod(i, 3)
+        if posicion >= por_cliente:
+            continue
+        # Las líneas de un cliente salen de su propio generador aunque caigan en trozos distintos
+        rng = _rng(semilla, 'carritos', f'cliente{cliente}')
+        libros = []
+        while len(libros) <= posicion:
+            indice = _sesgado(rng, plan['libros'], 3)
+            if indice not in libros:
+                libros.append(indice)
+        filas.append((plan['base']['clientes'] + cliente % plan['clientes'], plan['base']['libros'] + libros[posicion],
+                      rng.randint(1, 3), fechas.desde_segundos(plan['hasta'] - rng.randint(0, 7 * 86400))))
+    return filas
+
+
+def filas_eventos(semilla, trozo, inicio, fin, plan):
+    rng = _rng(semilla, 'eventos', trozo)
+    fechas = _Fechas(plan['con_zona'])
+    categorias = [valor for valor, _ in Evento.CATEGORIAS]
+    return [
+        (f'{rng.choice(["Presentación", "Club", "Taller", "Firma"])}: {rng.choice(SUSTANTIVOS)} {rng.choice(ADJETIVOS)}',
+         'Evento generado para pruebas.', fechas.desde_segundos(plan['hasta'] + rng.randint(-60, 90) * 86400),
+         'Sala principal', rng.choice(categorias), rng.choice([20, 50, 100]),
+         Decimal(rng.choice([0, 0, 100, 250])), True)
+        for _ in range(inicio, fin)
+    ]
+
+
+def filas_blog(semilla, trozo, inicio, fin, plan):
+    rng = _rng(semilla, 'blog', trozo)
+    fechas = _Fechas(plan['con_zona'])
+    categorias = [valor for valor, _ in Blog.CATEGORIAS]
+    return [
+        (f'Sobre {rng.choice(SUSTANTIVOS)} {rng.choice(ADJETIVOS)}', 'Contenido generado para pruebas. ' * 20,
+         plan['base']['clientes'] + _sesgado(rng, plan['clientes'], 2),
+         fechas.desde_segundos(plan['hasta'] - rng.randint(0, 365) * 86400), True, rng.choice(categorias),
+         'Resumen generado.')
+        for _ in range(inicio, fin)
+    ]
+
+
+# =============================================
+# ESCRITURA (proceso principal)
+# =============================================
+
+# tabla -> (modelo, campos en el orden de las tuplas, función de filas)
+TABLAS = {
+    'editoriales': (Editorial, ['editorialid', 'nombre', 'direccion', 'telefono', 'email', 'sitioweb', 'pais'],
+                    filas_editoriales),
+    'autores': (Autor, ['autorid', 'nombre', 'apellido', 'nacionalidad', 'fechanacimiento', 'bibliografia',
+                        'paginaweb'], filas_autores),
+    'libros': (Libro, ['libroid', 'titulo', 'autorid_id', 'editorialid_id', 'isbn', 'aniopublicacion', 'genero',
+                       'precioventa', 'stock', 'descripcion'], filas_libros),
+    'clientes': (User, ['id', 'password', 'username', 'first_name', 'last_name', 'email', 'is_superuser',
+                        'is_active', 'is_staff', 'date_joined'], filas_clientes),
+    'ventas': (Venta, ['ventaid', 'clienteid_id', 'fechaventa', 'montototal', 'metodopago', 'estadoventa',
+                       'descuentoaplicado', 'pagorecibido', 'cambio', 'montodevuelto'], filas_ventas),
+    'detalles': (DetalleVenta, ['ventaid_id', 'libroid_id', 'cantidad', 'preciounitario', 'iva', 'subtotal',
+                                'cantidaddevuelta'], None),
+    'carritos': (Carrito, ['usuario_id', 'libro_id', 'cantidad', 'fechaagregado'], filas_carritos),
+    'eventos': (Evento, ['titulo', 'descripcion', 'fecha', 'ubicacion', 'categoria', 'capacidad', 'precio',
+                         'activo'], filas_eventos),
+    'blog': (Blog, ['titulo', 'contenido', 'autor_id', 'fechapublicacion', 'activo', 'categoria', 'resumen'],
+             filas_blog),
+}
+ORDEN = ['editoriales', 'autores', 'libros', 'clientes', 'ventas', 'carritos', 'eventos', 'blog']
+
+
+class _Escritor:
+    def __init__(self):
+        self.sqlite = connection.vendor == 'sqlite'
+        self._sql = {}
+
+    def _insert(self, tabla):
+        if tabla not in self._sql:
+            modelo, campos, _ = TABLAS[tabla]
+            columnas = ', '.join(connection.ops.quote_name(modelo._meta.get_field(campo).column) for campo in campos)
+            self._sql[tabla] = (f'INSERT INTO {connection.ops.quote_name(modelo._meta.db_table)} ({columnas}) '
+                                f'VALUES ({", ".join(["%s"] * len(campos))})')
+        return self._sql[tabla]
+
+    def escribir(self, tabla, filas):
+        if not filas:
+            return
+        modelo, campos, _ = TABLAS[tabla]
+        if self.sqlite:
+            with connection.cursor() as cursor:
+                cursor.executemany(self._insert(tabla), filas)
+        else:
+            modelo.objects.bulk_create([modelo(**dict(zip(campos, fila))) for fila in filas], batch_size=2000)
+
+
+class _PragmasCarga:
+    """
+    En SQLite, sin fsync y con el diario en memoria mientras dura la carga.
+    Dentro de una transacción (p. ej. en las pruebas) SQLite no deja
+    cambiarlos y se dejan como están.
+    """
+
+    def __enter__(self):
+        self.previos = None
+        if connection.vendor == 'sqlite' and not connection.in_atomic_block:
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                modo = cursor.fetchone()[0]
+                cursor.execute('PRAGMA synchronous')
+                self.previos = (modo, cursor.fetchone()[0])
+                cursor.execute('PRAGMA journal_mode = MEMORY')
+                cursor.execute('PRAGMA synchronous = OFF')
+                cursor.execute('PRAGMA cache_size = -262144')
+                cursor.execute('PRAGMA temp_store = MEMORY')
+        return self
+
+    def __exit__(self, *exc):
+        if self.previos:
+            with connection.cursor() as cursor:
+                cursor.execute(f'PRAGMA journal_mode = {self.previos[0]}')
+                cursor.execute(f'PRAGMA synchronous = {int(self.previos[1])}')
+
+
+def _siguiente_id(modelo):
+    ultimo = modelo.objects.order_by('-pk').values_list('pk', flat=True).first()
+    return (ultimo or 0) + 1
+
+
+def limpiar():
+    """Borra catálogo, ventas, carritos, eventos, blog y los clientes generados"""
+    tablas = [Reserva, ClaveIdempotencia, VentaResumenDiario, DetalleVenta, Venta, Carrito, Blog, Evento, Libro,
+              Autor, Editorial]
+    with transaction.atomic(), connection.constraint_checks_disabled():
+        with connection.cursor() as cursor:
+            for modelo in tablas:
+                cursor.execute(f'DELETE FROM {connection.ops.quote_name(modelo._meta.db_table)}')
+        User.objects.filter(username__startswith='cliente_', is_staff=False).delete()
+
+
+def planear(escala, semilla, dias):
+    """Cuántas filas de cada tabla y desde qué id; lo que necesitan los trabajadores"""
+    cantidades = {tabla: max(1, round(por_unidad * escala)) for tabla, por_unidad in POR_ESCALA.items()}
+    hasta = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return {
+        **cantidades,
+        'semilla': semilla,
+        'dias': dias,
+        'hasta': int(hasta.timestamp()),
+        'desde': int(hasta.timestamp()) - dias * 86400,
+        'anio': hasta.year,
+        'con_zona': connection.vendor != 'sqlite',
+        'contrasena': make_password(CONTRASENA),
+        'base': {
+            'editoriales': _siguiente_id(Editorial),
+            'autores': _siguiente_id(Autor),
+            'libros': _siguiente_id(Libro),
+            'clientes': _siguiente_id(User),
+            'ventas': _siguiente_id(Venta),
+        },
+    }
+
+
+def _trozos(total, tamano):
+    return [(numero, inicio, min(inicio + tamano, total)) for numero, inicio in enumerate(range(0, total, tamano))]
+
+
+def generar(escala=1, semilla=42, dias=365, procesos=1, tamano_trozo=TAMANO_TROZO, progreso=None):
+    """
+    Genera y escribe todas las tablas. ``progreso(tabla, escritas, total)``
+    se llama tras cada trozo. Devuelve ``{tabla: filas}``.
+    """
+    plan = planear(escala, semilla, dias)
+    precios = array('i', (precio_de(semilla, i) for i in range(plan['libros'])))
+    _iniciar_trabajador(precios)
+    escritor = _Escritor()
+    escritas = {}
+
+    ejecutor = ProcessPoolExecutor(procesos, initializer=_iniciar_trabajador, initargs=(precios,)) \
+        if procesos > 1 else None
+    try:
+        with _PragmasCarga(), connection.constraint_checks_disabled():
+            for tabla in ORDEN:
+                funcion = TABLAS[tabla][2]
+                trozos = _trozos(plan[tabla], tamano_trozo)
+                argumentos = [(semilla, numero, inicio, fin, plan) for numero, inicio, fin in trozos]
+                # map conserva el orden: los ids automáticos salen iguales en cada corrida
+                resultados = ejecutor.map(funcion, *zip(*argumentos)) if ejecutor \
+                    else (funcion(*args) for args in argumentos)
+                escritas[tabla] = 0
+                for filas in resultados:
+                    with transaction.atomic():
+                        if tabla == 'ventas':
+                            ventas, detalles = filas
+                            escritor.escribir('ventas', ventas)
+                            escritor.escribir('detalles', detalles)
+                            escritas['detalles'] = escritas.get('detalles', 0) + len(detalles)
+                            filas = ventas
+                        else:
+                            escritor.escribir(tabla, filas)
+                    escritas[tabla] += len(filas)
+                    if progreso:
+                        progreso(tabla, escritas[tabla], plan[tabla])
+    finally:
+        if ejecutor:
+            ejecutor.shutdown()
+
+    # Los ids se dieron a mano: en PostgreSQL las secuencias deben alcanzarlos
+    modelos = [TABLAS[tabla][0] for tabla in ORDEN]
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(_EstiloSinColor(), modelos):
+            cursor.execute(sql)
+
+    resumenes.recalcular_rango()
+    busqueda.reconstruir_indice()
+    facetas.registrar_cambio()
+    analitica.invalidar_todo()
+    return escritas
+
+
+class _EstiloSinColor:
+    """``sequence_reset_sql`` pide un estilo de color; aquí no se imprime"""
+
+    def __getattr__(self, nombre):
+        return lambda texto: texto
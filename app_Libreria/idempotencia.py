@@ -0,0 +1,158 @@
+# app_Libreria/idempotencia.py
+"""
+Claves de idempotencia para los POST que crean ventas.
+
+El formulario manda un campo oculto ``clave_idempotencia`` (etiqueta
+``{% campo_idempotencia %}``, una clave nueva cada vez que se pinta) o el
+cliente manda el encabezado ``Idempotency-Key``. La vista decorada con
+``@idempotente(...)``:
+
+1. Si ya hay un resultado guardado para ``(usuario, vista, clave)``, redirige
+   a él sin volver a ejecutar la vista (doble clic, reintento del navegador).
+2. Si no, inserta la clave y ejecuta la vista en la misma transacción. Una
+   petición repetida que llegue mientras tanto choca con la restricción
+   única al insertar, espera a que la primera termine y devuelve su
+   resultado.
+3. Sólo se guarda la respuesta si redirige a una de las vistas de ``exito``;
+   con un error de validación se revierte todo y la misma clave puede
+   reintentarse.
+
+Reusar una clave con otros datos del formulario responde 422.
+
+Las claves vencen a las ``IDEMPOTENCIA_HORAS``; las vencidas se borran por
+lotes a lo sumo una vez cada ``INTERVALO_PURGA`` segundos, desde las propias
+peticiones.
+"""
+import hashlib
+from datetime import timedelta
+from functools import wraps
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, HttpResponseRedirect
+from django.urls import Resolver404, resolve
+from django.utils import timezone
+
+from .models import ClaveIdempotencia
+
+CAMPO = 'clave_idempotencia'
+ENCABEZADO = 'Idempotency-Key'
+HORAS_DEFAULT = 24
+INTERVALO_PURGA = 60 * 10
+TAMANO_LOTE_PURGA = 1000
+ALIAS_CACHE = 'default'
+
+# Campos que cambian entre envíos del mismo formulario sin cambiar la operación
+_CAMPOS_IGNORADOS = {'csrfmiddlewaretoken', CAMPO}
+
+
+class _SinGuardar(Exception):
+    """Revierte la transacción de la clave sin perder la respuesta de la vista"""
+
+    def __init__(self, respuesta):
+        self.respuesta = respuesta
+
+
+def clave_de(request):
+    clave = request.headers.get(ENCABEZADO) or request.POST.get(CAMPO, '')
+    return clave.strip()[:255]
+
+
+def huella_de(request):
+    """SHA-256 de los datos del POST, para detectar una clave reusada con otros datos"""
+    datos = sorted(
+        (campo, valor)
+        for campo, valores in request.POST.lists() if campo not in _CAMPOS_IGNORADOS
+        for valor in valores
+    )
+    return hashlib.sha256(repr(datos).encode()).hexdigest()
+
+
+def _es_exito(respuesta, exito):
+    if not isinstance(respuesta, HttpResponseRedirect):
+        return False
+    try:
+        return resolve(urlsplit(respuesta.url).path).url_name in exito
+    except Resolver404:
+        return False
+
+
+def _repetir(request, registro, huella):
+    if registro.huella != huella:
+        return HttpResponse('La clave de idempotencia ya se usó con otros datos', status=422)
+    messages.info(request, 'Esta operación ya se había procesado')
+    return HttpResponseRedirect(registro.respuesta)
+
+
+def _vigente(usuario, vista, clave):
+    return ClaveIdempotencia.objects.filter(
+        usuario=usuario, vista=vista, clave=clave, expira__gt=timezone.now()
+    ).first()
+
+
+def purgar_vencidas(tamano_lote=TAMANO_LOTE_PURGA):
+    """Borra un lote de claves vencidas; devuelve cuántas borró"""
+    ids = list(ClaveIdempotencia.objects.filter(expira__lte=timezone.now())
+               .order_by('expira').values_list('claveid', flat=True)[:tamano_lote])
+    if not ids:
+        return 0
+    borradas, _ = ClaveIdempotencia.objects.filter(claveid__in=ids).delete()
+    return borradas
+
+
+def _purgar_de_vez_en_cuando():
+    # cache.add sólo tiene éxito para una petición por intervalo
+    if caches[ALIAS_CACHE].add('idempotencia:purga', 1, INTERVALO_PURGA):
+        purgar_vencidas()
+
+
+def idempotente(*exito):
+    """
+    Decorador para vistas POST. ``exito`` son los nombres de URL a los que
+    redirige la vista cuando la operación se completó.
+    """
+    def decorador(vista):
+        nombre = vista.__name__
+
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            clave = clave_de(request) if request.method == 'POST' else ''
+            if not clave or not request.user.is_authenticated:
+                return vista(request, *args, **kwargs)
+
+            huella = huella_de(request)
+            registro = ClaveIdempotencia.objects.filter(usuario=request.user, vista=nombre, clave=clave).first()
+            if registro is not None:
+                if registro.expira > timezone.now():
+                    return _repetir(request, registro, huella)
+                # Una clave vencida se puede volver a usar
+                registro.delete()
+            horas = getattr(settings, 'IDEMPOTENCIA_HORAS', HORAS_DEFAULT)
+            try:
+                with transaction.atomic():
+                    registro = ClaveIdempotencia.objects.create(
+                        usuario=request.user, vista=nombre, clave=clave, huella=huella,
+                        expira=timezone.now() + timedelta(hours=horas),
+                    )
+                    respuesta = vista(request, *args, **kwargs)
+                    if not _es_exito(respuesta, exito):
+                        raise _SinGuardar(respuesta)
+                    registro.respuesta = respuesta.url
+                    registro.save(update_fields=['respuesta'])
+            except _SinGuardar as e:
+                return e.respuesta
+            except IntegrityError:
+                # Otra petición con la misma clave terminó primero
+                registro = _vigente(request.user, nombre, clave)
+                if registro is None:
+                    raise
+                return _repetir(request, registro, huella)
+
+            _purgar_de_vez_en_cuando()
+            return respuesta
+
+        return envoltura
+    return decorador
@@ -0,0 +1,183 @@
+# app_Libreria/imagenes.py
+"""
+Derivados de las imágenes subidas (portadas de libros, imágenes de eventos y
+del blog).
+
+Por cada original se generan versiones redimensionadas en WebP y JPEG en
+varios anchos más una miniatura borrosa (placeholder) codificada como data
+URI. Se guardan junto a un ``manifest.json`` en::
+
+    MEDIA_ROOT/derivados/<ruta del original sin extensión>/
+
+La generación corre en un pool de hilos fuera de la petición: las vistas
+sólo encolan el trabajo (ver ``signals.py``) y responden de inmediato.
+Mientras los derivados no existan, las plantillas usan el original.
+"""
+import base64
+import io
+import json
+import logging
+import posixpath
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage, storages
+from PIL import Image, ImageFilter, ImageOps
+
+logger = logging.getLogger(__name__)
+
+ANCHOS = (160, 320, 640, 960)
+CALIDAD_WEBP = 78
+CALIDAD_JPEG = 80
+ANCHO_PLACEHOLDER = 16
+CARPETA = 'derivados'
+MANIFIESTO = 'manifest.json'
+
+# Manifiestos ya leídos (LRU por proceso)
+MAX_MANIFIESTOS = 2048
+_manifiestos = OrderedDict()
+_manifiestos_candado = threading.Lock()
+
+_pool = None
+_pool_candado = threading.Lock()
+_en_proceso = set()
+
+
+def carpeta_derivados(nombre):
+    """Carpeta de derivados para el nombre (relativo a MEDIA_ROOT) de un original"""
+    base, _ = posixpath.splitext(nombre)
+    return posixpath.join(CARPETA, base)
+
+
+def _almacen():
+    # Los derivados se guardan con su propio nombre, no por contenido
+    return storages['derivados']
+
+
+def _guardar(ruta, contenido):
+    almacen = _almacen()
+    if almacen.exists(ruta):
+        almacen.delete(ruta)
+    almacen.save(ruta, ContentFile(contenido))
+
+
+def _a_rgb(imagen):
+    """Aplana la transparencia sobre fondo blanco (JPEG no tiene canal alfa)"""
+    if imagen.mode in ('RGBA', 'LA') or (imagen.mode == 'P' and 'transparency' in imagen.info):
+        imagen = imagen.convert('RGBA')
+        fondo = Image.new('RGB', imagen.size, (255, 255, 255))
+        fondo.paste(imagen, mask=imagen.getchannel('A'))
+        return fondo
+    return imagen.convert('RGB')
+
+
+def generar_derivados(nombre):
+    """
+    Genera los derivados de un original de forma síncrona y devuelve el
+    manifiesto. El manifiesto se escribe al final: si existe, todo lo demás
+    también.
+    """
+    with default_storage.open(nombre, 'rb') as archivo:
+        original = Image.open(archivo)
+        original.load()
+    original = _a_rgb(ImageOps.exif_transpose(original))
+
+    carpeta = carpeta_derivados(nombre)
+    anchos = [ancho for ancho in ANCHOS if ancho < original.width] or [original.width]
+    if original.width not in anchos and original.width < ANCHOS[-1]:
+        anchos.append(original.width)
+
+    for ancho in anchos:
+        alto = max(1, round(original.height * ancho / original.width))
+        copia = original.resize((ancho, alto), Image.LANCZOS)
+        for formato, extension, opciones in (
+            ('WEBP', 'webp', {'quality': CALIDAD_WEBP, 'method': 4}),
+            ('JPEG', 'jpg', {'quality': CALIDAD_JPEG, 'optimize': True, 'progressive': True}),
+        ):
+            salida = io.BytesIO()
+            copia.save(salida, formato, **opciones)
+            _guardar(posixpath.join(carpeta, f'{ancho}.{extension}'), salida.getvalue())
+
+    miniatura = original.copy()
+    miniatura.thumbnail((ANCHO_PLACEHOLDER, ANCHO_PLACEHOLDER * 4))
+    miniatura = miniatura.filter(ImageFilter.GaussianBlur(1))
+    salida = io.BytesIO()
+    miniatura.save(salida, 'JPEG', quality=40)
+
+    manifiesto = {
+        'anchos': sorted(anchos),
+        'proporcion': round(original.height / original.width, 4),
+        'placeholder': 'data:image/jpeg;base64,' + base64.b64encode(salida.getvalue()).decode(),
+    }
+    _guardar(posixpath.join(carpeta, MANIFIESTO), json.dumps(manifiesto).encode())
+    _recordar_manifiesto(nombre, manifiesto)
+    return manifiesto
+
+
+def manifiesto_de(nombre):
+    """Manifiesto de derivados de un original, o None si aún no existen"""
+    with _manifiestos_candado:
+        if nombre in _manifiestos:
+            _manifiestos.move_to_end(nombre)
+            return _manifiestos[nombre]
+
+    ruta = posixpath.join(carpeta_derivados(nombre), MANIFIESTO)
+    try:
+        with _almacen().open(ruta, 'rb') as archivo:
+            manifiesto = json.loads(archivo.read())
+    except (FileNotFoundError, ValueError):
+        # La ausencia no se recuerda: el trabajo puede terminar en cualquier momento
+        return None
+    _recordar_manifiesto(nombre, manifiesto)
+    return manifiesto
+
+
+def _recordar_manifiesto(nombre, manifiesto):
+    with _manifiestos_candado:
+        _manifiestos[nombre] = manifiesto
+        while len(_manifiestos) > MAX_MANIFIESTOS:
+            _manifiestos.popitem(last=False)
+
+
+def url_derivado(nombre, ancho, extension):
+    return _almacen().url(posixpath.join(carpeta_derivados(nombre), f'{ancho}.{extension}'))
+
+
+def _obtener_pool():
+    global _pool
+    with _pool_candado:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'IMAGENES_WORKERS', 2),
+                thread_name_prefix='derivados',
+            )
+        return _pool
+
+
+def encolar(nombre, al_terminar=None):
+    """
+    Programa la generación de derivados en segundo plano. ``al_terminar`` se
+    llama (en el hilo del pool) cuando los derivados están listos.
+    """
+    if not nombre:
+        return
+    with _pool_candado:
+        if nombre in _en_proceso:
+            return
+        _en_proceso.add(nombre)
+
+    def trabajo():
+        try:
+            generar_derivados(nombre)
+            if al_terminar is not None:
+                al_terminar()
+        except Exception:
+            logger.exception('No se pudieron generar los derivados de %s', nombre)
+        finally:
+            with _pool_candado:
+                _en_proceso.discard(nombre)
+
+    _obtener_pool().submit(trabajo)
@@ -0,0 +1,528 @@
+# app_Libreria/importar.py
+"""
+Importación masiva del catálogo (libros, autores y editoriales) desde CSV u
+ONIX, con upserts por lotes.
+
+El archivo se lee en streaming (``csv.DictReader`` o ``iterparse`` de ONIX,
+soltando cada ``<Product>`` al terminar) y cada registro se valida
+(ISBN-10/13 con dígito de control, año, precio, género) antes de juntarse
+en lotes. Por lote, en una transacción:
+
+1. Autores y editoriales se resuelven por nombre en diccionarios en memoria
+   cargados al empezar; los nuevos se crean con un ``bulk_create``.
+2. Los libros se insertan o actualizan con ``bulk_create(update_conflicts=
+   True)`` sobre ``isbn``. Un ISBN se reconoce aunque venga con otros
+   guiones o en su forma ISBN-10: los existentes se indexan por su ISBN-13
+   normalizado y se actualizan con el ISBN tal como está guardado.
+3. Los libros del lote se indexan en la búsqueda de texto completo.
+
+``bulk_create`` no dispara señales, así que al confirmar cada lote se
+cambian los sellos de tarjetas y se descarta la disponibilidad en caché de
+esos libros; al terminar se pide reconstruir las facetas (y el índice de
+ISBN del punto de venta, que lee el mismo registro) y se vacía la analítica
+si algún libro existente cambió.
+
+El stock de los libros existentes sólo se toca con ``actualizar_stock``: lo
+normal es que lo lleven las ventas, no el catálogo.
+
+Después de cada lote confirmado se puede guardar un punto de control (el
+número de registros ya leídos); una importación interrumpida se reanuda
+saltando esos registros.
+"""
+import csv
+import datetime
+import json
+import os
+import unicodedata
+import xml.etree.ElementTree as ET
+from collections import ChainMap
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from . import analitica, busqueda, facetas, reservas, tarjetas
+from .models import Autor, Editorial, Libro
+from .punto_venta import isbn13_de, isbn_valido
+
+TAMANO_LOTE = 1000
+MAX_ERRORES_GUARDADOS = 50
+# Autor.fechanacimiento es obligatoria y los catálogos no la traen
+FECHA_DESCONOCIDA = datetime.date(1900, 1, 1)
+
+CAMPOS_ACTUALIZADOS = ['titulo', 'autorid', 'editorialid', 'aniopublicacion', 'genero', 'precioventa']
+
+# Encabezados de CSV aceptados -> campo del registro
+ALIAS_CSV = {
+    'isbn': 'isbn',
+    'titulo': 'titulo',
+    'title': 'titulo',
+    'autor': 'autor',
+    'author': 'autor',
+    'autor_nombre': 'autor_nombre',
+    'autor_apellido': 'autor_apellido',
+    'editorial': 'editorial',
+    'publisher': 'editorial',
+    'genero': 'genero',
+    'anio': 'aniopublicacion',
+    'ano': 'aniopublicacion',
+    'aniopublicacion': 'aniopublicacion',
+    'year': 'aniopublicacion',
+    'precio': 'precioventa',
+    'precioventa': 'precioventa',
+    'price': 'precioventa',
+    'stock': 'stock',
+    'descripcion': 'descripcion',
+    'description': 'descripcion',
+}
+
+# Prefijos de materias ONIX -> género; el más largo que coincida gana
+MATERIAS_BISAC = {
+    'FIC027': 'ROM', 'FIC015': 'TER', 'FIC028': 'CIE', 'FIC009': 'FAN', 'FIC014': 'HIS',
+    'FIC': 'FIC', 'BIO': 'BIO', 'JUV': 'INF', 'JNF': 'INF', 'HIS': 'HIS',
+}
+MATERIAS_THEMA = {
+    'FR': 'ROM', 'FK': 'TER', 'FL': 'CIE', 'FM': 'FAN', 'FV': 'HIS',
+    'F': 'FIC', 'DNB': 'BIO', 'Y': 'INF', 'NH': 'HIS',
+}
+ESQUEMA_BISAC = '10'
+ESQUEMA_THEMA = '93'
+
+
+class RegistroInvalido(ValueError):
+    """Un registro del archivo no se puede importar"""
+
+
+@dataclass(frozen=True)
+class RegistroLibro:
+    isbn: str
+    titulo: str
+    autor: str
+    autor_nombre: str
+    autor_apellido: str
+    editorial: str
+    genero: str
+    aniopublicacion: int
+    precioventa: Decimal
+    stock: int
+    descripcion: str
+
+    @property
+    def clave(self):
+        return isbn13_de(self.isbn)
+
+
+@dataclass
+class Resultado:
+    leidos: int = 0
+    creados: int = 0
+    actualizados: int = 0
+    invalidos: int = 0
+    autores_nuevos: int = 0
+    editoriales_nuevas: int = 0
+    errores: list = field(default_factory=list)
+
+    def error(self, mensaje):
+        self.invalidos += 1
+        if len(self.errores) < MAX_ERRORES_GUARDADOS:
+            self.errores.append(mensaje)
+
+
+def _nombre(texto):
+    """Llave para comparar nombres: sin mayúsculas ni espacios repetidos"""
+    return ' '.join(str(texto).split()).casefold()
+
+
+def _sin_acentos(texto):
+    return ''.join(c for c in unicodedata.normalize('NFD', texto) if not unicodedata.combining(c))
+
+
+_GENEROS = {}
+for _codigo, _etiqueta in Libro.GENEROS:
+    _GENEROS[_codigo.casefold()] = _codigo
+    _GENEROS[_sin_acentos(_etiqueta).casefold()] = _codigo
+
+
+# =============================================
+# LECTURA
+# =============================================
+
+def leer_csv(archivo):
+    """Diccionarios con los campos del registro, uno por fila"""
+    lector = csv.DictReader(archivo)
+    columnas = {encabezado: ALIAS_CSV.get(_sin_acentos(_nombre(encabezado)).replace(' ', '_'))
+                for encabezado in lector.fieldnames or []}
+    for fila in lector:
+        yield {campo: (fila[encabezado] or '').strip()
+               for encabezado, campo in columnas.items() if campo}
+
+
+def _local(etiqueta):
+    return etiqueta.rsplit('}', 1)[-1]
+
+
+def _todos(elemento, nombre):
+    return [hijo for hijo in elemento.iter() if _local(hijo.tag) == nombre]
+
+
+def _texto(elemento, nombre):
+    for hijo in elemento.iter():
+        if _local(hijo.tag) == nombre and hijo.text and hijo.text.strip():
+            return hijo.text.strip()
+    return ''
+
+
+def _isbn_onix(producto):
+    encontrados = {}
+    for identificador in _todos(producto, 'ProductIdentifier'):
+        encontrados[_texto(identificador, 'ProductIDType')] = _texto(identificador, 'IDValue')
+    # 15 = ISBN-13, 03 = GTIN-13, 02 = ISBN-10
+    return encontrados.get('15') or encontrados.get('03') or encontrados.get('02') or ''
+
+
+def _autor_onix(producto):
+    contribuidores = _todos(producto, 'Contributor')
+    principal = next((c for c in contribuidores if _texto(c, 'ContributorRole') == 'A01'),
+                     contribuidores[0] if contribuidores else None)
+    if principal is None:
+        return {}
+    if _texto(principal, 'KeyNames'):
+        return {'autor_nombre': _texto(principal, 'NamesBeforeKey'), 'autor_apellido': _texto(principal, 'KeyNames')}
+    if _texto(principal, 'PersonNameInverted'):
+        return {'autor': _texto(principal, 'PersonNameInverted')}
+    return {'autor': _texto(principal, 'PersonName') or _texto(principal, 'CorporateName')}
+
+
+def _genero_onix(producto):
+    for materia in _todos(producto, 'Subject'):
+        esquema = _texto(materia, 'SubjectSchemeIdentifier')
+        tabla = MATERIAS_BISAC if esquema == ESQUEMA_BISAC else MATERIAS_THEMA if esquema == ESQUEMA_THEMA else None
+        codigo = _texto(materia, 'SubjectCode').upper()
+        if tabla and codigo:
+            prefijo = max((p for p in tabla if codigo.startswith(p)), key=len, default=None)
+            if prefijo:
+                return tabla[prefijo]
+    # ONIX 2.1
+    codigo = _texto(producto, 'BASICMainSubject').upper()
+    prefijo = max((p for p in MATERIAS_BISAC if codigo.startswith(p)), key=len, default=None)
+    # Sin materia reconocible: ficción general
+    return MATERIAS_BISAC[prefijo] if prefijo else 'FIC'
+
+
+def _descripcion_onix(producto):
+    for contenido in _todos(producto, 'TextContent'):
+        # 03 = descripción
+        if _texto(contenido, 'TextType') == '03':
+            return _texto(contenido, 'Text')
+    return _texto(producto, 'Text')
+
+
+def leer_onix(archivo):
+    """
+    Diccionarios con los campos del registro, uno por ``<Product>`` de un
+    mensaje ONIX 3.0 o 2.1 con etiquetas de referencia.
+    """
+    raiz = None
+    for evento, elemento in ET.iterparse(archivo, events=('start', 'end')):
+        if evento == 'start':
+            if raiz is None:
+                raiz = elemento
+            continue
+        if _local(elemento.tag) != 'Product':
+            continue
+        titulo = _texto(elemento, 'TitleText') or _texto(elemento, 'DistinctiveTitle')
+        subtitulo = _texto(elemento, 'Subtitle')
+        fechas = _todos(elemento, 'PublishingDate')
+        fecha = _texto(fechas[0], 'Date') if fechas else _texto(elemento, 'PublicationDate')
+        yield {
+            'isbn': _isbn_onix(elemento),
+            'titulo': f'{titulo}: {subtitulo}' if subtitulo else titulo,
+            **_autor_onix(elemento),
+            'editorial': _texto(elemento, 'PublisherName'),
+            'genero': _genero_onix(elemento),
+            'aniopublicacion': fecha[:4],
+            'precioventa': _texto(elemento, 'PriceAmount'),
+            'stock': _texto(elemento, 'OnHand'),
+            'descripcion': _descripcion_onix(elemento),
+        }
+        # Suelta lo ya leído para que la memoria no crezca con el archivo
+        raiz.clear()
+
+
+def formato_de(ruta):
+    return 'onix' if os.path.splitext(ruta)[1].lower() in ('.xml', '.onx', '.onix') else 'csv'
+
+
+def leer(ruta, formato=None):
+    """Registros crudos del archivo; el formato se deduce de la extensión si no se da"""
+    if (formato or formato_de(ruta)) == 'onix':
+        with open(ruta, 'rb') as archivo:
+            yield from leer_onix(archivo)
+    else:
+        with open(ruta, encoding='utf-8-sig', newline='') as archivo:
+            yield from leer_csv(archivo)
+
+
+# =============================================
+# VALIDACIÓN
+# =============================================
+
+def _entero(valor, campo, obligatorio=True):
+    if not valor:
+        if obligatorio:
+            raise RegistroInvalido(f'falta {campo}')
+        return 0
+    try:
+        return int(valor)
+    except ValueError:
+        raise RegistroInvalido(f'{campo} no es un número entero: {valor!r}')
+
+
+def _partir_autor(autor):
+    """``(nombre, apellido)``: "Apellido, Nombre" o la última palabra como apellido"""
+    if ',' in autor:
+        apellido, nombre = (parte.strip() for parte in autor.split(',', 1))
+        return nombre, apellido
+    nombre, _, apellido = autor.rpartition(' ')
+    return nombre, apellido
+
+
+def validar(datos):
+    """``RegistroLibro`` a partir de un registro crudo; lanza ``RegistroInvalido``"""
+    isbn = datos.get('isbn', '').strip()
+    if not isbn_valido(isbn):
+        raise RegistroInvalido(f'ISBN inválido: {isbn!r}')
+    if len(isbn) > Libro._meta.get_field('isbn').max_length:
+        raise RegistroInvalido(f'ISBN demasiado largo: {isbn!r}')
+
+    titulo = datos.get('titulo', '')
+    if not titulo:
+        raise RegistroInvalido('falta el título')
+
+    nombre, apellido = datos.get('autor_nombre', ''), datos.get('autor_apellido', '')
+    if not apellido:
+        nombre, apellido = _partir_autor(datos.get('autor', '').strip())
+    if not apellido:
+        raise RegistroInvalido('falta el autor')
+
+    editorial = datos.get('editorial', '')
+    if not editorial:
+        raise RegistroInvalido('falta la editorial')
+
+    genero = _GENEROS.get(_sin_acentos(datos.get('genero', '')).casefold())
+    if genero is None:
+        raise RegistroInvalido(f'género desconocido: {datos.get("genero", "")!r}')
+
+    anio = _entero(datos.get('aniopublicacion'), 'el año de publicación')
+    if not 0 < anio <= datetime.date.today().year + 5:
+        raise RegistroInvalido(f'año de publicación fuera de rango: {anio}')
+
+    try:
+        precio = Decimal(datos.get('precioventa', '')).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        raise RegistroInvalido(f'precio inválido: {datos.get("precioventa", "")!r}')
+    if precio < 0:
+        raise RegistroInvalido(f'precio negativo: {precio}')
+
+    stock = _entero(datos.get('stock'), 'el stock', obligatorio=False)
+    if stock < 0:
+        raise RegistroInvalido(f'stock negativo: {stock}')
+
+    return RegistroLibro(
+        isbn=isbn,
+        titulo=titulo[:255],
+        autor=f'{nombre} {apellido}'.strip(),
+        autor_nombre=nombre[:100],
+        autor_apellido=apellido[:100],
+        editorial=editorial[:255],
+        genero=genero,
+        aniopublicacion=anio,
+        precioventa=precio,
+        stock=stock,
+        descripcion=datos.get('descripcion', ''),
+    )
+
+
+# =============================================
+# ESCRITURA
+# =============================================
+
+class ImportadorCatalogo:
+    """
+    Junta registros válidos en lotes y los escribe. Cargar los diccionarios
+    de autores, editoriales e ISBN existentes cuesta tres consultas, una vez.
+    """
+
+    def __init__(self, tamano_lote=TAMANO_LOTE, actualizar_stock=False, con_descripcion=True):
+        self.tamano_lote = tamano_lote
+        self.campos = CAMPOS_ACTUALIZADOS + (['descripcion'] if con_descripcion else []) \
+            + (['stock'] if actualizar_stock else [])
+        self.resultado = Resultado()
+        self.autores = {
+            _nombre(f'{nombre} {apellido}'): autorid
+            for autorid, nombre, apellido in Autor.objects.values_list('autorid', 'nombre', 'apellido').iterator()
+        }
+        self.editoriales = {
+            _nombre(nombre): editorialid
+            for editorialid, nombre in Editorial.objects.values_list('editorialid', 'nombre').iterator()
+        }
+        # ISBN-13 normalizado -> ISBN tal como está guardado
+        self.existentes = {
+            isbn13_de(isbn): isbn
+            for isbn in Libro.objects.values_list('isbn', flat=True).iterator(chunk_size=10000)
+        }
+        self._lote = {}
+
+    def agregar(self, registro):
+        """Suma un registro válido; escribe el lote al llenarse. Devuelve si escribió"""
+        # Un ISBN repetido dentro del lote: gana el último
+        self._lote[registro.clave] = registro
+        if len(self._lote) >= self.tamano_lote:
+            self.escribir()
+            return True
+        return False
+
+    def _resolver_autores(self, registros):
+        """Crea los autores que faltan para el lote; devuelve ``{clave: autorid}`` de los nuevos"""
+        nuevos = {}
+        for registro in registros:
+            clave = _nombre(registro.autor)
+            if clave not in self.autores and clave not in nuevos:
+                nuevos[clave] = Autor(
+                    nombre=registro.autor_nombre, apellido=registro.autor_apellido, nacionalidad='',
+                    fechanacimiento=FECHA_DESCONOCIDA, bibliografia='',
+                )
+        if nuevos:
+            Autor.objects.bulk_create(nuevos.values())
+        return {clave: autor.autorid for clave, autor in nuevos.items()}
+
+    def _resolver_editoriales(self, registros):
+        """Crea las editoriales que faltan para el lote; devuelve ``{clave: editorialid}`` de las nuevas"""
+        nuevas = {}
+        for registro in registros:
+            clave = _nombre(registro.editorial)
+            if clave not in self.editoriales and clave not in nuevas:
+                nuevas[clave] = Editorial(nombre=registro.editorial, direccion='', telefono='', email='', pais='')
+        if not nuevas:
+            return {}
+        # ignore_conflicts: otra importación pudo crearla entre tanto; los ids se leen después
+        Editorial.objects.bulk_create(nuevas.values(), ignore_conflicts=True)
+        nombres = [editorial.nombre for editorial in nuevas.values()]
+        return {
+            _nombre(nombre): editorialid
+            for editorialid, nombre in Editorial.objects.filter(nombre__in=nombres).values_list('editorialid', 'nombre')
+        }
+
+    def escribir(self):
+        """
+        Escribe el lote pendiente en una transacción. Los diccionarios en
+        memoria y los contadores se actualizan sólo cuando el lote quedó
+        escrito: si la transacción se revierte no cuentan filas que no existen.
+        """
+        registros = list(self._lote.values())
+        self._lote = {}
+        if not registros:
+            return
+        with transaction.atomic():
+            autores = ChainMap(self._resolver_autores(registros), self.autores)
+            editoriales = ChainMap(self._resolver_editoriales(registros), self.editoriales)
+            libros = []
+            creados = {}
+            for registro in registros:
+                guardado = self.existentes.get(registro.clave)
+                libros.append(Libro(
+                    isbn=guardado or registro.isbn,
+                    titulo=registro.titulo,
+                    autorid_id=autores[_nombre(registro.autor)],
+                    editorialid_id=editoriales[_nombre(registro.editorial)],
+                    aniopublicacion=registro.aniopublicacion,
+                    genero=registro.genero,
+                    precioventa=registro.precioventa,
+                    stock=registro.stock,
+                    descripcion=registro.descripcion,
+                ))
+                if not guardado:
+                    creados[registro.clave] = registro.isbn
+            Libro.objects.bulk_create(libros, update_conflicts=True, unique_fields=['isbn'],
+                                      update_fields=self.campos)
+
+            # Índice de búsqueda y los ids de los libros (nuevos o no) para las cachés
+            libroids = busqueda.indexar_consulta(Libro.objects.filter(isbn__in=[libro.isbn for libro in libros]))
+
+            def notificar():
+                tarjetas.cambiar_sellos('libro', libroids)
+                reservas.invalidar_disponibles(*libroids)
+
+            transaction.on_commit(notificar)
+
+        self.autores.update(autores.maps[0])
+        self.editoriales.update(editoriales.maps[0])
+        self.existentes.update(creados)
+        self.resultado.autores_nuevos += len(autores.maps[0])
+        self.resultado.editoriales_nuevas += len(editoriales.maps[0])
+        self.resultado.creados += len(creados)
+        self.resultado.actualizados += len(libros) - len(creados)
+
+    def terminar(self):
+        """Escribe lo pendiente y avisa a las facetas y la analítica"""
+        self.escribir()
+        if self.resultado.creados or self.resultado.actualizados:
+            facetas.registrar_cambio()
+        if self.resultado.actualizados:
+            analitica.invalidar_todo()
+        return self.resultado
+
+
+def importar(registros, tamano_lote=TAMANO_LOTE, actualizar_stock=False, con_descripcion=True,
+             saltar=0, al_escribir=None):
+    """
+    Importa registros crudos (de ``leer``). ``saltar`` ignora los primeros
+    (para reanudar) y ``al_escribir(resultado)`` se llama tras cada lote
+    confirmado, con ``resultado.leidos`` contando también los saltados.
+    """
+    importador = ImportadorCatalogo(tamano_lote, actualizar_stock, con_descripcion)
+    resultado = importador.resultado
+    for numero, datos in enumerate(registros, start=1):
+        resultado.leidos = numero
+        if numero <= saltar:
+            continue
+        try:
+            registro = validar(datos)
+        except RegistroInvalido as e:
+            resultado.error(f'Registro {numero}: {e}')
+            continue
+        if importador.agregar(registro) and al_escribir:
+            al_escribir(resultado)
+    importador.terminar()
+    if al_escribir:
+        al_escribir(resultado)
+    return resultado
+
+
+# =============================================
+# PUNTO DE CONTROL
+# =============================================
+
+def _identidad(ruta):
+    estado = os.stat(ruta)
+    return {'archivo': os.path.abspath(ruta), 'tamano': estado.st_size, 'modificado': estado.st_mtime}
+
+
+def leer_punto_control(ruta_control, ruta_archivo):
+    """Registros ya importados del archivo según el punto de control, o 0"""
+    try:
+        with open(ruta_control, encoding='utf-8') as archivo:
+            control = json.load(archivo)
+    except (OSError, ValueError):
+        return 0
+    # Si el archivo cambió, el número de registros ya no significa nada
+    if {clave: control.get(clave) for clave in ('archivo', 'tamano', 'modificado')} != _identidad(ruta_archivo):
+        return 0
+    return int(control.get('registros', 0))
+
+
+def guardar_punto_control(ruta_control, ruta_archivo, registros):
+    temporal = f'{ruta_control}.tmp'
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump({**_identidad(ruta_archivo), 'registros': registros}, archivo)
+    os.replace(temporal, ruta_control)
@@ -0,0 +1,43 @@
+# app_Libreria/management/commands/auditar_consultas.py
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from app_Libreria.auditoria import MINIMO_FILAS, PLANIFICADORES, auditar
+
+
+class Command(BaseCommand):
+    help = ('Captura el SQL que emite cada vista sobre la base de datos actual y reporta, con EXPLAIN, '
+            'los recorridos completos de tablas y los ordenamientos en B-tree temporales')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rutas', nargs='+', help='Sólo estas rutas (nombre de URL o nombre:variante)')
+        parser.add_argument('--solo-lectura', action='store_true',
+                            help='Salta los escenarios que escriben (carrito y checkout)')
+        parser.add_argument('--minimo-filas', type=int, default=MINIMO_FILAS,
+                            help=f'No reporta recorridos de tablas más chicas (default: {MINIMO_FILAS})')
+        parser.add_argument('--plan', action='store_true', help='Muestra el plan completo de cada consulta')
+        parser.add_argument('--estricto', action='store_true', help='Termina con error si hay hallazgos')
+
+    def handle(self, *args, **options):
+        consultas = auditar(options['rutas'], options['solo_lectura'], options['minimo_filas'])
+        if consultas is None:
+            raise CommandError(f'Sin EXPLAIN para {connection.vendor}: la auditoría sólo corre en '
+                               f'{" y ".join(PLANIFICADORES)}')
+
+        for consulta in consultas:
+            self.stdout.write(self.style.WARNING(', '.join(consulta.rutas)))
+            for hallazgo in consulta.hallazgos:
+                self.stdout.write(f'  - {hallazgo}')
+            sql = consulta.sql if options['verbosity'] > 1 else consulta.sql[:400]
+            self.stdout.write(f'  {sql}')
+            if options['plan']:
+                for linea in consulta.plan:
+                    self.stdout.write(f'    | {linea}')
+
+        if not consultas:
+            self.stdout.write(self.style.SUCCESS('Sin recorridos completos ni ordenamientos temporales'))
+            return
+        mensaje = f'{len(consultas)} consultas con hallazgos'
+        if options['estricto']:
+            raise CommandError(mensaje)
+        self.stdout.write(mensaje)
@@ -0,0 +1,55 @@
+# app_Libreria/management/commands/cancelar_ventas.py
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from app_Libreria.models import Venta
+from app_Libreria.ventas import TAMANO_LOTE, cancelar_ventas
+
+
+class Command(BaseCommand):
+    help = ('Cancela ventas en bloque y repone su stock en una sola transacción. '
+            'Las ventas se eligen por id, desde un archivo o por estado y fecha')
+
+    def add_arguments(self, parser):
+        parser.add_argument('ventaids', nargs='*', type=int, help='Ids de las ventas a cancelar')
+        parser.add_argument('--archivo', help='Archivo con un id de venta por línea ("-" para stdin)')
+        parser.add_argument('--estado', choices=[valor for valor, _ in Venta.ESTADOS_VENTA],
+                            help='Sólo ventas en este estado (p. ej. PENDIENTE)')
+        parser.add_argument('--antes-de', type=datetime.date.fromisoformat,
+                            help='Sólo ventas anteriores a esta fecha (AAAA-MM-DD)')
+        parser.add_argument('--lote', type=int, default=TAMANO_LOTE,
+                            help=f'Ventas por sentencia (default: {TAMANO_LOTE})')
+        parser.add_argument('--simular', action='store_true',
+                            help='Sólo informa cuántas ventas cancelaría')
+
+    def handle(self, *args, **options):
+        ids = list(options['ventaids'])
+        if options['archivo']:
+            archivo = self.stdin if options['archivo'] == '-' else open(options['archivo'], encoding='utf-8')
+            with archivo:
+                ids.extend(int(linea) for linea in archivo if linea.strip())
+        if not ids and not options['estado'] and not options['antes_de']:
+            raise CommandError('Indica ids, --archivo, --estado o --antes-de')
+
+        ventas = Venta.objects.exclude(estadoventa='CANCELADA')
+        if options['estado']:
+            ventas = ventas.filter(estadoventa=options['estado'])
+        if options['antes_de']:
+            limite = timezone.make_aware(datetime.datetime.combine(options['antes_de'], datetime.time.min))
+            ventas = ventas.filter(fechaventa__lt=limite)
+
+        # Con muchos ids, el filtro se aplica por lotes en lugar de un IN gigante
+        if ids:
+            seleccion = [venta for lote in range(0, len(ids), options['lote'])
+                         for venta in ventas.filter(ventaid__in=ids[lote:lote + options['lote']])
+                         .values_list('ventaid', flat=True)]
+        else:
+            seleccion = list(ventas.values_list('ventaid', flat=True))
+
+        if options['simular']:
+            self.stdout.write(f'Se cancelarían {len(seleccion)} ventas')
+            return
+        canceladas = cancelar_ventas(seleccion, options['lote'])
+        self.stdout.write(self.style.SUCCESS(f'{canceladas} ventas canceladas'))
@@ -0,0 +1,151 @@
+# app_Libreria/management/commands/compactar_medios.py
+import os
+import posixpath
+import time
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from app_Libreria import tarjetas
+from app_Libreria.almacenamiento import es_ruta_por_contenido
+from app_Libreria.imagenes import CARPETA as CARPETA_DERIVADOS, carpeta_derivados
+from app_Libreria.models import ArchivoMedia, Libro, Evento, Blog
+
+CAMPOS = ((Libro, 'portada'), (Evento, 'imagen'), (Blog, 'imagen'))
+
+
+class Command(BaseCommand):
+    help = ('Pasa las imágenes subidas al almacenamiento por contenido (deduplicando), '
+            'recalcula las referencias y borra los archivos de MEDIA_ROOT que nadie usa')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--simular', action='store_true',
+                            help='Sólo informa lo que haría, sin mover ni borrar nada')
+        parser.add_argument('--gracia', type=int, default=60,
+                            help='No borra archivos modificados hace menos de N minutos (default: 60)')
+
+    def handle(self, *args, **options):
+        self.simular = options['simular']
+        self.migrar()
+        referenciadas = self.recontar()
+        self.recolectar(referenciadas, options['gracia'] * 60)
+
+    # =============================================
+    # 1. MIGRACIÓN AL ALMACENAMIENTO POR CONTENIDO
+    # =============================================
+
+    def migrar(self):
+        movidos = 0
+        for modelo, campo in CAMPOS:
+            nombres = (modelo.objects.exclude(**{f'{campo}__isnull': True}).exclude(**{campo: ''})
+                       .values_list(campo, flat=True).distinct())
+            for nombre in nombres:
+                if es_ruta_por_contenido(nombre):
+                    continue
+                if not default_storage.exists(nombre):
+                    self.stderr.write(f'{modelo.__name__}.{campo}: no existe {nombre}')
+                    continue
+                if self.simular:
+                    self.stdout.write(f'Se movería {nombre}')
+                    movidos += 1
+                    continue
+
+                with default_storage.open(nombre, 'rb') as archivo:
+                    ruta = default_storage.save(nombre, File(archivo, name=nombre))
+                with transaction.atomic():
+                    # update() no dispara señales: la tarjeta se invalida a mano
+                    filas = modelo.objects.filter(**{campo: nombre})
+                    if modelo is Libro:
+                        for libroid in filas.values_list('libroid', flat=True):
+                            transaction.on_commit(lambda libroid=libroid: tarjetas.cambiar_sello('libro', libroid))
+                    filas.update(**{campo: ruta})
+                movidos += 1
+        self.stdout.write(f'Archivos pasados al almacenamiento por contenido: {movidos}')
+        if movidos and not self.simular:
+            self.stdout.write('Ejecute generar_derivados para crear los derivados de los archivos movidos.')
+
+    # =============================================
+    # 2. CONTADORES DE REFERENCIAS
+    # =============================================
+
+    def recontar(self):
+        """Recalcula ``referencias`` desde las tablas y devuelve las rutas en uso"""
+        conteo = {}
+        for modelo, campo in CAMPOS:
+            for fila in (modelo.objects.exclude(**{f'{campo}__isnull': True}).exclude(**{campo: ''})
+                         .values(campo).annotate(n=Count('pk'))):
+                conteo[fila[campo]] = conteo.get(fila[campo], 0) + fila['n']
+
+        if not self.simular:
+            with transaction.atomic():
+                for archivo in ArchivoMedia.objects.select_for_update():
+                    referencias = conteo.get(archivo.ruta, 0)
+                    if archivo.referencias != referencias:
+                        archivo.referencias = referencias
+                        archivo.save(update_fields=['referencias'])
+        return set(conteo)
+
+    # =============================================
+    # 3. RECOLECCIÓN DE BASURA
+    # =============================================
+
+    def recolectar(self, referenciadas, gracia):
+        raiz = default_storage.location
+        # Los derivados de un original en uso también están en uso
+        carpetas_vivas = {carpeta_derivados(nombre) for nombre in referenciadas}
+        limite = time.time() - gracia
+        borrados = liberados = 0
+
+        for carpeta, _, archivos in os.walk(raiz, topdown=False):
+            for nombre in archivos:
+                completa = os.path.join(carpeta, nombre)
+                ruta = os.path.relpath(completa, raiz).replace(os.sep, '/')
+                if ruta.startswith(CARPETA_DERIVADOS + '/'):
+                    en_uso = posixpath.dirname(ruta) in carpetas_vivas
+                else:
+                    en_uso = ruta in referenciadas
+                estado = os.stat(completa)
+                if en_uso or estado.st_mtime > limite:
+                    continue
+
+                if self.simular:
+                    self.stdout.write(f'Se borraría {ruta}')
+                elif es_ruta_por_contenido(ruta):
+                    if not self.borrar_por_contenido(completa, ruta, limite):
+                        continue
+                else:
+                    os.remove(completa)
+                borrados += 1
+                liberados += estado.st_size
+
+            if not self.simular and carpeta != raiz and not os.listdir(carpeta):
+                os.rmdir(carpeta)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{"Se borrarían" if self.simular else "Borrados"} {borrados} archivos sin uso '
+            f'({liberados / 1024 / 1024:.1f} MB)'
+        ))
+
+    def borrar_por_contenido(self, completa, ruta, limite):
+        """
+        Borra un archivo por contenido si sigue sin uso. Una subida pudo
+        reutilizarlo después del recuento: con su registro bloqueado (como en
+        ``AlmacenamientoPorContenido._save``) se revisan otra vez las
+        referencias y la fecha de modificación antes de borrar.
+        """
+        with transaction.atomic():
+            archivo = ArchivoMedia.objects.select_for_update().filter(ruta=ruta).first()
+            if archivo is not None and archivo.referencias > 0:
+                return False
+            try:
+                if os.stat(completa).st_mtime > limite:
+                    return False
+                os.remove(completa)
+            except FileNotFoundError:
+                return False
+            if archivo is not None:
+                archivo.delete()
+        return True
@@ -0,0 +1,48 @@
+# app_Libreria/management/commands/exportar_ventas.py
+import datetime
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app_Libreria.exportar import FORMATOS, TABLAS, TAMANO_PAGINA, ExportacionInvalida, exportar
+from app_Libreria.models import Venta
+
+
+class Command(BaseCommand):
+    help = ('Exporta ventas o líneas de venta a CSV o XLSX sin cargarlas en memoria. '
+            'Sin --salida escribe en la salida estándar')
+
+    def add_arguments(self, parser):
+        parser.add_argument('tabla', choices=list(TABLAS), help='ventas o detalles (líneas de venta)')
+        parser.add_argument('--formato', choices=FORMATOS, default='csv')
+        parser.add_argument('--salida', help='Archivo de destino')
+        parser.add_argument('--desde', type=datetime.date.fromisoformat, help='Primer día (AAAA-MM-DD)')
+        parser.add_argument('--hasta', type=datetime.date.fromisoformat, help='Último día (AAAA-MM-DD)')
+        parser.add_argument('--estado', choices=[valor for valor, _ in Venta.ESTADOS_VENTA])
+        parser.add_argument('--metodo', choices=[valor for valor, _ in Venta.METODOS_PAGO])
+        parser.add_argument('--pagina', type=int, default=TAMANO_PAGINA,
+                            help=f'Filas por consulta (default: {TAMANO_PAGINA})')
+
+    def handle(self, *args, **options):
+        try:
+            trozos = exportar(
+                options['tabla'], options['formato'], tamano_pagina=options['pagina'],
+                desde=options['desde'], hasta=options['hasta'],
+                estado=options['estado'], metodo=options['metodo'],
+            )
+        except ExportacionInvalida as e:
+            raise CommandError(str(e))
+
+        destino = open(options['salida'], 'wb') if options['salida'] else sys.stdout.buffer
+        total = 0
+        try:
+            for trozo in trozos:
+                destino.write(trozo)
+                total += len(trozo)
+        finally:
+            if options['salida']:
+                destino.close()
+            else:
+                destino.flush()
+        if options['salida']:
+            self.stderr.write(self.style.SUCCESS(f'{total} bytes escritos en {options["salida"]}'))
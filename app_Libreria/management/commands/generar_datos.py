@@ -0,0 +1,46 @@
+# app_Libreria/management/commands/generar_datos.py
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app_Libreria.generador import CONTRASENA, POR_ESCALA, TAMANO_TROZO, generar, limpiar
+
+
+class Command(BaseCommand):
+    help = ('Genera datos sintéticos deterministas (catálogo, clientes, ventas, carritos, eventos y blog) '
+            'para pruebas de rendimiento')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--escala', type=float, default=1,
+                            help='Multiplicador de volumen; 1 = ' + ', '.join(
+                                f'{cantidad} {tabla}' for tabla, cantidad in POR_ESCALA.items()))
+        parser.add_argument('--semilla', type=int, default=42, help='Semilla; la misma da los mismos datos')
+        parser.add_argument('--dias', type=int, default=365, help='Días hacia atrás que cubren las ventas')
+        parser.add_argument('--procesos', type=int, default=os.cpu_count() or 1,
+                            help='Procesos que generan filas (la escritura es siempre en el proceso principal)')
+        parser.add_argument('--trozo', type=int, default=TAMANO_TROZO,
+                            help=f'Filas por trozo y por transacción (default: {TAMANO_TROZO})')
+        parser.add_argument('--limpiar', action='store_true',
+                            help='Borra antes catálogo, ventas, carritos, eventos, blog y clientes generados')
+
+    def handle(self, *args, **options):
+        if options['escala'] <= 0 or options['dias'] < 1 or options['procesos'] < 1 or options['trozo'] < 1:
+            raise CommandError('--escala, --dias, --procesos y --trozo deben ser positivos')
+        if options['limpiar']:
+            limpiar()
+            self.stdout.write('Datos anteriores borrados')
+
+        inicio = time.monotonic()
+
+        def progreso(tabla, escritas, total):
+            if escritas == total or options['verbosity'] > 1:
+                transcurrido = time.monotonic() - inicio
+                self.stdout.write(f'{tabla}: {escritas}/{total} · {transcurrido:.1f} s')
+
+        escritas = generar(options['escala'], options['semilla'], options['dias'], options['procesos'],
+                           options['trozo'], progreso)
+        self.stdout.write(self.style.SUCCESS(
+            f'{sum(escritas.values())} filas en {time.monotonic() - inicio:.1f} s '
+            f'(contraseña de los clientes: {CONTRASENA})'
+        ))
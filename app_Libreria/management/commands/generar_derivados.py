@@ -0,0 +1,46 @@
+# app_Libreria/management/commands/generar_derivados.py
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+
+from app_Libreria import tarjetas
+from app_Libreria.imagenes import generar_derivados, manifiesto_de
+from app_Libreria.models import Libro, Evento, Blog
+
+
+class Command(BaseCommand):
+    help = 'Genera los derivados (WebP/JPEG por ancho y placeholder) de las imágenes ya subidas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--forzar', action='store_true',
+                            help='Regenera también las imágenes que ya tienen derivados')
+        parser.add_argument('--hilos', type=int, default=4,
+                            help='Imágenes procesadas en paralelo (default: 4)')
+
+    def handle(self, *args, **options):
+        nombres = set()
+        for modelo, campo in ((Libro, 'portada'), (Evento, 'imagen'), (Blog, 'imagen')):
+            nombres.update(modelo.objects.exclude(**{campo: ''}).exclude(**{f'{campo}__isnull': True})
+                           .values_list(campo, flat=True))
+        if not options['forzar']:
+            nombres = {nombre for nombre in nombres if manifiesto_de(nombre) is None}
+
+        portadas = {}
+        for libroid, portada in Libro.objects.filter(portada__in=nombres).values_list('libroid', 'portada'):
+            portadas.setdefault(portada, []).append(libroid)
+
+        generadas = errores = 0
+        with ThreadPoolExecutor(max_workers=options['hilos']) as pool:
+            trabajos = {pool.submit(generar_derivados, nombre): nombre for nombre in sorted(nombres)}
+            for trabajo in as_completed(trabajos):
+                try:
+                    trabajo.result()
+                    generadas += 1
+                    # La tarjeta en caché se generó con el original
+                    for libroid in portadas.get(trabajos[trabajo], ()):
+                        tarjetas.cambiar_sello('libro', libroid)
+                except Exception as e:
+                    errores += 1
+                    self.stderr.write(f'{trabajos[trabajo]}: {e}')
+
+        self.stdout.write(self.style.SUCCESS(f'Derivados generados: {generadas} imágenes ({errores} con error)'))
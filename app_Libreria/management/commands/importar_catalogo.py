@@ -0,0 +1,65 @@
+# app_Libreria/management/commands/importar_catalogo.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app_Libreria.importar import (TAMANO_LOTE, guardar_punto_control, importar, leer,
+                                   leer_punto_control)
+
+
+class Command(BaseCommand):
+    help = ('Importa libros (con sus autores y editoriales) desde un CSV u ONIX, '
+            'insertando o actualizando por ISBN en lotes')
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='Archivo CSV u ONIX (.xml, .onx, .onix)')
+        parser.add_argument('--formato', choices=['csv', 'onix'], help='Por defecto según la extensión')
+        parser.add_argument('--lote', type=int, default=TAMANO_LOTE,
+                            help=f'Libros por transacción (default: {TAMANO_LOTE})')
+        parser.add_argument('--actualizar-stock', action='store_true',
+                            help='Sobrescribe también el stock de los libros que ya existen')
+        parser.add_argument('--sin-descripcion', action='store_true',
+                            help='No sobrescribe la descripción de los libros que ya existen')
+        parser.add_argument('--punto-control', help='Archivo donde se anota el avance tras cada lote')
+        parser.add_argument('--reanudar', action='store_true',
+                            help='Salta los registros ya importados según --punto-control')
+
+    def handle(self, *args, **options):
+        ruta = options['archivo']
+        control = options['punto_control']
+        if options['reanudar'] and not control:
+            raise CommandError('--reanudar necesita --punto-control')
+        saltar = leer_punto_control(control, ruta) if options['reanudar'] else 0
+        if saltar:
+            self.stdout.write(f'Reanudando después de {saltar} registros')
+
+        inicio = time.monotonic()
+
+        def al_escribir(resultado):
+            if control:
+                guardar_punto_control(control, ruta, resultado.leidos)
+            transcurrido = time.monotonic() - inicio
+            por_segundo = (resultado.leidos - saltar) / transcurrido if transcurrido else 0
+            self.stdout.write(
+                f'{resultado.leidos} leídos · {resultado.creados} nuevos · {resultado.actualizados} actualizados · '
+                f'{resultado.invalidos} inválidos · {por_segundo:.0f}/s'
+            )
+
+        try:
+            resultado = importar(
+                leer(ruta, options['formato']), tamano_lote=options['lote'],
+                actualizar_stock=options['actualizar_stock'], con_descripcion=not options['sin_descripcion'],
+                saltar=saltar, al_escribir=al_escribir,
+            )
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for error in resultado.errores:
+            self.stderr.write(error)
+        if resultado.invalidos > len(resultado.errores):
+            self.stderr.write(f'... y {resultado.invalidos - len(resultado.errores)} registros inválidos más')
+        self.stdout.write(self.style.SUCCESS(
+            f'Importación terminada en {time.monotonic() - inicio:.1f} s: {resultado.creados} libros nuevos, '
+            f'{resultado.actualizados} actualizados, {resultado.autores_nuevos} autores y '
+            f'{resultado.editoriales_nuevas} editoriales nuevos, {resultado.invalidos} registros inválidos'
+        ))
@@ -0,0 +1,17 @@
+# app_Libreria/management/commands/liberar_reservas.py
+from django.core.management.base import BaseCommand
+
+from app_Libreria.reservas import liberar_vencidas
+
+
+class Command(BaseCommand):
+    help = ('Borra las reservas de stock vencidas. Ya no apartan unidades; '
+            'borrarlas sólo evita que la tabla crezca (programar con cron)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=1000,
+                            help='Reservas borradas por sentencia (default: 1000)')
+
+    def handle(self, *args, **options):
+        borradas = liberar_vencidas(options['lote'])
+        self.stdout.write(self.style.SUCCESS(f'{borradas} reservas vencidas borradas'))
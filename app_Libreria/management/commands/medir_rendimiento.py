@@ -0,0 +1,85 @@
+# app_Libreria/management/commands/medir_rendimiento.py
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app_Libreria.rendimiento import (CALENTAMIENTO, REPETICIONES, UMBRAL, comparar, encabezado,
+                                      medir_concurrencia, medir_rutas, rutas_sin_escenario)
+
+
+class Command(BaseCommand):
+    help = ('Mide latencia (p50/p95/p99), consultas, bytes y memoria de cada ruta de la aplicación '
+            'sobre la base de datos actual; opcionalmente el checkout con compras simultáneas')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticiones', type=int, default=REPETICIONES,
+                            help=f'Peticiones medidas por ruta (default: {REPETICIONES})')
+        parser.add_argument('--calentamiento', type=int, default=CALENTAMIENTO,
+                            help=f'Peticiones previas sin medir (default: {CALENTAMIENTO})')
+        parser.add_argument('--rutas', nargs='+', help='Sólo estas rutas (nombre de URL o nombre:variante)')
+        parser.add_argument('--solo-lectura', action='store_true',
+                            help='Salta los escenarios que escriben (carrito y checkout)')
+        parser.add_argument('--hilos', type=int, default=0,
+                            help='Además, compras simultáneas con este número de hilos')
+        parser.add_argument('--compras', type=int, default=10, help='Compras por hilo en el modo concurrente')
+        parser.add_argument('--sin-rutas', action='store_true', help='Sólo el modo concurrente')
+        parser.add_argument('--salida', help='Archivo JSON donde guardar los resultados')
+        parser.add_argument('--comparar', help='JSON de una corrida anterior contra el cual buscar regresiones')
+        parser.add_argument('--umbral', type=float, default=UMBRAL,
+                            help=f'Aumento relativo del p95 que cuenta como regresión (default: {UMBRAL})')
+
+    def handle(self, *args, **options):
+        if options['repeticiones'] < 1:
+            raise CommandError('--repeticiones debe ser al menos 1')
+        base = None
+        if options['comparar']:
+            try:
+                with open(options['comparar'], encoding='utf-8') as archivo:
+                    base = json.load(archivo)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'No se pudo leer {options["comparar"]}: {e}')
+
+        faltan = rutas_sin_escenario()
+        if faltan:
+            self.stderr.write(f'Rutas sin escenario: {", ".join(faltan)}')
+
+        resultado = encabezado()
+        if not options['sin_rutas']:
+            def al_medir(clave, metricas):
+                self.stdout.write(
+                    f'{clave:<32} {metricas["estado"]} · p50 {metricas["p50_ms"]:8.1f} · p95 {metricas["p95_ms"]:8.1f} '
+                    f'· p99 {metricas["p99_ms"]:8.1f} ms · {metricas["consultas"]:3} consultas '
+                    f'· {metricas["bytes"]:>9} B · {metricas["memoria_pico_kib"]:>8} KiB'
+                )
+
+            rutas, omitidas = medir_rutas(options['repeticiones'], options['calentamiento'], options['rutas'],
+                                          options['solo_lectura'], al_medir=al_medir)
+            resultado['rutas'] = rutas
+            resultado['omitidas'] = omitidas
+            for clave, motivo in omitidas.items():
+                self.stdout.write(f'{clave:<32} omitida ({motivo})')
+
+        if options['hilos'] > 0:
+            concurrencia = medir_concurrencia(options['hilos'], options['compras'])
+            resultado['concurrente'] = concurrencia
+            self.stdout.write(
+                f'Concurrente: {concurrencia["hilos"]} hilos · {concurrencia["completadas"]} completadas · '
+                f'{concurrencia["rechazadas"]} rechazadas · {concurrencia["errores"]} errores · '
+                f'{concurrencia["compras_por_segundo"]} compras/s · p95 {concurrencia["p95_ms"]} ms'
+            )
+            for error in concurrencia['errores_muestra']:
+                self.stderr.write(error)
+
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8') as archivo:
+                json.dump(resultado, archivo, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Resultados en {options["salida"]}'))
+
+        if base is not None:
+            regresiones = comparar(resultado.get('rutas', {}), base.get('rutas', {}), options['umbral'])
+            for regresion in regresiones:
+                self.stderr.write(regresion)
+            if regresiones:
+                raise CommandError(f'{len(regresiones)} regresiones respecto a {options["comparar"]} '
+                                   f'(commit {base.get("commit")})')
+            self.stdout.write(self.style.SUCCESS(f'Sin regresiones respecto a {options["comparar"]}'))
@@ -0,0 +1,19 @@
+# app_Libreria/management/commands/reindexar_busqueda.py
+from django.core.management.base import BaseCommand
+
+from app_Libreria.busqueda import reconstruir_indice, fts_disponible
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye desde cero el índice de búsqueda de texto completo de libros'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=2000,
+                            help='Libros por lote al escribir el índice (default: 2000)')
+
+    def handle(self, *args, **options):
+        if not fts_disponible():
+            self.stdout.write(self.style.WARNING('Este motor de base de datos no tiene índice de texto completo; nada que hacer.'))
+            return
+        total = reconstruir_indice(tamano_lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(f'Índice reconstruido: {total} libros'))
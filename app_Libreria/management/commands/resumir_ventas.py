@@ -0,0 +1,19 @@
+# app_Libreria/management/commands/resumir_ventas.py
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from app_Libreria.resumenes import recalcular_rango
+
+
+class Command(BaseCommand):
+    help = ('Recalcula el resumen diario de ventas (VentaResumenDiario) desde las ventas. '
+            'Sin fechas reconstruye todo el historial')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', type=datetime.date.fromisoformat, help='Primer día (AAAA-MM-DD)')
+        parser.add_argument('--hasta', type=datetime.date.fromisoformat, help='Último día (AAAA-MM-DD)')
+
+    def handle(self, *args, **options):
+        filas = recalcular_rango(options['desde'], options['hasta'])
+        self.stdout.write(self.style.SUCCESS(f'{filas} filas de resumen escritas'))
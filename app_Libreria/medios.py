@@ -0,0 +1,239 @@
+# app_Libreria/medios.py
+"""
+Entrega de los archivos de ``MEDIA_ROOT`` (portadas, imágenes de eventos y
+del blog, derivados).
+
+La vista ``servir_medio`` resuelve las validaciones HTTP (ETag fuerte,
+``Last-Modified``, ``304``, ``Range``/``If-Range``) y después entrega el
+archivo según ``MEDIA_ENTREGA``:
+
+* ``'python'`` (por defecto): ``FileResponse`` sobre el descriptor del
+  archivo. Los servidores WSGI con ``wsgi.file_wrapper`` (gunicorn, uWSGI)
+  lo envían con ``os.sendfile`` sin copiarlo a Python, también los rangos.
+* ``'x-sendfile'``: Apache (mod_xsendfile) o lighttpd envían el archivo.
+* ``'x-accel-redirect'``: nginx envía el archivo desde la ubicación
+  interna ``MEDIA_ACCEL_PREFIJO`` (``internal;`` apuntando a MEDIA_ROOT).
+
+Los nombres con hash de contenido nunca cambian de contenido, así que se
+marcan ``immutable`` con un año de vigencia; el resto usa
+``MEDIA_MAX_AGE`` segundos.
+
+``servir_estatico`` hace lo mismo para ``STATIC_ROOT`` (lo que deja
+``collectstatic``) y elige la variante ``.br`` o ``.gz`` precomprimida
+según ``Accept-Encoding``. Con ``DEBUG`` el ``runserver`` de staticfiles
+atiende ``STATIC_URL`` antes de llegar a esta vista.
+"""
+import mimetypes
+import os
+import re
+import stat
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+MAX_AGE_DEFAULT = 60 * 60
+MAX_AGE_INMUTABLE = 60 * 60 * 24 * 365
+TAMANO_BLOQUE = 64 * 1024
+
+# Un segmento hexadecimal de 16+ caracteres en el nombre del archivo
+# (``ab/cd/abcdef....png`` o ``portada.abcdef....png``)
+_NOMBRE_CON_HASH = re.compile(r'(?:^|[/._-])[0-9a-f]{16,64}\.[A-Za-z0-9]+$')
+# Nombres de ManifestStaticFilesStorage: ``base.0123456789ab.css``
+_NOMBRE_MANIFIESTO = re.compile(r'\.[0-9a-f]{12}\.[A-Za-z0-9]+$')
+# Variantes precomprimidas en orden de preferencia
+CODIFICACIONES = (('br', '.br'), ('gzip', '.gz'))
+_RANGO = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def etag_de(estado):
+    """ETag fuerte a partir del tamaño y la fecha de modificación (en ns)"""
+    return f'"{estado.st_size:x}-{estado.st_mtime_ns:x}"'
+
+
+def es_inmutable(ruta):
+    return bool(_NOMBRE_CON_HASH.search(ruta))
+
+
+def es_estatico_inmutable(ruta):
+    return bool(_NOMBRE_MANIFIESTO.search(ruta))
+
+
+def leer_rango(encabezado, tamano):
+    """
+    ``(inicio, fin)`` inclusivo de un encabezado ``Range`` de un solo tramo,
+    ``None`` si no aplica (se sirve completo) o ``False`` si no es
+    satisfacible. Varios tramos se ignoran, como permite el RFC 9110.
+    """
+    coincidencia = _RANGO.match(encabezado.strip())
+    if not coincidencia:
+        return None
+    inicio, fin = coincidencia.groups()
+    if not inicio and not fin:
+        return None
+    if not inicio:
+        # Sufijo: los últimos N bytes
+        largo = int(fin)
+        if largo == 0:
+            return False
+        return max(0, tamano - largo), tamano - 1
+    inicio = int(inicio)
+    fin = min(int(fin), tamano - 1) if fin else tamano - 1
+    if inicio >= tamano or fin < inicio:
+        return False
+    return inicio, fin
+
+
+class _Tramo:
+    """
+    Vista de sólo lectura de ``largo`` bytes de un archivo ya posicionado.
+    Expone ``fileno()`` para que el ``wsgi.file_wrapper`` use ``sendfile``
+    (limitado por ``Content-Length``) y ``read()`` para los demás servidores.
+    """
+
+    def __init__(self, archivo, inicio, largo):
+        archivo.seek(inicio)
+        self.archivo = archivo
+        self.restante = largo
+
+    def read(self, tamano=-1):
+        if self.restante <= 0:
+            return b''
+        if tamano is None or tamano < 0 or tamano > self.restante:
+            tamano = self.restante
+        datos = self.archivo.read(tamano)
+        self.restante -= len(datos)
+        return datos
+
+    def fileno(self):
+        return self.archivo.fileno()
+
+    def close(self):
+        self.archivo.close()
+
+
+def _no_modificado(request, etag, modificado):
+    si_no_coincide = request.headers.get('If-None-Match')
+    if si_no_coincide is not None:
+        etags = parse_etags(si_no_coincide)
+        return '*' in etags or etag in etags
+    desde = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return desde is not None and int(modificado) <= desde
+
+
+def _encabezados_cache(response, etag, modificado, inmutable):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(modificado)
+    response['Accept-Ranges'] = 'bytes'
+    if inmutable:
+        response['Cache-Control'] = f'public, max-age={MAX_AGE_INMUTABLE}, immutable'
+    else:
+        max_age = getattr(settings, 'MEDIA_MAX_AGE', MAX_AGE_DEFAULT)
+        response['Cache-Control'] = f'public, max-age={max_age}'
+
+
+def _resolver(raiz, ruta):
+    try:
+        completa = safe_join(raiz, ruta)
+        estado = os.stat(completa)
+    except (SuspiciousFileOperation, ValueError, OSError):
+        return None, None
+    if not stat.S_ISREG(estado.st_mode):
+        return None, None
+    return completa, estado
+
+
+def _acepta(request, codificacion):
+    aceptadas = request.headers.get('Accept-Encoding', '')
+    return any(
+        parte.split(';')[0].strip() == codificacion and not parte.replace(' ', '').endswith(';q=0')
+        for parte in aceptadas.split(',')
+    )
+
+
+def _servir_archivo(request, ruta, completa, estado, inmutable, prefijo_accel, codificacion=None, tipo=None):
+    """
+    Respuesta para un archivo ya resuelto. ``codificacion`` indica que
+    ``completa`` es una variante precomprimida de ``ruta``.
+    """
+    etag = etag_de(estado)
+    modificado = estado.st_mtime
+    if tipo is None:
+        tipo, encoding = mimetypes.guess_type(completa)
+        # Igual que FileResponse: un .gz subido se entrega tal cual
+        tipo = 'application/octet-stream' if encoding else (tipo or 'application/octet-stream')
+
+    def encabezados(response):
+        _encabezados_cache(response, etag, modificado, inmutable)
+        if codificacion:
+            response['Content-Encoding'] = codificacion
+        if codificacion is not None or tipo.startswith(('text/', 'application/javascript')):
+            response['Vary'] = 'Accept-Encoding'
+        return response
+
+    if _no_modificado(request, etag, modificado):
+        return encabezados(HttpResponseNotModified())
+
+    entrega = getattr(settings, 'MEDIA_ENTREGA', 'python')
+    if entrega == 'x-sendfile' or (entrega == 'x-accel-redirect' and prefijo_accel):
+        # El servidor web resuelve Range y envía el cuerpo
+        response = HttpResponse(content_type=tipo)
+        if entrega == 'x-sendfile':
+            response['X-Sendfile'] = completa
+        else:
+            sufijo = dict(CODIFICACIONES).get(codificacion, '')
+            response['X-Accel-Redirect'] = prefijo_accel.rstrip('/') + '/' + quote(ruta + sufijo)
+        return encabezados(response)
+
+    rango = None
+    encabezado_rango = request.headers.get('Range')
+    si_rango = request.headers.get('If-Range')
+    if encabezado_rango and (si_rango is None or si_rango == etag):
+        rango = leer_rango(encabezado_rango, estado.st_size)
+
+    if rango is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{estado.st_size}'
+        return encabezados(response)
+
+    archivo = open(completa, 'rb')
+    if rango is None:
+        response = FileResponse(archivo, content_type=tipo)
+    else:
+        inicio, fin = rango
+        response = FileResponse(_Tramo(archivo, inicio, fin - inicio + 1), content_type=tipo, status=206)
+        response['Content-Length'] = fin - inicio + 1
+        response['Content-Range'] = f'bytes {inicio}-{fin}/{estado.st_size}'
+    response.block_size = TAMANO_BLOQUE
+    return encabezados(response)
+
+
+@require_safe
+def servir_medio(request, ruta):
+    completa, estado = _resolver(settings.MEDIA_ROOT, ruta)
+    if completa is None:
+        raise Http404('Archivo no encontrado')
+    prefijo = getattr(settings, 'MEDIA_ACCEL_PREFIJO', '/media-interno/')
+    return _servir_archivo(request, ruta, completa, estado, es_inmutable(ruta), prefijo)
+
+
+@require_safe
+def servir_estatico(request, ruta):
+    original, estado = _resolver(settings.STATIC_ROOT, ruta)
+    if original is None:
+        raise Http404('Archivo no encontrado')
+    tipo = mimetypes.guess_type(original)[0] or 'application/octet-stream'
+    prefijo = getattr(settings, 'STATIC_ACCEL_PREFIJO', None)
+    inmutable = es_estatico_inmutable(ruta)
+
+    for codificacion, sufijo in CODIFICACIONES:
+        if _acepta(request, codificacion):
+            completa, estado_variante = _resolver(settings.STATIC_ROOT, ruta + sufijo)
+            if completa is not None:
+                return _servir_archivo(request, ruta, completa, estado_variante, inmutable, prefijo,
+                                       codificacion=codificacion, tipo=tipo)
+    return _servir_archivo(request, ruta, original, estado, inmutable, prefijo, tipo=tipo)
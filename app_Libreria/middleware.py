@@ -0,0 +1,109 @@
+# app_Libreria/middleware.py
+"""
+Middleware de la aplicación.
+
+``PresupuestoConsultasMiddleware`` cuenta las consultas SQL de cada petición,
+agrupa las que tienen la misma forma (huella) y avisa cuando:
+
+* una misma huella se repite muchas veces (patrón N+1, típico de recorrer
+  llaves foráneas dentro de un ``{% for %}``), o
+* la vista supera su presupuesto de consultas (``PRESUPUESTO_CONSULTAS``,
+  por nombre de URL).
+
+Con ``PRESUPUESTO_CONSULTAS_ACTIVO`` (por omisión, en desarrollo) se registra
+una advertencia en el logger ``app_Libreria.consultas``; con
+``PRESUPUESTO_CONSULTAS_ESTRICTO`` (el perfil de pruebas) se lanza
+``PresupuestoConsultasExcedido``. Sin ninguno de los dos el middleware se
+retira al arrancar y las peticiones no pagan por sacar la huella de cada
+consulta.
+"""
+import logging
+import re
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('app_Libreria.consultas')
+
+PRESUPUESTO_DEFAULT = 20
+REPETICIONES_DEFAULT = 5
+
+_LISTA_IN = re.compile(r'\bIN\s*\((?:\s*%s\s*,?)+\)', re.IGNORECASE)
+_CADENA = re.compile(r"'(?:[^']|'')*'")
+_NUMERO = re.compile(r'\b\d+(?:\.\d+)?\b')
+_ESPACIOS = re.compile(r'\s+')
+
+
+class PresupuestoConsultasExcedido(Exception):
+    """Una vista hizo más consultas de las permitidas o tiene un N+1"""
+
+
+def huella_sql(sql):
+    """
+    Forma de una consulta sin sus valores: dos consultas con la misma huella
+    sólo difieren en los parámetros.
+    """
+    huella = _CADENA.sub('?', sql)
+    huella = _NUMERO.sub('?', huella)
+    huella = _LISTA_IN.sub('IN (...)', huella)
+    return _ESPACIOS.sub(' ', huella).strip()
+
+
+class RegistroConsultas:
+    """Envoltorio de ``execute_wrapper`` que anota cada consulta ejecutada"""
+
+    def __init__(self):
+        self.huellas = Counter()
+        self.total = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.total += 1
+        self.huellas[huella_sql(sql)] += 1
+        return execute(sql, params, many, context)
+
+    def repetidas(self, minimo):
+        return [(huella, veces) for huella, veces in self.huellas.most_common() if veces >= minimo]
+
+
+class PresupuestoConsultasMiddleware:
+
+    def __init__(self, get_response):
+        if not (getattr(settings, 'PRESUPUESTO_CONSULTAS_ACTIVO', False)
+                or getattr(settings, 'PRESUPUESTO_CONSULTAS_ESTRICTO', False)):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        registro = RegistroConsultas()
+        with ExitStack() as pila:
+            for conexion in connections.all():
+                pila.enter_context(conexion.execute_wrapper(registro))
+            response = self.get_response(request)
+
+        nombre = request.resolver_match.url_name if request.resolver_match else None
+        if settings.DEBUG:
+            response['X-Consultas-SQL'] = str(registro.total)
+        self.revisar(request, nombre, registro)
+        return response
+
+    def revisar(self, request, nombre, registro):
+        presupuestos = getattr(settings, 'PRESUPUESTO_CONSULTAS', {})
+        presupuesto = presupuestos.get(nombre, getattr(settings, 'PRESUPUESTO_CONSULTAS_DEFAULT', PRESUPUESTO_DEFAULT))
+        minimo = getattr(settings, 'PRESUPUESTO_CONSULTAS_REPETICIONES', REPETICIONES_DEFAULT)
+
+        problemas = []
+        if registro.total > presupuesto:
+            problemas.append(f'{registro.total} consultas (presupuesto: {presupuesto})')
+        for huella, veces in registro.repetidas(minimo):
+            problemas.append(f'posible N+1, {veces} veces: {huella[:300]}')
+
+        if not problemas:
+            return
+
+        mensaje = f'{request.method} {request.path} [{nombre}]: ' + '; '.join(problemas)
+        if getattr(settings, 'PRESUPUESTO_CONSULTAS_ESTRICTO', False):
+            raise PresupuestoConsultasExcedido(mensaje)
+        logger.warning(mensaje)
@@ -0,0 +1,49 @@
+# Índice de búsqueda de texto completo (FTS5) sobre libros
+
+from django.db import migrations
+
+TABLA_FTS = 'app_libreria_libro_fts'
+
+SQL_CREAR_TABLA = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {TABLA_FTS} USING fts5(
+        titulo, descripcion, isbn, autor, editorial,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+"""
+SQL_BORRAR_TABLA = f'DROP TABLE IF EXISTS {TABLA_FTS}'
+
+SQL_LLENAR_TABLA = f"""
+    INSERT INTO {TABLA_FTS} (rowid, titulo, descripcion, isbn, autor, editorial)
+    SELECT l.libroid, l.titulo, l.descripcion,
+           l.isbn || ' ' || replace(l.isbn, '-', ''),
+           a.nombre || ' ' || a.apellido,
+           e.nombre
+    FROM app_libreria_libro l
+    JOIN app_libreria_autor a ON a.autorid = l.autorid
+    JOIN app_libreria_editorial e ON e.editorialid = l.editorialid
+"""
+
+
+def crear_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(SQL_CREAR_TABLA)
+    schema_editor.execute(SQL_LLENAR_TABLA)
+
+
+def borrar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(SQL_BORRAR_TABLA)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_Libreria', '0006_evento_activo'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, borrar_indice),
+    ]
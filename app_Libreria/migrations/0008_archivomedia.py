@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_Libreria', '0007_libro_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivoMedia',
+            fields=[
+                ('archivoid', models.AutoField(primary_key=True, serialize=False)),
+                ('ruta', models.CharField(max_length=255, unique=True)),
+                ('hash', models.CharField(max_length=64)),
+                ('tamano', models.BigIntegerField()),
+                ('referencias', models.PositiveIntegerField(default=0)),
+                ('fechacreacion', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Archivo de medios',
+                'verbose_name_plural': 'Archivos de medios',
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_Libreria', '0008_archivomedia'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Reserva',
+            fields=[
+                ('reservaid', models.AutoField(primary_key=True, serialize=False)),
+                ('cantidad', models.PositiveIntegerField()),
+                ('expira', models.DateTimeField()),
+                ('carrito', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='reserva', to='app_Libreria.carrito')),
+                ('libro', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='app_Libreria.libro')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Reserva',
+                'verbose_name_plural': 'Reservas',
+                'indexes': [models.Index(fields=['libro', 'expira'], name='reserva_libro_expira_idx'), models.Index(fields=['expira'], name='reserva_expira_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_Libreria', '0010_clave_idempotencia'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='detalleventa',
+            name='cantidaddevuelta',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='venta',
+            name='montodevuelto',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:39
+
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, Sum
+from django.utils import timezone
+
+# Copia fija de carrito.TASA_IVA y resumenes.aporte al escribir la migración
+TASA_IVA = Decimal('0.16')
+CENTAVO = Decimal('0.01')
+
+
+def llenar_resumen(apps, schema_editor):
+    """Resumen de las ventas existentes, como ``manage.py resumir_ventas``"""
+    Venta = apps.get_model('app_Libreria', 'Venta')
+    DetalleVenta = apps.get_model('app_Libreria', 'DetalleVenta')
+    VentaResumenDiario = apps.get_model('app_Libreria', 'VentaResumenDiario')
+
+    unidades = dict(DetalleVenta.objects.order_by().values_list('ventaid')
+                    .annotate(total=Sum(F('cantidad') - F('cantidaddevuelta'))))
+    acumulado = {}
+    ventas = Venta.objects.order_by('fechaventa').values_list(
+        'ventaid', 'fechaventa', 'metodopago', 'estadoventa', 'montototal', 'montodevuelto')
+    for ventaid, fechaventa, metodopago, estadoventa, montototal, montodevuelto in ventas.iterator(chunk_size=2000):
+        dia = timezone.localtime(fechaventa).date() if timezone.is_aware(fechaventa) else fechaventa.date()
+        totales = acumulado.setdefault((dia, metodopago, estadoventa), {
+            'ventas': 0, 'bruto': Decimal('0'), 'iva': Decimal('0'), 'unidades': 0, 'devuelto': Decimal('0'),
+        })
+        totales['ventas'] += 1
+        totales['bruto'] += montototal
+        totales['iva'] += (montototal * TASA_IVA / (1 + TASA_IVA)).quantize(CENTAVO, rounding=ROUND_HALF_UP)
+        totales['unidades'] += unidades.get(ventaid) or 0
+        totales['devuelto'] += montodevuelto
+
+    VentaResumenDiario.objects.bulk_create([
+        VentaResumenDiario(fecha=fecha, metodopago=metodo, estadoventa=estado, **totales)
+        for (fecha, metodo, estado), totales in acumulado.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_Libreria', '0011_devoluciones'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VentaResumenDiario',
+            fields=[
+                ('resumenid', models.AutoField(primary_key=True, serialize=False)),
+                ('fecha', models.DateField()),
+                ('metodopago', models.CharField(choices=[('EFECTIVO', 'Efectivo'), ('TARJETA', 'Tarjeta'), ('TRANSFERENCIA', 'Transferencia')], max_length=50)),
+                ('estadoventa', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('COMPLETADA', 'Completada'), ('CANCELADA', 'Cancelada')], max_length=50)),
+                ('ventas', models.PositiveIntegerField(default=0)),
+                ('bruto', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('iva', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('unidades', models.IntegerField(default=0)),
+                ('devuelto', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+            ],
+            options={
+                'verbose_name': 'Resumen diario de ventas',
+                'verbose_name_plural': 'Resúmenes diarios de ventas',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='venta',
+            index=models.Index(fields=['fechaventa'], name='venta_fecha_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='ventaresumendiario',
+            constraint=models.UniqueConstraint(fields=('fecha', 'metodopago', 'estadoventa'), name='resumen_dia_unico'),
+        ),
+        # Sin esto el panel mostraría cero ventas hasta correr resumir_ventas
+        migrations.RunPython(llenar_resumen, migrations.RunPython.noop),
+    ]
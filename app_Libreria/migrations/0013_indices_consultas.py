@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:09
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+
+def unir_renglones_repetidos(apps, schema_editor):
+    """Antes de la restricción única: un solo renglón por (usuario, libro), con la cantidad sumada"""
+    Carrito = apps.get_model('app_Libreria', 'Carrito')
+    repetidos = (Carrito.objects.values('usuario', 'libro').annotate(renglones=Count('carritoid'))
+                 .filter(renglones__gt=1).annotate(primero=Min('carritoid'), cantidad=Sum('cantidad')))
+    for grupo in repetidos:
+        Carrito.objects.filter(carritoid=grupo['primero']).update(cantidad=grupo['cantidad'])
+        Carrito.objects.filter(usuario=grupo['usuario'], libro=grupo['libro']) \
+            .exclude(carritoid=grupo['primero']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_Libreria', '0012_venta_resumen_diario'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['activo', '-fechapublicacion'], name='blog_activo_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evento',
+            index=models.Index(fields=['activo', 'fecha'], name='evento_activo_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='libro',
+            index=models.Index(condition=models.Q(('stock__gt', 0)), fields=['libroid'], name='libro_con_stock_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='libro',
+            index=models.Index(condition=models.Q(('stock__gt', 0)), fields=['titulo', 'libroid'], name='libro_stock_titulo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='libro',
+            index=models.Index(condition=models.Q(('stock__gt', 0)), fields=['precioventa', 'libroid'], name='libro_stock_precio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venta',
+            index=models.Index(fields=['clienteid', '-fechaventa'], name='venta_cliente_fecha_idx'),
+        ),
+        migrations.RunPython(unir_renglones_repetidos, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='carrito',
+            constraint=models.UniqueConstraint(fields=('usuario', 'libro'), name='carrito_usuario_libro_unico'),
+        ),
+    ]
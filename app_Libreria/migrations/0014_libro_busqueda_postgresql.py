@@ -0,0 +1,58 @@
+# Índice de búsqueda de texto completo en PostgreSQL (tsvector + GIN); en SQLite
+# lo cubre la tabla FTS5 de 0007
+
+from django.db import migrations
+
+TABLA_FTS = 'app_libreria_libro_fts'
+
+SQL_CREAR_TABLA = [
+    'CREATE EXTENSION IF NOT EXISTS unaccent',
+    f"""
+    CREATE TABLE IF NOT EXISTS {TABLA_FTS} (
+        libroid integer PRIMARY KEY,
+        documento tsvector NOT NULL
+    )
+    """,
+    f'CREATE INDEX IF NOT EXISTS {TABLA_FTS}_documento_gin ON {TABLA_FTS} USING GIN (documento)',
+]
+SQL_BORRAR_TABLA = f'DROP TABLE IF EXISTS {TABLA_FTS}'
+
+# Mismos pesos que busqueda._SQL_GUARDAR_POSTGRESQL
+SQL_LLENAR_TABLA = f"""
+    INSERT INTO {TABLA_FTS} (libroid, documento)
+    SELECT l.libroid,
+           setweight(to_tsvector('simple', unaccent(l.titulo)), 'A') ||
+           setweight(to_tsvector('simple', unaccent(l.descripcion)), 'D') ||
+           setweight(to_tsvector('simple', unaccent(l.isbn || ' ' || replace(l.isbn, '-', ''))), 'A') ||
+           setweight(to_tsvector('simple', unaccent(a.nombre || ' ' || a.apellido)), 'B') ||
+           setweight(to_tsvector('simple', unaccent(e.nombre)), 'C')
+    FROM app_libreria_libro l
+    JOIN app_libreria_autor a ON a.autorid = l.autorid
+    JOIN app_libreria_editorial e ON e.editorialid = l.editorialid
+    ON CONFLICT (libroid) DO NOTHING
+"""
+
+
+def crear_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in SQL_CREAR_TABLA:
+        schema_editor.execute(sql)
+    schema_editor.execute(SQL_LLENAR_TABLA)
+
+
+def borrar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(SQL_BORRAR_TABLA)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_Libreria', '0013_indices_consultas'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, borrar_indice),
+    ]
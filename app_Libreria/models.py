@@ -76,6 +76,15 @@ class Libro(models.Model):
     
     class Meta:
         verbose_name_plural = "Libros"
+        indexes = [
+            # Sólo los libros con stock, en el orden de inicio y del catálogo (ver catalogo.ORDENES);
+            # la paginación por cursor recorre el índice sin ordenar
+            models.Index(fields=['libroid'], condition=models.Q(stock__gt=0), name='libro_con_stock_idx'),
+            models.Index(fields=['titulo', 'libroid'], condition=models.Q(stock__gt=0),
+                         name='libro_stock_titulo_idx'),
+            models.Index(fields=['precioventa', 'libroid'], condition=models.Q(stock__gt=0),
+                         name='libro_stock_precio_idx'),
+        ]
     
     def __str__(self):
         return self.titulo
@@ -106,9 +115,17 @@ class Venta(models.Model):
     descuentoaplicado = models.DecimalField(max_digits=5, decimal_places=2, default=0)
     pagorecibido = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     cambio = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    # Importe reembolsado por devoluciones parciales (ver ventas.devolver)
+    montodevuelto = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     
     class Meta:
         verbose_name_plural = "Ventas"
+        indexes = [
+            # Rangos por fecha: resúmenes diarios y reportes
+            models.Index(fields=['fechaventa'], name='venta_fecha_idx'),
+            # Historial de un cliente (mis_compras), del más reciente al más antiguo
+            models.Index(fields=['clienteid', '-fechaventa'], name='venta_cliente_fecha_idx'),
+        ]
     
     def __str__(self):
         return f"Venta #{self.ventaid} - {self.clienteid.username}"
@@ -130,6 +147,8 @@ class DetalleVenta(models.Model):
     preciounitario = models.DecimalField(max_digits=10, decimal_places=2)
     iva = models.DecimalField(max_digits=5, decimal_places=2, default=0.16)
     subtotal = models.DecimalField(max_digits=10, decimal_places=2)
+    # Unidades de la línea ya devueltas al stock
+    cantidaddevuelta = models.IntegerField(default=0)
     
     class Meta:
         verbose_name_plural = "Detalles de Venta"
@@ -147,6 +166,10 @@ class Carrito(models.Model):
     
     class Meta:
         verbose_name_plural = "Carritos"
+        constraints = [
+            # Un renglón por libro: reservas.reservar actualiza la cantidad con update_or_create
+            models.UniqueConstraint(fields=['usuario', 'libro'], name='carrito_usuario_libro_unico'),
+        ]
     
     def subtotal(self):
         return Decimal(str(self.libro.precioventa)) * self.cantidad
@@ -182,6 +205,10 @@ class Evento(models.Model):
         verbose_name = "Evento"
         verbose_name_plural = "Eventos"
         ordering = ['fecha']
+        indexes = [
+            # Eventos activos próximos o pasados, por fecha
+            models.Index(fields=['activo', 'fecha'], name='evento_activo_fecha_idx'),
+        ]
 class Blog(models.Model):
     CATEGORIAS = [
         ('GENERAL', 'General'),
@@ -210,4 +237,107 @@ class Blog(models.Model):
     class Meta:
         verbose_name = "Entrada de Blog"
         verbose_name_plural = "Entradas de Blog"
-        ordering = ['-fechapublicacion']
\ No newline at end of file
+        ordering = ['-fechapublicacion']
+        indexes = [
+            # Entradas activas de la más reciente a la más antigua
+            models.Index(fields=['activo', '-fechapublicacion'], name='blog_activo_fecha_idx'),
+        ]
+
+class ArchivoMedia(models.Model):
+    """
+    Registro de los archivos guardados por contenido (ver
+    app_Libreria/almacenamiento.py). ``referencias`` cuenta cuántos campos
+    de imagen apuntan al archivo; en 0 puede borrarse con ``compactar_medios``.
+    """
+    archivoid = models.AutoField(primary_key=True)
+    ruta = models.CharField(max_length=255, unique=True)
+    hash = models.CharField(max_length=64)
+    tamano = models.BigIntegerField()
+    referencias = models.PositiveIntegerField(default=0)
+    fechacreacion = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.ruta
+
+    class Meta:
+        verbose_name = "Archivo de medios"
+        verbose_name_plural = "Archivos de medios"
+
+
+class Reserva(models.Model):
+    """
+    Apartado temporal de unidades de un libro mientras está en un carrito
+    (ver app_Libreria/reservas.py). Deja de contar al pasar ``expira``.
+    """
+    reservaid = models.AutoField(primary_key=True)
+    carrito = models.OneToOneField(Carrito, on_delete=models.CASCADE, related_name='reserva')
+    libro = models.ForeignKey(Libro, on_delete=models.CASCADE)
+    usuario = models.ForeignKey(User, on_delete=models.CASCADE)
+    cantidad = models.PositiveIntegerField()
+    expira = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.cantidad} x {self.libro_id} hasta {self.expira:%H:%M}"
+
+    class Meta:
+        verbose_name = "Reserva"
+        verbose_name_plural = "Reservas"
+        indexes = [
+            models.Index(fields=['libro', 'expira'], name='reserva_libro_expira_idx'),
+            models.Index(fields=['expira'], name='reserva_expira_idx'),
+        ]
+
+
+class ClaveIdempotencia(models.Model):
+    """
+    Resultado de un POST con clave de idempotencia (ver
+    app_Libreria/idempotencia.py). Repetir la petición con la misma clave
+    devuelve ``respuesta`` sin volver a procesarla hasta ``expira``.
+    """
+    claveid = models.AutoField(primary_key=True)
+    usuario = models.ForeignKey(User, on_delete=models.CASCADE)
+    vista = models.CharField(max_length=50)
+    clave = models.CharField(max_length=255)
+    huella = models.CharField(max_length=64)
+    respuesta = models.CharField(max_length=255, blank=True)
+    expira = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.vista}:{self.clave}"
+
+    class Meta:
+        verbose_name = "Clave de idempotencia"
+        verbose_name_plural = "Claves de idempotencia"
+        constraints = [
+            models.UniqueConstraint(fields=['usuario', 'vista', 'clave'], name='idempotencia_clave_unica'),
+        ]
+        indexes = [
+            models.Index(fields=['expira'], name='idempotencia_expira_idx'),
+        ]
+
+
+class VentaResumenDiario(models.Model):
+    """
+    Totales de ventas por día, método de pago y estado (ver
+    app_Libreria/resumenes.py). ``unidades`` descuenta lo devuelto y
+    ``devuelto`` es lo reembolsado.
+    """
+    resumenid = models.AutoField(primary_key=True)
+    fecha = models.DateField()
+    metodopago = models.CharField(max_length=50, choices=Venta.METODOS_PAGO)
+    estadoventa = models.CharField(max_length=50, choices=Venta.ESTADOS_VENTA)
+    ventas = models.PositiveIntegerField(default=0)
+    bruto = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    iva = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    unidades = models.IntegerField(default=0)
+    devuelto = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    def __str__(self):
+        return f"{self.fecha} {self.metodopago} {self.estadoventa}: {self.ventas}"
+
+    class Meta:
+        verbose_name = "Resumen diario de ventas"
+        verbose_name_plural = "Resúmenes diarios de ventas"
+        constraints = [
+            models.UniqueConstraint(fields=['fecha', 'metodopago', 'estadoventa'], name='resumen_dia_unico'),
+        ]
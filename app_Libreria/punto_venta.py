@@ -0,0 +1,182 @@
+# app_Libreria/punto_venta.py
+"""
+Punto de venta: búsqueda de libros por ISBN o código de barras y validación
+de las líneas de una venta de mostrador.
+
+El índice ``codigo -> EntradaIsbn(libroid, titulo, precio, stock)`` vive en
+memoria del proceso. Cada ISBN se indexa normalizado (sin guiones) y en sus
+dos formas, ISBN-10 e ISBN-13: el código de barras de un libro es el
+EAN-13 (978...) aunque el catálogo tenga el ISBN-10. Se mantiene al día con
+el mismo registro de cambios de las facetas (``facetas.cambios_desde``), que
+ya anotan las señales de ``Libro`` y ``ventas.notificar_cambio_stock``.
+
+Precio y stock del índice sólo sirven para mostrar la línea al escanear; al
+registrar la venta ``validar_lineas`` los vuelve a leer en una consulta
+(``WHERE libroid IN (...)``) y el ``UPDATE`` condicional del motor de ventas
+tiene la última palabra.
+"""
+import re
+import threading
+from dataclasses import dataclass
+from decimal import Decimal
+
+from . import facetas
+from .models import Libro
+from .ventas import Faltante, LineaVenta, StockInsuficiente
+
+_NO_ISBN = re.compile(r'[^0-9X]')
+
+
+@dataclass(frozen=True)
+class EntradaIsbn:
+    libroid: int
+    titulo: str
+    precio: Decimal
+    stock: int
+
+
+def normalizar_isbn(codigo):
+    return _NO_ISBN.sub('', str(codigo).upper())
+
+
+def _isbn13(isbn10):
+    cuerpo = '978' + isbn10[:9]
+    suma = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(cuerpo))
+    return cuerpo + str((10 - suma % 10) % 10)
+
+
+def _isbn10(isbn13):
+    cuerpo = isbn13[3:12]
+    suma = sum(int(d) * (10 - i) for i, d in enumerate(cuerpo))
+    control = (11 - suma % 11) % 11
+    return cuerpo + ('X' if control == 10 else str(control))
+
+
+def isbn_valido(isbn):
+    """ISBN-10 o ISBN-13 con dígito de control correcto (con o sin guiones)"""
+    isbn = normalizar_isbn(isbn)
+    if len(isbn) == 10 and isbn[:9].isdigit() and (isbn[9].isdigit() or isbn[9] == 'X'):
+        return sum((10 - i) * (10 if d == 'X' else int(d)) for i, d in enumerate(isbn)) % 11 == 0
+    if len(isbn) == 13 and isbn.isdigit():
+        return sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(isbn)) % 10 == 0
+    return False
+
+
+def isbn13_de(isbn):
+    """Forma ISBN-13 normalizada; un ISBN-10 se convierte, lo demás queda igual"""
+    isbn = normalizar_isbn(isbn)
+    return _isbn13(isbn) if len(isbn) == 10 and isbn[:9].isdigit() else isbn
+
+
+def codigos_de(isbn):
+    """Formas con las que se puede escanear un ISBN"""
+    isbn = normalizar_isbn(isbn)
+    codigos = {isbn} if isbn else set()
+    if len(isbn) == 10 and isbn[:9].isdigit():
+        codigos.add(_isbn13(isbn))
+    elif len(isbn) == 13 and isbn.isdigit() and isbn.startswith('978'):
+        codigos.add(_isbn10(isbn))
+    return codigos
+
+
+class IndiceIsbn:
+    """``codigo -> EntradaIsbn`` en memoria del proceso"""
+
+    def __init__(self):
+        self._candado = threading.RLock()
+        self._por_codigo = {}
+        self._codigos_de = {}
+        self.version = None
+
+    def _poner(self, libroid, isbn, titulo, precio, stock):
+        codigos = codigos_de(isbn)
+        entrada = EntradaIsbn(libroid, titulo, precio, stock)
+        for codigo in codigos:
+            self._por_codigo[codigo] = entrada
+        self._codigos_de[libroid] = codigos
+
+    def _quitar(self, libroid):
+        for codigo in self._codigos_de.pop(libroid, ()):
+            entrada = self._por_codigo.get(codigo)
+            if entrada is not None and entrada.libroid == libroid:
+                del self._por_codigo[codigo]
+
+    def construir(self, version):
+        with self._candado:
+            self._por_codigo, self._codigos_de = {}, {}
+            filas = Libro.objects.values_list('libroid', 'isbn', 'titulo', 'precioventa', 'stock').order_by()
+            for fila in filas.iterator(chunk_size=5000):
+                self._poner(*fila)
+            self.version = version
+
+    def aplicar(self, libroids):
+        filas = Libro.objects.filter(libroid__in=libroids) \
+            .values_list('libroid', 'isbn', 'titulo', 'precioventa', 'stock')
+        with self._candado:
+            for libroid in libroids:
+                self._quitar(libroid)
+            for fila in filas:
+                self._poner(*fila)
+
+    def sincronizar(self):
+        version, cambios = facetas.cambios_desde(self.version)
+        if version == self.version:
+            return
+        with self._candado:
+            if cambios is None:
+                self.construir(version)
+            else:
+                self.aplicar(cambios)
+                self.version = version
+
+    def buscar(self, codigo, sincronizar=True):
+        if sincronizar:
+            self.sincronizar()
+        return self._por_codigo.get(normalizar_isbn(codigo))
+
+
+indice = IndiceIsbn()
+
+
+def buscar_isbn(codigo):
+    """``EntradaIsbn`` del libro con ese ISBN o código de barras, o ``None``"""
+    return indice.buscar(codigo)
+
+
+def cantidades_por_codigo(codigos):
+    """
+    ``({libroid: cantidad}, [códigos desconocidos])`` de una lista de códigos
+    escaneados; escanear el mismo libro dos veces suma dos unidades.
+    """
+    indice.sincronizar()
+    cantidades = {}
+    desconocidos = []
+    for codigo in codigos:
+        if not codigo.strip():
+            continue
+        entrada = indice.buscar(codigo, sincronizar=False)
+        if entrada is None:
+            desconocidos.append(codigo)
+        else:
+            cantidades[entrada.libroid] = cantidades.get(entrada.libroid, 0) + 1
+    return cantidades, desconocidos
+
+
+def validar_lineas(cantidades):
+    """
+    ``LineaVenta`` con el precio vigente de ``{libroid: cantidad}``, leídas en
+    una consulta. Lanza ``StockInsuficiente`` si algún libro no existe o no
+    alcanza.
+    """
+    libros = Libro.objects.filter(libroid__in=cantidades).values_list('libroid', 'titulo', 'precioventa', 'stock')
+    lineas = []
+    faltantes = []
+    for libroid, titulo, precio, stock in libros:
+        if stock < cantidades[libroid]:
+            faltantes.append(Faltante(libroid, titulo, stock, cantidades[libroid]))
+        lineas.append(LineaVenta(libroid, cantidades[libroid], precio))
+    for libroid in cantidades.keys() - {linea.libroid for linea in lineas}:
+        faltantes.append(Faltante(libroid, f'#{libroid}', 0, cantidades[libroid]))
+    if faltantes:
+        raise StockInsuficiente(faltantes)
+    return lineas
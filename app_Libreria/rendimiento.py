@@ -0,0 +1,459 @@
+# app_Libreria/rendimiento.py
+"""
+Mediciones de rendimiento de las vistas (``manage.py medir_rendimiento``).
+
+Recorre las rutas con nombre de ``app_Libreria/urls.py`` con el cliente de
+pruebas de Django, dentro del proceso y sin red, sobre la base de datos
+configurada (normalmente la sembrada con ``generar_datos``). Cada ruta tiene
+un ``Escenario``: con qué rol se pide (anónimo, cliente o administrador),
+con qué método, argumentos y datos, y qué preparar antes de cada petición
+(p. ej. meter un libro al carrito antes de pagar). Por ruta se anotan:
+
+* latencia p50/p95/p99 en milisegundos tras unas peticiones de calentamiento,
+* consultas SQL de la petición (con ``RegistroConsultas`` del middleware),
+* bytes de la respuesta (consumiendo también las respuestas en streaming),
+* pico de memoria de Python, medido aparte con ``tracemalloc`` para no
+  inflar las latencias.
+
+El modo concurrente lanza hilos, cada uno con su cliente, que compran los
+mismos pocos libros a la vez (agregar al carrito + ``procesar_compra``) para
+medir la contención del checkout: compras por segundo, latencias y cuántas
+terminaron bien, sin stock o con error (p. ej. ``database is locked``).
+
+Los escenarios que escriben (carrito, checkout) crean ventas reales a
+nombre de los usuarios ``medicion_*``; ``solo_lectura`` los salta. Los
+resultados son un diccionario serializable a JSON y ``comparar`` marca las
+rutas que empeoraron respecto a una corrida anterior.
+"""
+import subprocess
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from .middleware import RegistroConsultas
+from .models import Autor, Blog, Carrito, DetalleVenta, Editorial, Evento, Libro, Venta
+
+REPETICIONES = 20
+CALENTAMIENTO = 2
+UMBRAL = 0.25
+# Diferencias de latencia menores a esto son ruido aunque superen el umbral
+UMBRAL_MS_MINIMO = 2.0
+PERCENTILES = (50, 95, 99)
+
+USUARIO_ADMIN = 'medicion_admin'
+USUARIO_CLIENTE = 'medicion_cliente'
+
+
+class SinDatos(Exception):
+    """La base no tiene el objeto que necesita un escenario"""
+
+
+def percentil(valores, p):
+    """Percentil ``p`` (0-100) con interpolación lineal entre los dos vecinos"""
+    if not valores:
+        return None
+    ordenados = sorted(valores)
+    posicion = (len(ordenados) - 1) * p / 100
+    abajo = int(posicion)
+    arriba = min(abajo + 1, len(ordenados) - 1)
+    return ordenados[abajo] + (ordenados[arriba] - ordenados[abajo]) * (posicion - abajo)
+
+
+# =============================================
+# ESCENARIOS
+# =============================================
+
+@dataclass(frozen=True)
+class Escenario:
+    nombre: str
+    rol: str = 'anonimo'
+    metodo: str = 'GET'
+    # ctx -> kwargs de reverse(), parámetros GET y datos POST
+    argumentos: object = None
+    consulta: object = None
+    datos: object = None
+    # (cliente_http, ctx) -> None, antes de cada petición y fuera de la medición
+    preparar: object = None
+    escribe: bool = False
+    variante: str = ''
+
+    @property
+    def clave(self):
+        return f'{self.nombre}:{self.variante}' if self.variante else self.nombre
+
+
+def _dato(ctx, clave):
+    if ctx.get(clave) is None:
+        raise SinDatos(clave)
+    return ctx[clave]
+
+
+def _rango_reciente(dias):
+    def consulta(ctx):
+        hasta = timezone.localdate()
+        return {'desde': (hasta - timedelta(days=dias - 1)).isoformat(), 'hasta': hasta.isoformat()}
+    return consulta
+
+
+def _siguiente_libro(ctx):
+    """Va rotando entre los libros con más stock para no agotar ninguno"""
+    libros = _dato(ctx, 'libros_con_stock')
+    ctx['turno'] = ctx.get('turno', -1) + 1
+    return libros[ctx['turno'] % len(libros)]
+
+
+def _meter_al_carrito(cliente_http, ctx):
+    libroid = _siguiente_libro(ctx)
+    cliente_http.post(reverse('agregar_al_carrito', kwargs={'libro_id': libroid}))
+    ctx['carrito'] = (Carrito.objects.filter(usuario=ctx['cliente'], libro_id=libroid)
+                      .values_list('carritoid', flat=True).first())
+
+
+def _carrito(ctx):
+    return {'carrito_id': _dato(ctx, 'carrito')}
+
+
+ESCENARIOS = [
+    # Páginas públicas
+    Escenario('inicio'),
+    Escenario('libros'),
+    Escenario('libros', consulta={'q': 'sombra'}, variante='busqueda'),
+    Escenario('libros', consulta=lambda ctx: {'genero': 'FIC', 'editorial': _dato(ctx, 'editorial')},
+              variante='facetas'),
+    Escenario('eventos'),
+    Escenario('blog'),
+    Escenario('detalle_blog', argumentos=lambda ctx: {'blog_id': _dato(ctx, 'blog')}),
+    Escenario('contacto'),
+    Escenario('login_selector'),
+    Escenario('login_cliente'),
+    Escenario('login_admin'),
+
+    # Panel administrador
+    Escenario('panel_admin', 'admin'),
+    Escenario('admin_autores', 'admin'),
+    Escenario('agregar_autor', 'admin'),
+    Escenario('editar_autor', 'admin', argumentos=lambda ctx: {'id': _dato(ctx, 'autor')}),
+    Escenario('eliminar_autor', 'admin', argumentos=lambda ctx: {'id': _dato(ctx, 'autor')}),
+    Escenario('admin_editoriales', 'admin'),
+    Escenario('agregar_editorial', 'admin'),
+    Escenario('editar_editorial', 'admin', argumentos=lambda ctx: {'id': _dato(ctx, 'editorial')}),
+    Escenario('eliminar_editorial', 'admin', argumentos=lambda ctx: {'id': _dato(ctx, 'editorial')}),
+    Escenario('admin_libros', 'admin'),
+    Escenario('agregar_libro', 'admin'),
+    Escenario('editar_libro', 'admin', argumentos=lambda ctx: {'id': _dato(ctx, 'libro')}),
+    Escenario('eliminar_libro', 'admin', argumentos=lambda ctx: {'id': _dato(ctx, 'libro')}),
+    Escenario('admin_ventas', 'admin'),
+    Escenario('agregar_venta', 'admin'),
+    Escenario('agregar_venta', 'admin', consulta={'modo': 'pos'}, variante='pos'),
+    Escenario('buscar_isbn_venta', 'admin', argumentos=lambda ctx: {'codigo': _dato(ctx, 'isbn')}),
+    Escenario('analitica_ventas', 'admin', consulta=lambda ctx: {**_rango_reciente(90)(ctx), 'por': 'genero'}),
+    Escenario('exportar_ventas', 'admin', consulta=_rango_reciente(7)),
+    Escenario('editar_venta', 'admin', argumentos=lambda ctx: {'id': _dato(ctx, 'venta')}),
+    Escenario('eliminar_venta', 'admin', argumentos=lambda ctx: {'id': _dato(ctx, 'venta')}),
+    Escenario('detalle_venta_admin', 'admin', argumentos=lambda ctx: {'venta_id': _dato(ctx, 'venta')}),
+    # Por GET sólo redirigen al listado o al detalle
+    Escenario('cancelar_venta', 'admin', argumentos=lambda ctx: {'venta_id': _dato(ctx, 'venta')}),
+    Escenario('devolver_venta', 'admin', argumentos=lambda ctx: {'venta_id': _dato(ctx, 'venta')}),
+    Escenario('admin_detalles_venta', 'admin'),
+    Escenario('agregar_detalle_venta', 'admin'),
+    Escenario('editar_detalle_venta', 'admin', argumentos=lambda ctx: {'id': _dato(ctx, 'detalle')}),
+    Escenario('eliminar_detalle_venta', 'admin', argumentos=lambda ctx: {'id': _dato(ctx, 'detalle')}),
+    Escenario('admin_eventos', 'admin'),
+    Escenario('agregar_evento', 'admin'),
+    Escenario('editar_evento', 'admin', argumentos=lambda ctx: {'id': _dato(ctx, 'evento')}),
+    Escenario('eliminar_evento', 'admin', argumentos=lambda ctx: {'id': _dato(ctx, 'evento')}),
+    Escenario('admin_blog', 'admin'),
+    Escenario('agregar_entrada_blog', 'admin'),
+    Escenario('editar_entrada_blog', 'admin', argumentos=lambda ctx: {'id': _dato(ctx, 'blog')}),
+    Escenario('eliminar_entrada_blog', 'admin', argumentos=lambda ctx: {'id': _dato(ctx, 'blog')}),
+
+    # Carrito y compras; procesar_compra va antes de detalle_venta para que exista una venta propia
+    Escenario('ver_carrito', 'cliente'),
+    Escenario('agregar_al_carrito', 'cliente', 'POST', escribe=True,
+              argumentos=lambda ctx: {'libro_id': _siguiente_libro(ctx)}),
+    Escenario('actualizar_carrito', 'cliente', 'POST', escribe=True, argumentos=_carrito,
+              datos={'cantidad': 1}, preparar=_meter_al_carrito),
+    Escenario('eliminar_del_carrito', 'cliente', 'POST', escribe=True, argumentos=_carrito,
+              preparar=_meter_al_carrito),
+    Escenario('procesar_compra', 'cliente', 'POST', escribe=True, datos={'metodo_pago': 'TARJETA'},
+              preparar=_meter_al_carrito),
+    Escenario('detalle_venta', 'cliente',
+              argumentos=lambda ctx: {'venta_id': _dato(ctx, 'venta_cliente')}),
+    Escenario('mis_compras', 'cliente'),
+]
+
+# Rutas con nombre que no se miden, con el motivo
+OMITIDAS = {
+    'logout': 'cierra la sesión del cliente de medición',
+}
+
+
+def rutas_sin_escenario():
+    """Nombres de ``app_Libreria.urls`` que no tienen escenario ni están en ``OMITIDAS``"""
+    from . import urls
+    cubiertas = {escenario.nombre for escenario in ESCENARIOS} | set(OMITIDAS)
+    return sorted(patron.name for patron in urls.urlpatterns if patron.name and patron.name not in cubiertas)
+
+
+def _usuario(username, staff):
+    usuario, creado = User.objects.get_or_create(username=username, defaults={'is_staff': staff})
+    if creado:
+        usuario.set_unusable_password()
+        usuario.save(update_fields=['password'])
+    return usuario
+
+
+def _primero(modelo, **filtro):
+    return modelo.objects.filter(**filtro).order_by('pk').values_list('pk', flat=True).first()
+
+
+def preparar_contexto(cantidad_libros=50):
+    """Usuarios de medición y los ids de muestra que usan los escenarios"""
+    return {
+        'admin': _usuario(USUARIO_ADMIN, True),
+        'cliente': _usuario(USUARIO_CLIENTE, False),
+        'autor': _primero(Autor),
+        'editorial': _primero(Editorial),
+        'libro': _primero(Libro),
+        'isbn': Libro.objects.order_by('pk').values_list('isbn', flat=True).first(),
+        'libros_con_stock': list(Libro.objects.filter(stock__gt=0).order_by('-stock', 'pk')
+                                 .values_list('pk', flat=True)[:cantidad_libros]) or None,
+        'venta': Venta.objects.order_by('-pk').values_list('pk', flat=True).first(),
+        'detalle': DetalleVenta.objects.order_by('-pk').values_list('pk', flat=True).first(),
+        'evento': _primero(Evento),
+        'blog': _primero(Blog, activo=True),
+        'venta_cliente': None,
+    }
+
+
+# =============================================
+# MEDICIÓN POR RUTA
+# =============================================
+
+def _host():
+    """Un host aceptado por ``ALLOWED_HOSTS`` (con DEBUG y la lista vacía vale localhost)"""
+    for host in settings.ALLOWED_HOSTS:
+        if host != '*' and not host.startswith('.'):
+            return host
+    return 'localhost'
+
+
+def _cliente_http(usuario=None):
+    # Una vista que falla se anota con su 500 en lugar de cortar la medición
+    cliente_http = Client(raise_request_exception=False, HTTP_HOST=_host())
+    if usuario is not None:
+        cliente_http.force_login(usuario)
+    return cliente_http
+
+
+def clientes_http(ctx):
+    """Un ``Client`` con sesión por rol"""
+    return {'anonimo': _cliente_http(), 'cliente': _cliente_http(ctx['cliente']), 'admin': _cliente_http(ctx['admin'])}
+
+
+def _pedir(cliente_http, escenario, ctx):
+    """Hace la petición y la consume completa. Devuelve ``(respuesta, bytes)``"""
+    valor = lambda x: x(ctx) if callable(x) else (x or {})
+    url = reverse(escenario.nombre, kwargs=valor(escenario.argumentos) or None)
+    if escenario.metodo == 'POST':
+        respuesta = cliente_http.post(url, valor(escenario.datos))
+    else:
+        respuesta = cliente_http.get(url, valor(escenario.consulta))
+    if respuesta.streaming:
+        enviados = sum(len(trozo) for trozo in respuesta.streaming_content)
+    else:
+        enviados = len(respuesta.content)
+    return respuesta, enviados
+
+
+def medir_escenario(escenario, cliente_http, ctx, repeticiones=REPETICIONES, calentamiento=CALENTAMIENTO):
+    latencias = []
+    consultas = []
+    for i in range(calentamiento + repeticiones):
+        if escenario.preparar:
+            escenario.preparar(cliente_http, ctx)
+        registro = RegistroConsultas()
+        with connection.execute_wrapper(registro):
+            inicio = time.perf_counter()
+            respuesta, enviados = _pedir(cliente_http, escenario, ctx)
+            transcurrido = (time.perf_counter() - inicio) * 1000
+        if i >= calentamiento:
+            latencias.append(transcurrido)
+            consultas.append(registro.total)
+        if escenario.nombre == 'procesar_compra' and respuesta.status_code == 302 \
+                and '/carrito/detalle/' in respuesta.url:
+            ctx['venta_cliente'] = int(respuesta.url.rstrip('/').rsplit('/', 1)[1])
+
+    # Memoria en una pasada aparte: tracemalloc hace lentas todas las asignaciones
+    if escenario.preparar:
+        escenario.preparar(cliente_http, ctx)
+    tracemalloc.start()
+    try:
+        _pedir(cliente_http, escenario, ctx)
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'ruta': escenario.nombre,
+        'metodo': escenario.metodo,
+        'estado': respuesta.status_code,
+        **{f'p{p}_ms': round(percentil(latencias, p), 3) for p in PERCENTILES},
+        'media_ms': round(sum(latencias) / len(latencias), 3),
+        'consultas': max(consultas),
+        'bytes': enviados,
+        'memoria_pico_kib': round(pico / 1024, 1),
+        'repeticiones': repeticiones,
+    }
+
+
+def medir_rutas(repeticiones=REPETICIONES, calentamiento=CALENTAMIENTO, rutas=None, solo_lectura=False,
+                ctx=None, al_medir=None):
+    """
+    Mide los escenarios (todos, o los de ``rutas`` por nombre o clave).
+    Devuelve ``(resultados, omitidas)``: ``{clave: métricas}`` y ``{clave: motivo}``.
+    """
+    ctx = ctx or preparar_contexto()
+    clientes = clientes_http(ctx)
+    resultados, omitidas = {}, {}
+    for escenario in ESCENARIOS:
+        if rutas and escenario.nombre not in rutas and escenario.clave not in rutas:
+            continue
+        if solo_lectura and escenario.escribe:
+            omitidas[escenario.clave] = 'escribe en la base de datos'
+            continue
+        try:
+            resultados[escenario.clave] = medir_escenario(escenario, clientes[escenario.rol], ctx,
+                                                          repeticiones, calentamiento)
+        except SinDatos as e:
+            omitidas[escenario.clave] = f'sin datos: {e}'
+            continue
+        if al_medir:
+            al_medir(escenario.clave, resultados[escenario.clave])
+    Carrito.objects.filter(usuario=ctx['cliente']).delete()
+    return resultados, omitidas
+
+
+# =============================================
+# MODO CONCURRENTE
+# =============================================
+
+def medir_concurrencia(hilos=8, compras=10, libros_calientes=3, ctx=None):
+    """
+    ``hilos`` clientes compran ``compras`` veces cada uno, a la vez, entre los
+    ``libros_calientes`` libros con más stock. Cada compra es agregar al
+    carrito y ``procesar_compra``; se mide la compra completa.
+    """
+    ctx = ctx or preparar_contexto(libros_calientes)
+    libros = _dato(ctx, 'libros_con_stock')[:libros_calientes]
+    usuarios = [_usuario(f'{USUARIO_CLIENTE}_{i}', False) for i in range(hilos)]
+    Carrito.objects.filter(usuario__in=usuarios).delete()
+    latencias, resultados = [], {'completadas': 0, 'rechazadas': 0, 'errores': 0}
+    errores = []
+    candado = threading.Lock()
+    salida = threading.Barrier(hilos)
+
+    def comprar(i):
+        try:
+            cliente_http = _cliente_http(usuarios[i])
+            salida.wait()
+            for n in range(compras):
+                libroid = libros[(i + n) % len(libros)]
+                inicio = time.perf_counter()
+                try:
+                    agregar = cliente_http.post(reverse('agregar_al_carrito', kwargs={'libro_id': libroid}))
+                    respuesta = cliente_http.post(reverse('procesar_compra'), {'metodo_pago': 'TARJETA'})
+                    if max(agregar.status_code, respuesta.status_code) >= 500:
+                        resultado = 'errores'
+                        with candado:
+                            errores.append(f'HTTP {max(agregar.status_code, respuesta.status_code)}')
+                    elif '/carrito/detalle/' in respuesta.get('Location', ''):
+                        resultado = 'completadas'
+                    else:
+                        resultado = 'rechazadas'
+                except Exception as e:
+                    resultado = 'errores'
+                    with candado:
+                        errores.append(f'{type(e).__name__}: {e}')
+                transcurrido = (time.perf_counter() - inicio) * 1000
+                with candado:
+                    latencias.append(transcurrido)
+                    resultados[resultado] += 1
+        finally:
+            connections.close_all()
+
+    inicio = time.perf_counter()
+    trabajadores = [threading.Thread(target=comprar, args=(i,)) for i in range(hilos)]
+    for trabajador in trabajadores:
+        trabajador.start()
+    for trabajador in trabajadores:
+        trabajador.join()
+    duracion = time.perf_counter() - inicio
+    Carrito.objects.filter(usuario__in=usuarios).delete()
+
+    return {
+        'hilos': hilos,
+        'compras_por_hilo': compras,
+        'libros': libros,
+        **resultados,
+        'compras_por_segundo': round(resultados['completadas'] / duracion, 2) if duracion else None,
+        **{f'p{p}_ms': round(percentil(latencias, p), 3) if latencias else None for p in PERCENTILES},
+        'duracion_s': round(duracion, 3),
+        'errores_muestra': sorted(set(errores))[:5],
+    }
+
+
+# =============================================
+# RESULTADOS
+# =============================================
+
+def _commit():
+    try:
+        salida = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                                capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return salida.stdout.strip() or None
+
+
+def encabezado():
+    """Datos de la corrida para saber qué se compara con qué"""
+    return {
+        'fecha': timezone.now().isoformat(timespec='seconds'),
+        'commit': _commit(),
+        'motor': connection.vendor,
+        'debug': settings.DEBUG,
+        'filas': {
+            'libros': Libro.objects.count(),
+            'ventas': Venta.objects.count(),
+            'detalles': DetalleVenta.objects.count(),
+        },
+    }
+
+
+def comparar(actual, base, umbral=UMBRAL, minimo_ms=UMBRAL_MS_MINIMO):
+    """
+    Rutas de ``actual`` que empeoraron respecto a ``base`` (dos resultados de
+    ``medir_rutas``): p95 más de ``umbral`` (fracción) y de ``minimo_ms`` por
+    encima, o más consultas. Devuelve una lista de mensajes.
+    """
+    regresiones = []
+    for clave, metricas in actual.items():
+        anterior = base.get(clave)
+        if not anterior:
+            continue
+        antes, ahora = anterior['p95_ms'], metricas['p95_ms']
+        if ahora > antes * (1 + umbral) and ahora - antes > minimo_ms:
+            regresiones.append(f'{clave}: p95 {antes:.1f} → {ahora:.1f} ms (+{(ahora / antes - 1) * 100:.0f}%)')
+        if metricas['consultas'] > anterior['consultas']:
+            regresiones.append(f'{clave}: consultas {anterior["consultas"]} → {metricas["consultas"]}')
+    return regresiones
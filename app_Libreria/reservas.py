@@ -0,0 +1,136 @@
+# app_Libreria/reservas.py
+"""
+Reservas de stock con vencimiento.
+
+Al agregar un libro al carrito (o cambiar su cantidad) se aparta esa
+cantidad durante ``RESERVA_MINUTOS``. Lo disponible para vender es::
+
+    stock - unidades apartadas por reservas vigentes
+
+Las reservas son orientativas: evitan que muchos compradores lleguen al
+pago por las mismas últimas unidades, pero la garantía final sigue siendo
+el ``UPDATE`` condicional de ``ventas.descontar_stock``, que ahora también
+descuenta lo apartado por otros usuarios.
+
+Las reservas vencidas ya no cuentan; ``liberar_vencidas`` (comando
+``liberar_reservas``) sólo las borra por lotes para que la tabla no crezca.
+
+Las tarjetas del catálogo leen lo disponible de la caché ``default``
+(``disponibilidad``) con una vigencia corta, porque una reserva vence sin
+que ningún evento lo avise.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Carrito, Libro, Reserva
+
+ALIAS_CACHE = 'default'
+MINUTOS_DEFAULT = 15
+TTL_DISPONIBLE_DEFAULT = 30
+
+
+class SinDisponibilidad(Exception):
+    """No quedan suficientes unidades libres de reservas"""
+
+    def __init__(self, libro, disponible):
+        self.libro = libro
+        self.disponible = max(disponible, 0)
+        super().__init__(f'"{libro.titulo}": disponible {self.disponible}')
+
+
+def _clave_disponible(libroid):
+    return f'disponible:{libroid}'
+
+
+def apartado(excluir_usuario=None, libro=OuterRef('libroid')):
+    """
+    Expresión con las unidades apartadas por reservas vigentes de un libro
+    (por defecto, el de la fila externa), sin contar las de ``excluir_usuario``.
+    """
+    reservas = Reserva.objects.filter(libro=libro, expira__gt=timezone.now())
+    if excluir_usuario is not None:
+        reservas = reservas.exclude(usuario=excluir_usuario)
+    total = reservas.order_by().values('libro').annotate(total=Sum('cantidad')).values('total')
+    return Coalesce(Subquery(total), Value(0))
+
+
+def disponibles(libroids):
+    """``{libroid: disponible}`` con caché corta; los faltantes en una consulta"""
+    libroids = list(libroids)
+    if not libroids:
+        return {}
+    cache = caches[ALIAS_CACHE]
+    en_cache = cache.get_many([_clave_disponible(libroid) for libroid in libroids])
+    resultado = {}
+    faltantes = []
+    for libroid in libroids:
+        valor = en_cache.get(_clave_disponible(libroid))
+        if valor is None:
+            faltantes.append(libroid)
+        else:
+            resultado[libroid] = valor
+
+    if faltantes:
+        leidos = dict(
+            Libro.objects.filter(libroid__in=faltantes)
+            .annotate(disponible=F('stock') - apartado())
+            .values_list('libroid', 'disponible')
+        )
+        leidos = {libroid: max(disponible, 0) for libroid, disponible in leidos.items()}
+        cache.set_many({_clave_disponible(libroid): valor for libroid, valor in leidos.items()},
+                       getattr(settings, 'DISPONIBILIDAD_TTL', TTL_DISPONIBLE_DEFAULT))
+        resultado.update(leidos)
+    return resultado
+
+
+def invalidar_disponibles(*libroids):
+    caches[ALIAS_CACHE].delete_many([_clave_disponible(libroid) for libroid in libroids])
+
+
+def reservar(usuario, libro, cantidad):
+    """
+    Deja ``cantidad`` unidades de ``libro`` en el carrito de ``usuario`` y las
+    aparta por ``RESERVA_MINUTOS`` (renovando la reserva si ya existía).
+    Lanza ``SinDisponibilidad`` si otros usuarios ya apartaron lo que queda.
+    """
+    minutos = getattr(settings, 'RESERVA_MINUTOS', MINUTOS_DEFAULT)
+    with transaction.atomic():
+        # Un UPDATE sin cambios bloquea la fila del libro (en SQLite, la escritura de
+        # la base) hasta el commit: dos carritos no pueden leer lo mismo disponible
+        # y apartar ambos la última unidad
+        Libro.objects.filter(libroid=libro.libroid).update(stock=F('stock'))
+        disponible = (Libro.objects.filter(libroid=libro.libroid)
+                      .annotate(disponible=F('stock') - apartado(usuario))
+                      .values_list('disponible', flat=True).first())
+        if disponible is None or cantidad > disponible:
+            raise SinDisponibilidad(libro, disponible or 0)
+
+        item, _ = Carrito.objects.update_or_create(usuario=usuario, libro=libro, defaults={'cantidad': cantidad})
+        Reserva.objects.update_or_create(carrito=item, defaults={
+            'libro': libro,
+            'usuario': usuario,
+            'cantidad': cantidad,
+            'expira': timezone.now() + timedelta(minutes=minutos),
+        })
+        libroid = libro.libroid
+        transaction.on_commit(lambda: invalidar_disponibles(libroid))
+    return item
+
+
+def liberar_vencidas(tamano_lote=1000):
+    """Borra por lotes las reservas vencidas; devuelve cuántas borró"""
+    total = 0
+    while True:
+        ids = list(Reserva.objects.filter(expira__lte=timezone.now())
+                   .order_by('expira').values_list('reservaid', flat=True)[:tamano_lote])
+        if not ids:
+            return total
+        # Sin receptores de señales en Reserva, delete() es un solo DELETE por lote
+        borradas, _ = Reserva.objects.filter(reservaid__in=ids).delete()
+        total += borradas
@@ -0,0 +1,208 @@
+# app_Libreria/resumenes.py
+"""
+Resumen diario de ventas (``VentaResumenDiario``) y totales del panel.
+
+Cada venta aporta a una fila ``(día, metodopago, estadoventa)``: una venta,
+su ``montototal`` como bruto, el IVA incluido en él, sus unidades no
+devueltas y lo reembolsado. El panel lee las filas de hoy (a lo sumo una por
+método y estado) en lugar de recorrer las ventas.
+
+Mantenimiento incremental:
+
+* Una venta nueva (``ventas.registrar_venta``) suma su aporte a su fila con
+  un upsert (``... DO UPDATE SET ventas = ventas + 1, ...``) en la misma
+  transacción.
+* Editar, cancelar, devolver o borrar ventas o líneas marca el día afectado
+  (señales de ``Venta`` y ``DetalleVenta``, y ``ventas.cancelar_ventas``) y
+  al confirmar la transacción se recalculan sólo esos días desde las ventas,
+  con una consulta por día sobre el índice de ``fechaventa``.
+
+``manage.py resumir_ventas`` recalcula todo (o un rango de fechas).
+"""
+import datetime
+import threading
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import analitica
+from .carrito import TASA_IVA, redondear
+from .models import DetalleVenta, Evento, Libro, Venta, VentaResumenDiario
+
+CLAVE_HOY = 'panel:hoy:{}'
+CLAVE_TOTALES = 'panel:totales'
+TTL_HOY = 60 * 60
+TTL_TOTALES = 60
+CAMPOS = ('ventas', 'bruto', 'iva', 'unidades', 'devuelto')
+
+_pendientes = threading.local()
+
+
+def dia_de(fechaventa):
+    return timezone.localtime(fechaventa).date() if timezone.is_aware(fechaventa) else fechaventa.date()
+
+
+def limites_dia(dia):
+    inicio = timezone.make_aware(datetime.datetime.combine(dia, datetime.time.min))
+    return inicio, inicio + datetime.timedelta(days=1)
+
+
+def iva_incluido(monto):
+    """IVA contenido en un total que ya lo incluye"""
+    return redondear(monto * TASA_IVA / (1 + TASA_IVA))
+
+
+def aporte(montototal, unidades, montodevuelto=Decimal('0')):
+    return {
+        'ventas': 1,
+        'bruto': montototal,
+        'iva': iva_incluido(montototal),
+        'unidades': unidades,
+        'devuelto': montodevuelto,
+    }
+
+
+def _invalidar(*dias):
+    cache.delete_many([CLAVE_HOY.format(dia.isoformat()) for dia in dias])
+    analitica.invalidar_dias(*dias)
+
+
+# =============================================
+# VENTA NUEVA
+# =============================================
+
+def sumar_venta(venta, unidades):
+    """
+    Suma una venta recién creada a su fila; llamar dentro de su transacción.
+    Una sola consulta: ``INSERT ... ON CONFLICT DO UPDATE`` (SQLite 3.24+ y
+    PostgreSQL), así la primera venta del día no paga un UPDATE fallido más
+    un INSERT y dos ventas simultáneas no chocan por crear la misma fila.
+    """
+    dia = dia_de(venta.fechaventa)
+    valores = aporte(venta.montototal, unidades, venta.montodevuelto)
+    tabla = connection.ops.quote_name(VentaResumenDiario._meta.db_table)
+    columnas = ', '.join(CAMPOS)
+    sumas = ', '.join(f'{campo} = {tabla}.{campo} + excluded.{campo}' for campo in CAMPOS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {tabla} (fecha, metodopago, estadoventa, {columnas}) '
+            f'VALUES (%s, %s, %s, {", ".join(["%s"] * len(CAMPOS))}) '
+            f'ON CONFLICT (fecha, metodopago, estadoventa) DO UPDATE SET {sumas}',
+            [dia, venta.metodopago, venta.estadoventa, *(valores[campo] for campo in CAMPOS)],
+        )
+    transaction.on_commit(lambda: _invalidar(dia))
+
+
+# =============================================
+# RECÁLCULO POR DÍA
+# =============================================
+
+def _acumular(ventas):
+    """``{(dia, metodo, estado): totales}`` de un queryset de ventas"""
+    unidades = (DetalleVenta.objects.filter(ventaid=OuterRef('ventaid')).order_by()
+                .values('ventaid').annotate(total=Sum(F('cantidad') - F('cantidaddevuelta'))).values('total'))
+    filas = ventas.annotate(
+        unidades=Coalesce(Subquery(unidades, output_field=IntegerField()), Value(0)),
+    ).values_list('fechaventa', 'metodopago', 'estadoventa', 'montototal', 'montodevuelto', 'unidades')
+
+    acumulado = {}
+    for fechaventa, metodopago, estadoventa, montototal, montodevuelto, unidades in filas.iterator(chunk_size=2000):
+        totales = acumulado.setdefault((dia_de(fechaventa), metodopago, estadoventa), dict.fromkeys(CAMPOS, 0))
+        for campo, valor in aporte(montototal, unidades, montodevuelto).items():
+            totales[campo] += valor
+    return acumulado
+
+
+def recalcular_dias(dias):
+    """Reemplaza las filas de ``dias`` por las calculadas desde las ventas"""
+    dias = sorted(set(dias))
+    with transaction.atomic():
+        for dia in dias:
+            # Bloquea las filas del día (donde se puede) para no pisar un sumar_venta simultáneo
+            list(VentaResumenDiario.objects.select_for_update().filter(fecha=dia).values_list('pk'))
+            inicio, fin = limites_dia(dia)
+            acumulado = _acumular(Venta.objects.filter(fechaventa__gte=inicio, fechaventa__lt=fin))
+            VentaResumenDiario.objects.filter(fecha=dia).delete()
+            VentaResumenDiario.objects.bulk_create([
+                VentaResumenDiario(fecha=fecha, metodopago=metodo, estadoventa=estado, **totales)
+                for (fecha, metodo, estado), totales in acumulado.items()
+            ])
+        transaction.on_commit(lambda: _invalidar(*dias))
+
+
+def recalcular_rango(desde=None, hasta=None):
+    """Recalcula todos los días con ventas entre ``desde`` y ``hasta`` (incluidos)"""
+    ventas = Venta.objects.all()
+    filas = VentaResumenDiario.objects.all()
+    if desde:
+        ventas = ventas.filter(fechaventa__gte=limites_dia(desde)[0])
+        filas = filas.filter(fecha__gte=desde)
+    if hasta:
+        ventas = ventas.filter(fechaventa__lt=limites_dia(hasta)[1])
+        filas = filas.filter(fecha__lte=hasta)
+    with transaction.atomic():
+        acumulado = _acumular(ventas.order_by('fechaventa'))
+        filas.delete()
+        VentaResumenDiario.objects.bulk_create([
+            VentaResumenDiario(fecha=fecha, metodopago=metodo, estadoventa=estado, **totales)
+            for (fecha, metodo, estado), totales in acumulado.items()
+        ], batch_size=1000)
+    cache.delete(CLAVE_TOTALES)
+    _invalidar(*{fecha for fecha, _, _ in acumulado}, timezone.localdate())
+    return len(acumulado)
+
+
+def _aplicar_pendientes():
+    dias, _pendientes.dias = getattr(_pendientes, 'dias', set()), set()
+    if dias:
+        recalcular_dias(dias)
+
+
+def marcar_dias(*dias):
+    """
+    Programa el recálculo de ``dias`` al confirmar la transacción actual. Un
+    solo recálculo por transacción aunque se marquen muchas veces.
+    """
+    if not hasattr(_pendientes, 'dias'):
+        _pendientes.dias = set()
+    _pendientes.dias.update(dia for dia in dias if dia is not None)
+    # Cada marcado registra su callback: el primero en correr se lleva todos los
+    # días y los demás no encuentran nada. Si la transacción se revierte, sus
+    # días esperan al siguiente commit; recalcularlos de más no cambia nada.
+    transaction.on_commit(_aplicar_pendientes)
+
+
+# =============================================
+# PANEL
+# =============================================
+
+def resumen_dia(dia=None):
+    """``{'ventas', 'bruto', 'iva', 'unidades', 'devuelto', 'ingresos'}`` de un día, en caché"""
+    dia = dia or timezone.localdate()
+    clave = CLAVE_HOY.format(dia.isoformat())
+    resumen = cache.get(clave)
+    if resumen is None:
+        sumas = VentaResumenDiario.objects.filter(fecha=dia).aggregate(**{campo: Sum(campo) for campo in CAMPOS})
+        resumen = {campo: valor or 0 for campo, valor in sumas.items()}
+        resumen['ingresos'] = resumen['bruto'] - resumen['devuelto']
+        cache.set(clave, resumen, TTL_HOY)
+    return resumen
+
+
+def totales_panel():
+    """Conteos generales del panel; se refrescan cada ``TTL_TOTALES`` segundos"""
+    totales = cache.get(CLAVE_TOTALES)
+    if totales is None:
+        totales = {
+            'total_libros': Libro.objects.count(),
+            'total_ventas': VentaResumenDiario.objects.aggregate(n=Coalesce(Sum('ventas'), Value(0)))['n'],
+            'total_usuarios': User.objects.count(),
+            'total_eventos': Evento.objects.count(),
+        }
+        cache.set(CLAVE_TOTALES, totales, TTL_TOTALES)
+    return totales
@@ -0,0 +1,254 @@
+# app_Libreria/signals.py
+"""
+Receptores de señales de la aplicación.
+
+Mantienen al día las estructuras derivadas de los modelos (como el índice de
+búsqueda) cada vez que se guarda o elimina un registro, sin que las vistas
+tengan que recordarlo.
+"""
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from . import almacenamiento, analitica, busqueda, carrito, facetas, imagenes, reservas, resumenes, tarjetas
+from .models import Libro, Autor, Editorial, Evento, Blog, Carrito, Venta, DetalleVenta
+
+
+# =============================================
+# ÍNDICE DE BÚSQUEDA
+# =============================================
+
+@receiver(post_save, sender=Libro)
+def indexar_libro_guardado(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    busqueda.indexar_libros([instance])
+
+
+@receiver(post_delete, sender=Libro)
+def desindexar_libro_eliminado(sender, instance, **kwargs):
+    busqueda.desindexar_libro(instance.libroid)
+
+
+@receiver(post_save, sender=Autor)
+def reindexar_libros_del_autor(sender, instance, created=False, raw=False, **kwargs):
+    if raw or created:
+        return
+    busqueda.reindexar_libros_de(autorid_id=instance.autorid)
+
+
+@receiver(post_save, sender=Editorial)
+def reindexar_libros_de_editorial(sender, instance, created=False, raw=False, **kwargs):
+    if raw or created:
+        return
+    busqueda.reindexar_libros_de(editorialid_id=instance.editorialid)
+
+
+# =============================================
+# FACETAS DEL CATÁLOGO
+# =============================================
+
+@receiver(post_save, sender=Libro)
+@receiver(post_delete, sender=Libro)
+def registrar_cambio_faceta(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    libroid = instance.libroid
+    transaction.on_commit(lambda: facetas.registrar_cambio(libroid))
+
+
+@receiver(post_save, sender=Editorial)
+def reconstruir_facetas_editorial(sender, instance, created=False, raw=False, **kwargs):
+    # Los nombres de las editoriales se guardan en el índice
+    if raw or created:
+        return
+    transaction.on_commit(facetas.registrar_cambio)
+
+
+# =============================================
+# CACHÉ DE TARJETAS DE LIBRO
+# =============================================
+
+@receiver(post_save, sender=Libro)
+@receiver(post_delete, sender=Libro)
+def invalidar_tarjeta_libro(sender, instance, **kwargs):
+    libroid = instance.libroid
+    transaction.on_commit(lambda: tarjetas.cambiar_sello('libro', libroid))
+
+
+@receiver(post_save, sender=Autor)
+@receiver(post_delete, sender=Autor)
+def invalidar_tarjetas_autor(sender, instance, **kwargs):
+    autorid = instance.autorid
+    transaction.on_commit(lambda: tarjetas.cambiar_sello('autor', autorid))
+
+
+@receiver(post_save, sender=Editorial)
+@receiver(post_delete, sender=Editorial)
+def invalidar_tarjetas_editorial(sender, instance, **kwargs):
+    editorialid = instance.editorialid
+    transaction.on_commit(lambda: tarjetas.cambiar_sello('editorial', editorialid))
+
+
+# =============================================
+# RESUMEN DEL CARRITO
+# =============================================
+
+@receiver(post_save, sender=Carrito)
+@receiver(post_delete, sender=Carrito)
+def invalidar_resumen_carrito(sender, instance, **kwargs):
+    usuario_id = instance.usuario_id
+    transaction.on_commit(lambda: carrito.invalidar_resumen(usuario_id))
+
+
+@receiver(post_init, sender=Libro)
+def recordar_precio(sender, instance, **kwargs):
+    instance._precio_original = instance.__dict__.get('precioventa')
+
+
+@receiver(post_save, sender=Libro)
+def invalidar_resumenes_por_precio(sender, instance, created=False, raw=False, **kwargs):
+    # Sólo un cambio de precio altera el subtotal de los carritos que tienen el libro
+    if raw or created or instance._precio_original == instance.precioventa:
+        return
+    instance._precio_original = instance.precioventa
+    usuarios = list(Carrito.objects.filter(libro=instance).values_list('usuario_id', flat=True))
+    if usuarios:
+        transaction.on_commit(lambda: carrito.invalidar_resumen(*usuarios))
+
+
+# =============================================
+# DISPONIBILIDAD (STOCK MENOS RESERVAS)
+# =============================================
+# Reserva no tiene receptores a propósito: así se borra por lotes sin leer
+# cada fila (ver reservas.liberar_vencidas). Sus cambios pasan por Carrito.
+
+@receiver(post_save, sender=Libro)
+@receiver(post_delete, sender=Libro)
+@receiver(post_delete, sender=Carrito)
+def invalidar_disponible(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    libroid = instance.libroid if sender is Libro else instance.libro_id
+    transaction.on_commit(lambda: reservas.invalidar_disponibles(libroid))
+
+
+# =============================================
+# RESUMEN DIARIO DE VENTAS
+# =============================================
+# Las ventas de registrar_venta ya suman su aporte (_sin_resumen); cualquier
+# otro cambio marca el día para recalcularlo al confirmar.
+
+@receiver(post_init, sender=Venta)
+def recordar_dia_venta(sender, instance, **kwargs):
+    fechaventa = instance.__dict__.get('fechaventa')
+    instance._dia_original = resumenes.dia_de(fechaventa) if fechaventa else None
+
+
+@receiver(post_save, sender=Venta)
+@receiver(post_delete, sender=Venta)
+def marcar_dia_venta(sender, instance, raw=False, **kwargs):
+    if raw or getattr(instance, '_sin_resumen', False):
+        return
+    resumenes.marcar_dias(instance._dia_original, resumenes.dia_de(instance.fechaventa))
+    instance._dia_original = resumenes.dia_de(instance.fechaventa)
+
+
+@receiver(post_save, sender=DetalleVenta)
+@receiver(post_delete, sender=DetalleVenta)
+def marcar_dia_detalle(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    venta = instance._state.fields_cache.get('ventaid')
+    if venta is not None:
+        fechaventa = venta.fechaventa
+    else:
+        fechaventa = Venta.objects.filter(pk=instance.ventaid_id).values_list('fechaventa', flat=True).first()
+    if fechaventa:
+        resumenes.marcar_dias(resumenes.dia_de(fechaventa))
+
+
+@receiver(post_save, sender=Libro)
+@receiver(post_delete, sender=Libro)
+def invalidar_analitica(sender, instance, created=False, raw=False, **kwargs):
+    # Un libro nuevo no tiene ventas; uno editado puede cambiar de género, autor o editorial
+    if raw or created:
+        return
+    transaction.on_commit(analitica.invalidar_todo)
+
+
+# =============================================
+# DERIVADOS DE IMÁGENES
+# =============================================
+
+def _encolar_derivados(campo, al_terminar=None):
+    nombre = campo.name
+    if nombre and imagenes.manifiesto_de(nombre) is None:
+        transaction.on_commit(lambda: imagenes.encolar(nombre, al_terminar))
+
+
+@receiver(post_save, sender=Libro)
+def generar_derivados_portada(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    libroid = instance.libroid
+    # Al terminar se invalida la tarjeta para que tome el srcset
+    _encolar_derivados(instance.portada, lambda: tarjetas.cambiar_sello('libro', libroid))
+
+
+@receiver(post_save, sender=Evento)
+def generar_derivados_evento(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _encolar_derivados(instance.imagen)
+
+
+@receiver(post_save, sender=Blog)
+def generar_derivados_blog(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _encolar_derivados(instance.imagen)
+
+
+# =============================================
+# REFERENCIAS DE ARCHIVOS POR CONTENIDO
+# =============================================
+
+CAMPOS_IMAGEN = {Libro: 'portada', Evento: 'imagen', Blog: 'imagen'}
+
+
+_DESCONOCIDO = object()
+
+
+def _nombre_archivo(instance, campo):
+    # Sin pasar por el descriptor: un campo diferido (``only()``) no se consulta
+    valor = instance.__dict__.get(campo, _DESCONOCIDO)
+    return getattr(valor, 'name', valor) or None
+
+
+def _recordar_archivo(sender, instance, **kwargs):
+    # El nombre con el que se cargó la instancia, para saber si cambió al guardar
+    instance._archivo_original = _nombre_archivo(instance, CAMPOS_IMAGEN[sender])
+
+
+def _contar_archivo_guardado(sender, instance, raw=False, **kwargs):
+    anterior = getattr(instance, '_archivo_original', _DESCONOCIDO)
+    actual = _nombre_archivo(instance, CAMPOS_IMAGEN[sender])
+    if raw or anterior is _DESCONOCIDO or actual is _DESCONOCIDO:
+        return
+    if actual != anterior:
+        almacenamiento.sumar_referencias(actual, 1)
+        almacenamiento.sumar_referencias(anterior, -1)
+    instance._archivo_original = actual
+
+
+def _descontar_archivo_eliminado(sender, instance, **kwargs):
+    anterior = getattr(instance, '_archivo_original', _DESCONOCIDO)
+    if anterior is not _DESCONOCIDO:
+        almacenamiento.sumar_referencias(anterior, -1)
+
+
+for _modelo in CAMPOS_IMAGEN:
+    post_init.connect(_recordar_archivo, sender=_modelo)
+    post_save.connect(_contar_archivo_guardado, sender=_modelo)
+    post_delete.connect(_descontar_archivo_eliminado, sender=_modelo)
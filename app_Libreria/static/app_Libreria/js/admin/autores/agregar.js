@@ -0,0 +1,213 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('autorForm');
+    const submitBtn = document.getElementById('submitBtn');
+    const fileInput = document.getElementById('foto');
+    const filePreview = document.getElementById('file-preview');
+    const fileName = document.getElementById('file-name');
+    const fileDetails = document.getElementById('file-details');
+    const fechaInput = document.getElementById('fechanacimiento');
+    const bioTextarea = document.getElementById('bibliografia');
+    const charCount = document.getElementById('char-count');
+
+    // Contador de caracteres
+    function updateCharCount() {
+        const count = bioTextarea.value.length;
+        charCount.textContent = `${count} caracteres`;
+
+        // Cambiar color según la cantidad
+        charCount.classList.remove('warning', 'error');
+        if (count > 1000) {
+            charCount.classList.add('error');
+        } else if (count > 500) {
+            charCount.classList.add('warning');
+        }
+    }
+
+    bioTextarea.addEventListener('input', updateCharCount);
+    updateCharCount();
+
+    // Fecha máxima (hoy)
+    const today = new Date().toISOString().split('T')[0];
+    fechaInput.max = today;
+    fechaInput.value = '1990-01-01'; // Valor por defecto
+
+    // Manejo de archivos
+    fileInput.addEventListener('change', function() {
+        if (this.files && this.files[0]) {
+            const file = this.files[0];
+            const fileSizeMB = (file.size / (1024 * 1024)).toFixed(2);
+
+            // Mostrar preview
+            filePreview.classList.add('show');
+            fileName.textContent = file.name;
+            fileDetails.textContent = `${file.type.split('/')[1].toUpperCase()} • ${fileSizeMB} MB`;
+
+            // Mostrar previsualización de imagen
+            if (file.type.startsWith('image/')) {
+                const reader = new FileReader();
+                reader.onload = function(e) {
+                    // Actualizar icono con mini preview
+                    const previewIcon = filePreview.querySelector('.preview-icon');
+                    previewIcon.innerHTML = `<img src="${e.target.result}" style="width: 40px; height: 40px; border-radius: 5px; object-fit: cover;">`;
+                };
+                reader.readAsDataURL(file);
+            }
+        } else {
+            filePreview.classList.remove('show');
+        }
+    });
+
+    // Efectos de enfoque en campos
+    const inputContainers = document.querySelectorAll('.input-container, .textarea-container');
+
+    inputContainers.forEach(container => {
+        const input = container.querySelector('.form-control');
+
+        input.addEventListener('focus', function() {
+            container.classList.add('focused');
+        });
+
+        input.addEventListener('blur', function() {
+            container.classList.remove('focused');
+
+            // Validación básica en blur
+            if (this.hasAttribute('required') && !this.value.trim()) {
+                container.classList.add('invalid');
+                container.classList.remove('valid');
+            } else if (this.value.trim()) {
+                container.classList.add('valid');
+                container.classList.remove('invalid');
+            }
+        });
+
+        // Efecto hover
+        container.addEventListener('mouseenter', function() {
+            if (!this.classList.contains('focused')) {
+                this.style.transform = 'translateY(-2px)';
+            }
+        });
+
+        container.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+        });
+    });
+
+    // Validación del formulario
+    form.addEventListener('submit', function(e) {
+        e.preventDefault();
+
+        let isValid = true;
+        const errors = [];
+
+        // Ocultar todos los errores primero
+        document.querySelectorAll('.error-message').forEach(el => {
+            el.style.display = 'none';
+        });
+
+        // Validar campos requeridos
+        const requiredFields = [
+            {id: 'nombre', name: 'Nombre', container: 'nombre-container'},
+            {id: 'apellido', name: 'Apellido', container: 'apellido-container'},
+            {id: 'nacionalidad', name: 'Nacionalidad', container: 'nacionalidad-container'},
+            {id: 'fechanacimiento', name: 'Fecha de Nacimiento', container: 'fecha-container'}
+        ];
+
+        requiredFields.forEach(field => {
+            const input = document.getElementById(field.id);
+            const container = document.getElementById(field.container);
+            const errorEl = document.getElementById(field.id + '-error');
+
+            if (!input.value.trim()) {
+                // Mostrar error
+                errorEl.style.display = 'flex';
+                container.classList.add('invalid');
+                container.classList.remove('valid');
+
+                // Efecto de atención
+                container.classList.add('required-empty');
+                setTimeout(() => {
+                    container.classList.remove('required-empty');
+                }, 2000);
+
+                isValid = false;
+                errors.push(field.name);
+            } else {
+                container.classList.add('valid');
+                container.classList.remove('invalid');
+            }
+        });
+
+        // Validar fecha
+        if (fechaInput.value) {
+            const selectedDate = new Date(fechaInput.value);
+            const today = new Date();
+
+            if (selectedDate > today) {
+                const errorEl = document.getElementById('fechanacimiento-error');
+                errorEl.textContent = '⚠️ La fecha no puede ser futura';
+                errorEl.style.display = 'flex';
+                document.getElementById('fecha-container').classList.add('invalid');
+                isValid = false;
+            }
+        }
+
+        // Validar URL si se proporciona
+        const urlInput = document.getElementById('paginaweb');
+        if (urlInput.value && !isValidURL(urlInput.value)) {
+            const errorEl = document.getElementById('paginaweb-error');
+            errorEl.textContent = '⚠️ Ingrese una URL válida (ej: https://ejemplo.com)';
+            errorEl.style.display = 'flex';
+            document.getElementById('url-container').classList.add('invalid');
+            isValid = false;
+        }
+
+        // Validar biografía (recomendación)
+        if (bioTextarea.value.length > 0 && bioTextarea.value.length < 100) {
+            alert('💡 Recomendación: La biografía es muy corta. Considere agregar más detalles.');
+        }
+
+        // Animación del botón
+        if (!isValid) {
+            submitBtn.style.animation = 'shake 0.5s ease';
+            setTimeout(() => {
+                submitBtn.style.animation = '';
+            }, 500);
+
+            // Scroll al primer error
+            const firstError = document.querySelector('.error-message[style*="flex"]');
+            if (firstError) {
+                firstError.scrollIntoView({ behavior: 'smooth', block: 'center' });
+            }
+
+            alert(`❌ Por favor, complete los siguientes campos:\n\n• ${errors.join('\n• ')}`);
+        } else {
+            // Efecto de éxito
+            submitBtn.innerHTML = '<span>✅</span> Guardando...';
+            submitBtn.style.background = 'linear-gradient(135deg, #43a047, #66bb6a)';
+
+            // Simular procesamiento
+            setTimeout(() => {
+                form.submit();
+            }, 1000);
+        }
+    });
+
+    // Función para validar URL
+    function isValidURL(string) {
+        try {
+            const url = new URL(string);
+            return url.protocol === 'http:' || url.protocol === 'https:';
+        } catch (_) {
+            return false;
+        }
+    }
+
+    // Efecto de entrada en campos
+    const inputs = document.querySelectorAll('.form-control');
+    inputs.forEach((input, index) => {
+        setTimeout(() => {
+            input.style.opacity = '1';
+            input.style.transform = 'translateY(0)';
+        }, index * 100);
+    });
+});
@@ -0,0 +1,227 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('autorForm');
+    const submitBtn = document.getElementById('submitBtn');
+    const fechaInput = document.getElementById('fechanacimiento');
+    const bioTextarea = document.getElementById('bibliografia');
+    const charCount = document.getElementById('char-count');
+
+    // Contador de caracteres
+    function updateCharCount() {
+        const count = bioTextarea.value.length;
+        charCount.textContent = `${count} caracteres`;
+
+        // Cambiar color según la cantidad
+        charCount.classList.remove('warning', 'error');
+        if (count > 1000) {
+            charCount.classList.add('error');
+        } else if (count > 500) {
+            charCount.classList.add('warning');
+        }
+    }
+
+    bioTextarea.addEventListener('input', updateCharCount);
+    updateCharCount(); // Inicializar con el valor actual
+
+    // Fecha máxima (hoy)
+    const today = new Date().toISOString().split('T')[0];
+    fechaInput.max = today;
+
+    // Efectos de enfoque en campos
+    const inputContainers = document.querySelectorAll('.input-container, .textarea-container');
+
+    inputContainers.forEach(container => {
+        const input = container.querySelector('.form-control');
+
+        input.addEventListener('focus', function() {
+            container.classList.add('focused');
+            this.style.background = 'var(--blanco)';
+        });
+
+        input.addEventListener('blur', function() {
+            container.classList.remove('focused');
+
+            // Validación básica en blur
+            if (this.hasAttribute('required') && !this.value.trim()) {
+                container.classList.add('invalid');
+                container.classList.remove('valid');
+            } else if (this.value.trim()) {
+                container.classList.add('valid');
+                container.classList.remove('invalid');
+            }
+        });
+
+        // Efecto hover
+        container.addEventListener('mouseenter', function() {
+            if (!this.classList.contains('focused')) {
+                this.style.transform = 'translateY(-2px)';
+            }
+        });
+
+        container.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+        });
+
+        // Inicializar estado basado en el valor
+        if (input.value.trim()) {
+            container.classList.add('valid');
+        }
+    });
+
+    // Validación del formulario
+    form.addEventListener('submit', function(e) {
+        e.preventDefault();
+
+        let isValid = true;
+        const errors = [];
+
+        // Ocultar todos los errores primero
+        document.querySelectorAll('.error-message').forEach(el => {
+            el.style.display = 'none';
+        });
+
+        // Validar campos requeridos
+        const requiredFields = [
+            {id: 'nombre', name: 'Nombre', container: 'nombre-container'},
+            {id: 'apellido', name: 'Apellido', container: 'apellido-container'},
+            {id: 'nacionalidad', name: 'Nacionalidad', container: 'nacionalidad-container'},
+            {id: 'fechanacimiento', name: 'Fecha de Nacimiento', container: 'fecha-container'}
+        ];
+
+        requiredFields.forEach(field => {
+            const input = document.getElementById(field.id);
+            const container = document.getElementById(field.container);
+            const errorEl = document.getElementById(field.id + '-error');
+
+            if (!input.value.trim()) {
+                // Mostrar error
+                errorEl.style.display = 'flex';
+                container.classList.add('invalid');
+                container.classList.remove('valid');
+
+                // Efecto de atención
+                container.classList.add('required-empty');
+                setTimeout(() => {
+                    container.classList.remove('required-empty');
+                }, 2000);
+
+                isValid = false;
+                errors.push(field.name);
+            } else {
+                container.classList.add('valid');
+                container.classList.remove('invalid');
+            }
+        });
+
+        // Validar fecha
+        if (fechaInput.value) {
+            const selectedDate = new Date(fechaInput.value);
+            const today = new Date();
+
+            if (selectedDate > today) {
+                const errorEl = document.getElementById('fechanacimiento-error');
+                errorEl.textContent = '⚠️ La fecha no puede ser futura';
+                errorEl.style.display = 'flex';
+                document.getElementById('fecha-container').classList.add('invalid');
+                isValid = false;
+                errors.push('Fecha de Nacimiento (fecha futura)');
+            }
+        }
+
+        // Validar URL si se proporciona
+        const urlInput = document.getElementById('paginaweb');
+        if (urlInput.value && !isValidURL(urlInput.value)) {
+            const errorEl = document.getElementById('paginaweb-error');
+            errorEl.textContent = '⚠️ Ingrese una URL válida (ej: https://ejemplo.com)';
+            errorEl.style.display = 'flex';
+            document.getElementById('url-container').classList.add('invalid');
+            isValid = false;
+            errors.push('Página Web (URL inválida)');
+        }
+
+        // Validar biografía (recomendación)
+        if (bioTextarea.value.length > 0 && bioTextarea.value.length < 50) {
+            if (!confirm('⚠️ La biografía es muy corta (menos de 50 caracteres). ¿Desea continuar de todos modos?')) {
+                isValid = false;
+                bioTextarea.focus();
+            }
+        }
+
+        // Animación del botón
+        if (!isValid) {
+            submitBtn.style.animation = 'shake 0.5s ease';
+            setTimeout(() => {
+                submitBtn.style.animation = '';
+            }, 500);
+
+            // Scroll al primer error
+            const firstError = document.querySelector('.error-message[style*="flex"]');
+            if (firstError) {
+                firstError.scrollIntoView({ behavior: 'smooth', block: 'center' });
+            }
+
+            alert(`❌ Por favor, corrija los siguientes errores:\n\n• ${errors.join('\n• ')}`);
+        } else {
+            // Mostrar confirmación
+            if (confirm(`¿Está seguro de que desea actualizar la información de "${document.getElementById('nombre').value} ${document.getElementById('apellido').value}"?`)) {
+                // Efecto de éxito
+                submitBtn.innerHTML = '<span>⏳</span> Actualizando...';
+                submitBtn.style.background = 'linear-gradient(135deg, #ff9800, #ffb74d)';
+                submitBtn.disabled = true;
+
+                // Simular procesamiento
+                setTimeout(() => {
+                    form.submit();
+                }, 1500);
+            }
+        }
+    });
+
+    // Función para validar URL
+    function isValidURL(string) {
+        try {
+            const url = new URL(string);
+            return url.protocol === 'http:' || url.protocol === 'https:';
+        } catch (_) {
+            return false;
+        }
+    }
+
+    // Efecto de entrada en campos (animación secuencial)
+    const inputs = document.querySelectorAll('.form-control');
+    inputs.forEach((input, index) => {
+        input.style.opacity = '0';
+        input.style.transform = 'translateY(10px)';
+
+        setTimeout(() => {
+            input.style.transition = 'opacity 0.3s ease, transform 0.3s ease';
+            input.style.opacity = '1';
+            input.style.transform = 'translateY(0)';
+        }, index * 100);
+    });
+
+    // Detectar cambios en los campos
+    let originalValues = {};
+    inputs.forEach(input => {
+        originalValues[input.id] = input.value;
+
+        input.addEventListener('input', function() {
+            if (this.value !== originalValues[this.id]) {
+                this.style.boxShadow = '0 0 0 2px rgba(255, 152, 0, 0.2)';
+            } else {
+                this.style.boxShadow = 'none';
+            }
+        });
+    });
+
+    // Prevenir navegación accidental si hay cambios
+    let hasChanges = false;
+    form.addEventListener('input', () => hasChanges = true);
+
+    window.addEventListener('beforeunload', function(e) {
+        if (hasChanges) {
+            e.preventDefault();
+            e.returnValue = 'Tiene cambios sin guardar. ¿Está seguro de que desea salir?';
+            return e.returnValue;
+        }
+    });
+});
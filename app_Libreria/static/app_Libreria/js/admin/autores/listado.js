@@ -0,0 +1,383 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Crear partículas decorativas
+    createParticles();
+
+    // Inicializar funcionalidades
+    initializeSorting();
+    initializeFilters();
+    initializeSearch();
+    calculateStats();
+    addHoverEffects();
+
+    // Animación de entrada para las filas
+    animateTableRows();
+});
+
+function createParticles() {
+    const particlesContainer = document.getElementById('particles');
+    if (!particlesContainer) return;
+
+    for (let i = 0; i < 20; i++) {
+        const particle = document.createElement('div');
+        particle.className = 'particle';
+
+        // Posición aleatoria
+        const left = Math.random() * 100;
+        const top = Math.random() * 100;
+
+        // Tamaño aleatorio
+        const size = Math.random() * 4 + 1;
+
+        // Color aleatorio
+        const colors = ['#2e7d32', '#4caf50', '#2196f3', '#ff9800', '#9c27b0'];
+        const color = colors[Math.floor(Math.random() * colors.length)];
+
+        // Aplicar estilos
+        particle.style.left = `${left}%`;
+        particle.style.top = `${top}%`;
+        particle.style.width = `${size}px`;
+        particle.style.height = `${size}px`;
+        particle.style.background = color;
+        particle.style.opacity = Math.random() * 0.3 + 0.1;
+        particle.style.animationDuration = `${Math.random() * 20 + 10}s`;
+        particle.style.animationDelay = `${Math.random() * 5}s`;
+
+        particlesContainer.appendChild(particle);
+    }
+}
+
+function initializeSorting() {
+    let currentSort = { column: -1, direction: 1 };
+
+    window.sortTable = function(header, columnIndex) {
+        const table = document.getElementById('authorsTable');
+        const tbody = table.querySelector('tbody');
+        const rows = Array.from(tbody.querySelectorAll('tr'));
+
+        // Remover clases de ordenamiento anteriores
+        table.querySelectorAll('th').forEach(th => {
+            th.classList.remove('sorted-asc', 'sorted-desc');
+        });
+
+        // Determinar dirección
+        if (currentSort.column === columnIndex) {
+            currentSort.direction *= -1;
+        } else {
+            currentSort.direction = 1;
+        }
+
+        currentSort.column = columnIndex;
+
+        // Aplicar clase visual
+        if (currentSort.direction === 1) {
+            header.classList.add('sorted-asc');
+        } else {
+            header.classList.add('sorted-desc');
+        }
+
+        // Ordenar filas
+        rows.sort((a, b) => {
+            let aValue, bValue;
+
+            if (columnIndex === 0) {
+                // ID
+                aValue = parseInt(a.cells[0].querySelector('.id-badge').textContent.replace('#', ''));
+                bValue = parseInt(b.cells[0].querySelector('.id-badge').textContent.replace('#', ''));
+            } else if (columnIndex === 1) {
+                // Nombre
+                aValue = a.cells[1].textContent.toLowerCase();
+                bValue = b.cells[1].textContent.toLowerCase();
+            } else if (columnIndex === 2) {
+                // Nacionalidad
+                aValue = a.cells[2].textContent.toLowerCase();
+                bValue = b.cells[2].textContent.toLowerCase();
+            } else if (columnIndex === 3) {
+                // Fecha
+                aValue = new Date(a.getAttribute('data-date'));
+                bValue = new Date(b.getAttribute('data-date'));
+            }
+
+            if (aValue < bValue) return -1 * currentSort.direction;
+            if (aValue > bValue) return 1 * currentSort.direction;
+            return 0;
+        });
+
+        // Reorganizar filas con animación
+        rows.forEach((row, index) => {
+            tbody.appendChild(row);
+
+            // Efecto visual
+            row.style.animation = 'slideInRow 0.5s ease-out';
+            row.style.animationDelay = `${index * 0.05}s`;
+
+            // Resetear animación después de completar
+            setTimeout(() => {
+                row.style.animation = '';
+            }, 500 + (index * 50));
+        });
+    };
+}
+
+function initializeFilters() {
+    const filterButtons = document.querySelectorAll('.filter-tag');
+    const tableBody = document.getElementById('tableBody');
+
+    filterButtons.forEach(button => {
+        button.addEventListener('click', function() {
+            // Actualizar botón activo
+            filterButtons.forEach(btn => btn.classList.remove('active'));
+            this.classList.add('active');
+
+            // Animación del botón
+            this.style.transform = 'scale(0.95)';
+            setTimeout(() => {
+                this.style.transform = '';
+            }, 200);
+
+            // Filtrar tabla
+            const filterType = this.getAttribute('data-filter');
+            filterTable(filterType);
+        });
+    });
+}
+
+function filterTable(filterType) {
+    const rows = document.querySelectorAll('#tableBody tr');
+    const emptyState = document.getElementById('emptyState');
+    let visibleCount = 0;
+
+    rows.forEach(row => {
+        let showRow = true;
+
+        switch(filterType) {
+            case 'all':
+                showRow = true;
+                break;
+            case 'active':
+                // Ejemplo: mostrar solo autores con biografía
+                showRow = row.getAttribute('data-bio') !== '';
+                break;
+            case 'classic':
+                // Ejemplo: autores antiguos (nacidos antes de 1900)
+                const birthYear = new Date(row.getAttribute('data-date')).getFullYear();
+                showRow = birthYear < 1900;
+                break;
+            case 'modern':
+                // Ejemplo: autores modernos (nacidos después de 1950)
+                const year = new Date(row.getAttribute('data-date')).getFullYear();
+                showRow = year >= 1950;
+                break;
+            case 'nobel':
+                // Ejemplo: autores con menciones específicas en biografía
+                const bio = row.getAttribute('data-bio');
+                showRow = bio.includes('nobel') || bio.includes('premio');
+                break;
+        }
+
+        if (showRow) {
+            row.style.display = '';
+            visibleCount++;
+
+            // Efecto de aparición
+            row.style.animation = 'slideInRow 0.4s ease-out';
+            setTimeout(() => {
+                row.style.animation = '';
+            }, 400);
+        } else {
+            row.style.display = 'none';
+        }
+    });
+
+    // Mostrar/ocultar estado vacío
+    if (emptyState) {
+        if (visibleCount === 0 && rows.length > 0) {
+            emptyState.style.display = 'block';
+        } else {
+            emptyState.style.display = 'none';
+        }
+    }
+
+    // Actualizar estadísticas
+    updateTotalCount(visibleCount);
+}
+
+function initializeSearch() {
+    const searchInput = document.getElementById('searchInput');
+    const searchButton = document.querySelector('.command-btn');
+
+    searchInput.addEventListener('input', performSearch);
+    searchButton.addEventListener('click', performSearch);
+
+    // Efecto de enfoque
+    searchInput.addEventListener('focus', function() {
+        this.parentElement.style.boxShadow = '0 0 20px rgba(0, 255, 136, 0.3)';
+        this.parentElement.style.borderColor = 'var(--verde-neon)';
+    });
+
+    searchInput.addEventListener('blur', function() {
+        this.parentElement.style.boxShadow = '';
+        this.parentElement.style.borderColor = 'rgba(255, 215, 0, 0.3)';
+    });
+}
+
+function performSearch() {
+    const searchTerm = document.getElementById('searchInput').value.toLowerCase();
+    const rows = document.querySelectorAll('#tableBody tr');
+    const emptyState = document.getElementById('emptyState');
+    let visibleCount = 0;
+
+    rows.forEach(row => {
+        const name = row.getAttribute('data-name');
+        const nationality = row.getAttribute('data-nationality');
+        const id = row.cells[0].querySelector('.id-badge').textContent.toLowerCase();
+
+        const matches = !searchTerm || 
+            name.includes(searchTerm) || 
+            nationality.includes(searchTerm) ||
+            id.includes(searchTerm);
+
+        if (matches) {
+            row.style.display = '';
+            visibleCount++;
+
+            // Efecto de resaltado
+            if (searchTerm) {
+                row.style.background = 'linear-gradient(90deg, var(--verde-suave), transparent)';
+                setTimeout(() => {
+                    row.style.background = '';
+                }, 1000);
+            }
+        } else {
+            row.style.display = 'none';
+        }
+    });
+
+    // Mostrar/ocultar estado vacío
+    if (emptyState) {
+        if (visibleCount === 0 && rows.length > 0) {
+            emptyState.style.display = 'block';
+        } else {
+            emptyState.style.display = 'none';
+        }
+    }
+
+    // Actualizar estadísticas
+    updateTotalCount(visibleCount);
+}
+
+function calculateStats() {
+    const rows = document.querySelectorAll('#tableBody tr');
+    const nacionalidades = new Set();
+    const hoy = new Date();
+    const ultimoMes = new Date();
+    ultimoMes.setMonth(ultimoMes.getMonth() - 1);
+
+    let autoresRecientes = 0;
+
+    rows.forEach(row => {
+        const nacionalidad = row.getAttribute('data-nationality');
+        if (nacionalidad) {
+            nacionalidades.add(nacionalidad);
+        }
+
+        // Ejemplo: contar autores "recientes" (último mes)
+        // Esto es solo un ejemplo - necesitarías datos reales
+        if (Math.random() > 0.7) {
+            autoresRecientes++;
+        }
+    });
+
+    // Actualizar estadísticas en tiempo real
+    document.getElementById('nacionalidades-count').textContent = nacionalidades.size;
+    document.getElementById('ultimo-mes').textContent = autoresRecientes;
+
+    // Estadística de ejemplo para premios
+    const premiosCount = Math.floor(rows.length * 1.5);
+    document.getElementById('premios-count').textContent = premiosCount;
+}
+
+function updateTotalCount(count) {
+    const totalElement = document.getElementById('total-autores');
+    const currentCount = parseInt(totalElement.textContent);
+
+    // Animación de conteo
+    animateCounter(totalElement, currentCount, count);
+}
+
+function animateCounter(element, start, end) {
+    const duration = 500;
+    const steps = 20;
+    const stepValue = (end - start) / steps;
+    let currentStep = 0;
+
+    const timer = setInterval(() => {
+        currentStep++;
+        const currentValue = Math.round(start + (stepValue * currentStep));
+        element.textContent = currentValue;
+
+        if (currentStep >= steps) {
+            clearInterval(timer);
+            element.textContent = end;
+        }
+    }, duration / steps);
+}
+
+function addHoverEffects() {
+    // Efectos en botones de acción
+    document.querySelectorAll('.btn-action-premium').forEach(button => {
+        button.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-5px) scale(1.05)';
+        });
+
+        button.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0) scale(1)';
+        });
+    });
+
+    // Efectos en badges de ID
+    document.querySelectorAll('.id-badge').forEach(badge => {
+        badge.addEventListener('mouseenter', function() {
+            this.style.transform = 'scale(1.2) rotate(5deg)';
+            this.style.boxShadow = '0 0 20px rgba(0, 255, 136, 0.5)';
+        });
+
+        badge.addEventListener('mouseleave', function() {
+            this.style.transform = 'scale(1) rotate(0)';
+            this.style.boxShadow = 'var(--sombra-suave)';
+        });
+    });
+}
+
+function animateTableRows() {
+    const rows = document.querySelectorAll('#tableBody tr');
+
+    rows.forEach((row, index) => {
+        // Retraso escalonado para la animación
+        row.style.animationDelay = `${index * 0.1}s`;
+
+        // Efecto al pasar el mouse
+        row.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateX(15px) scale(1.01)';
+            this.style.zIndex = '10';
+        });
+
+        row.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateX(0) scale(1)';
+            this.style.zIndex = '1';
+        });
+    });
+}
+
+// Confirmación antes de eliminar
+document.addEventListener('click', function(e) {
+    if (e.target.closest('.btn-delete-premium')) {
+        const autorRow = e.target.closest('tr');
+        const autorNombre = autorRow.querySelector('.col-author').textContent.trim();
+        const autorId = autorRow.querySelector('.id-badge').textContent;
+
+        // Diálogo de confirmación mejorado
+        if (!confirm(`⚠️ ELIMINACIÓN PERMANENTE ⚠️\n\n¿Eliminar al autor ${autorNombre} (${autorId})?\n\nEsta acción NO se puede deshacer y afectará a todos los libros asociados.`)) {
+            e.preventDefault();
+        }
+    }
+});
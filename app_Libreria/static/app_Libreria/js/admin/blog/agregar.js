@@ -0,0 +1,139 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('blogForm');
+    const resumenTextarea = document.querySelector('textarea[name="resumen"]');
+    const charCount = document.getElementById('charCount');
+    const imagenInput = document.getElementById('imagenInput');
+    const imagePreview = document.getElementById('imagePreview');
+
+    // Contador de caracteres para resumen
+    resumenTextarea.addEventListener('input', function() {
+        const longitud = this.value.length;
+        charCount.textContent = longitud;
+
+        if (longitud > 200) {
+            charCount.style.color = '#dc3545';
+            charCount.textContent += ' (¡Demasiado largo!)';
+            this.style.borderColor = '#dc3545';
+        } else if (longitud > 180) {
+            charCount.style.color = '#ffc107';
+            this.style.borderColor = '#ffc107';
+        } else {
+            charCount.style.color = '#28a745';
+            this.style.borderColor = '#ddd';
+        }
+    });
+
+    // Disparar evento para calcular longitud inicial
+    resumenTextarea.dispatchEvent(new Event('input'));
+
+    // Previsualización de imagen
+    imagenInput.addEventListener('change', function(e) {
+        if (this.files && this.files[0]) {
+            const reader = new FileReader();
+
+            reader.onload = function(e) {
+                imagePreview.innerHTML = '';
+                const img = document.createElement('img');
+                img.src = e.target.result;
+                img.alt = 'Previsualización de imagen';
+                imagePreview.appendChild(img);
+                imagePreview.style.display = 'block';
+            }
+
+            reader.readAsDataURL(this.files[0]);
+
+            // Validar tamaño de archivo (max 5MB)
+            if (this.files[0].size > 5 * 1024 * 1024) {
+                alert('La imagen es demasiado grande. Máximo 5MB.');
+                this.value = '';
+                imagePreview.style.display = 'none';
+                return;
+            }
+
+            // Validar tipo de archivo
+            const validTypes = ['image/jpeg', 'image/png', 'image/gif'];
+            if (!validTypes.includes(this.files[0].type)) {
+                alert('Formato de imagen no válido. Use JPG, PNG o GIF.');
+                this.value = '';
+                imagePreview.style.display = 'none';
+                return;
+            }
+        } else {
+            imagePreview.style.display = 'none';
+        }
+    });
+
+    // Validación del formulario
+    form.addEventListener('submit', function(e) {
+        let valid = true;
+        const requiredFields = form.querySelectorAll('[required]');
+        const errorMessages = [];
+
+        // Validar campos requeridos
+        requiredFields.forEach(function(field) {
+            if (!field.value.trim()) {
+                valid = false;
+                field.style.borderColor = '#dc3545';
+
+                // Crear mensaje de error si no existe
+                if (!field.nextElementSibling || !field.nextElementSibling.classList.contains('error-message')) {
+                    const error = document.createElement('div');
+                    error.className = 'error-message';
+                    error.style.color = '#dc3545';
+                    error.style.fontSize = '0.875rem';
+                    error.style.marginTop = '5px';
+                    error.textContent = 'Este campo es requerido';
+                    field.parentNode.appendChild(error);
+                }
+
+                errorMessages.push(`"${field.previousElementSibling.textContent.replace(' *', '')}" es requerido.`);
+            } else {
+                field.style.borderColor = '';
+                const error = field.parentNode.querySelector('.error-message');
+                if (error) {
+                    error.remove();
+                }
+            }
+        });
+
+        // Validar longitud del resumen
+        if (resumenTextarea.value.length > 200) {
+            valid = false;
+            errorMessages.push('El resumen no puede tener más de 200 caracteres.');
+        }
+
+        if (!valid) {
+            e.preventDefault();
+            alert('Por favor, corrija los siguientes errores:\n\n' + errorMessages.join('\n'));
+        }
+    });
+
+    // Auto-resize del textarea de contenido
+    const contenidoTextarea = document.querySelector('textarea[name="contenido"]');
+    contenidoTextarea.addEventListener('input', function() {
+        this.style.height = 'auto';
+        this.style.height = (this.scrollHeight) + 'px';
+    });
+
+    // Disparar auto-resize inicial
+    contenidoTextarea.dispatchEvent(new Event('input'));
+});
+
+function guardarBorrador() {
+    // Desmarcar la casilla de activo
+    document.getElementById('activo').checked = false;
+    // Cambiar texto del botón
+    const submitBtn = document.querySelector('button[type="submit"]');
+    const originalText = submitBtn.textContent;
+    submitBtn.textContent = 'Guardando borrador...';
+    submitBtn.disabled = true;
+
+    // Enviar el formulario
+    document.querySelector('form').submit();
+
+    // Restaurar después de 3 segundos (por si hay error)
+    setTimeout(function() {
+        submitBtn.textContent = originalText;
+        submitBtn.disabled = false;
+    }, 3000);
+}
@@ -0,0 +1,81 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Validación básica del formulario
+    const form = document.querySelector('form');
+    const requiredFields = form.querySelectorAll('[required]');
+
+    form.addEventListener('submit', function(e) {
+        let valid = true;
+
+        requiredFields.forEach(function(field) {
+            if (!field.value.trim()) {
+                valid = false;
+                field.style.borderColor = '#dc3545';
+
+                // Crear mensaje de error si no existe
+                if (!field.nextElementSibling || !field.nextElementSibling.classList.contains('error-message')) {
+                    const error = document.createElement('div');
+                    error.className = 'error-message';
+                    error.style.color = '#dc3545';
+                    error.style.fontSize = '0.875rem';
+                    error.style.marginTop = '5px';
+                    error.textContent = 'Este campo es requerido';
+                    field.parentNode.appendChild(error);
+                }
+            } else {
+                field.style.borderColor = '';
+                const error = field.parentNode.querySelector('.error-message');
+                if (error) {
+                    error.remove();
+                }
+            }
+        });
+
+        if (!valid) {
+            e.preventDefault();
+            alert('Por favor, complete todos los campos requeridos.');
+        }
+    });
+
+    // Previsualización de imagen al seleccionar
+    const fileInput = document.querySelector('input[type="file"]');
+    if (fileInput) {
+        fileInput.addEventListener('change', function(e) {
+            if (this.files && this.files[0]) {
+                const reader = new FileReader();
+                const currentImage = document.querySelector('.current-image');
+
+                // Si ya hay una imagen actual, reemplazarla
+                let imgContainer = currentImage;
+                if (!imgContainer) {
+                    imgContainer = document.createElement('div');
+                    imgContainer.className = 'current-image';
+                    fileInput.parentNode.insertBefore(imgContainer, fileInput);
+                } else {
+                    imgContainer.innerHTML = '';
+                }
+
+                reader.onload = function(e) {
+                    const img = document.createElement('img');
+                    img.src = e.target.result;
+                    img.width = 150;
+                    img.className = 'img-thumbnail';
+                    imgContainer.appendChild(img);
+                }
+
+                reader.readAsDataURL(this.files[0]);
+            }
+        });
+    }
+
+    // Auto-resize del textarea
+    const textareas = document.querySelectorAll('textarea');
+    textareas.forEach(function(textarea) {
+        textarea.addEventListener('input', function() {
+            this.style.height = 'auto';
+            this.style.height = (this.scrollHeight) + 'px';
+        });
+
+        // Trigger inicial
+        textarea.dispatchEvent(new Event('input'));
+    });
+});
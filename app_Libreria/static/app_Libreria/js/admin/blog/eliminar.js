@@ -0,0 +1,64 @@
+// Confirmación de eliminación
+function confirmarEliminacion() {
+    const checkbox = document.getElementById('confirmCheckbox');
+
+    if (!checkbox.checked) {
+        alert('Debes marcar la casilla de confirmación para proceder con la eliminación.');
+        return false;
+    }
+
+    const confirmacion = confirm('¿ESTÁS ABSOLUTAMENTE SEGURO/A de eliminar esta entrada?\n\nEsta acción NO se puede deshacer.');
+    return confirmacion;
+}
+
+// Deshabilitar botón de eliminar hasta que se marque el checkbox
+document.addEventListener('DOMContentLoaded', function() {
+    const checkbox = document.getElementById('confirmCheckbox');
+    const btnEliminar = document.querySelector('.btn-danger-custom');
+
+    // Inicialmente deshabilitado
+    btnEliminar.style.opacity = '0.5';
+    btnEliminar.style.cursor = 'not-allowed';
+    btnEliminar.disabled = true;
+
+    checkbox.addEventListener('change', function() {
+        if (this.checked) {
+            btnEliminar.style.opacity = '1';
+            btnEliminar.style.cursor = 'pointer';
+            btnEliminar.disabled = false;
+        } else {
+            btnEliminar.style.opacity = '0.5';
+            btnEliminar.style.cursor = 'not-allowed';
+            btnEliminar.disabled = true;
+        }
+    });
+
+    // Efecto hover en la tarjeta
+    const card = document.querySelector('.confirmacion-card');
+    card.addEventListener('mouseenter', function() {
+        this.style.transform = 'translateY(-5px)';
+        this.style.transition = 'transform 0.3s ease';
+    });
+
+    card.addEventListener('mouseleave', function() {
+        this.style.transform = 'translateY(0)';
+    });
+
+    // Animación de entrada
+    card.style.opacity = '0';
+    card.style.transform = 'translateY(20px)';
+
+    setTimeout(() => {
+        card.style.transition = 'opacity 0.5s ease, transform 0.5s ease';
+        card.style.opacity = '1';
+        card.style.transform = 'translateY(0)';
+    }, 100);
+});
+
+// Prevenir envío accidental con tecla Enter
+document.getElementById('formEliminar').addEventListener('keydown', function(e) {
+    if (e.key === 'Enter') {
+        e.preventDefault();
+        alert('Presiona el botón para confirmar la eliminación.');
+    }
+});
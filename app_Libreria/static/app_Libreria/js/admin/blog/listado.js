@@ -0,0 +1,158 @@
+// ============================================
+// FUNCIONALIDADES DEL LISTADO
+// ============================================
+
+document.addEventListener('DOMContentLoaded', function() {
+    // Inicializar efectos
+    initializeHoverEffects();
+    initializeTableInteractions();
+    initializeAnimations();
+
+    // Confirmación antes de eliminar
+    initializeDeleteConfirmations();
+});
+
+// ============================================
+// EFECTOS HOVER
+// ============================================
+function initializeHoverEffects() {
+    // Efecto hover en botones de acción
+    const actionButtons = document.querySelectorAll('.btn-accion');
+    actionButtons.forEach(button => {
+        button.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-2px)';
+            this.style.boxShadow = '0 4px 8px rgba(0,0,0,0.1)';
+        });
+
+        button.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+            this.style.boxShadow = 'none';
+        });
+    });
+
+    // Efecto hover en tarjetas de estadísticas
+    const statCards = document.querySelectorAll('.estadistica-card');
+    statCards.forEach(card => {
+        card.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-3px)';
+        });
+
+        card.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+        });
+    });
+}
+
+// ============================================
+// INTERACCIONES CON LA TABLA
+// ============================================
+function initializeTableInteractions() {
+    // Resaltar fila al pasar el mouse
+    const tableRows = document.querySelectorAll('.tabla-body tr');
+    tableRows.forEach(row => {
+        row.addEventListener('mouseenter', function() {
+            this.style.backgroundColor = 'rgba(46, 125, 50, 0.08)';
+        });
+
+        row.addEventListener('mouseleave', function() {
+            this.style.backgroundColor = '';
+        });
+    });
+
+    // Hacer clic en la fila (excepto en acciones)
+    tableRows.forEach(row => {
+        row.addEventListener('click', function(e) {
+            // Solo si no se hace clic en un botón de acción
+            if (!e.target.closest('.btn-accion') && !e.target.closest('a')) {
+                const editLink = this.querySelector('.btn-editar');
+                if (editLink) {
+                    editLink.style.transform = 'scale(1.05)';
+                    setTimeout(() => {
+                        editLink.style.transform = '';
+                    }, 200);
+                }
+            }
+        });
+    });
+}
+
+// ============================================
+// ANIMACIONES
+// ============================================
+function initializeAnimations() {
+    // Animar estadísticas al cargar
+    const statValues = document.querySelectorAll('.estadistica-valor');
+    statValues.forEach(value => {
+        const originalText = value.textContent;
+        const number = parseInt(originalText.replace(/\D/g, ''));
+
+        if (!isNaN(number)) {
+            // Efecto de conteo
+            animateCounter(value, number);
+        }
+    });
+
+    // Animar entrada de tarjeta principal
+    const mainCard = document.querySelector('.contenido-card');
+    if (mainCard) {
+        mainCard.style.animationDelay = '0.1s';
+    }
+}
+
+function animateCounter(element, finalValue) {
+    let currentValue = 0;
+    const duration = 1000; // 1 segundo
+    const increment = finalValue / (duration / 16); // 60fps
+
+    const timer = setInterval(() => {
+        currentValue += increment;
+        if (currentValue >= finalValue) {
+            currentValue = finalValue;
+            clearInterval(timer);
+        }
+        element.textContent = Math.round(currentValue);
+    }, 16);
+}
+
+// ============================================
+// CONFIRMACIÓN DE ELIMINACIÓN
+// ============================================
+function initializeDeleteConfirmations() {
+    const deleteButtons = document.querySelectorAll('.btn-eliminar');
+    deleteButtons.forEach(button => {
+        button.addEventListener('click', function(e) {
+            // Obtener título de la entrada
+            const row = this.closest('tr');
+            const titulo = row.querySelector('.titulo-entrada').textContent;
+            const id = row.querySelector('.col-id').textContent;
+
+            // Mostrar confirmación
+            const confirmacion = confirm(
+                `¿Eliminar entrada del blog?\n\n` +
+                `ID: ${id}\n` +
+                `Título: ${titulo}\n\n` +
+                `Esta acción eliminará permanentemente la entrada.`
+            );
+
+            if (!confirmacion) {
+                e.preventDefault();
+            }
+        });
+    });
+}
+
+// ============================================
+// BÚSQUEDA Y FILTRADO (PARA IMPLEMENTACIÓN FUTURA)
+// ============================================
+function initializeSearch() {
+    // Esto se puede implementar más adelante
+    console.log('Funcionalidad de búsqueda lista para implementar');
+}
+
+// ============================================
+// ORDENAMIENTO DE TABLA (PARA IMPLEMENTACIÓN FUTURA)
+// ============================================
+function initializeSorting() {
+    // Esto se puede implementar más adelante
+    console.log('Funcionalidad de ordenamiento lista para implementar');
+}
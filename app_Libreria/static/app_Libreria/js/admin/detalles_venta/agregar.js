@@ -0,0 +1,116 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('detalleForm');
+    const libroSelect = document.getElementById('libroSelect');
+    const cantidadInput = document.getElementById('cantidadInput');
+    const precioInput = document.getElementById('precioInput');
+    const ivaInput = document.getElementById('ivaInput');
+
+    // Elementos de visualización
+    const subtotalDisplay = document.getElementById('subtotalDisplay');
+    const ivaDisplay = document.getElementById('ivaDisplay');
+    const totalDisplay = document.getElementById('totalDisplay');
+
+    // Función para calcular totales
+    function calcularTotales() {
+        const cantidad = parseFloat(cantidadInput.value) || 0;
+        const precio = parseFloat(precioInput.value) || 0;
+        const ivaPorcentaje = parseFloat(ivaInput.value) || 0;
+
+        const subtotal = cantidad * precio;
+        const ivaMonto = subtotal * (ivaPorcentaje / 100);
+        const total = subtotal + ivaMonto;
+
+        // Actualizar displays
+        subtotalDisplay.textContent = '$' + subtotal.toFixed(2);
+        ivaDisplay.textContent = '$' + ivaMonto.toFixed(2);
+        totalDisplay.textContent = '$' + total.toFixed(2);
+
+        // Validación visual
+        if (cantidad > 0 && precio > 0) {
+            cantidadInput.classList.remove('error');
+            precioInput.classList.remove('error');
+            cantidadInput.classList.add('success');
+            precioInput.classList.add('success');
+        } else {
+            cantidadInput.classList.remove('success');
+            precioInput.classList.remove('success');
+            if (cantidad <= 0) cantidadInput.classList.add('error');
+            if (precio <= 0) precioInput.classList.add('error');
+        }
+    }
+
+    // Auto-completar precio cuando se selecciona un libro
+    libroSelect.addEventListener('change', function() {
+        const selectedOption = this.options[this.selectedIndex];
+        if (selectedOption && selectedOption.dataset.precio) {
+            precioInput.value = selectedOption.dataset.precio;
+            calcularTotales();
+        }
+    });
+
+    // Calcular al cambiar cualquier campo
+    cantidadInput.addEventListener('input', calcularTotales);
+    precioInput.addEventListener('input', calcularTotales);
+    ivaInput.addEventListener('input', calcularTotales);
+
+    // Validación del formulario
+    form.addEventListener('submit', function(e) {
+        let valid = true;
+        const errorMessages = [];
+
+        // Validar campos requeridos
+        const requiredFields = form.querySelectorAll('[required]');
+        requiredFields.forEach(function(field) {
+            if (!field.value.trim()) {
+                valid = false;
+                field.classList.add('error');
+                errorMessages.push(`"${field.previousElementSibling.textContent.replace(' *', '')}" es requerido.`);
+            } else {
+                field.classList.remove('error');
+            }
+        });
+
+        // Validar valores numéricos positivos
+        const numericFields = [
+            { input: cantidadInput, name: 'Cantidad', min: 1 },
+            { input: precioInput, name: 'Precio Unitario', min: 0.01 },
+            { input: ivaInput, name: 'IVA', min: 0 }
+        ];
+
+        numericFields.forEach(function(field) {
+            const value = parseFloat(field.input.value);
+            if (isNaN(value) || value < field.min) {
+                valid = false;
+                field.input.classList.add('error');
+                errorMessages.push(`${field.name} debe ser mayor o igual a ${field.min}`);
+            } else {
+                field.input.classList.remove('error');
+            }
+        });
+
+        // Validar stock del libro (simulada - en realidad necesitarías consultar la BD)
+        const libroId = libroSelect.value;
+        const cantidad = parseInt(cantidadInput.value);
+        if (libroId && cantidad > 0) {
+            // Aquí podrías agregar una llamada AJAX para verificar el stock real
+            // Por ahora solo validamos que haya un libro seleccionado
+        }
+
+        if (!valid) {
+            e.preventDefault();
+            alert('Por favor, corrija los siguientes errores:\n\n' + errorMessages.join('\n'));
+        }
+    });
+
+    // Prevenir valores negativos
+    [cantidadInput, precioInput, ivaInput].forEach(function(input) {
+        input.addEventListener('input', function() {
+            if (parseFloat(this.value) < 0) {
+                this.value = Math.abs(parseFloat(this.value));
+            }
+        });
+    });
+
+    // Inicializar cálculos
+    calcularTotales();
+});
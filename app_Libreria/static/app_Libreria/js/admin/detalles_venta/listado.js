@@ -0,0 +1,175 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Confirmación para eliminar
+    function confirmDelete() {
+        return confirm('¿Estás seguro de que quieres eliminar este detalle de venta?\nEsta acción no se puede deshacer.');
+    }
+
+    // Asignar evento a todos los botones de eliminar
+    const deleteButtons = document.querySelectorAll('.btn-danger');
+    deleteButtons.forEach(function(button) {
+        button.addEventListener('click', function(e) {
+            if (!confirmDelete()) {
+                e.preventDefault();
+            }
+        });
+    });
+
+    // Efecto hover mejorado para filas
+    const tableRows = document.querySelectorAll('.data-table tbody tr');
+    tableRows.forEach(function(row) {
+        row.addEventListener('mouseenter', function() {
+            this.style.backgroundColor = 'rgba(46, 139, 87, 0.08)';
+            this.style.transform = 'translateX(5px)';
+            this.style.transition = 'all 0.2s ease';
+        });
+
+        row.addEventListener('mouseleave', function() {
+            this.style.backgroundColor = '';
+            this.style.transform = 'translateX(0)';
+        });
+    });
+
+    // Ordenar por columna al hacer clic en el encabezado (opcional)
+    const tableHeaders = document.querySelectorAll('.data-table th');
+    tableHeaders.forEach(function(header, index) {
+        header.style.cursor = 'pointer';
+        header.addEventListener('click', function() {
+            sortTable(index);
+        });
+
+        // Agregar indicador de orden
+        header.innerHTML += ' <span class="sort-indicator">↕</span>';
+    });
+
+    // Función para ordenar tabla (solo visual, no afecta datos del servidor)
+    function sortTable(columnIndex) {
+        const table = document.querySelector('.data-table');
+        const tbody = table.querySelector('tbody');
+        const rows = Array.from(tbody.querySelectorAll('tr'));
+
+        // Omitir fila vacía si existe
+        const filteredRows = rows.filter(row => !row.classList.contains('empty-state'));
+
+        if (filteredRows.length === 0) return;
+
+        // Determinar orden actual y alternar
+        const currentOrder = table.getAttribute('data-sort-order') || 'asc';
+        const newOrder = currentOrder === 'asc' ? 'desc' : 'asc';
+        table.setAttribute('data-sort-order', newOrder);
+
+        // Ordenar filas
+        filteredRows.sort(function(a, b) {
+            let aValue = a.cells[columnIndex].textContent.trim();
+            let bValue = b.cells[columnIndex].textContent.trim();
+
+            // Convertir a número si es posible
+            const aNum = parseFloat(aValue.replace(/[^0-9.-]+/g, ""));
+            const bNum = parseFloat(bValue.replace(/[^0-9.-]+/g, ""));
+
+            if (!isNaN(aNum) && !isNaN(bNum)) {
+                aValue = aNum;
+                bValue = bNum;
+            }
+
+            if (newOrder === 'asc') {
+                return aValue > bValue ? 1 : -1;
+            } else {
+                return aValue < bValue ? 1 : -1;
+            }
+        });
+
+        // Reorganizar filas en la tabla
+        tbody.innerHTML = '';
+        filteredRows.forEach(row => tbody.appendChild(row));
+
+        // Actualizar indicadores visuales
+        tableHeaders.forEach(header => {
+            header.querySelector('.sort-indicator').textContent = '↕';
+        });
+        tableHeaders[columnIndex].querySelector('.sort-indicator').textContent = 
+            newOrder === 'asc' ? '↑' : '↓';
+    }
+
+    // Agregar búsqueda rápida (opcional)
+    const searchContainer = document.createElement('div');
+    searchContainer.className = 'search-box';
+    searchContainer.innerHTML = `
+        <input type="text" placeholder="Buscar detalles..." id="searchInput">
+        <button type="button" id="clearSearch">×</button>
+    `;
+
+    const cardBody = document.querySelector('.card-body');
+    const tableContainer = document.querySelector('.table-container');
+    cardBody.insertBefore(searchContainer, tableContainer);
+
+    // Estilos para la búsqueda
+    const searchStyles = document.createElement('style');
+    searchStyles.textContent = `
+        .search-box {
+            margin-bottom: 15px;
+            position: relative;
+            max-width: 300px;
+        }
+
+        #searchInput {
+            width: 100%;
+            padding: 10px 35px 10px 15px;
+            border: 1px solid #ddd;
+            border-radius: 5px;
+            font-size: 0.9rem;
+        }
+
+        #searchInput:focus {
+            outline: none;
+            border-color: #2e8b57;
+            box-shadow: 0 0 0 2px rgba(46, 139, 87, 0.2);
+        }
+
+        #clearSearch {
+            position: absolute;
+            right: 10px;
+            top: 50%;
+            transform: translateY(-50%);
+            background: none;
+            border: none;
+            font-size: 1.2rem;
+            cursor: pointer;
+            color: #999;
+        }
+
+        #clearSearch:hover {
+            color: #dc3545;
+        }
+    `;
+    document.head.appendChild(searchStyles);
+
+    // Funcionalidad de búsqueda
+    const searchInput = document.getElementById('searchInput');
+    const clearSearch = document.getElementById('clearSearch');
+
+    searchInput.addEventListener('input', function() {
+        const searchTerm = this.value.toLowerCase();
+        const rows = document.querySelectorAll('.data-table tbody tr');
+
+        rows.forEach(row => {
+            if (row.classList.contains('empty-state')) return;
+
+            const text = row.textContent.toLowerCase();
+            if (text.includes(searchTerm)) {
+                row.style.display = '';
+            } else {
+                row.style.display = 'none';
+            }
+        });
+
+        clearSearch.style.display = searchTerm ? 'block' : 'none';
+    });
+
+    clearSearch.addEventListener('click', function() {
+        searchInput.value = '';
+        searchInput.dispatchEvent(new Event('input'));
+        searchInput.focus();
+    });
+
+    clearSearch.style.display = 'none';
+});
@@ -0,0 +1,200 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('editorialForm');
+    const nombreInput = document.getElementById('nombreInput');
+    const direccionInput = document.getElementById('direccionInput');
+    const telefonoInput = document.getElementById('telefonoInput');
+    const paisSelect = document.getElementById('paisSelect');
+    const paisOtroInput = document.getElementById('paisOtroInput');
+    const emailInput = document.getElementById('emailInput');
+    const sitiowebInput = document.getElementById('sitiowebInput');
+    const submitBtn = form.querySelector('button[type="submit"]');
+
+    // Elementos de vista previa
+    const previewNombre = document.getElementById('previewNombre');
+    const previewPais = document.getElementById('previewPais');
+    const previewEmail = document.getElementById('previewEmail');
+    const previewSitioWeb = document.getElementById('previewSitioWeb');
+
+    // Mostrar/ocultar campo "Otro" para país
+    paisSelect.addEventListener('change', function() {
+        if (this.value === 'Otro') {
+            paisOtroInput.style.display = 'block';
+            paisOtroInput.required = true;
+        } else {
+            paisOtroInput.style.display = 'none';
+            paisOtroInput.required = false;
+            paisOtroInput.value = '';
+        }
+        updatePreview();
+    });
+
+    // Validación de email en tiempo real
+    emailInput.addEventListener('input', function() {
+        const email = this.value.trim();
+        if (email && !isValidEmail(email)) {
+            this.classList.add('error');
+            this.classList.remove('success');
+        } else if (email) {
+            this.classList.remove('error');
+            this.classList.add('success');
+        } else {
+            this.classList.remove('error', 'success');
+        }
+        updatePreview();
+    });
+
+    // Validación de URL en tiempo real
+    sitiowebInput.addEventListener('input', function() {
+        const url = this.value.trim();
+        if (url && !isValidURL(url)) {
+            this.classList.add('error');
+        } else if (url) {
+            this.classList.remove('error');
+            this.classList.add('success');
+        } else {
+            this.classList.remove('error', 'success');
+        }
+        updatePreview();
+    });
+
+    // Validación de teléfono
+    telefonoInput.addEventListener('input', function() {
+        const telefono = this.value.trim();
+        if (telefono && !isValidPhone(telefono)) {
+            this.classList.add('error');
+            this.classList.remove('success');
+        } else if (telefono) {
+            this.classList.remove('error');
+            this.classList.add('success');
+        } else {
+            this.classList.remove('error', 'success');
+        }
+    });
+
+    // Actualizar vista previa en tiempo real
+    function updatePreview() {
+        previewNombre.textContent = nombreInput.value || '-';
+
+        const paisSeleccionado = paisSelect.value;
+        if (paisSeleccionado === 'Otro' && paisOtroInput.value) {
+            previewPais.textContent = paisOtroInput.value;
+        } else if (paisSeleccionado) {
+            previewPais.textContent = paisSeleccionado;
+        } else {
+            previewPais.textContent = '-';
+        }
+
+        previewEmail.textContent = emailInput.value || '-';
+        previewSitioWeb.textContent = sitiowebInput.value || '-';
+    }
+
+    // Escuchar cambios en todos los campos para vista previa
+    [nombreInput, direccionInput, telefonoInput, paisSelect, paisOtroInput, emailInput, sitiowebInput].forEach(input => {
+        input.addEventListener('input', updatePreview);
+    });
+
+    // Validar formulario al enviar
+    form.addEventListener('submit', function(e) {
+        let valid = true;
+        const errorMessages = [];
+
+        // Validar campos requeridos
+        const requiredFields = form.querySelectorAll('[required]');
+        requiredFields.forEach(function(field) {
+            if (!field.value.trim()) {
+                valid = false;
+                field.classList.add('error');
+                errorMessages.push(`"${field.previousElementSibling.textContent.replace(' *', '')}" es requerido.`);
+            } else {
+                field.classList.remove('error');
+            }
+        });
+
+        // Validar email
+        if (emailInput.value && !isValidEmail(emailInput.value)) {
+            valid = false;
+            emailInput.classList.add('error');
+            errorMessages.push('El email no tiene un formato válido.');
+        }
+
+        // Validar URL si existe
+        if (sitiowebInput.value && !isValidURL(sitiowebInput.value)) {
+            valid = false;
+            sitiowebInput.classList.add('error');
+            errorMessages.push('La URL del sitio web no es válida. Debe comenzar con http:// o https://');
+        }
+
+        // Validar teléfono
+        if (telefonoInput.value && !isValidPhone(telefonoInput.value)) {
+            valid = false;
+            telefonoInput.classList.add('error');
+            errorMessages.push('El teléfono debe contener solo números, espacios y los caracteres + - ( ).');
+        }
+
+        if (!valid) {
+            e.preventDefault();
+            alert('Por favor, corrija los siguientes errores:\n\n' + errorMessages.join('\n'));
+        } else {
+            // Mostrar estado de carga
+            submitBtn.classList.add('btn-loading');
+            submitBtn.disabled = true;
+
+            // Simular delay para mostrar efecto de carga (solo visual)
+            setTimeout(() => {
+                submitBtn.classList.remove('btn-loading');
+                submitBtn.disabled = false;
+            }, 2000);
+        }
+    });
+
+    // Funciones de validación
+    function isValidEmail(email) {
+        const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+        return emailRegex.test(email);
+    }
+
+    function isValidURL(url) {
+        try {
+            new URL(url);
+            return url.startsWith('http://') || url.startsWith('https://');
+        } catch (_) {
+            return false;
+        }
+    }
+
+    function isValidPhone(phone) {
+        const phoneRegex = /^[\d\s+\-()]+$/;
+        return phoneRegex.test(phone) && phone.replace(/[^\d]/g, '').length >= 8;
+    }
+
+    // Auto-formatear teléfono
+    telefonoInput.addEventListener('blur', function() {
+        let phone = this.value.replace(/[^\d+]/g, '');
+        if (phone.length > 0 && !phone.startsWith('+')) {
+            phone = '+52 ' + phone;
+        }
+        this.value = phone;
+    });
+
+    // Capitalizar nombre de editorial
+    nombreInput.addEventListener('blur', function() {
+        if (this.value) {
+            this.value = this.value
+                .toLowerCase()
+                .split(' ')
+                .map(word => word.charAt(0).toUpperCase() + word.slice(1))
+                .join(' ');
+        }
+    });
+
+    // Auto-completar http:// si el usuario no lo especifica
+    sitiowebInput.addEventListener('blur', function() {
+        let url = this.value.trim();
+        if (url && !url.startsWith('http://') && !url.startsWith('https://')) {
+            this.value = 'https://' + url;
+        }
+    });
+
+    // Inicializar vista previa
+    updatePreview();
+});
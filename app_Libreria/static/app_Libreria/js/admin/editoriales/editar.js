@@ -0,0 +1,316 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('editEditorialForm');
+    const originalValues = {};
+    const fields = ['nombre', 'pais', 'telefono', 'email', 'direccion', 'sitioweb'];
+    const changesSection = document.getElementById('changesSection');
+    const changesList = document.getElementById('changesList');
+    const submitBtn = document.getElementById('submitBtn');
+    const resetBtn = document.getElementById('resetBtn');
+    const lastUpdate = document.getElementById('lastUpdate');
+    const paisSelect = document.getElementById('paisSelect');
+    const paisOtroInput = document.getElementById('paisOtroInput');
+
+    // Lista de países predefinidos
+    const paisesPredefinidos = ['México','España','Argentina','Colombia','Chile','Perú','Estados Unidos','Reino Unido'];
+
+    // Guardar valores originales
+    fields.forEach(field => {
+        const input = document.getElementById(field + 'Input') || document.getElementById(field + 'Select');
+        if (input) {
+            originalValues[field] = field === 'pais' ? getPaisValue() : input.value;
+        }
+    });
+
+    // Mostrar/ocultar campo "Otro" para país
+    function togglePaisOtro() {
+        if (paisSelect.value === 'Otro') {
+            paisOtroInput.style.display = 'block';
+            paisOtroInput.required = true;
+        } else {
+            paisOtroInput.style.display = 'none';
+            paisOtroInput.required = false;
+        }
+    }
+
+    // Obtener valor actual de país
+    function getPaisValue() {
+        if (paisSelect.value === 'Otro') {
+            return paisOtroInput.value;
+        }
+        return paisSelect.value;
+    }
+
+    // Detectar cambios en tiempo real
+    function detectChanges() {
+        const changes = [];
+
+        fields.forEach(field => {
+            const input = document.getElementById(field + 'Input') || document.getElementById(field + 'Select');
+            if (!input) return;
+
+            const currentValue = field === 'pais' ? getPaisValue() : input.value;
+            const originalValue = originalValues[field];
+
+            if (currentValue !== originalValue) {
+                changes.push({
+                    field: field,
+                    original: originalValue,
+                    current: currentValue
+                });
+
+                // Marcar campo como modificado
+                input.classList.add('modified');
+            } else {
+                input.classList.remove('modified');
+            }
+        });
+
+        // Mostrar/ocultar sección de cambios
+        if (changes.length > 0) {
+            changesSection.style.display = 'block';
+            resetBtn.style.display = 'inline-flex';
+
+            // Actualizar lista de cambios
+            changesList.innerHTML = '';
+            changes.forEach(change => {
+                const li = document.createElement('li');
+                let fieldName = '';
+
+                switch(change.field) {
+                    case 'nombre': fieldName = 'Nombre'; break;
+                    case 'pais': fieldName = 'País'; break;
+                    case 'telefono': fieldName = 'Teléfono'; break;
+                    case 'email': fieldName = 'Email'; break;
+                    case 'direccion': fieldName = 'Dirección'; break;
+                    case 'sitioweb': fieldName = 'Sitio Web'; break;
+                }
+
+                li.textContent = `${fieldName}: "${change.original}" → "${change.current}"`;
+                changesList.appendChild(li);
+            });
+        } else {
+            changesSection.style.display = 'none';
+            resetBtn.style.display = 'none';
+        }
+
+        // Actualizar texto del botón
+        const btnText = submitBtn.querySelector('.btn-text');
+        if (changes.length > 0) {
+            btnText.textContent = `Actualizar (${changes.length} cambios)`;
+        } else {
+            btnText.textContent = 'Actualizar Editorial';
+        }
+    }
+
+    // Restaurar valores originales
+    function resetForm() {
+        if (!confirm('¿Restaurar todos los valores originales? Se perderán los cambios no guardados.')) {
+            return;
+        }
+
+        fields.forEach(field => {
+            const input = document.getElementById(field + 'Input') || document.getElementById(field + 'Select');
+            if (!input) return;
+
+            const originalValue = originalValues[field];
+            if (field === 'pais') {
+                // Determinar si es un país de la lista o "Otro"
+                if (paisesPredefinidos.includes(originalValue)) {
+                    paisSelect.value = originalValue;
+                    paisOtroInput.value = '';
+                    togglePaisOtro();
+                } else {
+                    paisSelect.value = 'Otro';
+                    paisOtroInput.value = originalValue;
+                    togglePaisOtro();
+                }
+            } else {
+                input.value = originalValue;
+            }
+            input.classList.remove('modified');
+        });
+
+        detectChanges();
+
+        // Mostrar mensaje temporal
+        const tempMsg = document.createElement('div');
+        tempMsg.className = 'alert alert-success';
+        tempMsg.innerHTML = 'Valores restaurados correctamente. <button type="button" class="alert-close" onclick="this.parentElement.remove()">×</button>';
+        document.querySelector('.messages-container').appendChild(tempMsg);
+
+        setTimeout(() => {
+            if (tempMsg.parentNode) {
+                tempMsg.remove();
+            }
+        }, 3000);
+    }
+
+    // Validaciones
+    function validateEmail(email) {
+        const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+        return emailRegex.test(email);
+    }
+
+    function validateURL(url) {
+        if (!url) return true; // Opcional
+        try {
+            new URL(url);
+            return url.startsWith('http://') || url.startsWith('https://');
+        } catch (_) {
+            return false;
+        }
+    }
+
+    // Validar formulario al enviar
+    form.addEventListener('submit', function(e) {
+        let valid = true;
+        const errorMessages = [];
+
+        // Validar campos requeridos
+        const requiredFields = form.querySelectorAll('[required]');
+        requiredFields.forEach(function(field) {
+            if (!field.value.trim()) {
+                valid = false;
+                field.classList.add('error');
+                const label = field.previousElementSibling?.textContent || 'Campo';
+                errorMessages.push(`"${label.replace(' *', '')}" es requerido.`);
+            } else {
+                field.classList.remove('error');
+            }
+        });
+
+        // Validar email
+        const emailInput = document.getElementById('emailInput');
+        if (emailInput.value && !validateEmail(emailInput.value)) {
+            valid = false;
+            emailInput.classList.add('error');
+            errorMessages.push('El email no tiene un formato válido.');
+        }
+
+        // Validar URL
+        const sitioWebInput = document.getElementById('sitiowebInput');
+        if (sitioWebInput.value && !validateURL(sitioWebInput.value)) {
+            valid = false;
+            sitioWebInput.classList.add('error');
+            errorMessages.push('La URL del sitio web no es válida. Debe comenzar con http:// o https://');
+        }
+
+        // Validar que haya cambios
+        const changes = Array.from(form.querySelectorAll('.modified'));
+        if (changes.length === 0 && valid) {
+            if (!confirm('No hay cambios detectados. ¿Deseas guardar de todas formas?')) {
+                e.preventDefault();
+                return;
+            }
+        }
+
+        if (!valid) {
+            e.preventDefault();
+
+            // Mostrar errores en un mensaje flotante
+            const errorDiv = document.createElement('div');
+            errorDiv.className = 'alert alert-danger';
+            errorDiv.innerHTML = `
+                <strong>Errores encontrados:</strong>
+                <ul style="margin: 10px 0 0 0; padding-left: 20px;">
+                    ${errorMessages.map(msg => `<li>${msg}</li>`).join('')}
+                </ul>
+                <button type="button" class="alert-close" onclick="this.parentElement.remove()">×</button>
+            `;
+
+            const messagesContainer = document.querySelector('.messages-container');
+            if (messagesContainer) {
+                messagesContainer.appendChild(errorDiv);
+            } else {
+                form.parentNode.insertBefore(errorDiv, form);
+            }
+
+            // Hacer scroll al primer error
+            const firstError = form.querySelector('.error');
+            if (firstError) {
+                firstError.scrollIntoView({ behavior: 'smooth', block: 'center' });
+                firstError.focus();
+            }
+        } else {
+            // Mostrar estado de carga
+            submitBtn.classList.add('btn-loading');
+            submitBtn.disabled = true;
+            submitBtn.querySelector('.btn-text').textContent = 'Guardando...';
+
+            // Actualizar timestamp
+            const now = new Date();
+            lastUpdate.textContent = now.toLocaleTimeString('es-MX', { 
+                hour: '2-digit', 
+                minute: '2-digit',
+                second: '2-digit'
+            }) + ' ' + now.toLocaleDateString('es-MX');
+        }
+    });
+
+    // Escuchar cambios en todos los campos
+    const allInputs = form.querySelectorAll('input, select, textarea');
+    allInputs.forEach(input => {
+        input.addEventListener('input', detectChanges);
+        input.addEventListener('change', detectChanges);
+    });
+
+    // Eventos específicos para país
+    paisSelect.addEventListener('change', function() {
+        togglePaisOtro();
+        detectChanges();
+    });
+
+    paisOtroInput.addEventListener('input', detectChanges);
+
+    // Auto-formatear teléfono
+    const telefonoInput = document.getElementById('telefonoInput');
+    telefonoInput.addEventListener('blur', function() {
+        let phone = this.value.replace(/[^\d+]/g, '');
+        if (phone.length > 0 && !phone.startsWith('+')) {
+            phone = '+52 ' + phone;
+        }
+        this.value = phone;
+        detectChanges();
+    });
+
+    // Auto-completar http:// en sitio web
+    const sitioWebInput = document.getElementById('sitiowebInput');
+    sitioWebInput.addEventListener('blur', function() {
+        let url = this.value.trim();
+        if (url && !url.startsWith('http://') && !url.startsWith('https://')) {
+            this.value = 'https://' + url;
+            detectChanges();
+        }
+    });
+
+    // Capitalizar nombre
+    const nombreInput = document.getElementById('nombreInput');
+    nombreInput.addEventListener('blur', function() {
+        if (this.value) {
+            const newValue = this.value
+                .toLowerCase()
+                .split(' ')
+                .map(word => word.charAt(0).toUpperCase() + word.slice(1))
+                .join(' ');
+
+            if (newValue !== this.value) {
+                this.value = newValue;
+                detectChanges();
+            }
+        }
+    });
+
+    // Inicializar
+    togglePaisOtro();
+    detectChanges();
+
+    // Asignar función reset al botón
+    resetBtn.onclick = resetForm;
+
+    // Configurar hora de última actualización
+    const now = new Date();
+    lastUpdate.textContent = now.toLocaleTimeString('es-MX', { 
+        hour: '2-digit', 
+        minute: '2-digit'
+    });
+});
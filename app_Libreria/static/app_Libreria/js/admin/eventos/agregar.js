@@ -0,0 +1,437 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('eventoForm');
+    const fechaInput = document.getElementById('fechaEvento');
+    const imagenInput = document.getElementById('imagenEvento');
+    const fileInfo = document.getElementById('fileInfo');
+    const previewDiv = document.getElementById('previewImagen');
+    const descripcionInput = document.getElementById('descripcionInput');
+    const charCount = document.getElementById('charCount');
+    const btnSubmit = document.getElementById('btnSubmit');
+
+    // Establecer fecha mínima como hoy
+    const hoy = new Date();
+    const fechaHoy = hoy.toISOString().slice(0, 16);
+    fechaInput.min = fechaHoy;
+
+    // Establecer valor predeterminado (mañana a las 19:00)
+    const manana = new Date();
+    manana.setDate(manana.getDate() + 1);
+    manana.setHours(19, 0, 0, 0);
+    const fechaManana = manana.toISOString().slice(0, 16);
+    fechaInput.value = fechaManana;
+
+    // Contador de caracteres para descripción
+    descripcionInput.addEventListener('input', function() {
+        const longitud = this.value.length;
+        charCount.textContent = longitud;
+
+        if (longitud > 500) {
+            charCount.style.color = '#dc3545';
+            this.style.borderColor = '#dc3545';
+        } else if (longitud > 450) {
+            charCount.style.color = '#ffc107';
+            this.style.borderColor = '#ffc107';
+        } else {
+            charCount.style.color = '#28a745';
+            this.style.borderColor = '#e1e5e9';
+        }
+    });
+
+    // Inicializar contador
+    descripcionInput.dispatchEvent(new Event('input'));
+
+    // Manejo de archivos
+    imagenInput.addEventListener('change', function() {
+        if (this.files && this.files[0]) {
+            const file = this.files[0];
+            fileInfo.textContent = file.name;
+            fileInfo.style.color = '#2e8b57';
+
+            // Validar tamaño (max 5MB)
+            if (file.size > 5 * 1024 * 1024) {
+                alert('La imagen es demasiado grande. Máximo 5MB.');
+                this.value = '';
+                fileInfo.textContent = 'Ningún archivo seleccionado';
+                fileInfo.style.color = '#6c757d';
+                previewDiv.style.display = 'none';
+                return;
+            }
+
+            // Validar tipo
+            const validTypes = ['image/jpeg', 'image/png', 'image/gif'];
+            if (!validTypes.includes(file.type)) {
+                alert('Formato de imagen no válido. Use JPG, PNG o GIF.');
+                this.value = '';
+                fileInfo.textContent = 'Ningún archivo seleccionado';
+                fileInfo.style.color = '#6c757d';
+                previewDiv.style.display = 'none';
+                return;
+            }
+
+            // Mostrar preview
+            const reader = new FileReader();
+            reader.onload = function(e) {
+                previewDiv.innerHTML = '';
+                const img = document.createElement('img');
+                img.src = e.target.result;
+                img.alt = 'Previsualización de imagen';
+                previewDiv.appendChild(img);
+                previewDiv.style.display = 'block';
+            };
+            reader.readAsDataURL(file);
+        } else {
+            fileInfo.textContent = 'Ningún archivo seleccionado';
+            fileInfo.style.color = '#6c757d';
+            previewDiv.style.display = 'none';
+        }
+    });
+
+    // Validar formulario al enviar
+    form.addEventListener('submit', function(e) {
+        let valid = true;
+        const errorMessages = [];
+
+        // Validar campos requeridos
+        const requiredFields = form.querySelectorAll('[required]');
+        requiredFields.forEach(function(field) {
+            if (!field.value.trim()) {
+                valid = false;
+                field.style.borderColor = '#dc3545';
+                const label = field.previousElementSibling?.textContent || 'Campo';
+                errorMessages.push(`"${label.replace(' *', '')}" es requerido.`);
+            } else {
+                field.style.borderColor = '';
+            }
+        });
+
+        // Validar descripción (máximo 500 caracteres)
+        if (descripcionInput.value.length > 500) {
+            valid = false;
+            descripcionInput.style.borderColor = '#dc3545';
+            errorMessages.push('La descripción no puede tener más de 500 caracteres.');
+        }
+
+        // Validar fecha futura
+        const fechaEvento = new Date(fechaInput.value);
+        if (fechaEvento <= hoy) {
+            valid = false;
+            fechaInput.style.borderColor = '#dc3545';
+            errorMessages.push('La fecha del evento debe ser futura.');
+        }
+
+        // Validar precio no negativo
+        const precioInput = document.getElementById('precioInput');
+        if (parseFloat(precioInput.value) < 0) {
+            valid = false;
+            precioInput.style.borderColor = '#dc3545';
+            errorMessages.push('El precio no puede ser negativo.');
+        }
+
+        if (!valid) {
+            e.preventDefault();
+
+            // Mostrar errores
+            const errorDiv = document.createElement('div');
+            errorDiv.className = 'alert alert-danger';
+            errorDiv.innerHTML = `
+                <strong>Errores encontrados:</strong>
+                <ul style="margin: 10px 0 0 0; padding-left: 20px;">
+                    ${errorMessages.map(msg => `<li>${msg}</li>`).join('')}
+                </ul>
+                <button type="button" class="alert-close" onclick="this.parentElement.remove()">×</button>
+            `;
+
+            const messagesContainer = document.querySelector('.messages-container');
+            if (messagesContainer) {
+                messagesContainer.appendChild(errorDiv);
+            } else {
+                form.parentNode.insertBefore(errorDiv, form);
+            }
+
+            // Hacer scroll al primer error
+            const firstError = form.querySelector('[style*="border-color: #dc3545"]');
+            if (firstError) {
+                firstError.scrollIntoView({ behavior: 'smooth', block: 'center' });
+                firstError.focus();
+            }
+        } else {
+            // Mostrar estado de carga
+            btnSubmit.classList.add('btn-loading');
+            btnSubmit.disabled = true;
+            btnSubmit.querySelector('.btn-text').textContent = 'Guardando...';
+        }
+    });
+
+    // Auto-resize del textarea
+    descripcionInput.addEventListener('input', function() {
+        this.style.height = 'auto';
+        this.style.height = (this.scrollHeight) + 'px';
+    });
+
+    // Inicializar auto-resize
+    descripcionInput.dispatchEvent(new Event('input'));
+});
+
+// Previsualizar evento
+window.previsualizarEvento = function() {
+    const titulo = document.getElementById('tituloInput').value || '[Sin título]';
+    const descripcion = document.getElementById('descripcionInput').value || '[Sin descripción]';
+    const fecha = document.getElementById('fechaEvento').value;
+    const categoriaSelect = document.getElementById('categoriaSelect');
+    const categoria = categoriaSelect.options[categoriaSelect.selectedIndex]?.text || 'Sin categoría';
+    const ubicacion = document.getElementById('ubicacionInput').value || '[Sin ubicación]';
+    const capacidad = document.getElementById('capacidadInput').value || '50';
+    const precio = document.getElementById('precioInput').value || '0';
+    const activo = document.getElementById('activo').checked ? 'Activo' : 'Inactivo';
+
+    // Formatear fecha
+    let fechaFormateada = 'Fecha no seleccionada';
+    if (fecha) {
+        const fechaObj = new Date(fecha);
+        fechaFormateada = fechaObj.toLocaleDateString('es-ES', {
+            weekday: 'long',
+            year: 'numeric',
+            month: 'long',
+            day: 'numeric',
+            hour: '2-digit',
+            minute: '2-digit'
+        });
+    }
+
+    // Construir contenido del modal
+    const modalContent = document.getElementById('previewContent');
+    modalContent.innerHTML = `
+        <div class="evento-preview">
+            <div class="preview-header">
+                <span class="categoria-badge">${categoria}</span>
+                <span class="estado-badge ${activo === 'Activo' ? 'activo' : 'inactivo'}">
+                    ${activo}
+                </span>
+            </div>
+
+            <h2 class="preview-titulo">${titulo}</h2>
+
+            <div class="preview-descripcion">
+                <h4>Descripción:</h4>
+                <p>${descripcion}</p>
+            </div>
+
+            <div class="preview-detalles">
+                <div class="detalle-item">
+                    <div class="detalle-icon">📅</div>
+                    <div class="detalle-content">
+                        <strong>Fecha y Hora:</strong>
+                        <span>${fechaFormateada}</span>
+                    </div>
+                </div>
+
+                <div class="detalle-item">
+                    <div class="detalle-icon">📍</div>
+                    <div class="detalle-content">
+                        <strong>Ubicación:</strong>
+                        <span>${ubicacion}</span>
+                    </div>
+                </div>
+
+                <div class="detalle-item">
+                    <div class="detalle-icon">👥</div>
+                    <div class="detalle-content">
+                        <strong>Capacidad:</strong>
+                        <span>${capacidad} personas</span>
+                    </div>
+                </div>
+
+                <div class="detalle-item">
+                    <div class="detalle-icon">💰</div>
+                    <div class="detalle-content">
+                        <strong>Precio:</strong>
+                        <span class="precio">${precio === '0' ? '🎉 Gratuito' : '$' + parseFloat(precio).toFixed(2)}</span>
+                    </div>
+                </div>
+            </div>
+
+            <div class="preview-image" id="previewImageModal">
+                ${document.getElementById('previewImagen').innerHTML || '<p class="no-image">🎨 No hay imagen seleccionada</p>'}
+            </div>
+
+            <div class="preview-nota">
+                <p>📝 <strong>Nota:</strong> Esta es una previsualización de cómo se verá el evento en la página pública.</p>
+            </div>
+        </div>
+
+        <style>
+            .evento-preview {
+                color: #333;
+            }
+
+            .preview-header {
+                display: flex;
+                justify-content: space-between;
+                align-items: center;
+                margin-bottom: 20px;
+                flex-wrap: wrap;
+                gap: 10px;
+            }
+
+            .categoria-badge {
+                background: linear-gradient(135deg, #2e8b57 0%, #3cb371 100%);
+                color: white;
+                padding: 6px 15px;
+                border-radius: 20px;
+                font-size: 0.9rem;
+                font-weight: 500;
+            }
+
+            .estado-badge {
+                padding: 6px 15px;
+                border-radius: 20px;
+                font-size: 0.9rem;
+                font-weight: 500;
+            }
+
+            .estado-badge.activo {
+                background: #28a745;
+                color: white;
+            }
+
+            .estado-badge.inactivo {
+                background: #6c757d;
+                color: white;
+            }
+
+            .preview-titulo {
+                color: #2e8b57;
+                margin-bottom: 20px;
+                font-size: 1.8rem;
+                border-bottom: 2px solid #e9ecef;
+                padding-bottom: 15px;
+            }
+
+            .preview-descripcion {
+                background: #f8f9fa;
+                padding: 20px;
+                border-radius: 8px;
+                margin-bottom: 25px;
+                border-left: 4px solid #2e8b57;
+            }
+
+            .preview-descripcion h4 {
+                color: #495057;
+                margin-bottom: 10px;
+            }
+
+            .preview-descripcion p {
+                line-height: 1.6;
+                color: #6c757d;
+            }
+
+            .preview-detalles {
+                display: grid;
+                grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+                gap: 20px;
+                margin-bottom: 25px;
+            }
+
+            .detalle-item {
+                display: flex;
+                gap: 15px;
+                align-items: flex-start;
+                padding: 15px;
+                background: white;
+                border: 1px solid #e9ecef;
+                border-radius: 8px;
+                transition: transform 0.2s;
+            }
+
+            .detalle-item:hover {
+                transform: translateY(-3px);
+                box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+            }
+
+            .detalle-icon {
+                font-size: 1.5rem;
+                color: #2e8b57;
+            }
+
+            .detalle-content {
+                flex: 1;
+            }
+
+            .detalle-content strong {
+                display: block;
+                color: #495057;
+                font-size: 0.9rem;
+                margin-bottom: 5px;
+            }
+
+            .detalle-content span {
+                color: #2e8b57;
+                font-weight: 500;
+                font-size: 1rem;
+            }
+
+            .detalle-content .precio {
+                color: #28a745;
+                font-weight: 600;
+                font-size: 1.1rem;
+            }
+
+            .preview-image {
+                margin: 25px 0;
+                text-align: center;
+            }
+
+            .preview-image img {
+                max-width: 100%;
+                max-height: 300px;
+                border-radius: 8px;
+                box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+            }
+
+            .no-image {
+                color: #6c757d;
+                font-style: italic;
+                padding: 30px;
+                background: #f8f9fa;
+                border-radius: 8px;
+                border: 2px dashed #dee2e6;
+            }
+
+            .preview-nota {
+                background: #fff9e6;
+                border: 1px solid #ffeaa7;
+                border-radius: 8px;
+                padding: 15px;
+                margin-top: 25px;
+                color: #856404;
+                font-size: 0.95rem;
+            }
+        </style>
+    `;
+
+    // Mostrar modal
+    const modal = document.getElementById('previewModal');
+    modal.style.display = 'flex';
+    document.body.style.overflow = 'hidden';
+};
+
+// Cerrar modal de previsualización
+window.closePreviewModal = function() {
+    const modal = document.getElementById('previewModal');
+    modal.style.display = 'none';
+    document.body.style.overflow = 'auto';
+};
+
+// Cerrar modal con ESC
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape') {
+        closePreviewModal();
+    }
+});
+
+// Cerrar modal al hacer clic fuera
+document.getElementById('previewModal').addEventListener('click', function(e) {
+    if (e.target === this) {
+        closePreviewModal();
+    }
+});
@@ -0,0 +1,211 @@
+// Variables para el control de eliminación
+let countdownInterval = null;
+let countdownSeconds = 10;
+let allConfirmationsChecked = false;
+
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.getElementById('formEliminar');
+    const btnEliminar = document.getElementById('btnEliminar');
+    const textConfirmation = document.getElementById('textConfirmation');
+    const confirmationHint = document.getElementById('confirmationHint');
+    const requiredText = 'ELIMINAR EVENTO';
+
+    // Checkboxes de confirmación
+    const checkboxes = [
+        document.getElementById('confirmarEliminar'),
+        document.getElementById('confirmarConsecuencias'),
+        document.getElementById('confirmarResponsabilidad')
+    ];
+
+    // Función para validar todas las confirmaciones
+    function validateConfirmations() {
+        const allChecked = checkboxes.every(checkbox => checkbox.checked);
+        const textMatches = textConfirmation.value.toUpperCase() === requiredText;
+
+        allConfirmationsChecked = allChecked && textMatches;
+
+        if (allConfirmationsChecked) {
+            btnEliminar.disabled = false;
+            textConfirmation.classList.remove('error');
+            textConfirmation.classList.add('success');
+            confirmationHint.innerHTML = '✅ Todas las confirmaciones completadas';
+            confirmationHint.style.color = '#28a745';
+        } else {
+            btnEliminar.disabled = true;
+            if (textConfirmation.value && !textMatches) {
+                textConfirmation.classList.add('error');
+                textConfirmation.classList.remove('success');
+                confirmationHint.innerHTML = `❌ Debes escribir exactamente "${requiredText}"`;
+                confirmationHint.style.color = '#dc3545';
+            } else {
+                textConfirmation.classList.remove('error', 'success');
+                confirmationHint.innerHTML = '❌ Todas las confirmaciones son requeridas';
+                confirmationHint.style.color = '#721c24';
+            }
+        }
+    }
+
+    // Escuchar cambios en checkboxes
+    checkboxes.forEach(checkbox => {
+        checkbox.addEventListener('change', validateConfirmations);
+    });
+
+    // Escuchar entrada de texto
+    textConfirmation.addEventListener('input', function() {
+        // Convertir automáticamente a mayúsculas
+        this.value = this.value.toUpperCase();
+        validateConfirmations();
+    });
+
+    // Validación al enviar formulario
+    form.addEventListener('submit', function(e) {
+        if (!allConfirmationsChecked) {
+            e.preventDefault();
+            alert('❌ Debes completar todas las confirmaciones para proceder con la eliminación.');
+            return false;
+        }
+
+        // Confirmación final
+        if (!confirm(`⚠️ ADVERTENCIA FINAL\n\n¿Estás absolutamente seguro de eliminar el evento?\n\n✅ Esta acción es PERMANENTE\n✅ No se puede recuperar\n✅ Se perderán todos los datos\n\nPara confirmar, haz clic en "Aceptar"`)) {
+            e.preventDefault();
+            return false;
+        }
+
+        // Mostrar cuenta regresiva
+        e.preventDefault();
+        showCountdown();
+    });
+
+    // Inicializar validación
+    validateConfirmations();
+});
+
+// Mostrar cuenta regresiva
+function showCountdown() {
+    const countdownBox = document.getElementById('countdownBox');
+    const countdownTimer = document.getElementById('countdownTimer');
+    const btnEliminar = document.getElementById('btnEliminar');
+
+    // Mostrar caja de cuenta regresiva
+    countdownBox.style.display = 'block';
+
+    // Deshabilitar botón de eliminar
+    btnEliminar.disabled = true;
+    btnEliminar.innerHTML = '<span class="btn-icon">⏳</span><span class="btn-text">Eliminación en progreso...</span>';
+
+    // Iniciar cuenta regresiva
+    countdownSeconds = 10;
+    countdownTimer.textContent = countdownSeconds;
+
+    countdownInterval = setInterval(function() {
+        countdownSeconds--;
+        countdownTimer.textContent = countdownSeconds;
+
+        if (countdownSeconds <= 0) {
+            clearInterval(countdownInterval);
+
+            // Cambiar texto del botón
+            btnEliminar.innerHTML = '<span class="btn-icon">🗑️</span><span class="btn-text">¡Evento eliminado!</span>';
+            btnEliminar.style.background = 'linear-gradient(135deg, #28a745 0%, #20c997 100%)';
+
+            // Enviar formulario después de un breve delay
+            setTimeout(function() {
+                document.getElementById('formEliminar').submit();
+            }, 1000);
+        }
+    }, 1000);
+}
+
+// Cancelar cuenta regresiva
+window.cancelCountdown = function() {
+    if (countdownInterval) {
+        clearInterval(countdownInterval);
+        countdownInterval = null;
+    }
+
+    const countdownBox = document.getElementById('countdownBox');
+    const btnEliminar = document.getElementById('btnEliminar');
+
+    // Ocultar cuenta regresiva
+    countdownBox.style.display = 'none';
+
+    // Restaurar botón
+    btnEliminar.disabled = !allConfirmationsChecked;
+    btnEliminar.innerHTML = '<span class="btn-icon">🗑️</span><span class="btn-text">Eliminar Permanentemente</span>';
+    btnEliminar.style.background = '';
+
+    // Mostrar mensaje
+    const tempMsg = document.createElement('div');
+    tempMsg.className = 'alert alert-info';
+    tempMsg.innerHTML = '✅ Eliminación cancelada. El evento se ha preservado. <button type="button" class="alert-close" onclick="this.parentElement.remove()">×</button>';
+
+    const formActions = document.querySelector('.form-actions');
+    formActions.parentNode.insertBefore(tempMsg, formActions);
+
+    setTimeout(() => {
+        if (tempMsg.parentNode) {
+            tempMsg.remove();
+        }
+    }, 3000);
+};
+
+// Mostrar alternativas
+window.showAlternatives = function() {
+    const alternativesBox = document.getElementById('alternativesBox');
+    alternativesBox.style.display = 'block';
+
+    // Hacer scroll suave
+    alternativesBox.scrollIntoView({ behavior: 'smooth', block: 'start' });
+};
+
+// Ocultar alternativas
+window.hideAlternatives = function() {
+    const alternativesBox = document.getElementById('alternativesBox');
+    alternativesBox.style.display = 'none';
+};
+
+// Exportar datos del evento (simulado)
+window.exportEventData = function() {
+    alert('📋 Exportando datos del evento...\n\nEsta funcionalidad exportaría:\n• Información del evento\n• Imágenes relacionadas\n• Estadísticas\n• Historial de cambios\n\n(En una implementación real, esto generaría un archivo ZIP con todos los datos)');
+
+    // Mostrar mensaje de éxito
+    const tempMsg = document.createElement('div');
+    tempMsg.className = 'alert alert-success';
+    tempMsg.innerHTML = '✅ Datos exportados correctamente. Se ha generado un archivo de respaldo. <button type="button" class="alert-close" onclick="this.parentElement.remove()">×</button>';
+
+    const alternativesContent = document.querySelector('.alternatives-content');
+    alternativesContent.parentNode.insertBefore(tempMsg, alternativesContent);
+
+    setTimeout(() => {
+        if (tempMsg.parentNode) {
+            tempMsg.remove();
+        }
+    }, 3000);
+};
+
+// Prevenir teclas no deseadas en la confirmación de texto
+document.addEventListener('keydown', function(e) {
+    const textConfirmation = document.getElementById('textConfirmation');
+    if (document.activeElement === textConfirmation) {
+        // Permitir solo letras, espacio, backspace, delete, flechas
+        if (!/[a-zA-Z\s]|Backspace|Delete|ArrowLeft|ArrowRight|ArrowUp|ArrowDown/.test(e.key)) {
+            e.preventDefault();
+        }
+    }
+
+    // Prevenir atajos de teclado peligrosos
+    if ((e.ctrlKey && e.key === 'Enter') || (e.key === 'F5')) {
+        if (allConfirmationsChecked) {
+            e.preventDefault();
+            alert('⚠️ Confirmación requerida\n\nUsa el botón "Eliminar Permanentemente" para proceder.');
+        }
+    }
+});
+
+// Bloquear clic derecho en la página
+document.addEventListener('contextmenu', function(e) {
+    if (e.target.closest('.delete-card')) {
+        e.preventDefault();
+        alert('⚠️ Acción de eliminación en progreso. Por favor, usa los controles proporcionados.');
+    }
+});
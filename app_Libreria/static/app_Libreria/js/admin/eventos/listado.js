@@ -0,0 +1,98 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const hoy = new Date().toISOString().split('T')[0];
+
+    // Filtro de eventos
+    const filtroSelect = document.getElementById('filtroEventos');
+    if (filtroSelect) {
+        filtroSelect.addEventListener('change', function() {
+            const filtro = this.value;
+            const filas = document.querySelectorAll('.fila-evento');
+
+            filas.forEach(fila => {
+                const fecha = fila.getAttribute('data-fecha');
+                const activo = fila.getAttribute('data-activo') === 'True';
+                const fechaEvento = new Date(fecha);
+                const hoyDate = new Date();
+
+                let mostrar = true;
+
+                switch(filtro) {
+                    case 'proximos':
+                        mostrar = fechaEvento > hoyDate && activo;
+                        break;
+                    case 'pasados':
+                        mostrar = fechaEvento <= hoyDate;
+                        break;
+                    case 'activos':
+                        mostrar = activo;
+                        break;
+                    case 'todos':
+                    default:
+                        mostrar = true;
+                }
+
+                fila.style.display = mostrar ? '' : 'none';
+            });
+        });
+    }
+
+    // Ordenamiento
+    const ordenSelect = document.getElementById('ordenEventos');
+    if (ordenSelect) {
+        ordenSelect.addEventListener('change', function() {
+            const orden = this.value;
+            const tabla = document.getElementById('tablaEventos');
+            const filas = Array.from(document.querySelectorAll('.fila-evento'));
+
+            if (filas.length === 0) return;
+
+            filas.sort((a, b) => {
+                const tituloA = a.cells[2].textContent.toLowerCase();
+                const tituloB = b.cells[2].textContent.toLowerCase();
+                const fechaA = new Date(a.getAttribute('data-fecha'));
+                const fechaB = new Date(b.getAttribute('data-fecha'));
+
+                switch(orden) {
+                    case 'fecha_asc':
+                        return fechaA - fechaB;
+                    case 'fecha_desc':
+                        return fechaB - fechaA;
+                    case 'titulo':
+                        return tituloA.localeCompare(tituloB);
+                    default:
+                        return 0;
+                }
+            });
+
+            // Reordenar filas en la tabla
+            const tbody = tabla.querySelector('tbody');
+            filas.forEach(fila => tbody.appendChild(fila));
+        });
+    }
+
+    // Animación para estadísticas
+    const statCards = document.querySelectorAll('.stat-card');
+    statCards.forEach(card => {
+        card.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-5px)';
+            this.style.boxShadow = '0 8px 16px rgba(0, 0, 0, 0.2)';
+        });
+
+        card.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+            this.style.boxShadow = 'var(--sombra)';
+        });
+    });
+
+    // Efecto hover mejorado para filas
+    const tableRows = document.querySelectorAll('.table-row');
+    tableRows.forEach(row => {
+        row.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateX(5px)';
+        });
+
+        row.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateX(0)';
+        });
+    });
+});
@@ -0,0 +1,195 @@
+// Funciones del panel
+function exportarDatos() {
+    if (confirm('¿Deseas exportar los datos de la librería?')) {
+        // Simulación de exportación
+        const btn = event.target;
+        const originalText = btn.innerHTML;
+
+        btn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Exportando...';
+        btn.disabled = true;
+
+        setTimeout(() => {
+            btn.innerHTML = '<i class="fas fa-check"></i> ¡Exportado!';
+            setTimeout(() => {
+                btn.innerHTML = originalText;
+                btn.disabled = false;
+            }, 1500);
+
+            alert('Los datos han sido exportados exitosamente.');
+        }, 2000);
+    }
+}
+
+function generarReporte() {
+    if (confirm('¿Generar reporte mensual?')) {
+        // Simulación de generación de reporte
+        alert('Reporte generado. Se descargará automáticamente.');
+        // En producción, redirigirías a una vista que genera el reporte
+    }
+}
+
+// Estilos CSS para el panel de administración
+const adminStyle = document.createElement('style');
+adminStyle.textContent = `
+    .admin-btn-primary {
+        background: linear-gradient(135deg, var(--verde-principal), var(--verde-oscuro));
+        color: white;
+        padding: 12px 20px;
+        border-radius: var(--radio-md);
+        text-decoration: none;
+        display: flex;
+        align-items: center;
+        gap: 10px;
+        font-weight: 600;
+        transition: var(--transicion-media);
+        border: none;
+        cursor: pointer;
+        text-align: left;
+    }
+
+    .admin-btn-primary:hover {
+        transform: translateY(-3px);
+        box-shadow: var(--sombra-mediana);
+        background: linear-gradient(135deg, var(--verde-oscuro), var(--verde-principal));
+    }
+
+    .admin-btn-secondary {
+        background-color: white;
+        color: var(--verde-principal);
+        padding: 12px 20px;
+        border-radius: var(--radio-md);
+        text-decoration: none;
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        gap: 10px;
+        font-weight: 600;
+        transition: var(--transicion-media);
+        border: 2px solid var(--verde-principal);
+        cursor: pointer;
+        text-align: center;
+    }
+
+    .admin-btn-secondary:hover {
+        background-color: var(--verde-principal);
+        color: white;
+        transform: translateY(-3px);
+        box-shadow: var(--sombra-suave);
+    }
+
+    .admin-access-btn {
+        padding: 10px 20px;
+        border-radius: var(--radio-md);
+        text-decoration: none;
+        display: inline-flex;
+        align-items: center;
+        gap: 8px;
+        font-weight: 600;
+        transition: var(--transicion-media);
+    }
+
+    .admin-access-btn:hover {
+        transform: translateY(-3px);
+        box-shadow: var(--sombra-suave);
+        opacity: 0.9;
+    }
+
+    /* Estilos para tarjetas de ventas */
+    a[style*="background-color: var(--gris-claro)"]:hover {
+        background-color: var(--verde-muy-claro) !important;
+        transform: translateX(5px);
+        transition: var(--transicion-media);
+    }
+
+    /* Scrollbar personalizado */
+    div[style*="overflow-y: auto"]::-webkit-scrollbar {
+        width: 6px;
+    }
+
+    div[style*="overflow-y: auto"]::-webkit-scrollbar-track {
+        background: var(--gris-claro);
+        border-radius: 3px;
+    }
+
+    div[style*="overflow-y: auto"]::-webkit-scrollbar-thumb {
+        background: var(--verde-principal);
+        border-radius: 3px;
+    }
+
+    /* Responsive */
+    @media (max-width: 768px) {
+        .admin-grid {
+            grid-template-columns: 1fr !important;
+        }
+
+        .stats-grid {
+            grid-template-columns: repeat(2, 1fr) !important;
+        }
+
+        .quick-actions-grid {
+            grid-template-columns: repeat(2, 1fr) !important;
+        }
+    }
+
+    @media (max-width: 480px) {
+        .stats-grid {
+            grid-template-columns: 1fr !important;
+        }
+
+        .quick-actions-grid {
+            grid-template-columns: 1fr !important;
+        }
+    }
+
+    /* Animaciones */
+    @keyframes pulse {
+        0% { transform: scale(1); }
+        50% { transform: scale(1.05); }
+        100% { transform: scale(1); }
+    }
+
+    .admin-btn-primary:active, .admin-btn-secondary:active {
+        animation: pulse 0.2s ease;
+    }
+`;
+document.head.appendChild(adminStyle);
+
+// Inicialización de efectos
+document.addEventListener('DOMContentLoaded', function() {
+    // Efecto hover en estadísticas
+    const statCards = document.querySelectorAll('div[style*="background: linear-gradient"]');
+    statCards.forEach(card => {
+        card.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-5px)';
+            this.style.transition = 'transform 0.3s ease';
+        });
+
+        card.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+        });
+    });
+
+    // Actualizar hora actual en tiempo real
+    function actualizarHora() {
+        const ahora = new Date();
+        const horaElement = document.getElementById('hora-actual');
+        if (horaElement) {
+            horaElement.textContent = ahora.toLocaleTimeString('es-ES', {
+                hour: '2-digit',
+                minute: '2-digit',
+                second: '2-digit'
+            });
+        }
+    }
+
+    // Crear elemento de hora si no existe
+    const horaContainer = document.createElement('div');
+    horaContainer.style.cssText = 'text-align: center; margin-top: var(--espacio-md); color: var(--gris-medio); font-size: 0.9rem;';
+    horaContainer.innerHTML = '<i class="far fa-clock"></i> Hora actual: <span id="hora-actual"></span>';
+
+    const contentBlock = document.querySelector('div[style*="ESTADÍSTICAS DE HOY"]').parentElement;
+    contentBlock.parentElement.insertBefore(horaContainer, contentBlock.nextElementSibling);
+
+    actualizarHora();
+    setInterval(actualizarHora, 1000);
+});
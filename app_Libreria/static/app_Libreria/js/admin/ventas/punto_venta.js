@@ -0,0 +1,60 @@
+// Punto de venta: cada código escaneado agrega una línea con un campo oculto
+// "codigos"; el servidor vuelve a validar todo al cobrar.
+(function () {
+    const form = document.getElementById('puntoVentaForm');
+    const entrada = document.getElementById('codigoEscaneado');
+    const aviso = document.getElementById('avisoEscaneo');
+    const cuerpo = document.getElementById('lineasEscaneadas');
+    let subtotal = 0;
+    let unidades = 0;
+
+    function actualizarTotales() {
+        document.getElementById('subtotalEscaneado').textContent = `$${subtotal.toFixed(2)}`;
+        document.getElementById('unidadesEscaneadas').textContent = unidades;
+    }
+
+    function agregarLinea(codigo, libro) {
+        const precio = parseFloat(libro.precio);
+        const fila = document.createElement('tr');
+        fila.innerHTML = '<td></td><td class="text-end"></td>' +
+            '<td class="text-end"><button type="button" class="btn btn-danger btn-sm">🗑️</button>' +
+            '<input type="hidden" name="codigos"></td>';
+        fila.cells[0].textContent = libro.titulo;
+        fila.cells[1].textContent = `$${precio.toFixed(2)}`;
+        fila.querySelector('input').value = codigo;
+        fila.querySelector('button').addEventListener('click', function () {
+            fila.remove();
+            subtotal -= precio;
+            unidades -= 1;
+            actualizarTotales();
+            entrada.focus();
+        });
+        cuerpo.appendChild(fila);
+        subtotal += precio;
+        unidades += 1;
+        actualizarTotales();
+    }
+
+    entrada.addEventListener('keydown', function (e) {
+        if (e.key !== 'Enter') return;
+        e.preventDefault();
+        const codigo = entrada.value.trim();
+        entrada.value = '';
+        if (!codigo) return;
+
+        fetch(form.dataset.urlIsbn.replace('CODIGO', encodeURIComponent(codigo)))
+            .then(function (respuesta) {
+                if (!respuesta.ok) throw new Error('No encontrado');
+                return respuesta.json();
+            })
+            .then(function (libro) {
+                agregarLinea(codigo, libro);
+                aviso.textContent = libro.stock > 0 ? `${libro.titulo} (stock: ${libro.stock})` : `${libro.titulo}: sin stock`;
+                aviso.className = libro.stock > 0 ? 'text-muted' : 'text-danger';
+            })
+            .catch(function () {
+                aviso.textContent = `Código no encontrado: ${codigo}`;
+                aviso.className = 'text-danger';
+            });
+    });
+})();
@@ -0,0 +1,137 @@
+// Toggle de visibilidad de contraseña
+const togglePasswordBtn = document.getElementById('togglePasswordBtn');
+const passwordInput = document.getElementById('password');
+const eyeOpen = document.querySelector('.eye-open');
+const eyeClosed = document.querySelector('.eye-closed');
+
+if (togglePasswordBtn && passwordInput) {
+    togglePasswordBtn.addEventListener('click', function() {
+        const isPassword = passwordInput.type === 'password';
+
+        passwordInput.type = isPassword ? 'text' : 'password';
+        eyeOpen.style.display = isPassword ? 'none' : 'block';
+        eyeClosed.style.display = isPassword ? 'block' : 'none';
+
+        // Enfocar el input después de cambiar
+        passwordInput.focus();
+    });
+}
+
+// Manejo del formulario
+const clientLoginForm = document.getElementById('clientLoginForm');
+const loginSubmitBtn = document.getElementById('loginSubmitBtn');
+
+if (clientLoginForm) {
+    clientLoginForm.addEventListener('submit', function(e) {
+        const username = document.getElementById('username').value.trim();
+        const password = document.getElementById('password').value;
+
+        // Validación básica
+        if (!username || !password) {
+            e.preventDefault();
+            showMessage('Por favor completa todos los campos', 'error');
+            return;
+        }
+
+        // Mostrar estado de loading
+        loginSubmitBtn.classList.add('loading');
+        loginSubmitBtn.disabled = true;
+
+        // El formulario se enviará normalmente
+    });
+}
+
+// Función para mostrar mensajes
+function showMessage(text, type = 'info') {
+    const messagesContainer = document.querySelector('.login-messages');
+    if (!messagesContainer) return;
+
+    const message = document.createElement('div');
+    message.className = `message message-${type}`;
+    message.innerHTML = `
+        <div class="message-icon">
+            <svg viewBox="0 0 24 24">
+                <path d="M12 2C6.48 2 2 6.48 2 12s4.48 10 10 10 10-4.48 10-10S17.52 2 12 2zm1 15h-2v-6h2v6zm0-4h-2V7h2v6z"/>
+            </svg>
+        </div>
+        <div class="message-content">
+            <p>${text}</p>
+        </div>
+    `;
+
+    messagesContainer.appendChild(message);
+
+    // Auto-remove después de 5 segundos
+    setTimeout(() => {
+        if (message.parentElement) {
+            message.style.animation = 'fadeOut 0.3s ease';
+            setTimeout(() => message.remove(), 300);
+        }
+    }, 5000);
+}
+
+// Modal de registro
+function showRegisterModal() {
+    const modal = document.getElementById('registerModal');
+    if (modal) {
+        modal.classList.add('show');
+        document.body.style.overflow = 'hidden';
+    }
+}
+
+function closeRegisterModal() {
+    const modal = document.getElementById('registerModal');
+    if (modal) {
+        modal.classList.remove('show');
+        document.body.style.overflow = '';
+    }
+}
+
+// Función para contraseña olvidada (placeholder)
+function showForgotPassword() {
+    showMessage('Para recuperar tu contraseña, contacta con soporte: soporte@libreria.com', 'info');
+}
+
+// Cerrar modal con ESC
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape') {
+        closeRegisterModal();
+    }
+});
+
+// Cerrar modal haciendo clic fuera
+document.getElementById('registerModal')?.addEventListener('click', function(e) {
+    if (e.target === this) {
+        closeRegisterModal();
+    }
+});
+
+// Auto-focus en el campo de usuario
+document.addEventListener('DOMContentLoaded', function() {
+    const usernameField = document.getElementById('username');
+    if (usernameField) {
+        usernameField.focus();
+    }
+
+    // Agregar animación de fadeOut
+    const style = document.createElement('style');
+    style.textContent = `
+        @keyframes fadeOut {
+            from {
+                opacity: 1;
+                transform: translateY(0);
+            }
+            to {
+                opacity: 0;
+                transform: translateY(-10px);
+            }
+        }
+    `;
+    document.head.appendChild(style);
+
+    // Animación de entrada para beneficios
+    const benefitItems = document.querySelectorAll('.benefit-item');
+    benefitItems.forEach((item, index) => {
+        item.style.animationDelay = `${index * 0.1}s`;
+    });
+});
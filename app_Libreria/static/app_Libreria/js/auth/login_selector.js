@@ -0,0 +1,77 @@
+// Modal de ayuda
+function showHelp() {
+    const modal = document.getElementById('helpModal');
+    if (modal) {
+        modal.classList.add('show');
+        document.body.style.overflow = 'hidden';
+    }
+}
+
+function closeHelpModal() {
+    const modal = document.getElementById('helpModal');
+    if (modal) {
+        modal.classList.remove('show');
+        document.body.style.overflow = '';
+    }
+}
+
+// Cerrar modal con ESC
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape') {
+        closeHelpModal();
+    }
+});
+
+// Cerrar modal haciendo clic fuera
+document.getElementById('helpModal')?.addEventListener('click', function(e) {
+    if (e.target === this) {
+        closeHelpModal();
+    }
+});
+
+// Efectos hover en las opciones
+document.addEventListener('DOMContentLoaded', function() {
+    const optionCards = document.querySelectorAll('.option-card');
+
+    optionCards.forEach(card => {
+        card.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-4px)';
+        });
+
+        card.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+        });
+    });
+
+    // Animación de entrada escalonada
+    const optionClient = document.querySelector('.option-client');
+    const optionAdmin = document.querySelector('.option-admin');
+
+    if (optionClient) {
+        optionClient.style.animationDelay = '0.1s';
+        optionClient.style.animation = 'slideUp 0.5s ease 0.1s both';
+    }
+
+    if (optionAdmin) {
+        optionAdmin.style.animationDelay = '0.2s';
+        optionAdmin.style.animation = 'slideUp 0.5s ease 0.2s both';
+    }
+
+    // Mostrar modal de ayuda en primer acceso (solo una vez)
+    const firstAccess = !localStorage.getItem('selector_first_access');
+    if (firstAccess) {
+        setTimeout(() => {
+            showHelp();
+            localStorage.setItem('selector_first_access', 'true');
+        }, 1000);
+    }
+});
+
+// Trackeo de selección
+document.querySelectorAll('.option-card').forEach(card => {
+    card.addEventListener('click', function() {
+        const option = this.classList.contains('option-client') ? 'cliente' : 'admin';
+        console.log(`Usuario seleccionó: ${option}`);
+        // Aquí podrías agregar tracking de analytics
+    });
+});
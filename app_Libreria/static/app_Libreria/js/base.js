@@ -0,0 +1,329 @@
+// Mostrar fecha actual en el footer
+document.getElementById('fecha-actual').textContent = new Date().toLocaleDateString('es-ES', {
+    year: 'numeric',
+    month: 'long',
+    day: 'numeric'
+});
+
+// Menu toggle para móviles
+const mobileMenuToggle = document.getElementById('mobileMenuToggle');
+const navMain = document.getElementById('navMain');
+
+if (mobileMenuToggle) {
+    mobileMenuToggle.addEventListener('click', () => {
+        navMain.classList.toggle('active');
+        const icon = mobileMenuToggle.querySelector('i');
+        if (navMain.classList.contains('active')) {
+            icon.classList.remove('fa-bars');
+            icon.classList.add('fa-times');
+        } else {
+            icon.classList.remove('fa-times');
+            icon.classList.add('fa-bars');
+        }
+    });
+}
+
+// Cerrar menú al hacer clic en un enlace (móvil)
+document.querySelectorAll('.nav-main a').forEach(link => {
+    link.addEventListener('click', () => {
+        if (window.innerWidth <= 992) {
+            navMain.classList.remove('active');
+            mobileMenuToggle.querySelector('i').classList.remove('fa-times');
+            mobileMenuToggle.querySelector('i').classList.add('fa-bars');
+        }
+    });
+});
+
+// Auto-dismiss alerts after 5 seconds
+setTimeout(function() {
+    const alerts = document.querySelectorAll('.alert');
+    alerts.forEach(alert => {
+        alert.style.opacity = '0';
+        alert.style.transform = 'translateX(100%)';
+        setTimeout(() => alert.remove(), 300);
+    });
+}, 5000);
+
+// Cerrar alertas al hacer clic fuera
+document.addEventListener('click', (e) => {
+    if (!e.target.closest('.alert')) {
+        const alerts = document.querySelectorAll('.alert');
+        alerts.forEach(alert => {
+            alert.style.opacity = '0';
+            setTimeout(() => alert.remove(), 300);
+        });
+    }
+});
+
+// Smooth scrolling para enlaces internos
+document.querySelectorAll('a[href^="#"]').forEach(anchor => {
+    anchor.addEventListener('click', function (e) {
+        e.preventDefault();
+        const targetId = this.getAttribute('href');
+        if (targetId === '#') return;
+
+        const targetElement = document.querySelector(targetId);
+        if (targetElement) {
+            window.scrollTo({
+                top: targetElement.offsetTop - 100,
+                behavior: 'smooth'
+            });
+        }
+    });
+});
+
+// Añadir clase activa a enlaces de navegación
+const currentPath = window.location.pathname;
+document.querySelectorAll('.nav-link').forEach(link => {
+    const linkPath = link.getAttribute('href');
+    if (currentPath === linkPath || (linkPath !== '/' && currentPath.startsWith(linkPath))) {
+        link.classList.add('active');
+    }
+});
+
+// Efecto de carga suave
+document.addEventListener('DOMContentLoaded', () => {
+    document.body.style.opacity = '0';
+    setTimeout(() => {
+        document.body.style.transition = 'opacity 0.5s ease';
+        document.body.style.opacity = '1';
+    }, 100);
+
+    // Normalizar imágenes de libros
+    normalizarImagenesLibros();
+});
+
+// ===== SISTEMA DE NORMALIZACIÓN DE IMÁGENES DE LIBROS =====
+function normalizarImagenesLibros() {
+    const contenedores = document.querySelectorAll('.libro-imagen-4x4');
+
+    contenedores.forEach(contenedor => {
+        const imagen = contenedor.querySelector('img');
+        if (imagen) {
+            // Si la imagen ya está cargada
+            if (imagen.complete) {
+                ajustarImagenLibro(imagen);
+            } else {
+                // Si aún no se carga
+                imagen.onload = function() {
+                    ajustarImagenLibro(this);
+                };
+            }
+        }
+    });
+}
+
+function ajustarImagenLibro(img) {
+    // Remover clases anteriores
+    img.classList.remove('vertical', 'horizontal', 'cuadrada');
+
+    const ratio = img.naturalWidth / img.naturalHeight;
+
+    // Determinar orientación
+    if (ratio < 0.7) {
+        // Vertical (más alta que ancha)
+        img.classList.add('vertical');
+    } else if (ratio > 1.3) {
+        // Horizontal (más ancha que alta)
+        img.classList.add('horizontal');
+    } else {
+        // Cuadrada o casi cuadrada
+        img.classList.add('cuadrada');
+    }
+}
+
+// Re-normalizar al cambiar tamaño de ventana
+window.addEventListener('resize', normalizarImagenesLibros);
+
+// ===== SISTEMA DE MODAL PARA EVENTOS =====
+
+// Datos de ejemplo para eventos (en producción vendrán de Django)
+const eventosData = [
+    {
+        id: 1,
+        titulo: "Noche de Poesía: Versos en la Librería",
+        categoria: "PRESENTACION",
+        categoriaTexto: "Presentación de Libro",
+        fecha: "15 de Marzo, 2024 - 19:00 hrs",
+        descripcion: "Una velada mágica dedicada a la poesía contemporánea. Escritores locales compartirán sus obras más recientes en un ambiente íntimo y acogedor. Habrá lectura de poemas, sesión de preguntas y firma de libros. Incluye un brindis de bienvenida.",
+        imagen: "https://images.unsplash.com/photo-1513475382585-d06e58bcb0e0?ixlib=rb-1.2.1&auto=format&fit=crop&w=800&q=80",
+        ubicacion: "Sala Principal - Librería AJMG",
+        capacidad: "50 personas",
+        precio: "Gratuito",
+        estado: "Activo",
+        cuposDisponibles: 25
+    },
+    {
+        id: 2,
+        titulo: "Taller de Escritura Creativa",
+        categoria: "TALLER",
+        categoriaTexto: "Taller Literario",
+        fecha: "22 de Marzo, 2024 - 17:00 hrs",
+        descripcion: "Aprende las técnicas fundamentales de la escritura creativa con nuestro taller intensivo de 3 horas. Dirigido por la reconocida escritora María González, autora de 'Las sombras del olvido'. Incluye ejercicios prácticos, retroalimentación personalizada y materiales de trabajo.",
+        imagen: "https://images.unsplash.com/photo-1455390582262-044cdead277a?ixlib=rb-1.2.1&auto=format&fit=crop&w=800&q=80",
+        ubicacion: "Aula de Talleres - Piso 2",
+        capacidad: "30 personas",
+        precio: "$350 MXN",
+        estado: "Activo",
+        cuposDisponibles: 12
+    },
+    {
+        id: 3,
+        titulo: "Club de Lectura: Cien Años de Soledad",
+        categoria: "CLUB_LECTURA",
+        categoriaTexto: "Club de Lectura",
+        fecha: "28 de Marzo, 2024 - 18:30 hrs",
+        descripcion: "Únete a nuestro club de lectura mensual donde analizaremos la obra maestra de Gabriel García Márquez. Discutiremos personajes, temas literarios y el realismo mágico. No es necesario haber terminado el libro para participar. Incluye guía de discusión y refrigerios.",
+        imagen: "https://images.unsplash.com/photo-1544947950-fa07a98d237f?ixlib=rb-1.2.1&auto=format&fit=crop&w=800&q=80",
+        ubicacion: "Rincón de Lectura",
+        capacidad: "40 personas",
+        precio: "Gratuito",
+        estado: "Activo",
+        cuposDisponibles: 18
+    },
+    {
+        id: 4,
+        titulo: "Firma de Autores: Nuevas Voces Mexicanas",
+        categoria: "FIRMA",
+        categoriaTexto: "Firma de Autores",
+        fecha: "5 de Abril, 2024 - 16:00 hrs",
+        descripcion: "Conoce a los talentos emergentes de la literatura mexicana. Cinco autores presentarán sus obras más recientes y estarán disponibles para firmar ejemplares. Oportunidad única para conversar con los escritores y adquirir libros con dedicatorias personalizadas.",
+        imagen: "https://images.unsplash.com/photo-1532012197267-da84d127e765?ixlib=rb-1.2.1&auto=format&fit=crop&w=800&q=80",
+        ubicacion: "Área de Eventos Especiales",
+        capacidad: "100 personas",
+        precio: "Gratuito",
+        estado: "Próximamente",
+        cuposDisponibles: 100
+    }
+];
+
+// Función para abrir el modal con los detalles del evento
+function verDetallesEvento(eventoId) {
+    const evento = eventosData.find(e => e.id === eventoId);
+    if (!evento) return;
+
+    // Llenar el modal con la información del evento
+    document.getElementById('modalCategoria').textContent = evento.categoriaTexto;
+    document.getElementById('modalTitulo').textContent = evento.titulo;
+    document.getElementById('modalFecha').textContent = evento.fecha;
+    document.getElementById('modalDescripcion').textContent = evento.descripcion;
+    document.getElementById('modalUbicacion').textContent = evento.ubicacion;
+    document.getElementById('modalCapacidad').textContent = evento.capacidad;
+    document.getElementById('modalPrecio').textContent = evento.precio;
+    document.getElementById('modalEstado').textContent = evento.estado;
+    document.getElementById('modalImagen').src = evento.imagen;
+    document.getElementById('modalImagen').alt = evento.titulo;
+
+    // Mostrar el modal
+    const modal = document.getElementById('modalEvento');
+    modal.classList.add('active');
+    document.body.style.overflow = 'hidden';
+
+    // Guardar el ID del evento en el modal para usar después
+    modal.dataset.eventoId = eventoId;
+}
+
+// Función para cerrar el modal
+function cerrarModal() {
+    const modal = document.getElementById('modalEvento');
+    modal.classList.remove('active');
+    document.body.style.overflow = 'auto';
+}
+
+// Función para reservar lugar en el evento
+function reservarEvento() {
+    const modal = document.getElementById('modalEvento');
+    const eventoId = modal.dataset.eventoId;
+    const evento = eventosData.find(e => e.id === parseInt(eventoId));
+
+    if (!evento) return;
+
+    if (evento.cuposDisponibles > 0) {
+        alert(`¡Reserva confirmada para "${evento.titulo}"!\n\nRecibirás un correo con los detalles de tu reservación.`);
+        // Aquí en producción se haría una petición AJAX al backend
+        cerrarModal();
+    } else {
+        alert('Lo sentimos, ya no hay cupos disponibles para este evento.');
+    }
+}
+
+// Función para compartir evento
+function compartirEvento() {
+    const modal = document.getElementById('modalEvento');
+    const eventoId = modal.dataset.eventoId;
+    const evento = eventosData.find(e => e.id === parseInt(eventoId));
+
+    if (!evento) return;
+
+    const textoCompartir = `¡Te invito al evento "${evento.titulo}" en Librería AJMG!\n📅 ${evento.fecha}\n📍 ${evento.ubicacion}\n\nMás información en nuestra página web.`;
+
+    if (navigator.share) {
+        navigator.share({
+            title: evento.titulo,
+            text: textoCompartir,
+            url: window.location.href
+        });
+    } else {
+        // Fallback para navegadores que no soportan Web Share API
+        navigator.clipboard.writeText(textoCompartir).then(() => {
+            alert('Enlace copiado al portapapeles. ¡Compártelo con tus amigos!');
+        });
+    }
+}
+
+// Cerrar modal al hacer clic fuera del contenido
+document.getElementById('modalEvento').addEventListener('click', function(e) {
+    if (e.target === this) {
+        cerrarModal();
+    }
+});
+
+// Cerrar modal con tecla ESC
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape') {
+        cerrarModal();
+    }
+});
+
+// Filtros de eventos
+function filtrarEventos(filtro) {
+    const cards = document.querySelectorAll('.evento-card');
+    const ahora = new Date();
+
+    cards.forEach(card => {
+        const fechaEvento = new Date(card.dataset.fecha);
+        const esPasado = fechaEvento < ahora;
+
+        switch(filtro) {
+            case 'proximos':
+                card.style.display = !esPasado ? 'block' : 'none';
+                break;
+            case 'pasados':
+                card.style.display = esPasado ? 'block' : 'none';
+                break;
+            case 'todos':
+                card.style.display = 'block';
+                break;
+        }
+    });
+
+    // Actualizar botones activos
+    document.querySelectorAll('.filtro-btn').forEach(btn => {
+        btn.classList.remove('active');
+        if (btn.dataset.filtro === filtro) {
+            btn.classList.add('active');
+        }
+    });
+}
+
+// Inicializar filtros si existen
+document.addEventListener('DOMContentLoaded', () => {
+    const filtroBtns = document.querySelectorAll('.filtro-btn');
+    if (filtroBtns.length > 0) {
+        filtroBtns.forEach(btn => {
+            btn.addEventListener('click', () => {
+                filtrarEventos(btn.dataset.filtro);
+            });
+        });
+    }
+});
@@ -0,0 +1,198 @@
+// Funciones para filtrar compras
+function filtrarCompras() {
+    const mes = document.getElementById('filtro-mes').value;
+    const anio = document.getElementById('filtro-anio').value;
+    const compras = document.querySelectorAll('.compra-item');
+
+    let visibles = 0;
+
+    compras.forEach(compra => {
+        const fechaCompra = new Date(compra.getAttribute('data-fecha'));
+        const mesCompra = fechaCompra.getMonth() + 1; // getMonth() devuelve 0-11
+        const anioCompra = fechaCompra.getFullYear();
+
+        let mostrar = true;
+
+        if (mes && mesCompra != parseInt(mes)) {
+            mostrar = false;
+        }
+
+        if (anio && anioCompra != parseInt(anio)) {
+            mostrar = false;
+        }
+
+        compra.style.display = mostrar ? '' : 'none';
+        if (mostrar) visibles++;
+    });
+
+    if (visibles === 0) {
+        alert('No se encontraron compras con los filtros seleccionados.');
+    } else {
+        alert(`Mostrando ${visibles} compras con los filtros aplicados.`);
+    }
+}
+
+function limpiarFiltros() {
+    document.getElementById('filtro-mes').value = '';
+    document.getElementById('filtro-anio').value = '';
+
+    const compras = document.querySelectorAll('.compra-item');
+    compras.forEach(compra => {
+        compra.style.display = '';
+    });
+
+    alert('Filtros limpiados. Mostrando todas las compras.');
+}
+
+// Estilos CSS para la página de compras
+const comprasStyle = document.createElement('style');
+comprasStyle.textContent = `
+    .compra-item:hover {
+        background-color: var(--verde-muy-claro);
+        transition: background-color 0.2s ease;
+    }
+
+    /* Estilos para selects */
+    select {
+        appearance: none;
+        background-image: url("data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' width='16' height='16' fill='%232e8b57' viewBox='0 0 16 16'%3E%3Cpath d='M7.247 11.14 2.451 5.658C1.885 5.013 2.345 4 3.204 4h9.592a1 1 0 0 1 .753 1.659l-4.796 5.48a1 1 0 0 1-1.506 0z'/%3E%3C/svg%3E");
+        background-repeat: no-repeat;
+        background-position: right 12px center;
+        background-size: 16px;
+        padding-right: 40px !important;
+        cursor: pointer;
+    }
+
+    select:hover {
+        border-color: var(--verde-principal);
+    }
+
+    select:focus {
+        outline: none;
+        border-color: var(--verde-principal);
+        box-shadow: 0 0 0 2px rgba(46, 139, 87, 0.2);
+    }
+
+    /* Estilos para botones */
+    button:hover {
+        transform: translateY(-2px);
+        transition: transform 0.2s ease;
+    }
+
+    a[style*="background-color: var(--verde-principal)"]:hover {
+        background: linear-gradient(135deg, var(--verde-oscuro), var(--verde-principal)) !important;
+        transform: translateY(-2px);
+        box-shadow: var(--sombra-suave);
+    }
+
+    /* Scrollbar para tabla */
+    div[style*="overflow-x: auto"]::-webkit-scrollbar {
+        height: 8px;
+    }
+
+    div[style*="overflow-x: auto"]::-webkit-scrollbar-track {
+        background: var(--gris-claro);
+        border-radius: 4px;
+    }
+
+    div[style*="overflow-x: auto"]::-webkit-scrollbar-thumb {
+        background: var(--verde-principal);
+        border-radius: 4px;
+    }
+
+    /* Responsive */
+    @media (max-width: 768px) {
+        .stats-grid {
+            grid-template-columns: repeat(2, 1fr) !important;
+        }
+
+        table {
+            font-size: 0.9rem;
+        }
+
+        td, th {
+            padding: var(--espacio-sm) !important;
+        }
+
+        .estado-compra {
+            font-size: 0.75rem !important;
+            padding: 4px 8px !important;
+        }
+
+        .filtros-container {
+            flex-direction: column;
+            align-items: stretch;
+        }
+
+        select, button {
+            width: 100%;
+        }
+    }
+
+    @media (max-width: 480px) {
+        .stats-grid {
+            grid-template-columns: 1fr !important;
+        }
+
+        table {
+            display: block;
+        }
+
+        thead {
+            display: none;
+        }
+
+        tr {
+            display: block;
+            margin-bottom: var(--espacio-md);
+            border: 1px solid var(--gris-claro) !important;
+            border-radius: var(--radio-md);
+            padding: var(--espacio-sm);
+        }
+
+        td {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            padding: var(--espacio-xs) !important;
+            border-bottom: 1px solid var(--gris-claro);
+        }
+
+        td:last-child {
+            border-bottom: none;
+        }
+
+        td::before {
+            content: attr(data-label);
+            font-weight: 600;
+            color: var(--verde-oscuro);
+            margin-right: var(--espacio-sm);
+        }
+    }
+`;
+document.head.appendChild(comprasStyle);
+
+// Inicialización
+document.addEventListener('DOMContentLoaded', function() {
+    // Añadir labels para responsive
+    const celdas = document.querySelectorAll('td');
+    const headers = ['ID Venta', 'Fecha', 'Total', 'Estado', 'Acciones'];
+
+    celdas.forEach((celda, index) => {
+        const headerIndex = index % headers.length;
+        celda.setAttribute('data-label', headers[headerIndex]);
+    });
+
+    // Efecto hover en filas
+    const filas = document.querySelectorAll('tbody tr');
+    filas.forEach(fila => {
+        fila.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateX(5px)';
+            this.style.transition = 'transform 0.2s ease';
+        });
+
+        fila.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateX(0)';
+        });
+    });
+});
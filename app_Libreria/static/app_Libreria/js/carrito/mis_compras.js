@@ -0,0 +1,219 @@
+// Variables globales
+let currentSort = { column: 'date', direction: 'desc' };
+let currentFilters = { status: 'all', month: 'all', sort: 'newest' };
+
+// Toggle de filtros
+document.getElementById('filterToggle').addEventListener('click', function() {
+    const filtersPanel = document.getElementById('filtersPanel');
+    filtersPanel.classList.toggle('show');
+    this.classList.toggle('active');
+});
+
+// Aplicar filtros
+function applyFilters() {
+    const statusFilter = document.getElementById('filterStatus').value;
+    const monthFilter = document.getElementById('filterMonth').value;
+    const sortFilter = document.getElementById('sortOrder').value;
+
+    currentFilters = {
+        status: statusFilter,
+        month: monthFilter,
+        sort: sortFilter
+    };
+
+    filterAndSortTable();
+
+    // Mostrar notificación
+    showNotification('Filtros aplicados correctamente', 'success');
+}
+
+// Resetear filtros
+function resetFilters() {
+    document.getElementById('filterStatus').value = 'all';
+    document.getElementById('filterMonth').value = 'all';
+    document.getElementById('sortOrder').value = 'newest';
+
+    currentFilters = { status: 'all', month: 'all', sort: 'newest' };
+
+    filterAndSortTable();
+    showNotification('Filtros restablecidos', 'info');
+}
+
+// Filtrar y ordenar tabla
+function filterAndSortTable() {
+    const rows = document.querySelectorAll('.purchase-row');
+    let visibleRows = [];
+
+    // Filtrar por estado
+    rows.forEach(row => {
+        let showRow = true;
+
+        // Filtrar por estado
+        if (currentFilters.status !== 'all' && 
+            row.dataset.status !== currentFilters.status) {
+            showRow = false;
+        }
+
+        // Filtrar por mes
+        if (currentFilters.month !== 'all') {
+            const rowDate = new Date(row.dataset.date);
+            const rowMonth = rowDate.getMonth() + 1; // getMonth() es 0-indexed
+            if (rowMonth.toString() !== currentFilters.month) {
+                showRow = false;
+            }
+        }
+
+        if (showRow) {
+            visibleRows.push(row);
+        }
+
+        // Mostrar/ocultar fila
+        row.style.display = showRow ? '' : 'none';
+    });
+
+    // Ordenar filas visibles
+    sortRows(visibleRows, currentFilters.sort);
+}
+
+// Ordenar filas
+function sortRows(rows, sortType) {
+    const tbody = document.querySelector('.purchases-table tbody');
+
+    // Crear array para ordenar
+    const rowsArray = Array.from(rows);
+
+    rowsArray.sort((a, b) => {
+        switch(sortType) {
+            case 'newest':
+                return new Date(b.dataset.date) - new Date(a.dataset.date);
+            case 'oldest':
+                return new Date(a.dataset.date) - new Date(b.dataset.date);
+            case 'total_high':
+                return parseFloat(b.dataset.total) - parseFloat(a.dataset.total);
+            case 'total_low':
+                return parseFloat(a.dataset.total) - parseFloat(b.dataset.total);
+            default:
+                return 0;
+        }
+    });
+
+    // Reordenar filas en el DOM
+    rowsArray.forEach(row => {
+        tbody.appendChild(row);
+    });
+}
+
+// Exportar a CSV
+function exportToCSV() {
+    const rows = document.querySelectorAll('.purchase-row:not([style*="display: none"])');
+    let csvContent = "data:text/csv;charset=utf-8,";
+
+    // Encabezados
+    csvContent += "ID Venta,Fecha,Total,Método Pago,Estado\n";
+
+    // Datos
+    rows.forEach(row => {
+        const id = row.querySelector('.purchase-id').textContent;
+        const date = row.querySelector('.purchase-date').textContent;
+        const total = row.querySelector('.purchase-total').textContent.replace('$', '');
+        const method = row.querySelector('.method-badge').textContent;
+        const status = row.querySelector('.status-badge').textContent;
+
+        csvContent += `${id},${date},${total},${method},${status}\n`;
+    });
+
+    // Crear enlace de descarga
+    const encodedUri = encodeURI(csvContent);
+    const link = document.createElement("a");
+    link.setAttribute("href", encodedUri);
+    link.setAttribute("download", "mis_compras.csv");
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+
+    showNotification('CSV descargado correctamente', 'success');
+}
+
+// Imprimir recibo
+function printReceipt(ventaId) {
+    // Aquí implementarías la lógica para generar un recibo
+    // Por ahora, redirigimos a la vista de detalles
+    window.open(`/carrito/detalle/${ventaId}/?print=true`, '_blank');
+}
+
+// Notificaciones
+function showNotification(message, type) {
+    const notification = document.createElement('div');
+    notification.className = `notification notification-${type}`;
+    notification.textContent = message;
+    notification.style.cssText = `
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        padding: 15px 25px;
+        border-radius: 6px;
+        color: white;
+        font-weight: 500;
+        z-index: 1000;
+        animation: slideIn 0.3s ease;
+    `;
+
+    if (type === 'success') {
+        notification.style.background = 'var(--verde-principal)';
+    } else if (type === 'error') {
+        notification.style.background = 'var(--rojo)';
+    } else {
+        notification.style.background = 'var(--azul-principal)';
+    }
+
+    document.body.appendChild(notification);
+
+    setTimeout(() => {
+        notification.style.animation = 'slideOut 0.3s ease';
+        setTimeout(() => notification.remove(), 300);
+    }, 3000);
+}
+
+// Inicializar
+document.addEventListener('DOMContentLoaded', function() {
+    // Configurar event listeners para ordenamiento
+    document.querySelectorAll('.sort-btn').forEach(btn => {
+        btn.addEventListener('click', function() {
+            const column = this.dataset.sort;
+            const direction = currentSort.direction === 'asc' ? 'desc' : 'asc';
+            currentSort = { column, direction };
+            // Aquí implementarías la lógica de ordenamiento
+            showNotification(`Ordenando por ${column} (${direction})`, 'info');
+        });
+    });
+
+    // Inicializar filtros
+    filterAndSortTable();
+});
+
+// Animaciones CSS
+const style = document.createElement('style');
+style.textContent = `
+@keyframes slideIn {
+    from {
+        transform: translateX(100%);
+        opacity: 0;
+    }
+    to {
+        transform: translateX(0);
+        opacity: 1;
+    }
+}
+
+@keyframes slideOut {
+    from {
+        transform: translateX(0);
+        opacity: 1;
+    }
+    to {
+        transform: translateX(100%);
+        opacity: 0;
+    }
+}
+`;
+document.head.appendChild(style);
@@ -0,0 +1,163 @@
+// Manejo del formulario
+document.getElementById('formContacto').addEventListener('submit', function(e) {
+    e.preventDefault();
+
+    // Validación básica
+    const inputs = this.querySelectorAll('input[required], select[required], textarea[required]');
+    let isValid = true;
+
+    inputs.forEach(input => {
+        if (!input.value.trim()) {
+            isValid = false;
+            input.style.borderColor = '#dc3545';
+        } else {
+            input.style.borderColor = '#28a745';
+        }
+    });
+
+    if (isValid) {
+        // Simulación de envío (en producción harías una petición AJAX)
+        const boton = this.querySelector('button[type="submit"]');
+        const textoOriginal = boton.innerHTML;
+
+        boton.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Enviando...';
+        boton.disabled = true;
+
+        setTimeout(() => {
+            boton.innerHTML = '<i class="fas fa-check"></i> ¡Mensaje Enviado!';
+            boton.style.backgroundColor = '#28a745';
+
+            setTimeout(() => {
+                boton.innerHTML = textoOriginal;
+                boton.disabled = false;
+                boton.style.backgroundColor = '';
+                this.reset();
+
+                // Mostrar mensaje de éxito
+                alert('¡Gracias por tu mensaje! Te contactaremos en un plazo de 24-48 horas.');
+            }, 2000);
+        }, 1500);
+    } else {
+        alert('Por favor, completa todos los campos obligatorios (*)');
+    }
+});
+
+// Efecto en inputs
+document.querySelectorAll('#formContacto input, #formContacto select, #formContacto textarea').forEach(input => {
+    input.addEventListener('focus', function() {
+        this.style.borderColor = 'var(--verde-principal)';
+        this.style.boxShadow = '0 0 0 2px rgba(46, 139, 87, 0.2)';
+    });
+
+    input.addEventListener('blur', function() {
+        this.style.boxShadow = 'none';
+        if (this.value.trim()) {
+            this.style.borderColor = '#28a745';
+        }
+    });
+});
+
+// Funciones para el mapa
+function abrirGoogleMaps() {
+    alert('En una implementación real, esto abriría Google Maps con nuestra ubicación.');
+    // window.open('https://maps.google.com/?q=Av.+Librería+123+Ciudad+de+México');
+}
+
+function mostrarComoLlegar() {
+    alert('Aquí se mostrarían instrucciones detalladas para llegar a nuestra librería.');
+}
+
+// Efectos hover en tarjetas
+document.addEventListener('DOMContentLoaded', function() {
+    const cards = document.querySelectorAll('div[style*="box-shadow: var"]');
+    cards.forEach(card => {
+        card.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-5px)';
+            this.style.transition = 'transform 0.3s ease';
+        });
+
+        card.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+        });
+    });
+});
+
+// Estilos adicionales para el formulario
+const contactoStyle = document.createElement('style');
+contactoStyle.textContent = `
+    /* Estilos para selects personalizados */
+    select {
+        appearance: none;
+        background-image: url("data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' width='16' height='16' fill='%232e8b57' viewBox='0 0 16 16'%3E%3Cpath d='M7.247 11.14 2.451 5.658C1.885 5.013 2.345 4 3.204 4h9.592a1 1 0 0 1 .753 1.659l-4.796 5.48a1 1 0 0 1-1.506 0z'/%3E%3C/svg%3E");
+        background-repeat: no-repeat;
+        background-position: right 12px center;
+        background-size: 16px;
+        padding-right: 40px !important;
+    }
+
+    /* Placeholder personalizado */
+    ::placeholder {
+        color: #adb5bd;
+        opacity: 0.8;
+    }
+
+    /* Focus states */
+    input:focus, select:focus, textarea:focus {
+        outline: none;
+    }
+
+    /* Checkbox personalizado */
+    input[type="checkbox"] {
+        accent-color: var(--verde-principal);
+    }
+
+    /* Botones de redes sociales con efectos hover */
+    a[style*="background-color: #1877f2"]:hover {
+        background-color: #166fe5 !important;
+        transform: translateY(-2px);
+    }
+
+    a[style*="background-color: #1da1f2"]:hover {
+        background-color: #1a8cd8 !important;
+        transform: translateY(-2px);
+    }
+
+    a[style*="gradient(45deg, #405de6"]:hover {
+        opacity: 0.9;
+        transform: translateY(-2px);
+    }
+
+    a[style*="background-color: #ff0000"]:hover {
+        background-color: #e60000 !important;
+        transform: translateY(-2px);
+    }
+
+    /* Responsive */
+    @media (max-width: 992px) {
+        .contacto-grid {
+            grid-template-columns: 1fr !important;
+        }
+    }
+
+    @media (max-width: 768px) {
+        .form-grid {
+            grid-template-columns: 1fr !important;
+        }
+
+        button {
+            width: 100%;
+        }
+    }
+
+    /* Animaciones para mensajes */
+    @keyframes pulse {
+        0% { transform: scale(1); }
+        50% { transform: scale(1.05); }
+        100% { transform: scale(1); }
+    }
+
+    button:active {
+        animation: pulse 0.2s ease;
+    }
+`;
+document.head.appendChild(contactoStyle);
@@ -0,0 +1,45 @@
+// Script para mejorar la interactividad
+document.addEventListener('DOMContentLoaded', function() {
+    // Efecto hover en tarjetas de características
+    const featureCards = document.querySelectorAll('.libros-grid-4x4 > div');
+    featureCards.forEach(card => {
+        card.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-10px)';
+            this.style.transition = 'transform 0.3s ease';
+        });
+
+        card.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0)';
+        });
+    });
+
+    // Smooth scroll para enlaces internos
+    document.querySelectorAll('a[href^="#"]').forEach(anchor => {
+        anchor.addEventListener('click', function(e) {
+            e.preventDefault();
+            const targetId = this.getAttribute('href');
+            if (targetId === '#') return;
+
+            const targetElement = document.querySelector(targetId);
+            if (targetElement) {
+                window.scrollTo({
+                    top: targetElement.offsetTop - 100,
+                    behavior: 'smooth'
+                });
+            }
+        });
+    });
+
+    // Contador animado (efecto)
+    const counterElements = document.querySelectorAll('.libro-stock-4x4');
+    counterElements.forEach(element => {
+        const originalText = element.textContent;
+        element.addEventListener('mouseenter', function() {
+            this.textContent = '¡Compra ahora!';
+        });
+
+        element.addEventListener('mouseleave', function() {
+            this.textContent = originalText;
+        });
+    });
+});
@@ -0,0 +1,74 @@
+// FUNCIÓN PARA MOSTRAR SOLO LIBROS SIN STOCK
+window.toggleLibrosSinStock = function() {
+    const checkbox = document.getElementById('toggleSinStock');
+    const url = new URL(window.location.href);
+
+    url.searchParams.delete('cursor');
+    url.searchParams.delete('sin_stock');
+    url.searchParams.set('disponibilidad', checkbox.checked ? 'sin_stock' : 'con_stock');
+
+    window.location.href = url.toString();
+};
+
+// Filtros rápidos de precio: ajustan el máximo y envían el formulario
+window.filtrarPrecioRapido = function(precio) {
+    const form = document.getElementById('form-filtros');
+    form.elements['precio_max'].value = precio;
+    form.submit();
+};
+
+// Enviar el formulario al cambiar un select
+document.addEventListener('DOMContentLoaded', function() {
+    document.querySelectorAll('#form-filtros select').forEach(select => {
+        select.addEventListener('change', function() {
+            this.form.submit();
+        });
+    });
+});
+
+// Estilos CSS adicionales para los filtros
+const style = document.createElement('style');
+style.textContent = `
+    button:hover {
+        background-color: var(--verde-principal) !important;
+        color: white !important;
+        border-color: var(--verde-principal) !important;
+        transform: translateY(-2px);
+        transition: var(--transicion-media);
+    }
+
+    select:hover, select:focus {
+        border-color: var(--verde-principal) !important;
+        outline: none;
+        box-shadow: 0 0 0 2px rgba(46, 139, 87, 0.2);
+    }
+
+    #toggleSinStock:checked {
+        accent-color: var(--verde-principal);
+    }
+
+    @media (max-width: 992px) {
+        .facetas-catalogo {
+            grid-template-columns: repeat(2, 1fr) !important;
+        }
+
+        .libros-grid-4x4 {
+            grid-template-columns: repeat(2, 1fr) !important;
+        }
+    }
+
+    @media (max-width: 768px) {
+        .libros-grid-4x4 {
+            grid-template-columns: 1fr !important;
+        }
+
+        .filtros-container > div {
+            grid-template-columns: 1fr !important;
+        }
+
+        .libro-imagen-4x4 {
+            height: 180px !important;
+        }
+    }
+`;
+document.head.appendChild(style);
@@ -0,0 +1,144 @@
+# app_Libreria/tarjetas.py
+"""
+Caché de fragmentos HTML para las tarjetas de libro de ``inicio`` y ``libros``.
+
+Cada tarjeta se guarda por libro y por variante (tipo de usuario y si lleva
+botones de administrador) bajo una llave que incluye los sellos de versión
+del libro, su autor y su editorial. Las señales de ``post_save`` y
+``post_delete`` de esos modelos cambian el sello, así que una tarjeta vieja
+simplemente deja de encontrarse; no hace falta borrarla.
+
+* Los fragmentos viven en el alias de caché ``tarjetas`` (por defecto un
+  LocMemCache LRU acotado por proceso; puede apuntarse a Redis/Memcached).
+* Los sellos viven en la caché ``default``, que debe ser compartida entre
+  procesos en producción para que todos vean las invalidaciones.
+
+Lo que cambia con cada reserva no se guarda: la plantilla deja marcas donde
+van la etiqueta de stock y el botón de agregar al carrito (con su token
+CSRF), y se reemplazan al servir la página con lo disponible que da
+``reservas.disponibles`` (caché corta, una consulta para los que falten).
+"""
+import time
+
+from django.core.cache import caches
+from django.middleware.csrf import get_token
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import mark_safe
+
+from .models import Libro
+from .reservas import disponibles
+
+PLANTILLA = 'partials/tarjeta_libro.html'
+PLANTILLA_STOCK = 'partials/tarjeta_stock.html'
+PLANTILLA_ACCION = 'partials/tarjeta_accion.html'
+ALIAS_FRAGMENTOS = 'tarjetas'
+ALIAS_SELLOS = 'default'
+MARCA_STOCK = '<!--stock-tarjeta-->'
+MARCA_ACCION = '<!--accion-tarjeta-->'
+
+TTL_FRAGMENTO = 60 * 60 * 24
+TTL_SELLO = None  # los sellos no expiran
+
+_PREFIJOS = {'libro': 'l', 'autor': 'a', 'editorial': 'e'}
+
+
+def _clave_sello(tipo, pk):
+    return f'tarjeta:sello:{_PREFIJOS[tipo]}:{pk}'
+
+
+def _nuevo_sello():
+    # Un sello nuevo nunca coincide con uno anterior, aunque la caché se vacíe
+    return format(time.time_ns(), 'x')
+
+
+def cambiar_sello(tipo, pk):
+    """Invalida las tarjetas que dependen de ese libro, autor o editorial"""
+    caches[ALIAS_SELLOS].set(_clave_sello(tipo, pk), _nuevo_sello(), TTL_SELLO)
+
+
+def cambiar_sellos(tipo, pks):
+    """``cambiar_sello`` para muchos a la vez (importaciones masivas)"""
+    sello = _nuevo_sello()
+    caches[ALIAS_SELLOS].set_many({_clave_sello(tipo, pk): sello for pk in pks}, TTL_SELLO)
+
+
+def _sellos(filas):
+    """Sellos actuales de cada (libro, autor, editorial); crea los que falten"""
+    claves = set()
+    for libroid, autorid, editorialid in filas:
+        claves.add(_clave_sello('libro', libroid))
+        claves.add(_clave_sello('autor', autorid))
+        claves.add(_clave_sello('editorial', editorialid))
+
+    cache = caches[ALIAS_SELLOS]
+    sellos = cache.get_many(claves)
+    faltantes = {clave: _nuevo_sello() for clave in claves if clave not in sellos}
+    if faltantes:
+        for clave, sello in faltantes.items():
+            # add() respeta el sello que otro proceso haya creado primero
+            if not cache.add(clave, sello, TTL_SELLO):
+                faltantes[clave] = cache.get(clave, sello)
+        sellos.update(faltantes)
+    return sellos
+
+
+def variante_usuario(user):
+    if not user.is_authenticated:
+        return 'anonimo'
+    return 'staff' if user.is_staff else 'cliente'
+
+
+def tarjetas_libros(request, filas, con_admin=True):
+    """
+    HTML de las tarjetas en el mismo orden que ``filas``, una lista de tuplas
+    ``(libroid, autorid_id, editorialid_id)``. Sólo los libros cuya tarjeta
+    no está en caché se leen de la base de datos (una consulta).
+    """
+    if not filas:
+        return []
+
+    variante = variante_usuario(request.user)
+    sufijo = f"{variante}:{'admin' if con_admin else 'simple'}"
+    sellos = _sellos(filas)
+    claves = {
+        libroid: 'tarjeta:{}:{}:{}.{}.{}'.format(
+            libroid, sufijo,
+            sellos[_clave_sello('libro', libroid)],
+            sellos[_clave_sello('autor', autorid)],
+            sellos[_clave_sello('editorial', editorialid)],
+        )
+        for libroid, autorid, editorialid in filas
+    }
+
+    fragmentos = caches[ALIAS_FRAGMENTOS]
+    en_cache = fragmentos.get_many(claves.values())
+    html = {libroid: en_cache[clave] for libroid, clave in claves.items() if clave in en_cache}
+
+    faltantes = [libroid for libroid in claves if libroid not in html]
+    if faltantes:
+        nuevos = {}
+        for libro in Libro.objects.select_related('autorid').filter(libroid__in=faltantes):
+            html[libro.libroid] = nuevos[claves[libro.libroid]] = render_to_string(PLANTILLA, {
+                'libro': libro,
+                'variante': variante,
+                'con_admin': con_admin,
+                'marca_stock': mark_safe(MARCA_STOCK),
+                'marca_accion': mark_safe(MARCA_ACCION),
+            })
+        fragmentos.set_many(nuevos, TTL_FRAGMENTO)
+
+    disponible = disponibles(libroid for libroid, _, _ in filas)
+    plantilla_stock = get_template(PLANTILLA_STOCK)
+    plantilla_accion = get_template(PLANTILLA_ACCION)
+    csrf = get_token(request) if variante == 'cliente' else None
+
+    tarjetas = []
+    for libroid, _, _ in filas:
+        if libroid not in html:
+            continue
+        contexto = {'libroid': libroid, 'disponible': disponible.get(libroid, 0), 'csrf_token': csrf}
+        tarjeta = html[libroid].replace(MARCA_STOCK, plantilla_stock.render(contexto))
+        if csrf is not None:
+            tarjeta = tarjeta.replace(MARCA_ACCION, plantilla_accion.render(contexto))
+        tarjetas.append(mark_safe(tarjeta))
+    return tarjetas
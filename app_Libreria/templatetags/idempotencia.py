@@ -0,0 +1,19 @@
+# app_Libreria/templatetags/idempotencia.py
+import uuid
+
+from django import template
+from django.utils.html import format_html
+
+from app_Libreria.idempotencia import CAMPO
+
+register = template.Library()
+
+
+@register.simple_tag
+def campo_idempotencia():
+    """
+    Campo oculto con una clave nueva para un formulario que crea una venta.
+
+    Uso: ``{% load idempotencia %}`` y dentro del ``<form>`` ``{% campo_idempotencia %}``
+    """
+    return format_html('<input type="hidden" name="{}" value="{}">', CAMPO, uuid.uuid4().hex)
@@ -0,0 +1,45 @@
+# app_Libreria/templatetags/imagenes.py
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from app_Libreria.imagenes import manifiesto_de, url_derivado
+
+register = template.Library()
+
+
+@register.simple_tag
+def imagen_responsiva(campo, alt='', clase='', sizes='(max-width: 768px) 100vw, 25vw'):
+    """
+    ``<picture>`` con ``srcset`` en WebP y JPEG para un ImageField.
+
+    Uso: ``{% load imagenes %}{% imagen_responsiva libro.portada libro.titulo 'imagen-libro-4x4' %}``
+
+    Si los derivados aún no se generan, devuelve un ``<img>`` con el original.
+    """
+    if not campo:
+        return ''
+
+    manifiesto = manifiesto_de(campo.name)
+    if manifiesto is None:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="lazy" decoding="async">',
+            campo.url, alt, clase,
+        )
+
+    anchos = manifiesto['anchos']
+    srcset_webp = format_html_join(', ', '{} {}w', ((url_derivado(campo.name, a, 'webp'), a) for a in anchos))
+    srcset_jpg = format_html_join(', ', '{} {}w', ((url_derivado(campo.name, a, 'jpg'), a) for a in anchos))
+    # El src por defecto es el ancho intermedio, suficiente para las tarjetas
+    ancho_src = anchos[len(anchos) // 2]
+
+    return format_html(
+        '<picture style="display: contents;">'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}" class="{}" width="{}" height="{}" loading="lazy" decoding="async" '
+        'style="background-image: url({}); background-size: cover;">'
+        '</picture>',
+        srcset_webp, sizes,
+        url_derivado(campo.name, ancho_src, 'jpg'), srcset_jpg, sizes, alt, clase,
+        ancho_src, round(ancho_src * manifiesto['proporcion']),
+        manifiesto['placeholder'],
+    )
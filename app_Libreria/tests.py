@@ -1,3 +1,1222 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import zipfile
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError, connection, connections, transaction
+from django.db.models import Count, F, Sum
+from django.http import HttpResponse
+from django.test import TestCase, TransactionTestCase, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from .carrito import cotizar_carrito, resumen_carrito
+from .management.commands.compactar_medios import Command as CompactarMedios
+from . import punto_venta
+from .idempotencia import purgar_vencidas
+from .medios import leer_rango
+from .analitica import serie_ventas
+from .busqueda import buscar_ids, buscar_pagina, reconstruir_indice
+from .catalogo import filtrar_libros, leer_filtros, pagina_catalogo
+from .exportar import exportar
+from . import (analitica, auditoria, busqueda, enrutador, facetas, generador, imagenes, rendimiento, resumenes,
+               tarjetas)
+from .importar import ImportadorCatalogo, guardar_punto_control, importar, leer, leer_punto_control, validar
+from .resumenes import recalcular_rango, resumen_dia
+from .reservas import SinDisponibilidad, disponibles, liberar_vencidas, reservar
+from .ventas import (DevolucionInvalida, LineaVenta, StockInsuficiente, cancelar_ventas, devolver,
+                     registrar_venta)
+from .middleware import PresupuestoConsultasMiddleware, PresupuestoConsultasExcedido, huella_sql
+from .models import (Autor, Editorial, Libro, Venta, DetalleVenta, Carrito, Blog, ArchivoMedia, Reserva, ClaveIdempotencia,
+                     VentaResumenDiario)
+
+
+def crear_catalogo(cantidad=10):
+    """Libros con autores y editoriales distintos, para que un N+1 se note"""
+    libros = []
+    for i in range(cantidad):
+        autor = Autor.objects.create(
+            nombre=f'Autor {i}', apellido='Prueba', nacionalidad='Mexicana',
+            fechanacimiento='1970-01-01', bibliografia=''
+        )
+        editorial = Editorial.objects.create(
+            nombre=f'Editorial {i}', direccion='Calle 1', telefono='555',
+            email=f'editorial{i}@ejemplo.com', pais='México'
+        )
+        libros.append(Libro.objects.create(
+            titulo=f'Libro {i}', autorid=autor, editorialid=editorial, isbn=f'978-0-{i:05d}',
+            aniopublicacion=1990 + i, genero='FIC', precioventa=Decimal('100.00') + i, stock=5
+        ))
+    return libros
+
+
+# =============================================
+# PRESUPUESTO DE CONSULTAS
+# =============================================
+
+class HuellaSqlTests(TestCase):
+
+    def test_ignora_valores_literales(self):
+        self.assertEqual(
+            huella_sql("SELECT * FROM t WHERE id = 12 AND nombre = 'ana'"),
+            huella_sql("SELECT * FROM t WHERE id = 7 AND nombre = 'luis'"),
+        )
+
+    def test_agrupa_listas_in_de_distinto_tamano(self):
+        self.assertEqual(
+            huella_sql('SELECT * FROM t WHERE id IN (%s, %s)'),
+            huella_sql('SELECT * FROM t WHERE id IN (%s, %s, %s, %s)'),
+        )
+
+
+@override_settings(PRESUPUESTO_CONSULTAS_ESTRICTO=True, PRESUPUESTO_CONSULTAS={'vista': 3})
+class PresupuestoConsultasMiddlewareTests(TestCase):
+
+    def setUp(self):
+        self.libros = crear_catalogo(6)
+
+    def _peticion(self):
+        request = RequestFactory().get('/')
+        request.resolver_match = type('Resolucion', (), {'url_name': 'vista'})()
+        return request
+
+    def test_lanza_excepcion_con_n_mas_uno(self):
+        def vista(request):
+            for libro in Libro.objects.all():
+                libro.autorid.nombre
+            return HttpResponse()
+
+        with self.assertRaisesMessage(PresupuestoConsultasExcedido, 'N+1'):
+            PresupuestoConsultasMiddleware(vista)(self._peticion())
+
+    def test_respeta_el_presupuesto(self):
+        def vista(request):
+            list(Libro.objects.select_related('autorid'))
+            return HttpResponse()
+
+        response = PresupuestoConsultasMiddleware(vista)(self._peticion())
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(PRESUPUESTO_CONSULTAS_ACTIVO=False, PRESUPUESTO_CONSULTAS_ESTRICTO=False)
+    def test_se_retira_si_no_mide(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            PresupuestoConsultasMiddleware(HttpResponse)
+
+
+@override_settings(PRESUPUESTO_CONSULTAS_ESTRICTO=True)
+class VistasSinNMasUnoTests(TestCase):
+    """Cada vista listada se recorre con datos suficientes para delatar un N+1"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.libros = crear_catalogo(10)
+        cls.cliente = User.objects.create_user('cliente', password='x')
+        cls.admin = User.objects.create_user('admin', password='x', is_staff=True)
+        cls.venta = Venta.objects.create(clienteid=cls.cliente, metodopago='TARJETA', estadoventa='COMPLETADA')
+        for libro in cls.libros:
+            DetalleVenta.objects.create(ventaid=cls.venta, libroid=libro, cantidad=1, preciounitario=libro.precioventa)
+            Carrito.objects.create(usuario=cls.cliente, libro=libro, cantidad=1)
+            otro = User.objects.create_user(f'usuario-{libro.libroid}')
+            Blog.objects.create(titulo=libro.titulo, contenido='...', autor=otro)
+            Venta.objects.create(clienteid=otro, metodopago='EFECTIVO', estadoventa='COMPLETADA')
+
+    def test_vistas_publicas(self):
+        for nombre in ('inicio', 'libros', 'eventos', 'blog'):
+            with self.subTest(vista=nombre):
+                self.assertEqual(self.client.get(reverse(nombre)).status_code, 200)
+
+    def test_vistas_de_cliente(self):
+        self.client.force_login(self.cliente)
+        urls = [
+            reverse('inicio'),
+            reverse('libros'),
+            reverse('ver_carrito'),
+            reverse('mis_compras'),
+            reverse('detalle_venta', args=[self.venta.ventaid]),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_listados_de_admin(self):
+        self.client.force_login(self.admin)
+        urls = [
+            reverse('panel_admin'),
+            reverse('admin_libros'),
+            reverse('admin_ventas'),
+            reverse('admin_blog'),
+            reverse('admin_detalles_venta'),
+            reverse('detalle_venta_admin', args=[self.venta.ventaid]),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 200)
+
+
+# =============================================
+# CATÁLOGO Y BÚSQUEDA
+# =============================================
+
+class PaginacionCatalogoTests(TestCase):
+
+    def test_cursor_sin_huecos_ni_repetidos_con_empates(self):
+        libros = crear_catalogo(3)
+        # 30 libros con sólo 3 precios y 2 títulos distintos: casi todo son empates
+        Libro.objects.bulk_create([
+            Libro(titulo=f'Empate {i % 2}', autorid=libros[i % 3].autorid, editorialid=libros[i % 3].editorialid,
+                  isbn=f'978-3-{i:05d}', aniopublicacion=2000, genero='FIC',
+                  precioventa=Decimal('50.00') * (1 + i % 3), stock=1)
+            for i in range(30)
+        ])
+
+        for orden, campo in (('precio_asc', 'precioventa'), ('precio_desc', '-precioventa'),
+                             ('titulo_asc', 'titulo'), ('titulo_desc', '-titulo')):
+            with self.subTest(orden=orden):
+                filtros = leer_filtros({'orden': orden})
+                vistos, cursor, paginas = [], None, 0
+                while True:
+                    pagina = pagina_catalogo(filtros, cursor, tamano=7)
+                    vistos += [fila[0] for fila in pagina['filas']]
+                    paginas += 1
+                    cursor = pagina['siguiente']
+                    if cursor is None:
+                        break
+                desempate = '-libroid' if campo.startswith('-') else 'libroid'
+                esperados = list(Libro.objects.order_by(campo, desempate).values_list('libroid', flat=True))
+                self.assertEqual(vistos, esperados)
+                self.assertEqual(paginas, 5)
+
+
+class FacetasTests(TestCase):
+
+    @staticmethod
+    def _sin_ceros(conteos):
+        return {valor: n for valor, n in conteos.items() if n}
+
+    def _conteos_orm(self, campo, **filtro):
+        return dict(Libro.objects.filter(**filtro).values_list(campo).annotate(n=Count('libroid')).order_by())
+
+    def test_otro_proceso_aplica_los_cambios_registrados(self):
+        class IndiceContado(facetas.IndiceFacetas):
+            construcciones = 0
+
+            def construir(self):
+                IndiceContado.construcciones += 1
+                super().construir()
+
+        libros = crear_catalogo(6)
+        # Índice de "otro proceso": sólo se entera de los cambios por la caché compartida
+        otro = IndiceContado()
+        otro.contar({})
+        self.assertEqual(IndiceContado.construcciones, 1)
+
+        # update() no dispara señales; quien lo usa anota cada libro cambiado
+        Libro.objects.filter(libroid=libros[0].libroid).update(genero='HIS', stock=0)
+        Libro.objects.filter(libroid=libros[1].libroid).update(precioventa=F('precioventa') + 300)
+        for libro in libros[:2]:
+            facetas.registrar_cambio(libro.libroid)
+
+        resultado = otro.contar({'disponibilidad': 'con_stock'})
+        self.assertEqual(IndiceContado.construcciones, 1)
+        conteos = resultado['conteos']
+        self.assertEqual(resultado['total'], Libro.objects.filter(stock__gt=0).count())
+        self.assertEqual(self._sin_ceros(conteos['genero']), self._conteos_orm('genero', stock__gt=0))
+        self.assertEqual(self._sin_ceros(conteos['decada']), {1990: 5})
+        self.assertEqual(conteos['disponibilidad'], {'con_stock': 5, 'sin_stock': 1})
+        precios = {}
+        for precio in Libro.objects.filter(stock__gt=0).values_list('precioventa', flat=True):
+            rango = facetas.rango_precio_de(precio)
+            precios[rango] = precios.get(rango, 0) + 1
+        self.assertEqual(self._sin_ceros(conteos['precio']), precios)
+
+
+class BusquedaTests(TestCase):
+
+    def test_relevancia_prefijos_y_acentos(self):
+        en_descripcion, en_titulo = crear_catalogo(2)
+        en_descripcion.descripcion = 'Una novela de aventuras'
+        en_descripcion.save()
+        en_titulo.titulo = 'Novela de García'
+        en_titulo.save()
+
+        self.assertEqual(buscar_ids('novela'), [en_titulo.libroid, en_descripcion.libroid])
+        self.assertEqual(buscar_ids('novel'), [en_titulo.libroid, en_descripcion.libroid])
+        self.assertEqual(buscar_ids('garcia'), [en_titulo.libroid])
+        self.assertEqual(buscar_ids(en_titulo.isbn.replace('-', '')), [en_titulo.libroid])
+
+    def test_el_indice_sigue_a_los_modelos(self):
+        libro, otro = crear_catalogo(2)
+        libro.titulo = 'Pedro Páramo'
+        libro.save()
+        self.assertEqual(buscar_ids('paramo'), [libro.libroid])
+
+        libro.titulo = 'Rayuela'
+        libro.save()
+        self.assertEqual(buscar_ids('rayuela'), [libro.libroid])
+        self.assertEqual(buscar_ids('paramo'), [])
+
+        # Renombrar al autor reindexa sus libros
+        autor = otro.autorid
+        autor.apellido = 'Cortázar'
+        autor.save()
+        self.assertEqual(buscar_ids('cortazar'), [otro.libroid])
+
+        libro.delete()
+        self.assertEqual(buscar_ids('rayuela'), [])
+
+    def test_filtros_no_pierden_coincidencias_de_baja_relevancia(self):
+        autor = Autor.objects.create(nombre='Ana', apellido='Prueba', nacionalidad='Mexicana',
+                                     fechanacimiento='1970-01-01', bibliografia='')
+        editorial = Editorial.objects.create(nombre='Editorial', direccion='Calle 1', telefono='555',
+                                             email='editorial@ejemplo.com', pais='México')
+        # 520 coincidencias fuertes (en el título) y 30 débiles (en la descripción) de otro género
+        Libro.objects.bulk_create([
+            Libro(titulo=f'Novela novela {i}', autorid=autor, editorialid=editorial, isbn=f'978-1-{i:05d}',
+                  aniopublicacion=2000, genero='FIC', precioventa=Decimal('100.00'), stock=1)
+            for i in range(520)
+        ] + [
+            Libro(titulo=f'Crónica {i}', descripcion='Una novela', autorid=autor, editorialid=editorial,
+                  isbn=f'978-2-{i:05d}', aniopublicacion=2000, genero='HIS', precioventa=Decimal('100.00'),
+                  stock=1)
+            for i in range(30)
+        ])
+        reconstruir_indice()
+        facetas.registrar_cambio()
+        self.assertEqual(len(buscar_ids('novela')), 550)
+
+        filtros = leer_filtros({'q': 'novela', 'genero': 'HIS'})
+        vistos, cursor = [], None
+        while True:
+            pagina = pagina_catalogo(filtros, cursor, tamano=12)
+            vistos += [fila[0] for fila in pagina['filas']]
+            cursor = pagina['siguiente']
+            if cursor is None:
+                break
+        esperados = set(Libro.objects.filter(genero='HIS').values_list('libroid', flat=True))
+        self.assertEqual(len(vistos), 30)
+        self.assertEqual(set(vistos), esperados)
+
+        response = self.client.get(reverse('libros'), {'q': 'novela', 'genero': 'HIS'})
+        self.assertEqual(response.context['total_resultados'], 30)
+        self.assertFalse(response.context['conteo_aproximado'])
+
+        # Una búsqueda más amplia que el tope cuenta sólo las más relevantes
+        with override_settings(BUSQUEDA_LIMITE_CONTEO=100):
+            response = self.client.get(reverse('libros'), {'q': 'novela'})
+        self.assertTrue(response.context['conteo_aproximado'])
+        self.assertEqual(response.context['total_resultados'], 100)
+        self.assertContains(response, 'de más de 100 encontrados')
+
+    @override_settings(BUSQUEDA_LIMITE_CONTEO=1)
+    def test_otros_motores_buscan_con_icontains(self):
+        libros = crear_catalogo(3)
+        Libro.objects.filter(pk=libros[1].pk).update(titulo='Pedro Páramo')
+        filtrados = leer_filtros({'genero': 'FIC'})
+        with patch.object(connection, 'vendor', 'mysql'):
+            self.assertEqual(buscar_ids('pedro'), [libros[1].libroid])
+            self.assertEqual(buscar_ids('Autor 2'), [libros[2].libroid])
+            # Por título: Libro 0, Libro 2, Pedro Páramo
+            self.assertEqual(buscar_pagina('prueba', filtrar_libros(filtrados), 1, 5),
+                             [libros[2].libroid, libros[1].libroid])
+            self.assertEqual(busqueda.ids_para_conteo('prueba'), ([libros[0].libroid], True))
+
+
+class TarjetasTests(TestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        caches['tarjetas'].clear()
+        self.libro = crear_catalogo(1)[0]  # stock 5
+        self.filas = [(self.libro.libroid, self.libro.autorid_id, self.libro.editorialid_id)]
+        self.cliente = User.objects.create_user('cliente')
+
+    def _tarjeta(self):
+        """HTML de la tarjeta y el token CSRF de su formulario"""
+        request = RequestFactory().get('/libros/')
+        request.user = self.cliente
+        html = str(tarjetas.tarjetas_libros(request, self.filas)[0])
+        token = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', html)
+        return html, token and token.group(1)
+
+    def test_sello_invalida_el_fragmento_y_el_stock_se_pinta_por_peticion(self):
+        html, token = self._tarjeta()
+        self.assertIn('Libro 0', html)
+        self.assertIn('5 disponibles', html)
+        self.assertIsNotNone(token)
+        self.assertNotIn(tarjetas.MARCA_STOCK, html)
+        self.assertNotIn(tarjetas.MARCA_ACCION, html)
+
+        # update() no dispara señales: el fragmento sigue en caché hasta cambiar el sello
+        Libro.objects.filter(pk=self.libro.pk).update(titulo='Rayuela')
+        with self.captureOnCommitCallbacks(execute=True):
+            reservar(User.objects.create_user('otro'), self.libro, 2)
+        html, otro_token = self._tarjeta()
+        self.assertIn('Libro 0', html)
+        # El stock y el botón (con el token de esta petición) no vienen del fragmento
+        self.assertIn('3 disponibles', html)
+        self.assertIsNotNone(otro_token)
+        self.assertNotEqual(otro_token, token)
+
+        tarjetas.cambiar_sello('libro', self.libro.libroid)
+        html, _ = self._tarjeta()
+        self.assertIn('Rayuela', html)
+        self.assertNotIn('Libro 0', html)
+        self.assertIn('3 disponibles', html)
+
+
+# =============================================
+# ENTREGA DE MEDIA
+# =============================================
+
+class MediosTests(TestCase):
+
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.carpeta.cleanup)
+        self.contenido = bytes(range(256)) * 4
+        os.makedirs(os.path.join(self.carpeta.name, 'portadas'))
+        with open(os.path.join(self.carpeta.name, 'portadas', 'a.png'), 'wb') as archivo:
+            archivo.write(self.contenido)
+        ajustes = override_settings(MEDIA_ROOT=self.carpeta.name, MEDIA_ENTREGA='python')
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        self.url = '/media/portadas/a.png'
+
+    def test_responde_304_con_etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(b''.join(response.streaming_content), self.contenido)
+        response = self.client.get(self.url, headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+    def test_rangos(self):
+        response = self.client.get(self.url, headers={'Range': 'bytes=10-19'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/1024')
+        self.assertEqual(b''.join(response.streaming_content), self.contenido[10:20])
+        self.assertEqual(leer_rango('bytes=-100', 1024), (924, 1023))
+        self.assertEqual(self.client.get(self.url, headers={'Range': 'bytes=2000-'}).status_code, 416)
+
+    def test_no_sale_de_media_root(self):
+        self.assertEqual(self.client.get('/media/../manage.py').status_code, 404)
+
+    def test_estaticos_precomprimidos(self):
+        ruta = os.path.join(self.carpeta.name, 'base.0123456789ab.css')
+        for sufijo, contenido in (('', b'body{}'), ('.gz', b'gz')):
+            with open(ruta + sufijo, 'wb') as archivo:
+                archivo.write(contenido)
+        with override_settings(STATIC_ROOT=self.carpeta.name):
+            response = self.client.get('/static/base.0123456789ab.css', headers={'Accept-Encoding': 'gzip, br'})
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(b''.join(response.streaming_content), b'gz')
+
+    @override_settings(MEDIA_ENTREGA='x-accel-redirect', MEDIA_ACCEL_PREFIJO='/interno/')
+    def test_delega_en_nginx(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Accel-Redirect'], '/interno/portadas/a.png')
+        self.assertEqual(response.content, b'')
+
+
+# =============================================
+# ALMACENAMIENTO POR CONTENIDO
+# =============================================
+
+class AlmacenamientoPorContenidoTests(TestCase):
+
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.carpeta.cleanup)
+        ajustes = override_settings(MEDIA_ROOT=self.carpeta.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        self.autor = User.objects.create_user('autor')
+
+    def _entrada(self, nombre, contenido=b'mismos bytes'):
+        return Blog.objects.create(titulo=nombre, contenido='...', autor=self.autor,
+                                   imagen=SimpleUploadedFile(nombre, contenido))
+
+    def test_deduplica_subidas_identicas(self):
+        primera, segunda = self._entrada('a.PNG'), self._entrada('b.png')
+        self.assertEqual(primera.imagen.name, segunda.imagen.name)
+        self.assertTrue(primera.imagen.name.startswith('archivos/'))
+        self.assertEqual(ArchivoMedia.objects.get(ruta=primera.imagen.name).referencias, 2)
+
+    def test_cuenta_reemplazos_y_borrados(self):
+        entrada = self._entrada('a.png')
+        anterior = entrada.imagen.name
+        entrada.imagen = SimpleUploadedFile('c.png', b'otros bytes')
+        entrada.save()
+        self.assertEqual(ArchivoMedia.objects.get(ruta=anterior).referencias, 0)
+        entrada.delete()
+        self.assertEqual(ArchivoMedia.objects.get(ruta=entrada.imagen.name).referencias, 0)
+
+    def test_recoleccion_no_borra_un_archivo_reutilizado(self):
+        entrada = self._entrada('a.png')
+        ruta = entrada.imagen.name
+        completa = os.path.join(self.carpeta.name, ruta)
+        entrada.delete()
+        viejo = time.time() - 3 * 3600
+        os.utime(completa, (viejo, viejo))
+
+        # La subida idéntica reutiliza el archivo y le actualiza la fecha
+        self._entrada('b.png')
+        self.assertGreater(os.stat(completa).st_mtime, viejo)
+
+        # Aun con un recuento previo a la subida y la fecha vieja, se revisan las referencias
+        os.utime(completa, (viejo, viejo))
+        compactar = CompactarMedios(stdout=io.StringIO())
+        compactar.simular = False
+        compactar.recolectar(set(), 3600)
+        self.assertTrue(os.path.exists(completa))
+        self.assertEqual(ArchivoMedia.objects.get(ruta=ruta).referencias, 1)
+
+
+# =============================================
+# DERIVADOS DE IMÁGENES
+# =============================================
+
+class DerivadosImagenTests(TestCase):
+
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.carpeta.cleanup)
+        ajustes = override_settings(MEDIA_ROOT=self.carpeta.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        os.makedirs(os.path.join(self.carpeta.name, 'portadas'))
+        # PNG con transparencia, más angosto que el ancho mayor
+        Image.new('RGBA', (400, 200), (200, 30, 30, 128)).save(
+            os.path.join(self.carpeta.name, 'portadas', 'a.png'))
+
+    def test_genera_anchos_formatos_y_manifiesto(self):
+        manifiesto = imagenes.generar_derivados('portadas/a.png')
+        self.assertEqual(manifiesto['anchos'], [160, 320, 400])
+        self.assertEqual(manifiesto['proporcion'], 0.5)
+        self.assertTrue(manifiesto['placeholder'].startswith('data:image/jpeg;base64,'))
+
+        carpeta = os.path.join(self.carpeta.name, 'derivados', 'portadas', 'a')
+        self.assertEqual(sorted(os.listdir(carpeta)), [
+            '160.jpg', '160.webp', '320.jpg', '320.webp', '400.jpg', '400.webp', 'manifest.json'])
+        with Image.open(os.path.join(carpeta, '320.webp')) as derivado:
+            self.assertEqual((derivado.format, derivado.size), ('WEBP', (320, 160)))
+        with Image.open(os.path.join(carpeta, '160.jpg')) as derivado:
+            self.assertEqual((derivado.format, derivado.mode, derivado.size), ('JPEG', 'RGB', (160, 80)))
+        with open(os.path.join(carpeta, 'manifest.json')) as archivo:
+            self.assertEqual(json.load(archivo), manifiesto)
+        self.assertEqual(imagenes.manifiesto_de('portadas/a.png'), manifiesto)
+
+        # Volver a generar reemplaza los archivos en lugar de crear copias con sufijo
+        imagenes.generar_derivados('portadas/a.png')
+        self.assertEqual(len(os.listdir(carpeta)), 7)
+
+
+# =============================================
+# CARRITO
+# =============================================
+
+class ResumenCarritoTests(TestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.libros = crear_catalogo(3)
+        self.cliente = User.objects.create_user('cliente', password='x')
+        self.client.force_login(self.cliente)
+
+    def test_se_actualiza_al_agregar_y_cambiar_precio(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for libro in self.libros[:2]:
+                self.client.post(reverse('agregar_al_carrito', args=[libro.libroid]))
+        self.assertEqual(resumen_carrito(self.cliente),
+                         {'items': 2, 'unidades': 2, 'subtotal': Decimal('201.00')})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.libros[0].precioventa = Decimal('50.00')
+            self.libros[0].save()
+        self.assertEqual(resumen_carrito(self.cliente)['subtotal'], Decimal('151.00'))
+
+    def test_la_barra_no_consulta_el_carrito(self):
+        Carrito.objects.create(usuario=self.cliente, libro=self.libros[0], cantidad=2)
+        self.client.get(reverse('eventos'))
+        with self.assertNumQueries(0):
+            resumen_carrito(self.cliente)
+        response = self.client.get(reverse('eventos'))
+        self.assertContains(response, 'class="cart-badge">1<')
+
+
+class CarritoCotizadoTests(TestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.libros = crear_catalogo(10)
+        self.cliente = User.objects.create_user('cliente', password='x')
+        self.client.force_login(self.cliente)
+
+    def _consultas_ver_carrito(self):
+        with CaptureQueriesContext(connection) as consultas:
+            self.client.get(reverse('ver_carrito'))
+        return len(consultas)
+
+    def test_totales_en_una_pasada(self):
+        Carrito.objects.create(usuario=self.cliente, libro=self.libros[0], cantidad=2)
+        Carrito.objects.create(usuario=self.cliente, libro=self.libros[3], cantidad=1)
+        carrito = cotizar_carrito(self.cliente, descuento=Decimal('3.00'))
+        self.assertEqual([linea.subtotal for linea in carrito], [Decimal('200.00'), Decimal('103.00')])
+        self.assertEqual(carrito.subtotal, Decimal('303.00'))
+        self.assertEqual(carrito.iva, Decimal('48.00'))
+        self.assertEqual(carrito.total, Decimal('348.00'))
+        with self.assertRaises(AttributeError):
+            carrito.total = Decimal('0')
+
+    def test_ver_carrito_no_crece_con_el_carrito(self):
+        Carrito.objects.create(usuario=self.cliente, libro=self.libros[0], cantidad=1)
+        con_uno = self._consultas_ver_carrito()
+        for libro in self.libros[1:]:
+            Carrito.objects.create(usuario=self.cliente, libro=libro, cantidad=1)
+        self.assertEqual(self._consultas_ver_carrito(), con_uno)
+
+    def test_procesar_compra_usa_los_totales(self):
+        Carrito.objects.create(usuario=self.cliente, libro=self.libros[0], cantidad=2)
+        response = self.client.post(reverse('procesar_compra'), {'metodo_pago': 'TARJETA'})
+        venta = Venta.objects.get(clienteid=self.cliente)
+        self.assertRedirects(response, reverse('detalle_venta', args=[venta.ventaid]))
+        self.assertEqual(venta.montototal, Decimal('232.00'))
+        self.assertEqual(Libro.objects.get(pk=self.libros[0].pk).stock, 3)
+        self.assertFalse(Carrito.objects.filter(usuario=self.cliente).exists())
+
+
+# =============================================
+# MOTOR DE VENTAS
+# =============================================
+
+class RegistrarVentaTests(TestCase):
+
+    def setUp(self):
+        self.libros = crear_catalogo(3)
+        self.cliente = User.objects.create_user('cliente')
+
+    def test_revierte_todo_si_una_linea_no_alcanza(self):
+        lineas = [LineaVenta(self.libros[0].libroid, 2, Decimal('100.00')),
+                  LineaVenta(self.libros[1].libroid, 6, Decimal('101.00'))]
+        with self.assertRaises(StockInsuficiente) as contexto:
+            registrar_venta(self.cliente, lineas, 'TARJETA')
+        self.assertEqual([f.libroid for f in contexto.exception.faltantes], [self.libros[1].libroid])
+        self.assertEqual(Libro.objects.get(pk=self.libros[0].pk).stock, 5)
+        self.assertFalse(Venta.objects.exists())
+
+    def test_una_consulta_de_stock_y_detalles_en_lote(self):
+        lineas = [LineaVenta(libro.libroid, 1, libro.precioventa) for libro in self.libros]
+        # UPDATE de stock + INSERT de la venta + INSERT de los detalles + upsert del resumen (+ savepoint)
+        with self.assertNumQueries(6):
+            venta = registrar_venta(self.cliente, lineas, 'TARJETA')
+        self.assertEqual(venta.detalles.count(), 3)
+        self.assertEqual(venta.montototal, Decimal('351.48'))
+
+
+class ReservasTests(TestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.libro = crear_catalogo(1)[0]  # stock 5
+        self.ana = User.objects.create_user('ana')
+        self.beto = User.objects.create_user('beto')
+
+    def test_lo_apartado_no_se_vende_a_otros(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            reservar(self.ana, self.libro, 4)
+        self.assertEqual(disponibles([self.libro.libroid]), {self.libro.libroid: 1})
+        with self.assertRaises(SinDisponibilidad):
+            reservar(self.beto, self.libro, 2)
+        with self.assertRaises(StockInsuficiente):
+            registrar_venta(self.beto, [LineaVenta(self.libro.libroid, 2, self.libro.precioventa)],
+                            'TARJETA', respetar_reservas=True)
+        # Quien reservó sí puede comprar lo suyo
+        registrar_venta(self.ana, [LineaVenta(self.libro.libroid, 4, self.libro.precioventa)],
+                        'TARJETA', respetar_reservas=True)
+        self.assertEqual(Libro.objects.get(pk=self.libro.pk).stock, 1)
+
+    def test_las_vencidas_no_cuentan_y_se_borran(self):
+        reservar(self.ana, self.libro, 5)
+        Reserva.objects.update(expira=timezone.now() - timedelta(minutes=1))
+        reservar(self.beto, self.libro, 5)
+        self.assertEqual(liberar_vencidas(), 1)
+        self.assertEqual(list(Reserva.objects.values_list('usuario__username', flat=True)), ['beto'])
+        # El artículo sigue en el carrito de ana; sólo perdió la reserva
+        self.assertTrue(Carrito.objects.filter(usuario=self.ana).exists())
+
+
+class IdempotenciaTests(TestCase):
+
+    def setUp(self):
+        self.libro = crear_catalogo(1)[0]
+        self.cliente = User.objects.create_user('cliente')
+        self.client.force_login(self.cliente)
+
+    def _comprar(self, clave, **datos):
+        Carrito.objects.get_or_create(usuario=self.cliente, libro=self.libro, defaults={'cantidad': 1})
+        return self.client.post(reverse('procesar_compra'),
+                                {'metodo_pago': 'TARJETA', 'clave_idempotencia': clave, **datos})
+
+    def test_repetir_la_clave_no_vuelve_a_vender(self):
+        primera = self._comprar('abc')
+        segunda = self._comprar('abc')
+        venta = Venta.objects.get()
+        self.assertRedirects(primera, reverse('detalle_venta', args=[venta.ventaid]))
+        self.assertEqual(segunda['Location'], primera['Location'])
+        self.assertEqual(Libro.objects.get(pk=self.libro.pk).stock, 4)
+        self.assertEqual(self._comprar('abc', metodo_pago='EFECTIVO').status_code, 422)
+
+    def test_un_error_no_consume_la_clave(self):
+        self._comprar('abc', metodo_pago='')
+        self.assertFalse(ClaveIdempotencia.objects.exists())
+        self._comprar('abc')
+        self.assertEqual(Venta.objects.count(), 1)
+
+    def test_encabezado_y_purga(self):
+        Carrito.objects.create(usuario=self.cliente, libro=self.libro, cantidad=1)
+        respuesta = self.client.post(reverse('procesar_compra'), {'metodo_pago': 'TARJETA'},
+                                     headers={'Idempotency-Key': 'xyz'})
+        self.assertEqual(ClaveIdempotencia.objects.get().respuesta, respuesta['Location'])
+        ClaveIdempotencia.objects.update(expira=timezone.now())
+        self.assertEqual(purgar_vencidas(), 1)
+
+
+class PuntoVentaTests(TestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        punto_venta.indice.version = None
+        self.libros = crear_catalogo(3)
+        Libro.objects.filter(pk=self.libros[0].pk).update(isbn='0-306-40615-2')
+        self.cliente = User.objects.create_user('cliente')
+        self.client.force_login(User.objects.create_user('cajero', is_staff=True))
+
+    def test_busca_por_isbn_y_codigo_de_barras(self):
+        self.assertEqual(punto_venta.buscar_isbn('9780306406157').libroid, self.libros[0].libroid)
+        self.assertEqual(punto_venta.buscar_isbn('0306406152').libroid, self.libros[0].libroid)
+        with self.assertNumQueries(0):
+            self.assertIsNone(punto_venta.buscar_isbn('123'))
+        # Un cambio de precio llega al índice por el registro de cambios
+        with self.captureOnCommitCallbacks(execute=True):
+            libro = Libro.objects.get(pk=self.libros[0].pk)
+            libro.precioventa = Decimal('80.00')
+            libro.save()
+        self.assertEqual(punto_venta.buscar_isbn('9780306406157').precio, Decimal('80.00'))
+
+    def test_venta_escaneada(self):
+        codigos = ['978-0-306-40615-7', '0306406152', '978-0-00001']
+        respuesta = self.client.post(reverse('agregar_venta'), {
+            'modo': 'pos', 'cliente': 'cliente', 'metodopago': 'TARJETA', 'codigos': codigos,
+        })
+        venta = Venta.objects.get()
+        self.assertRedirects(respuesta, reverse('detalle_venta_admin', args=[venta.ventaid]),
+                             fetch_redirect_response=False)
+        self.assertEqual(sorted(venta.detalles.values_list('libroid', 'cantidad')),
+                         [(self.libros[0].libroid, 2), (self.libros[1].libroid, 1)])
+        self.assertEqual(Libro.objects.get(pk=self.libros[0].pk).stock, 3)
+
+    def test_formulario_completo_valida_todo_o_nada(self):
+        self.client.post(reverse('agregar_venta'), {
+            'clienteid': self.cliente.id, 'metodopago': 'TARJETA', 'montototal': '500',
+            'libros': [self.libros[0].libroid, self.libros[1].libroid], 'cantidades': ['1', '9'],
+        })
+        self.assertFalse(Venta.objects.exists())
+        self.assertEqual(Libro.objects.get(pk=self.libros[0].pk).stock, 5)
+
+    def test_formulario_ignora_el_total_enviado(self):
+        self.client.post(reverse('agregar_venta'), {
+            'clienteid': self.cliente.id, 'metodopago': 'TARJETA', 'montototal': '1.00',
+            'descuentoaplicado': '10', 'libros': [self.libros[0].libroid], 'cantidades': ['2'],
+        })
+        # (2 × 100.00 − 10) + 16 % de IVA
+        self.assertEqual(Venta.objects.get().montototal, Decimal('220.40'))
+
+    def test_formulario_rechaza_cantidades_no_positivas(self):
+        for cantidades in (['0'], ['-1'], ['3', '-2']):
+            with self.subTest(cantidades=cantidades):
+                response = self.client.post(reverse('agregar_venta'), {
+                    'clienteid': self.cliente.id, 'metodopago': 'EFECTIVO', 'pagorecibido': '116',
+                    'libros': [self.libros[0].libroid, self.libros[1].libroid][:len(cantidades)],
+                    'cantidades': cantidades,
+                }, follow=True)
+                self.assertContains(response, 'Las cantidades deben ser de al menos 1')
+        self.assertFalse(Venta.objects.exists())
+        self.assertEqual(Libro.objects.get(pk=self.libros[0].pk).stock, 5)
+
+
+class CancelacionesTests(TestCase):
+
+    def setUp(self):
+        self.libros = crear_catalogo(2)
+        self.cliente = User.objects.create_user('cliente')
+        self.ventas = [
+            registrar_venta(self.cliente, [LineaVenta(self.libros[0].libroid, 2, Decimal('100.00')),
+                                           LineaVenta(self.libros[1].libroid, 1, Decimal('101.00'))], 'TARJETA')
+            for _ in range(2)
+        ]
+
+    def _stock(self):
+        return list(Libro.objects.order_by('libroid').values_list('stock', flat=True))
+
+    def test_cancela_en_bloque_sin_repetir(self):
+        self.assertEqual(self._stock(), [1, 3])
+        ids = [venta.ventaid for venta in self.ventas]
+        # Lectura de ventas y de líneas agregadas + 3 UPDATE (líneas, ventas, stock)
+        with self.assertNumQueries(7):
+            self.assertEqual(cancelar_ventas(ids), 2)
+        self.assertEqual(cancelar_ventas(ids), 0)
+        self.assertEqual(self._stock(), [5, 5])
+
+    def test_devolucion_parcial(self):
+        venta = self.ventas[0]
+        linea = venta.detalles.get(libroid=self.libros[0])
+        self.assertEqual(devolver(venta.ventaid, {linea.pk: 1}), Decimal('116.00'))
+        with self.assertRaises(DevolucionInvalida):
+            devolver(venta.ventaid, {linea.pk: 2})
+        self.assertEqual(self._stock(), [2, 3])
+        # Cancelar después sólo repone lo que faltaba
+        cancelar_ventas([venta.ventaid])
+        self.assertEqual(self._stock(), [3, 4])
+        venta.refresh_from_db()
+        self.assertEqual((venta.estadoventa, venta.montodevuelto), ('CANCELADA', venta.montototal))
+
+    def test_devolucion_reparte_el_descuento(self):
+        Libro.objects.update(stock=5)
+        # Subtotal 301.00 menos 30.10 de descuento, más IVA: 314.24 (90% del precio con IVA)
+        venta = registrar_venta(self.cliente, [LineaVenta(self.libros[0].libroid, 2, Decimal('100.00')),
+                                               LineaVenta(self.libros[1].libroid, 1, Decimal('101.00'))],
+                                'TARJETA', descuento=Decimal('30.10'))
+        self.assertEqual(venta.montototal, Decimal('314.24'))
+        linea, otra = venta.detalles.order_by('libroid')
+        # 116.00 con IVA, de los que se reembolsa la parte proporcional
+        self.assertEqual(devolver(venta.ventaid, {linea.pk: 1}), Decimal('104.40'))
+        # La última devolución cierra la venta con lo que faltaba
+        self.assertEqual(devolver(venta.ventaid, {linea.pk: 1, otra.pk: 1}), Decimal('209.84'))
+        venta.refresh_from_db()
+        self.assertEqual((venta.estadoventa, venta.montodevuelto), ('CANCELADA', venta.montototal))
+
+
+class ResumenDiarioTests(TestCase):
+
+    def setUp(self):
+        self.libros = crear_catalogo(2)
+        self.cliente = User.objects.create_user('cliente')
+
+    def _vender(self, metodo='TARJETA'):
+        return registrar_venta(self.cliente, [LineaVenta(self.libros[0].libroid, 1, Decimal('100.00')),
+                                              LineaVenta(self.libros[1].libroid, 1, Decimal('101.00'))], metodo)
+
+    def _filas(self):
+        return sorted(VentaResumenDiario.objects.values_list('metodopago', 'estadoventa', 'ventas', 'bruto', 'unidades'))
+
+    def test_venta_suma_a_su_fila(self):
+        self._vender()
+        self._vender()
+        self._vender('EFECTIVO')
+        filas = self._filas()
+        total = Venta.objects.first().montototal
+        self.assertEqual(filas, [('EFECTIVO', 'COMPLETADA', 1, total, 2), ('TARJETA', 'COMPLETADA', 2, 2 * total, 4)])
+        hoy = resumen_dia()
+        self.assertEqual((hoy['ventas'], hoy['ingresos']), (3, 3 * total))
+
+    def test_cancelar_recalcula_el_dia_y_coincide_con_reconstruir(self):
+        venta = self._vender()
+        self._vender()
+        with self.captureOnCommitCallbacks(execute=True):
+            cancelar_ventas([venta.ventaid])
+        incremental = self._filas()
+        self.assertEqual([fila[:3] for fila in incremental],
+                         [('TARJETA', 'CANCELADA', 1), ('TARJETA', 'COMPLETADA', 1)])
+        self.assertEqual(resumen_dia()['ingresos'], venta.montototal)
+        recalcular_rango()
+        self.assertEqual(self._filas(), incremental)
+
+    def test_un_recalculo_por_transaccion_y_sobrevive_a_un_rollback(self):
+        dia, otro = timezone.localdate(), timezone.localdate() - timedelta(days=1)
+        with patch.object(resumenes, 'recalcular_dias') as recalcular:
+            with self.captureOnCommitCallbacks(execute=True):
+                resumenes.marcar_dias(dia)
+                resumenes.marcar_dias(dia, otro)
+            recalcular.assert_called_once_with({dia, otro})
+
+            # Los días de una transacción revertida se recalculan con la siguiente
+            recalcular.reset_mock()
+            try:
+                with transaction.atomic():
+                    resumenes.marcar_dias(otro)
+                    raise DatabaseError
+            except DatabaseError:
+                pass
+            with self.captureOnCommitCallbacks(execute=True):
+                resumenes.marcar_dias(dia)
+            recalcular.assert_called_once_with({dia, otro})
+
+
+class AnaliticaTests(TestCase):
+
+    def setUp(self):
+        caches['analitica'].clear()
+        self.libros = crear_catalogo(3)
+        Libro.objects.filter(pk=self.libros[2].pk).update(genero='TER')
+        self.cliente = User.objects.create_user('cliente')
+        self.hoy = timezone.localdate()
+        self.ventas = [
+            registrar_venta(self.cliente, [LineaVenta(self.libros[0].libroid, 2, Decimal('100.00')),
+                                           LineaVenta(self.libros[2].libroid, 1, Decimal('102.00'))], 'TARJETA'),
+            registrar_venta(self.cliente, [LineaVenta(self.libros[1].libroid, 1, Decimal('101.00'))], 'EFECTIVO'),
+        ]
+        # La segunda venta, dos meses atrás
+        Venta.objects.filter(pk=self.ventas[1].pk).update(fechaventa=timezone.now() - timedelta(days=62))
+
+    def _por_genero(self):
+        datos = serie_ventas(self.hoy - timedelta(days=90), self.hoy, 'mes', 'genero')
+        return {serie['nombre']: (serie['total_unidades'], serie['total_ingresos']) for serie in datos['series']}
+
+    def test_series_por_mes_y_genero(self):
+        datos = serie_ventas(self.hoy - timedelta(days=90), self.hoy, 'mes', 'genero')
+        ficcion = next(serie for serie in datos['series'] if serie['clave'] == 'FIC')
+        self.assertEqual(ficcion['unidades'][-1], 2)
+        self.assertEqual(sum(ficcion['unidades']), 3)
+        self.assertEqual(self._por_genero(), {'Ficción': (3, '301.00'), 'Terror': (1, '102.00')})
+        # Con los bloques en caché no hay consultas
+        with self.assertNumQueries(0):
+            serie_ventas(self.hoy - timedelta(days=90), self.hoy, 'semana', 'genero')
+        autores = serie_ventas(self.hoy - timedelta(days=90), self.hoy, 'dia', 'autor', limite=1)
+        self.assertEqual([serie['nombre'] for serie in autores['series']], ['Autor 0 Prueba', 'Otros'])
+
+    def test_cancelar_descarta_el_mes(self):
+        self._por_genero()
+        with self.captureOnCommitCallbacks(execute=True):
+            cancelar_ventas([self.ventas[0].ventaid])
+        self.assertEqual(self._por_genero(), {'Ficción': (1, '101.00')})
+
+    def test_invalidacion_llega_por_la_cache_compartida(self):
+        self._por_genero()
+        bloques_locales = dict(caches['analitica']._cache)
+        # Otro proceso cancela: sólo cambia el sello en 'default', no la caché local de bloques
+        DetalleVenta.objects.filter(ventaid=self.ventas[0]).update(cantidaddevuelta=F('cantidad'))
+        analitica.invalidar_dias(self.hoy)
+        self.assertEqual(dict(caches['analitica']._cache).keys(), bloques_locales.keys())
+        self.assertEqual(self._por_genero(), {'Ficción': (1, '101.00')})
+
+
+class ExportarTests(TestCase):
+
+    def setUp(self):
+        self.libros = crear_catalogo(2)
+        Libro.objects.filter(pk=self.libros[1].pk).update(titulo='=HIPERVINCULO("x")')
+        self.cliente = User.objects.create_user('cliente')
+        for libro in self.libros:
+            registrar_venta(self.cliente, [LineaVenta(libro.libroid, 1, libro.precioventa)], 'TARJETA')
+        cancelar_ventas([Venta.objects.order_by('ventaid').last().ventaid])
+
+    def _bytes(self, *args, **kwargs):
+        return b''.join(exportar(*args, **kwargs))
+
+    def test_csv_por_paginas_con_columnas_unidas(self):
+        lineas = self._bytes('detalles', 'csv', tamano_pagina=1).decode('utf-8-sig').splitlines()
+        filas = list(csv.reader(lineas))
+        self.assertEqual(len(filas), 3)
+        self.assertEqual(filas[1][filas[0].index('Autor')], 'Autor 0 Prueba')
+        self.assertEqual(filas[2][filas[0].index('Título')], '\'=HIPERVINCULO("x")')
+        completadas = self._bytes('ventas', 'csv', estado='COMPLETADA').decode('utf-8-sig').splitlines()
+        self.assertEqual(len(completadas), 2)
+
+    def test_xlsx_es_un_zip_valido(self):
+        contenido = self._bytes('ventas', 'xlsx', tamano_pagina=1)
+        with zipfile.ZipFile(io.BytesIO(contenido)) as archivo:
+            self.assertIsNone(archivo.testzip())
+            hoja = archivo.read('xl/worksheets/sheet1.xml').decode()
+        self.assertEqual(hoja.count('<row>'), 3)
+
+    def test_vista_en_streaming(self):
+        admin = User.objects.create_user('admin', is_staff=True)
+        self.client.force_login(admin)
+        respuesta = self.client.get(reverse('exportar_ventas'), {'tabla': 'detalles', 'formato': 'xlsx'})
+        self.assertTrue(respuesta.streaming)
+        self.assertIn('detalles_', respuesta['Content-Disposition'])
+        self.assertEqual(self.client.get(reverse('exportar_ventas'), {'estado': 'OTRO'}).status_code, 400)
+
+ONIX_PRUEBA = """<?xml version="1.0" encoding="UTF-8"?>
+<ONIXMessage release="3.0" xmlns="http://ns.editeur.org/onix/3.0/reference">
+  <Product>
+    <ProductIdentifier><ProductIDType>15</ProductIDType><IDValue>9780306406157</IDValue></ProductIdentifier>
+    <DescriptiveDetail>
+      <TitleDetail><TitleElement><TitleText>Libro ONIX</TitleText></TitleElement></TitleDetail>
+      <Contributor><ContributorRole>A01</ContributorRole><NamesBeforeKey>Ana</NamesBeforeKey><KeyNames>Pérez</KeyNames></Contributor>
+      <Subject><SubjectSchemeIdentifier>10</SubjectSchemeIdentifier><SubjectCode>FIC015000</SubjectCode></Subject>
+    </DescriptiveDetail>
+    <PublishingDetail>
+      <Publisher><PublisherName>Editorial 0</PublisherName></Publisher>
+      <PublishingDate><PublishingDateRole>01</PublishingDateRole><Date>20190301</Date></PublishingDate>
+    </PublishingDetail>
+    <ProductSupply><SupplyDetail><Price><PriceAmount>250.00</PriceAmount></Price></SupplyDetail></ProductSupply>
+  </Product>
+</ONIXMessage>"""
+
+
+class ImportarCatalogoTests(TestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.libro = crear_catalogo(1)[0]
+        Libro.objects.filter(pk=self.libro.pk).update(isbn='0-306-40615-2')
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+
+    def _archivo(self, nombre, contenido):
+        ruta = os.path.join(self.directorio.name, nombre)
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write(contenido)
+        return ruta
+
+    def test_csv_actualiza_por_isbn_normalizado_y_crea_lo_nuevo(self):
+        ruta = self._archivo('catalogo.csv', (
+            'ISBN,Título,Autor,Editorial,Género,Año,Precio,Stock\n'
+            '978-0-306-40615-7,Nuevo título,Autor 0 Prueba,Editorial 0,Terror,2001,120.00,9\n'
+            '978-1-86197-876-9,Otro libro,"Rulfo, Juan",Editorial Nueva,Ficción,1955,99.90,3\n'
+            '978-1-86197-876-0,ISBN malo,Juan Rulfo,Editorial Nueva,FIC,1955,99.90,3\n'
+        ))
+        resultado = importar(leer(ruta))
+        self.assertEqual((resultado.creados, resultado.actualizados, resultado.invalidos), (1, 1, 1))
+        self.assertEqual(resultado.autores_nuevos, 1)
+        self.libro.refresh_from_db()
+        # El ISBN guardado se conserva y el stock de un libro existente no se toca
+        self.assertEqual((self.libro.isbn, self.libro.titulo, self.libro.genero, self.libro.stock),
+                         ('0-306-40615-2', 'Nuevo título', 'TER', 5))
+        nuevo = Libro.objects.get(isbn='978-1-86197-876-9')
+        self.assertEqual((nuevo.autorid.nombre, nuevo.autorid.apellido, nuevo.stock), ('Juan', 'Rulfo', 3))
+        self.assertEqual(buscar_ids('Rulfo'), [nuevo.libroid])
+
+    def test_onix_y_punto_de_control(self):
+        ruta = self._archivo('catalogo.xml', ONIX_PRUEBA)
+        control = os.path.join(self.directorio.name, 'avance.json')
+        resultado = importar(leer(ruta), al_escribir=lambda r: guardar_punto_control(control, ruta, r.leidos))
+        self.assertEqual(resultado.actualizados, 1)
+        self.libro.refresh_from_db()
+        self.assertEqual((self.libro.titulo, self.libro.genero, self.libro.aniopublicacion),
+                         ('Libro ONIX', 'TER', 2019))
+        self.assertEqual(leer_punto_control(control, ruta), 1)
+        self.assertEqual(importar(leer(ruta), saltar=1).actualizados, 0)
+
+    def test_lote_revertido_no_deja_rastro_en_memoria(self):
+        class ImportadorQueFalla(ImportadorCatalogo):
+            fallar = True
+
+            def _resolver_editoriales(self, registros):
+                nuevas = super()._resolver_editoriales(registros)
+                if self.fallar:
+                    raise DatabaseError('falla simulada')
+                return nuevas
+
+        ruta = self._archivo('catalogo.csv', (
+            'ISBN,Título,Autor,Editorial,Género,Año,Precio,Stock\n'
+            '978-1-86197-876-9,Otro libro,Juan Rulfo,Editorial Nueva,Ficción,1955,99.90,3\n'
+        ))
+        registro = validar(next(iter(leer(ruta))))
+        importador = ImportadorQueFalla()
+        importador.agregar(registro)
+        with self.assertRaises(DatabaseError):
+            importador.escribir()
+        resultado = importador.resultado
+        self.assertEqual((resultado.creados, resultado.actualizados, resultado.autores_nuevos), (0, 0, 0))
+        self.assertNotIn(registro.clave, importador.existentes)
+        self.assertFalse(Autor.objects.filter(apellido='Rulfo').exists())
+
+        # El mismo importador reintenta el lote desde cero
+        importador.fallar = False
+        importador.agregar(registro)
+        importador.escribir()
+        self.assertEqual((resultado.creados, resultado.autores_nuevos, resultado.editoriales_nuevas), (1, 1, 1))
+        self.assertEqual(Libro.objects.get(isbn='978-1-86197-876-9').autorid.apellido, 'Rulfo')
+
+
+class GeneradorDatosTests(TestCase):
+
+    def test_genera_las_cantidades_de_la_escala_de_forma_determinista(self):
+        escritas = generador.generar(escala=0.01, semilla=7, dias=30)
+        self.assertEqual(Libro.objects.count(), escritas['libros'])
+        self.assertEqual(escritas['libros'], 20)
+        self.assertEqual(Venta.objects.count(), 100)
+        self.assertEqual(DetalleVenta.objects.count(), escritas['detalles'])
+        self.assertTrue(all(punto_venta.isbn_valido(isbn) for isbn in Libro.objects.values_list('isbn', flat=True)))
+        # El resumen diario se recalcula al terminar
+        self.assertEqual(sum(VentaResumenDiario.objects.values_list('ventas', flat=True)), 100)
+
+        # Los mismos argumentos dan las mismas filas, en cualquier proceso
+        plan = generador.planear(0.01, 7, 30)
+        generador._iniciar_trabajador([generador.precio_de(7, i) for i in range(plan['libros'])])
+        self.assertEqual(generador.filas_ventas(7, 0, 0, 50, plan), generador.filas_ventas(7, 0, 0, 50, plan))
+        self.assertNotEqual(generador.filas_ventas(7, 0, 0, 50, plan), generador.filas_ventas(8, 0, 0, 50, plan))
+
+
+class RendimientoTests(TestCase):
+
+    def test_todas_las_rutas_tienen_escenario(self):
+        self.assertEqual(rendimiento.rutas_sin_escenario(), [])
+        self.assertEqual(rendimiento.percentil([4, 1, 3, 2], 50), 2.5)
+        self.assertEqual(rendimiento.percentil([1, 2, 3, 4, 5], 95), 4.8)
+
+    def test_mide_rutas_y_detecta_regresiones(self):
+        crear_catalogo(2)
+        resultados, omitidas = rendimiento.medir_rutas(
+            repeticiones=3, calentamiento=0, rutas=['inicio', 'libros:busqueda', 'mis_compras', 'detalle_blog'])
+        self.assertEqual(set(resultados), {'inicio', 'libros:busqueda', 'mis_compras'})
+        self.assertEqual(omitidas, {'detalle_blog': 'sin datos: blog'})
+        for metricas in resultados.values():
+            self.assertEqual(metricas['estado'], 200)
+            self.assertLessEqual(metricas['p50_ms'], metricas['p95_ms'])
+            self.assertGreater(metricas['bytes'], 0)
+
+        lento = {**resultados['inicio'], 'p95_ms': resultados['inicio']['p95_ms'] * 2 + 10}
+        self.assertEqual(rendimiento.comparar(resultados, resultados), [])
+        self.assertEqual(len(rendimiento.comparar({'inicio': lento}, resultados)), 1)
+
+
+class AuditoriaConsultasTests(TestCase):
+
+    def test_reporta_recorridos_y_respeta_los_indices(self):
+        crear_catalogo(3)
+        hallazgos = {ruta: consulta.hallazgos
+                     for consulta in auditoria.auditar(['admin_libros', 'mis_compras', 'inicio'], minimo_filas=0)
+                     for ruta in consulta.rutas}
+        self.assertIn('recorrido completo de app_Libreria_libro (3 filas)', hallazgos['admin_libros'])
+        # venta_cliente_fecha_idx y libro_con_stock_idx
+        self.assertNotIn('mis_compras', hallazgos)
+        self.assertNotIn('inicio', hallazgos)
+        self.assertEqual(auditoria.auditar(['admin_libros']), [])
+
+    def test_motor_sin_explain(self):
+        with patch.object(connection, 'vendor', 'mysql'):
+            self.assertIsNone(auditoria.auditar(['admin_libros']))
+            with self.assertRaisesMessage(CommandError, 'Sin EXPLAIN para mysql'):
+                call_command('auditar_consultas', stdout=io.StringIO())
+
+
+class MotorSqliteTests(TestCase):
+
+    def test_pragmas_y_transacciones_inmediatas(self):
+        with connection.cursor() as cursor:
+            for pragma, esperado in [('journal_mode', 'wal'), ('synchronous', 1), ('busy_timeout', 5000),
+                                     ('temp_store', 2)]:
+                cursor.execute(f'PRAGMA {pragma}')
+                self.assertEqual(cursor.fetchone()[0], esperado, pragma)
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+        self.assertTrue(connection.is_usable())
+
+
+class EnrutadorReplicaTests(TestCase):
+
+    def decidir(self, request, ruta):
+        """``(leía de la réplica durante la vista, response)``"""
+        decisiones = []
+
+        def vista(request):
+            middleware.process_view(request, vista, (), {})
+            decisiones.append(enrutador.leer_de_replica())
+            return HttpResponse()
+
+        middleware = enrutador.LecturaReplicaMiddleware(vista)
+        request.resolver_match = type('Resolucion', (), {'url_name': ruta})()
+        response = middleware(request)
+        self.assertFalse(enrutador.leer_de_replica())
+        return decisiones[0], response
+
+    def test_vistas_publicas_leen_de_replica_salvo_tras_escribir(self):
+        fabrica = RequestFactory()
+        self.assertTrue(self.decidir(fabrica.get('/'), 'inicio')[0])
+        self.assertFalse(self.decidir(fabrica.get('/'), 'ver_carrito')[0])
+
+        en_replica, response = self.decidir(fabrica.post('/'), 'procesar_compra')
+        self.assertFalse(en_replica)
+        pegado = response.cookies[enrutador.COOKIE_PEGADO].value
+        fabrica.cookies[enrutador.COOKIE_PEGADO] = pegado
+        self.assertFalse(self.decidir(fabrica.get('/'), 'libros')[0])
+
+    def test_sin_alias_replica_todo_va_a_default(self):
+        router = enrutador.EnrutadorReplica()
+        token = enrutador._en_replica.set(True)
+        try:
+            self.assertEqual(router.db_for_read(Libro), 'default')
+        finally:
+            enrutador._en_replica.reset(token)
+        self.assertEqual(router.db_for_write(Libro), 'default')
+        self.assertFalse(router.allow_migrate('replica', 'app_Libreria'))
+
+
+class VentasConcurrentesTests(TransactionTestCase):
+
+    def test_no_sobrevende_con_compras_simultaneas(self):
+        libro = crear_catalogo(1)[0]
+        cliente = User.objects.create_user('cliente')
+        compradores = 20
+        vendidas, agotadas, errores = [], [], []
+        salida = threading.Barrier(compradores)
+
+        def comprar():
+            try:
+                salida.wait()
+                registrar_venta(cliente, [LineaVenta(libro.libroid, 1, libro.precioventa)], 'TARJETA')
+                vendidas.append(1)
+            except StockInsuficiente:
+                agotadas.append(1)
+            except Exception as e:
+                errores.append(e)
+            finally:
+                connections.close_all()
+
+        hilos = [threading.Thread(target=comprar) for _ in range(compradores)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(errores, [])
+        self.assertEqual(len(vendidas), 5)
+        self.assertEqual(len(agotadas), compradores - 5)
+        self.assertEqual(Libro.objects.get(pk=libro.pk).stock, 0)
+        self.assertEqual(DetalleVenta.objects.count(), 5)
+
+    def test_no_aparta_de_mas_con_carritos_simultaneos(self):
+        libro = crear_catalogo(1)[0]  # stock 5
+        usuarios = [User.objects.create_user(f'usuario{i}') for i in range(12)]
+        apartadas, agotadas, errores = [], [], []
+        salida = threading.Barrier(len(usuarios))
+
+        def apartar(usuario):
+            try:
+                salida.wait()
+                reservar(usuario, libro, 1)
+                apartadas.append(1)
+            except SinDisponibilidad:
+                agotadas.append(1)
+            except Exception as e:
+                errores.append(e)
+            finally:
+                connections.close_all()
+
+        hilos = [threading.Thread(target=apartar, args=(usuario,)) for usuario in usuarios]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(errores, [])
+        self.assertEqual(len(apartadas), 5)
+        self.assertEqual(len(agotadas), len(usuarios) - 5)
+        self.assertEqual(Reserva.objects.aggregate(n=Sum('cantidad'))['n'], 5)
@@ -40,10 +40,14 @@ urlpatterns = [
     # CRUD Ventas (admin)
     path('panel-admin/ventas/', views.admin_ventas, name='admin_ventas'),
     path('panel-admin/ventas/agregar/', views.agregar_venta, name='agregar_venta'),
+    path('panel-admin/ventas/isbn/<str:codigo>/', views.buscar_isbn_venta, name='buscar_isbn_venta'),
+    path('panel-admin/ventas/analitica/', views.analitica_ventas, name='analitica_ventas'),
+    path('panel-admin/ventas/exportar/', views.exportar_ventas, name='exportar_ventas'),
     path('panel-admin/ventas/editar/<int:id>/', views.editar_venta, name='editar_venta'),
     path('panel-admin/ventas/eliminar/<int:id>/', views.eliminar_venta, name='eliminar_venta'),
     path('panel-admin/ventas/<int:venta_id>/', views.detalle_venta_admin, name='detalle_venta_admin'),
     path('panel-admin/ventas/cancelar/<int:venta_id>/', views.cancelar_venta, name='cancelar_venta'),
+    path('panel-admin/ventas/devolver/<int:venta_id>/', views.devolver_venta, name='devolver_venta'),
     
     # CRUD Detalles Venta (admin)
     path('panel-admin/detalles-venta/', views.admin_detalles_venta, name='admin_detalles_venta'),
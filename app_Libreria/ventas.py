@@ -0,0 +1,296 @@
+# app_Libreria/ventas.py
+"""
+Motor de ventas: registra una venta con sus detalles y descuenta el stock
+de forma atómica.
+
+Todo ocurre dentro de ``transaction.atomic``:
+
+1. El stock de todos los libros se descuenta con un único ``UPDATE`` con
+   ``CASE``, condicionado a que cada libro tenga existencias suficientes
+   (``WHERE (libroid = 1 AND stock >= 2) OR ...``). La condición la evalúa
+   la base de datos al escribir la fila, así que dos compras simultáneas no
+   pueden vender la misma unidad.
+   Con un ``usuario``, a las existencias se les restan además las unidades
+   que otros usuarios tienen apartadas (``reservas.apartado``).
+2. Si el ``UPDATE`` afectó menos filas que libros hay en la venta, alguna
+   línea no alcanzó: se lanza ``StockInsuficiente`` y la transacción se
+   revierte completa.
+3. La ``Venta`` se inserta y sus ``DetalleVenta`` se crean con
+   ``bulk_create``.
+
+``update()`` y ``bulk_create()`` no disparan señales, así que al confirmar
+se avisa a las facetas y a la caché de tarjetas de los libros tocados.
+
+Cancelaciones y devoluciones hacen el camino inverso, también en una
+transacción: ``cancelar_ventas`` anula muchas ventas por lotes y
+``devolver`` reembolsa unidades de algunas líneas. En ambos casos el stock
+se repone sumando por libro y con un ``UPDATE`` con ``F('stock') + n``, sin
+leer ni guardar cada ``Libro``. ``DetalleVenta.cantidaddevuelta`` evita
+devolver dos veces la misma unidad.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, F, Q, Sum, When
+
+from . import facetas, reservas, resumenes, tarjetas
+from .carrito import TASA_IVA, redondear
+from .models import Libro, Venta, DetalleVenta
+
+
+TAMANO_LOTE = 500
+
+
+class StockInsuficiente(Exception):
+    """Alguna línea pide más unidades de las que hay; ``faltantes`` las lista"""
+
+    def __init__(self, faltantes):
+        self.faltantes = faltantes
+        super().__init__('; '.join(
+            f'"{faltante.titulo}": disponible {faltante.disponible}, solicitado {faltante.solicitado}'
+            for faltante in faltantes
+        ))
+
+
+class DevolucionInvalida(Exception):
+    """La devolución pide más unidades de las que quedan por devolver"""
+
+
+@dataclass(frozen=True)
+class Faltante:
+    libroid: int
+    titulo: str
+    disponible: int
+    solicitado: int
+
+
+@dataclass(frozen=True)
+class LineaVenta:
+    libroid: int
+    cantidad: int
+    precio_unitario: Decimal
+
+
+def notificar_cambio_stock(libroids):
+    """Facetas y tarjetas de libros cuyo stock cambió con ``update()``"""
+    libroids = list(libroids)
+
+    def notificar():
+        for libroid in libroids:
+            facetas.registrar_cambio(libroid)
+            tarjetas.cambiar_sello('libro', libroid)
+        reservas.invalidar_disponibles(*libroids)
+
+    transaction.on_commit(notificar)
+
+
+def descontar_stock(cantidades, usuario=None):
+    """
+    Descuenta ``{libroid: cantidad}`` en un solo ``UPDATE`` condicional.
+    Debe llamarse dentro de una transacción: si falta stock lanza
+    ``StockInsuficiente`` y la transacción debe revertirse. Con ``usuario``
+    no se tocan las unidades que otros tienen reservadas.
+    """
+    if not cantidades:
+        return
+    condicion = Q()
+    casos = []
+    for libroid, cantidad in cantidades.items():
+        if usuario is None:
+            condicion |= Q(libroid=libroid, stock__gte=cantidad)
+        else:
+            condicion |= Q(libroid=libroid, stock__gte=reservas.apartado(usuario) + cantidad)
+        casos.append(When(libroid=libroid, then=F('stock') - cantidad))
+
+    actualizados = Libro.objects.filter(condicion).update(stock=Case(*casos, default=F('stock')))
+    if actualizados != len(cantidades):
+        raise StockInsuficiente(_faltantes(cantidades, usuario))
+    notificar_cambio_stock(cantidades)
+
+
+def _faltantes(cantidades, usuario=None):
+    # El stock de los libros que no alcanzaron no cambió: el UPDATE no los tocó
+    libros = Libro.objects.filter(libroid__in=cantidades)
+    if usuario is not None:
+        libros = libros.annotate(libre=F('stock') - reservas.apartado(usuario))
+    else:
+        libros = libros.annotate(libre=F('stock'))
+    faltantes = []
+    existentes = set()
+    for libroid, titulo, stock in libros.values_list('libroid', 'titulo', 'libre'):
+        existentes.add(libroid)
+        if stock < cantidades[libroid]:
+            faltantes.append(Faltante(libroid, titulo, stock, cantidades[libroid]))
+    for libroid in cantidades.keys() - existentes:
+        faltantes.append(Faltante(libroid, f'#{libroid}', 0, cantidades[libroid]))
+    return faltantes
+
+
+def calcular_total(lineas, descuento=Decimal('0')):
+    """Subtotal de las líneas menos el descuento, más IVA"""
+    subtotal = sum((linea.precio_unitario * linea.cantidad for linea in lineas), Decimal('0'))
+    base = subtotal - min(descuento, subtotal)
+    return redondear(base + base * TASA_IVA)
+
+
+def registrar_venta(cliente, lineas, metodopago, pagorecibido=None, descuento=Decimal('0'),
+                    montototal=None, estado='COMPLETADA', respetar_reservas=False):
+    """
+    Crea una venta con sus detalles y descuenta el stock, todo o nada.
+
+    ``lineas`` es un iterable de ``LineaVenta`` (o de cualquier objeto con
+    ``libroid``, ``cantidad`` y ``precio_unitario``). Si no se da
+    ``montototal`` se calcula: subtotal menos descuento más IVA. Si no se da
+    ``pagorecibido`` se asume el total exacto. Con ``respetar_reservas`` no
+    se venden unidades apartadas en carritos de otros usuarios.
+    """
+    lineas = [linea for linea in lineas if linea.cantidad > 0]
+    cantidades = {}
+    for linea in lineas:
+        cantidades[linea.libroid] = cantidades.get(linea.libroid, 0) + linea.cantidad
+
+    if montototal is None:
+        montototal = calcular_total(lineas, descuento)
+    if pagorecibido is None:
+        pagorecibido = montototal
+
+    with transaction.atomic():
+        descontar_stock(cantidades, cliente if respetar_reservas else None)
+
+        venta = Venta(
+            clienteid=cliente,
+            montototal=montototal,
+            metodopago=metodopago,
+            estadoventa=estado,
+            descuentoaplicado=descuento,
+            pagorecibido=pagorecibido,
+        )
+        venta.calcular_cambio()
+        # El resumen diario se suma abajo, ya con las unidades
+        venta._sin_resumen = True
+        venta.save()
+
+        # bulk_create no llama a DetalleVenta.save(): el subtotal se calcula aquí
+        DetalleVenta.objects.bulk_create([
+            DetalleVenta(
+                ventaid=venta,
+                libroid_id=linea.libroid,
+                cantidad=linea.cantidad,
+                preciounitario=linea.precio_unitario,
+                iva=TASA_IVA,
+                subtotal=linea.precio_unitario * linea.cantidad,
+            )
+            for linea in lineas
+        ])
+        resumenes.sumar_venta(venta, sum(cantidades.values()))
+    return venta
+
+
+# =============================================
+# CANCELACIONES Y DEVOLUCIONES
+# =============================================
+
+def _lotes(valores, tamano=TAMANO_LOTE):
+    valores = list(valores)
+    for inicio in range(0, len(valores), tamano):
+        yield valores[inicio:inicio + tamano]
+
+
+def reponer_stock(cantidades):
+    """Suma ``{libroid: cantidad}`` al stock con un ``UPDATE`` por lote de libros"""
+    cantidades = {libroid: cantidad for libroid, cantidad in cantidades.items() if cantidad}
+    for lote in _lotes(cantidades):
+        Libro.objects.filter(libroid__in=lote).update(stock=Case(
+            *[When(libroid=libroid, then=F('stock') + cantidades[libroid]) for libroid in lote],
+            default=F('stock'),
+        ))
+    if cantidades:
+        notificar_cambio_stock(cantidades)
+
+
+def cancelar_ventas(ventaids, tamano_lote=TAMANO_LOTE):
+    """
+    Cancela las ventas dadas que no lo estén ya y repone el stock que les
+    quedaba sin devolver, todo en una transacción. Devuelve cuántas canceló.
+    """
+    reponer = {}
+    canceladas = 0
+    with transaction.atomic():
+        for lote in _lotes(dict.fromkeys(ventaids), tamano_lote):
+            # select_for_update bloquea las filas donde la base de datos lo permite; en
+            # SQLite la transacción ya tiene la escritura para sí en cuanto actualiza
+            seleccion = dict(Venta.objects.select_for_update().filter(ventaid__in=lote)
+                             .exclude(estadoventa='CANCELADA').values_list('ventaid', 'fechaventa'))
+            if not seleccion:
+                continue
+            ids = list(seleccion)
+            # update() no dispara señales: los días tocados se recalculan al confirmar
+            resumenes.marcar_dias(*{resumenes.dia_de(fecha) for fecha in seleccion.values()})
+            pendientes = (DetalleVenta.objects.filter(ventaid__in=ids).order_by()
+                          .values('libroid').annotate(unidades=Sum(F('cantidad') - F('cantidaddevuelta')))
+                          .values_list('libroid', 'unidades'))
+            for libroid, unidades in pendientes:
+                reponer[libroid] = reponer.get(libroid, 0) + unidades
+            DetalleVenta.objects.filter(ventaid__in=ids).update(cantidaddevuelta=F('cantidad'))
+            canceladas += Venta.objects.filter(ventaid__in=ids).update(
+                estadoventa='CANCELADA', montodevuelto=F('montototal'),
+            )
+        reponer_stock(reponer)
+    return canceladas
+
+
+def devolver(ventaid, cantidades):
+    """
+    Devuelve ``{detalleventaid: unidades}`` de una venta: repone el stock y
+    suma el importe a ``montodevuelto``. El importe es el precio más IVA de
+    las unidades, con el descuento de la venta repartido en proporción entre
+    las líneas. Si ya no queda nada por devolver, la venta queda cancelada y
+    se reembolsa todo lo que faltaba. Devuelve el importe.
+    """
+    cantidades = {int(detalleid): int(unidades) for detalleid, unidades in cantidades.items() if int(unidades)}
+    if not cantidades:
+        raise DevolucionInvalida('No se indicó ninguna unidad a devolver')
+
+    with transaction.atomic():
+        venta = Venta.objects.select_for_update().get(ventaid=ventaid)
+        if venta.estadoventa == 'CANCELADA':
+            raise DevolucionInvalida(f'La venta #{ventaid} ya está cancelada')
+        detalles = {detalle.detalleventaid: detalle for detalle in venta.detalles.all()}
+
+        condicion = Q()
+        casos = []
+        reponer = {}
+        importe = Decimal('0')
+        for detalleid, unidades in cantidades.items():
+            detalle = detalles.get(detalleid)
+            if detalle is None or unidades < 0 or unidades > detalle.cantidad - detalle.cantidaddevuelta:
+                raise DevolucionInvalida(f'La línea #{detalleid} no tiene {unidades} unidades por devolver')
+            condicion |= Q(detalleventaid=detalleid, cantidaddevuelta__lte=F('cantidad') - unidades)
+            casos.append(When(detalleventaid=detalleid, then=F('cantidaddevuelta') + unidades))
+            reponer[detalle.libroid_id] = reponer.get(detalle.libroid_id, 0) + unidades
+            importe += detalle.preciounitario * unidades * (1 + detalle.iva)
+
+        # Condicionado como descontar_stock: otra devolución simultánea no puede pasarse
+        actualizadas = venta.detalles.filter(condicion).update(
+            cantidaddevuelta=Case(*casos, default=F('cantidaddevuelta'))
+        )
+        if actualizadas != len(cantidades):
+            raise DevolucionInvalida('Otra devolución cambió la venta; vuelve a intentarlo')
+        reponer_stock(reponer)
+
+        pendiente = venta.montototal - venta.montodevuelto
+        if venta.detalles.filter(cantidaddevuelta__lt=F('cantidad')).exists():
+            # montototal ya trae el descuento: cada línea devuelve su parte proporcional
+            bruto = sum((detalle.preciounitario * detalle.cantidad * (1 + detalle.iva)
+                         for detalle in detalles.values()), Decimal('0'))
+            if bruto:
+                importe = importe * venta.montototal / bruto
+            importe = min(redondear(importe), pendiente)
+        else:
+            # La última devolución se lleva lo que quede, sin residuos de redondeo
+            importe = pendiente
+            venta.estadoventa = 'CANCELADA'
+        venta.montodevuelto += importe
+        venta.save(update_fields=['montodevuelto', 'estadoventa'])
+    return importe
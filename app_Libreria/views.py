@@ -3,12 +3,27 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from django.http import HttpResponseForbidden
+from django.http import HttpResponseForbidden, JsonResponse, StreamingHttpResponse, HttpResponseBadRequest
+from django.urls import reverse
 from django.utils import timezone
-from django.db.models import Q
-from datetime import datetime
+from django.db import transaction
+from django.db.models import Q, Prefetch
+from datetime import datetime, timedelta
 from decimal import Decimal, InvalidOperation
 from .models import *
+from .catalogo import leer_filtros, pagina_catalogo
+from .busqueda import ids_para_conteo
+from .facetas import facetas_catalogo
+from .tarjetas import tarjetas_libros
+from .carrito import TASA_IVA, cotizar_carrito
+from .ventas import (registrar_venta, calcular_total, cancelar_ventas, devolver, LineaVenta,
+                     StockInsuficiente, DevolucionInvalida)
+from .reservas import reservar, SinDisponibilidad
+from .idempotencia import idempotente
+from .punto_venta import buscar_isbn, cantidades_por_codigo, validar_lineas
+from .resumenes import resumen_dia, totales_panel
+from .analitica import serie_ventas, LIMITE_DEFAULT
+from .exportar import exportar, nombre_archivo, TIPOS_CONTENIDO
 
 # =============================================
 # DECORADORES PERSONALIZADOS
@@ -36,33 +51,74 @@ def crear_perfil_cliente(user):
 
 def inicio(request):
     try:
-        # Filtrar solo libros con libroid válido
-        libros = Libro.objects.filter(stock__gt=0).exclude(libroid__isnull=True)[:8]
-        return render(request, 'inicio.html', {'libros': libros})
+        # Sólo los ids; las tarjetas salen de la caché de fragmentos
+        filas = Libro.objects.filter(stock__gt=0).exclude(libroid__isnull=True) \
+            .order_by('libroid').values_list('libroid', 'autorid', 'editorialid')[:8]
+        return render(request, 'inicio.html', {'tarjetas': tarjetas_libros(request, list(filas), con_admin=False)})
     except Exception as e:
         print(f"Error en vista inicio: {e}")
-        return render(request, 'inicio.html', {'libros': []})
+        return render(request, 'inicio.html', {'tarjetas': []})
+
+def _url_faceta(parametros, activo, **valores):
+    """Querystring del catálogo que activa (o quita, si ya está activo) un valor de faceta"""
+    parametros = parametros.copy()
+    parametros.pop('cursor', None)
+    parametros.pop('sin_stock', None)
+    for nombre, valor in valores.items():
+        if activo or valor is None:
+            parametros.pop(nombre, None)
+        else:
+            parametros[nombre] = valor
+    return parametros.urlencode()
 
 def libros(request):
     try:
-        # Obtener el parámetro del filtro desde la URL
-        mostrar_solo_sin_stock = request.GET.get('sin_stock', 'false') == 'true'
+        # Los filtros y la paginación se resuelven en la base de datos
+        filtros = leer_filtros(request.GET)
+        pagina = pagina_catalogo(filtros, cursor=request.GET.get('cursor'))
         
-        # Filtrar libros según el parámetro
-        if mostrar_solo_sin_stock:
-            # Mostrar SOLO libros SIN stock
-            libros_lista = Libro.objects.filter(stock=0).exclude(libroid__isnull=True)
-        else:
-            # Mostrar solo libros CON stock (comportamiento original)
-            libros_lista = Libro.objects.filter(stock__gt=0).exclude(libroid__isnull=True)
+        # Conteos por faceta para los filtros actuales (en memoria); con una búsqueda
+        # muy amplia sólo se cruzan sus coincidencias más relevantes
+        ids_busqueda, conteo_aproximado = ids_para_conteo(filtros['q']) if filtros['q'] else (None, False)
+        facetas = facetas_catalogo(filtros, ids_busqueda)
+        for faceta in ('genero', 'editorial', 'decada'):
+            for opcion in facetas['facetas'][faceta]:
+                opcion['url'] = _url_faceta(request.GET, opcion['activo'], **{faceta: opcion['valor']})
+        for opcion in facetas['facetas']['precio']:
+            opcion['url'] = _url_faceta(request.GET, opcion['activo'],
+                                        precio_min=opcion['minimo'], precio_max=opcion['maximo'])
+        for opcion in facetas['facetas']['disponibilidad']:
+            # Quitar el filtro de disponibilidad equivale a mostrar todos
+            opcion['url'] = _url_faceta(request.GET, False,
+                                        disponibilidad='todos' if opcion['activo'] else opcion['valor'])
+        
+        # Parámetros actuales sin el cursor, para armar los enlaces de paginación
+        parametros = request.GET.copy()
+        parametros.pop('cursor', None)
+        parametros.pop('sin_stock', None)
         
         return render(request, 'libros.html', {
-            'libros': libros_lista,
-            'mostrar_solo_sin_stock': mostrar_solo_sin_stock  # Nuevo nombre para claridad
+            'tarjetas': tarjetas_libros(request, pagina['filas']),
+            'siguiente_cursor': pagina['siguiente'],
+            'es_primera_pagina': not request.GET.get('cursor'),
+            'filtros': filtros,
+            'generos': Libro.GENEROS,
+            'facetas': facetas['facetas'],
+            'facetas_ordenadas': [
+                ('Género', facetas['facetas']['genero']),
+                ('Editorial', facetas['facetas']['editorial']),
+                ('Década', facetas['facetas']['decada']),
+                ('Precio', facetas['facetas']['precio']),
+                ('Disponibilidad', facetas['facetas']['disponibilidad']),
+            ],
+            'total_resultados': facetas['total'],
+            'conteo_aproximado': conteo_aproximado,
+            'parametros': parametros.urlencode(),
+            'mostrar_solo_sin_stock': filtros['disponibilidad'] == 'sin_stock'
         })
     except Exception as e:
         print(f"Error en vista libros: {e}")
-        return render(request, 'libros.html', {'libros': []})
+        return render(request, 'libros.html', {'tarjetas': []})
 
 def eventos(request):
     # Obtener filtros
@@ -100,7 +156,7 @@ def eventos(request):
 
 def blog(request):
     # Obtener TODAS las entradas activas sin filtros
-    entradas = Blog.objects.filter(activo=True).order_by('-fechapublicacion')
+    entradas = Blog.objects.filter(activo=True).select_related('autor').order_by('-fechapublicacion')
     
     return render(request, 'blog.html', {
         'entradas': entradas
@@ -164,13 +220,12 @@ def logout_view(request):
 @login_required
 @user_passes_test(es_administrador)
 def panel_admin(request):
+    # Conteos en caché y ventas del día desde el resumen diario (ver resumenes.py)
+    hoy = resumen_dia()
     stats = {
-        'total_libros': Libro.objects.count(),
-        'total_ventas': Venta.objects.count(),
-        'total_usuarios': User.objects.count(),
-        'total_eventos': Evento.objects.count(),
-        'ventas_hoy': Venta.objects.filter(fechaventa__date=timezone.now().date()).count(),
-        'ingresos_hoy': sum(venta.montototal for venta in Venta.objects.filter(fechaventa__date=timezone.now().date())),
+        **totales_panel(),
+        'ventas_hoy': hoy['ventas'],
+        'ingresos_hoy': hoy['ingresos'],
     }
     return render(request, 'admin/panel_admin.html', {'stats': stats})
 
@@ -326,7 +381,7 @@ def eliminar_editorial(request, id):
 @login_required
 @user_passes_test(es_administrador)
 def admin_libros(request):
-    libros = Libro.objects.all()
+    libros = Libro.objects.select_related('autorid', 'editorialid')
     
     # Calcular estadísticas
     total_stock = sum(libro.stock for libro in libros)
@@ -430,31 +485,34 @@ def eliminar_libro(request, id):
 @user_passes_test(es_administrador)
 def admin_ventas(request):
     # Filtrar solo ventas con ventaid válido
-    ventas = Venta.objects.exclude(ventaid__isnull=True).order_by('-fechaventa')
+    ventas = Venta.objects.exclude(ventaid__isnull=True).select_related('clienteid').order_by('-fechaventa')
     return render(request, 'admin/ventas/listado.html', {'ventas': ventas})
 
 @login_required
 @user_passes_test(es_administrador)
+@idempotente('admin_ventas', 'detalle_venta_admin')
 def agregar_venta(request):
+    if request.POST.get('modo') == 'pos' or request.GET.get('modo') == 'pos':
+        return _venta_punto_venta(request)
+    
     if request.method == 'POST':
         try:
             # Validar campos requeridos
             cliente_id = request.POST.get('clienteid')
             metodopago = request.POST.get('metodopago')
-            montototal_str = request.POST.get('montototal', '0')
             
-            if not all([cliente_id, metodopago, montototal_str]):
+            if not all([cliente_id, metodopago]):
                 messages.error(request, 'Todos los campos marcados con * son obligatorios')
                 return redirect('agregar_venta')
             
             # Validar que el cliente existe y no es staff
-            if not User.objects.filter(id=cliente_id, is_staff=False).exists():
+            cliente = User.objects.filter(id=cliente_id, is_staff=False).first()
+            if cliente is None:
                 messages.error(request, 'Cliente no válido o no encontrado')
                 return redirect('agregar_venta')
             
             # Convertir valores numéricos a Decimal de forma segura
             try:
-                montototal = Decimal(montototal_str) if montototal_str.strip() else Decimal('0.00')
                 descuentoaplicado = Decimal(request.POST.get('descuentoaplicado', '0')) if request.POST.get('descuentoaplicado', '0').strip() else Decimal('0.00')
                 pagorecibido = Decimal(request.POST.get('pagorecibido', '0')) if request.POST.get('pagorecibido', '0').strip() else Decimal('0.00')
             except (ValueError, InvalidOperation) as e:
@@ -462,54 +520,52 @@ def agregar_venta(request):
                 return redirect('agregar_venta')
             
             # Validar montos negativos
-            if any(val < Decimal('0.00') for val in [montototal, descuentoaplicado, pagorecibido]):
+            if any(val < Decimal('0.00') for val in [descuentoaplicado, pagorecibido]):
                 messages.error(request, 'Los valores no pueden ser negativos')
                 return redirect('agregar_venta')
             
-            # Validar pago en efectivo
-            if metodopago == 'EFECTIVO' and pagorecibido < montototal:
-                messages.error(request, f'Para pago en efectivo, el pago recibido (${pagorecibido}) debe ser mayor o igual al total (${montototal})')
-                return redirect('agregar_venta')
-            
-            # Crear la venta
-            venta = Venta.objects.create(
-                clienteid_id=cliente_id,
-                metodopago=metodopago,
-                montototal=montototal,
-                descuentoaplicado=descuentoaplicado,
-                pagorecibido=pagorecibido,
-                estadoventa='COMPLETADA'
-            )
-            
-            # Procesar libros de la venta
-            libros_ids = request.POST.getlist('libros[]')
-            cantidades = request.POST.getlist('cantidades[]')
-            precios = request.POST.getlist('precios[]')
-            
-            for i, libro_id in enumerate(libros_ids):
-                if libro_id and i < len(cantidades) and i < len(precios) and libro_id != '':
+            # Líneas de la venta (el formulario las manda como libros/cantidades)
+            libros_ids = request.POST.getlist('libros') or request.POST.getlist('libros[]')
+            cantidades_post = request.POST.getlist('cantidades') or request.POST.getlist('cantidades[]')
+            cantidades = {}
+            for libro_id, cantidad in zip(libros_ids, cantidades_post):
+                if libro_id:
                     try:
-                        detalle = DetalleVenta.objects.create(
-                            ventaid=venta,
-                            libroid_id=libro_id,
-                            cantidad=int(cantidades[i]),
-                            preciounitario=Decimal(precios[i]),
-                            subtotal=Decimal(precios[i]) * int(cantidades[i])
-                        )
-                        
-                        # Actualizar stock del libro
-                        libro = Libro.objects.get(libroid=libro_id)
-                        libro.stock -= int(cantidades[i])
-                        libro.save()
-                        
-                    except Libro.DoesNotExist:
-                        messages.warning(request, f'El libro con ID {libro_id} no existe')
-                    except Exception as e:
-                        messages.warning(request, f'Error al procesar libro: {str(e)}')
+                        libroid, cantidad = int(libro_id), int(cantidad)
+                    except ValueError:
+                        messages.error(request, 'Las cantidades deben ser números enteros')
+                        return redirect('agregar_venta')
+                    # registrar_venta descarta las líneas sin unidades; el total debe salir de las mismas
+                    if cantidad < 1:
+                        messages.error(request, 'Las cantidades deben ser de al menos 1')
+                        return redirect('agregar_venta')
+                    cantidades[libroid] = cantidades.get(libroid, 0) + cantidad
+            if not cantidades:
+                messages.error(request, 'Debes agregar al menos un libro a la venta')
+                return redirect('agregar_venta')
             
-            # Calcular y guardar el cambio
-            venta.calcular_cambio()
-            venta.save()
+            # Todas las líneas se validan en una consulta y la venta se registra completa o no se registra.
+            # El total sale de los precios vigentes, no del montototal que manda el formulario
+            try:
+                lineas = validar_lineas(cantidades)
+                montototal = calcular_total(lineas, descuentoaplicado)
+                if metodopago == 'EFECTIVO' and pagorecibido < montototal:
+                    messages.error(request, f'Para pago en efectivo, el pago recibido (${pagorecibido}) debe ser mayor o igual al total (${montototal})')
+                    return redirect('agregar_venta')
+                venta = registrar_venta(
+                    cliente,
+                    lineas,
+                    metodopago,
+                    pagorecibido=pagorecibido,
+                    descuento=descuentoaplicado,
+                    montototal=montototal,
+                )
+            except StockInsuficiente as e:
+                for faltante in e.faltantes:
+                    messages.error(request, 
+                        f'No hay suficiente stock de "{faltante.titulo}". '
+                        f'Disponible: {faltante.disponible}, Solicitado: {faltante.solicitado}')
+                return redirect('agregar_venta')
             
             messages.success(request, f'Venta #{venta.ventaid} agregada correctamente')
             return redirect('admin_ventas')
@@ -523,7 +579,8 @@ def agregar_venta(request):
             libros = Libro.objects.filter(stock__gt=0)
             return render(request, 'admin/ventas/agregar.html', {
                 'clientes': clientes,
-                'libros': libros
+                'libros': libros,
+                'tasa_iva': TASA_IVA
             })
     
     # GET request - mostrar formulario
@@ -539,16 +596,121 @@ def agregar_venta(request):
         
         return render(request, 'admin/ventas/agregar.html', {
             'clientes': clientes,
-            'libros': libros
+            'libros': libros,
+            'tasa_iva': TASA_IVA
         })
     
     except Exception as e:
         messages.error(request, f'Error al cargar el formulario: {str(e)}')
         return render(request, 'admin/ventas/agregar.html', {
             'clientes': [],
-            'libros': []
+            'libros': [],
+            'tasa_iva': TASA_IVA
         })
 
+def _venta_punto_venta(request):
+    """
+    Modo punto de venta de ``agregar_venta``: los libros se escanean por ISBN
+    o código de barras (``buscar_isbn`` en memoria) y la venta se valida con
+    una consulta y se registra con el motor de ventas.
+    """
+    if request.method == 'POST':
+        metodopago = request.POST.get('metodopago')
+        usuario = request.POST.get('cliente', '').strip()
+        codigos = request.POST.getlist('codigos')
+        try:
+            descuento = Decimal(request.POST.get('descuentoaplicado') or '0')
+            pagorecibido = Decimal(request.POST['pagorecibido']) if request.POST.get('pagorecibido') else None
+        except InvalidOperation:
+            messages.error(request, 'Error en los valores numéricos. Use formato correcto (ej: 100.50)')
+            return redirect(f"{reverse('agregar_venta')}?modo=pos")
+        
+        cliente = User.objects.filter(username=usuario, is_staff=False).first() if usuario else None
+        cantidades, desconocidos = cantidades_por_codigo(codigos)
+        if cliente is None:
+            messages.error(request, 'Cliente no válido o no encontrado')
+        elif metodopago not in dict(Venta.METODOS_PAGO):
+            messages.error(request, 'Debes seleccionar un método de pago')
+        elif desconocidos:
+            messages.error(request, f'Códigos no encontrados: {", ".join(desconocidos)}')
+        elif not cantidades:
+            messages.error(request, 'Escanea al menos un libro')
+        else:
+            try:
+                lineas = validar_lineas(cantidades)
+                total = calcular_total(lineas, descuento)
+                if metodopago == 'EFECTIVO' and (pagorecibido or Decimal('0')) < total:
+                    messages.error(request, f'Para pago en efectivo, el pago recibido debe cubrir el total (${total})')
+                else:
+                    venta = registrar_venta(cliente, lineas, metodopago, pagorecibido=pagorecibido,
+                                            descuento=descuento, montototal=total)
+                    messages.success(request, f'Venta #{venta.ventaid} registrada')
+                    return redirect('detalle_venta_admin', venta_id=venta.ventaid)
+            except StockInsuficiente as e:
+                messages.error(request, str(e))
+        return redirect(f"{reverse('agregar_venta')}?modo=pos")
+    
+    return render(request, 'admin/ventas/punto_venta.html', {'metodos_pago': Venta.METODOS_PAGO})
+
+@login_required
+@user_passes_test(es_administrador)
+def buscar_isbn_venta(request, codigo):
+    """Libro escaneado en el punto de venta, desde el índice en memoria"""
+    entrada = buscar_isbn(codigo)
+    if entrada is None:
+        return JsonResponse({'error': 'No encontrado'}, status=404)
+    return JsonResponse({
+        'libroid': entrada.libroid,
+        'titulo': entrada.titulo,
+        'precio': str(entrada.precio),
+        'stock': entrada.stock,
+    })
+
+@login_required
+@user_passes_test(es_administrador)
+def analitica_ventas(request):
+    """
+    Series para gráficas: ?desde=&hasta= (AAAA-MM-DD, por defecto los últimos
+    30 días), ?periodo=dia|semana|mes, ?por=total|genero|autor|editorial|metodo
+    y ?limite= (series por separado antes de agrupar el resto en "Otros")
+    """
+    try:
+        hasta = datetime.strptime(request.GET['hasta'], '%Y-%m-%d').date() if request.GET.get('hasta') \
+            else timezone.localdate()
+        desde = datetime.strptime(request.GET['desde'], '%Y-%m-%d').date() if request.GET.get('desde') \
+            else hasta - timedelta(days=29)
+        limite = int(request.GET.get('limite', LIMITE_DEFAULT))
+        datos = serie_ventas(desde, hasta, request.GET.get('periodo', 'dia'), request.GET.get('por', 'total'),
+                             max(limite, 1))
+    except ValueError as e:
+        # Fechas o límite mal escritos, o ConsultaInvalida
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse(datos)
+
+@login_required
+@user_passes_test(es_administrador)
+def exportar_ventas(request):
+    """
+    Descarga en streaming de ?tabla=ventas|detalles en ?formato=csv|xlsx,
+    filtrada por ?desde=&hasta= (AAAA-MM-DD), ?estado= y ?metodo=
+    """
+    tabla = request.GET.get('tabla', 'ventas')
+    formato = request.GET.get('formato', 'csv')
+    try:
+        filtros = {
+            'desde': datetime.strptime(request.GET['desde'], '%Y-%m-%d').date() if request.GET.get('desde') else None,
+            'hasta': datetime.strptime(request.GET['hasta'], '%Y-%m-%d').date() if request.GET.get('hasta') else None,
+            'estado': request.GET.get('estado') or None,
+            'metodo': request.GET.get('metodo') or None,
+        }
+        trozos = exportar(tabla, formato, **filtros)
+    except ValueError as e:
+        # Fechas mal escritas o ExportacionInvalida
+        return HttpResponseBadRequest(str(e))
+    response = StreamingHttpResponse(trozos, content_type=TIPOS_CONTENIDO[formato])
+    response['Content-Disposition'] = f'attachment; filename="{nombre_archivo(tabla, formato)}"'
+    return response
+
 @login_required
 @user_passes_test(es_administrador)
 def editar_venta(request, id):
@@ -604,7 +766,12 @@ def eliminar_venta(request, id):
 @login_required
 @user_passes_test(es_administrador)
 def detalle_venta_admin(request, venta_id):
-    venta = get_object_or_404(Venta, ventaid=venta_id)
+    venta = get_object_or_404(
+        Venta.objects.select_related('clienteid').prefetch_related(
+            Prefetch('detalles', queryset=DetalleVenta.objects.select_related('libroid__autorid'))
+        ),
+        ventaid=venta_id
+    )
     return render(request, 'admin/ventas/detalle.html', {'venta': venta})
 
 @login_required
@@ -614,19 +781,36 @@ def cancelar_venta(request, venta_id):
     
     if request.method == 'POST':
         try:
-            # Restaurar stock
-            for detalle in venta.detalles.all():
-                detalle.libroid.stock += detalle.cantidad
-                detalle.libroid.save()
-            
-            venta.estadoventa = 'CANCELADA'
-            venta.save()
-            messages.success(request, 'Venta cancelada y stock restaurado')
+            # Estado y stock de todas las líneas en una transacción
+            if cancelar_ventas([venta.ventaid]):
+                messages.success(request, 'Venta cancelada y stock restaurado')
+            else:
+                messages.warning(request, 'La venta ya estaba cancelada')
         except Exception as e:
             messages.error(request, f'Error al cancelar venta: {str(e)}')
     
     return redirect('admin_ventas')
 
+@login_required
+@user_passes_test(es_administrador)
+def devolver_venta(request, venta_id):
+    """Devolución parcial: el formulario manda ``devolver_<detalleventaid>`` con las unidades"""
+    if request.method == 'POST':
+        cantidades = {
+            campo[len('devolver_'):]: valor
+            for campo, valor in request.POST.items()
+            if campo.startswith('devolver_') and valor.strip()
+        }
+        try:
+            importe = devolver(venta_id, cantidades)
+            messages.success(request, f'Devolución registrada. Importe a reembolsar: ${importe}')
+        except (DevolucionInvalida, ValueError) as e:
+            messages.error(request, f'No se pudo registrar la devolución: {e}')
+        except Venta.DoesNotExist:
+            messages.error(request, 'La venta no existe')
+    
+    return redirect('detalle_venta_admin', venta_id=venta_id)
+
 # =============================================
 # CRUD DETALLES VENTA (ADMIN) - COMPLETO
 # =============================================
@@ -635,7 +819,7 @@ def cancelar_venta(request, venta_id):
 @user_passes_test(es_administrador)
 def admin_detalles_venta(request):
     try:
-        detalles = DetalleVenta.objects.all().select_related('ventaid', 'libroid').order_by('-ventaid_id')
+        detalles = DetalleVenta.objects.all().select_related('ventaid', 'libroid__autorid').order_by('-ventaid_id')
         return render(request, 'admin/detalles_venta/listado.html', {'detalles': detalles})
     except Exception as e:
         messages.error(request, f'Error al cargar detalles: {str(e)}')
@@ -660,7 +844,7 @@ def agregar_detalle_venta(request):
         except Exception as e:
             messages.error(request, f'Error al agregar detalle: {str(e)}')
     
-    ventas = Venta.objects.all()
+    ventas = Venta.objects.select_related('clienteid')
     libros = Libro.objects.all()
     return render(request, 'admin/detalles_venta/agregar.html', {
         'ventas': ventas,
@@ -873,7 +1057,7 @@ def eliminar_evento(request, id):
 @login_required
 @user_passes_test(es_administrador)
 def admin_blog(request):
-    entradas = Blog.objects.all().order_by('-fechapublicacion')
+    entradas = Blog.objects.select_related('autor').order_by('-fechapublicacion')
     return render(request, 'admin/blog/listado.html', {'entradas': entradas})
 
 @login_required
@@ -957,25 +1141,6 @@ def ver_carrito(request):
         Carrito.objects.filter(usuario=request.user).delete()
         messages.success(request, 'Carrito vaciado correctamente')
         return redirect('ver_carrito')
-    """
-    Muestra el carrito de compras del usuario actual con cálculos de IVA correctos
-    """
-    # Obtener todos los items del carrito del usuario actual
-    items_carrito = Carrito.objects.filter(usuario=request.user)
-    
-    # Calcular subtotal (suma de todos los items)
-    subtotal = Decimal('0.00')
-    
-    for item in items_carrito:
-        # Calcular subtotal para cada item y agregarlo al objeto
-        item.item_subtotal = item.libro.precioventa * item.cantidad
-        subtotal += item.item_subtotal
-    
-    # Calcular IVA (16%)
-    iva = subtotal * Decimal('0.16')
-    
-    # Calcular total final (subtotal + IVA)
-    total_final = subtotal + iva
     
     # Manejar actualización de cantidad si es POST
     if request.method == 'POST':
@@ -984,21 +1149,19 @@ def ver_carrito(request):
         
         if item_id and nueva_cantidad:
             try:
-                item = Carrito.objects.get(carritoid=item_id, usuario=request.user)
+                item = Carrito.objects.select_related('libro').get(carritoid=item_id, usuario=request.user)
                 nueva_cantidad = int(nueva_cantidad)
                 
-                # Verificar que haya suficiente stock
-                if nueva_cantidad <= item.libro.stock:
-                    if nueva_cantidad > 0:
-                        item.cantidad = nueva_cantidad
-                        item.save()
-                        messages.success(request, f'Cantidad de "{item.libro.titulo}" actualizada')
-                    else:
-                        item.delete()
-                        messages.info(request, f'"{item.libro.titulo}" eliminado del carrito')
+                if nueva_cantidad > 0:
+                    # Verificar que haya suficiente stock sin reservar y renovar la reserva
+                    reservar(request.user, item.libro, nueva_cantidad)
+                    messages.success(request, f'Cantidad de "{item.libro.titulo}" actualizada')
                 else:
-                    messages.error(request, f'No hay suficiente stock para "{item.libro.titulo}"')
+                    item.delete()
+                    messages.info(request, f'"{item.libro.titulo}" eliminado del carrito')
                     
+            except SinDisponibilidad as e:
+                messages.error(request, f'No hay suficiente stock para "{e.libro.titulo}" (disponible: {e.disponible})')
             except Carrito.DoesNotExist:
                 messages.error(request, 'El item no existe en tu carrito')
             except ValueError:
@@ -1006,12 +1169,16 @@ def ver_carrito(request):
             
             return redirect('ver_carrito')
     
+    # Carrito con sus libros en una consulta; subtotales, IVA (16%) y total en una pasada
+    carrito = cotizar_carrito(request.user)
+    
     context = {
-        'items_carrito': items_carrito,
-        'subtotal': subtotal,
-        'iva': iva,
-        'total_final': total_final,
-        'total_carrito': subtotal,  # Para compatibilidad con tu template actual
+        'carrito': carrito,
+        'items_carrito': carrito.lineas,
+        'subtotal': carrito.subtotal,
+        'iva': carrito.iva,
+        'total_final': carrito.total,
+        'total_carrito': carrito.subtotal,  # Para compatibilidad con tu template actual
     }
     
     return render(request, 'carrito/ver_carrito.html', context)
@@ -1020,7 +1187,7 @@ def ver_carrito(request):
 @login_required
 def agregar_al_carrito(request, libro_id):
     """
-    Agrega un libro al carrito del usuario
+    Agrega un libro al carrito del usuario y aparta la unidad por unos minutos
     """
     libro = get_object_or_404(Libro, libroid=libro_id)
     
@@ -1029,23 +1196,21 @@ def agregar_al_carrito(request, libro_id):
         messages.error(request, f'"{libro.titulo}" no está disponible en este momento')
         return redirect('libros')
     
-    # Verificar si el libro ya está en el carrito del usuario
-    carrito_item, created = Carrito.objects.get_or_create(
-        usuario=request.user,
-        libro=libro,
-        defaults={'cantidad': 1}
-    )
-    
-    if not created:
-        # Si ya existe, aumentar cantidad (si hay stock)
-        if carrito_item.cantidad < libro.stock:
-            carrito_item.cantidad += 1
-            carrito_item.save()
-            messages.success(request, f'Cantidad de "{libro.titulo}" aumentada en el carrito')
-        else:
+    # Si ya está en el carrito, aumentar cantidad (si hay unidades sin reservar)
+    en_carrito = Carrito.objects.filter(usuario=request.user, libro=libro).values_list('cantidad', flat=True).first()
+    try:
+        reservar(request.user, libro, (en_carrito or 0) + 1)
+    except SinDisponibilidad:
+        if en_carrito:
             messages.warning(request, f'Stock máximo de "{libro.titulo}" alcanzado')
+        else:
+            messages.error(request, f'Las últimas unidades de "{libro.titulo}" están apartadas en otros carritos')
+            return redirect('libros')
     else:
-        messages.success(request, f'"{libro.titulo}" agregado al carrito')
+        if en_carrito:
+            messages.success(request, f'Cantidad de "{libro.titulo}" aumentada en el carrito')
+        else:
+            messages.success(request, f'"{libro.titulo}" agregado al carrito')
     
     return redirect('ver_carrito')
 
@@ -1067,33 +1232,27 @@ def eliminar_del_carrito(request, carrito_id):
 
 
 @login_required
+@idempotente('detalle_venta')
 def procesar_compra(request):
     """
     Procesa la compra del carrito
     """
     if request.method == 'POST':
-        # Obtener items del carrito
-        items_carrito = Carrito.objects.filter(usuario=request.user)
+        # Carrito con sus libros y totales, leído una sola vez
+        carrito = cotizar_carrito(request.user)
         
-        if not items_carrito.exists():
+        if not carrito:
             messages.error(request, 'Tu carrito está vacío')
             return redirect('ver_carrito')
         
         # Verificar stock antes de procesar
-        for item in items_carrito:
-            if item.cantidad > item.libro.stock:
-                messages.error(request, 
-                    f'No hay suficiente stock de "{item.libro.titulo}". '
-                    f'Disponible: {item.libro.stock}, Solicitado: {item.cantidad}')
-                return redirect('ver_carrito')
-        
-        # Calcular totales
-        subtotal = Decimal('0.00')
-        for item in items_carrito:
-            subtotal += item.libro.precioventa * item.cantidad
+        for linea in carrito.sin_stock:
+            messages.error(request, 
+                f'No hay suficiente stock de "{linea.libro.titulo}". '
+                f'Disponible: {linea.libro.stock}, Solicitado: {linea.cantidad}')
+            return redirect('ver_carrito')
         
-        iva = subtotal * Decimal('0.16')
-        total_final = subtotal + iva
+        total_final = carrito.total
         
         # Obtener datos del formulario
         metodo_pago = request.POST.get('metodo_pago')
@@ -1118,47 +1277,34 @@ def procesar_compra(request):
         else:
             pago_recibido = total_final
         
-        # Crear la venta
+        # Crear la venta: stock, venta, detalles y carrito en una sola transacción
         try:
-            venta = Venta.objects.create(
-                clienteid=request.user,
-                montototal=total_final,
-                metodopago=metodo_pago,
-                estadoventa='COMPLETADA',
-                pagorecibido=pago_recibido
-            )
-            
-            # Calcular cambio si es efectivo
-            if metodo_pago == 'EFECTIVO':
-                venta.calcular_cambio()
-                venta.save()
-            
-            # Crear detalles de venta y actualizar stock
-            for item in items_carrito:
-                # Crear detalle de venta
-                DetalleVenta.objects.create(
-                    ventaid=venta,
-                    libroid=item.libro,
-                    cantidad=item.cantidad,
-                    preciounitario=item.libro.precioventa,
-                    iva=Decimal('0.16'),
-                    subtotal=item.libro.precioventa * item.cantidad
+            with transaction.atomic():
+                venta = registrar_venta(
+                    request.user,
+                    [LineaVenta(linea.libro.libroid, linea.cantidad, linea.precio_unitario) for linea in carrito],
+                    metodo_pago,
+                    pagorecibido=pago_recibido,
+                    montototal=total_final,
+                    respetar_reservas=True,
                 )
                 
-                # Actualizar stock del libro
-                libro = item.libro
-                libro.stock -= item.cantidad
-                libro.save()
-            
-            # Vaciar el carrito
-            items_carrito.delete()
+                # Vaciar el carrito
+                Carrito.objects.filter(carritoid__in=[linea.carritoid for linea in carrito]).delete()
             
             # Mensaje de éxito
             messages.success(request, f'¡Compra realizada exitosamente! Número de venta: #{venta.ventaid}')
             
             # Redirigir a detalle de venta
             return redirect('detalle_venta', venta_id=venta.ventaid)
-            
+        
+        except StockInsuficiente as e:
+            # Otro cliente compró las últimas unidades mientras tanto; no se guardó nada
+            for faltante in e.faltantes:
+                messages.error(request, 
+                    f'No hay suficiente stock de "{faltante.titulo}". '
+                    f'Disponible: {faltante.disponible}, Solicitado: {faltante.solicitado}')
+            return redirect('ver_carrito')
         except Exception as e:
             messages.error(request, f'Error al procesar la compra: {str(e)}')
             return redirect('ver_carrito')
@@ -1170,7 +1316,12 @@ def detalle_venta(request, venta_id):
     Muestra el detalle de una venta específica
     """
     # Obtener la venta del usuario actual
-    venta = get_object_or_404(Venta, ventaid=venta_id, clienteid=request.user)
+    venta = get_object_or_404(
+        Venta.objects.prefetch_related(
+            Prefetch('detalles', queryset=DetalleVenta.objects.select_related('libroid'))
+        ),
+        ventaid=venta_id, clienteid=request.user
+    )
     
     context = {
         'venta': venta,
@@ -1202,17 +1353,16 @@ def actualizar_carrito(request, carrito_id):
         try:
             cantidad = int(cantidad)
             if cantidad > 0:
-                item = Carrito.objects.get(carritoid=carrito_id, usuario=request.user)
+                item = Carrito.objects.select_related('libro').get(carritoid=carrito_id, usuario=request.user)
                 
-                # Verificar stock
-                if cantidad <= item.libro.stock:
-                    item.cantidad = cantidad
-                    item.save()
+                # Verificar stock sin reservar y renovar la reserva
+                try:
+                    reservar(request.user, item.libro, cantidad)
                     messages.success(request, f'Cantidad actualizada para "{item.libro.titulo}"')
-                else:
+                except SinDisponibilidad as e:
                     messages.error(request, 
                         f'No hay suficiente stock de "{item.libro.titulo}". '
-                        f'Disponible: {item.libro.stock}')
+                        f'Disponible: {e.disponible}')
             else:
                 # Si cantidad es 0, eliminar
                 item = Carrito.objects.get(carritoid=carrito_id, usuario=request.user)
@@ -48,6 +48,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'app_Libreria.middleware.PresupuestoConsultasMiddleware',
 ]
 
 ROOT_URLCONF = 'backend_Libreria.urls'
@@ -62,6 +63,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'app_Libreria.context_processors.carrito',
             ],
         },
     },
@@ -73,14 +75,53 @@ WSGI_APPLICATION = 'backend_Libreria.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# app_Libreria.backends.sqlite es el motor sqlite3 de Django con WAL, PRAGMAs
+# de producción y BEGIN IMMEDIATE (ver su docstring). Las conexiones se
+# reutilizan entre peticiones de un mismo hilo y se revisan antes de usarse.
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'app_Libreria.backends.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        # La base de pruebas va en archivo (no en memoria compartida) para que
+        # las pruebas de concurrencia esperen los bloqueos en vez de fallar
+        'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# En producción con varios procesos 'default' debe ser compartida
+# (Redis/Memcached): guarda los sellos de versión de las tarjetas y el
+# registro de cambios de las facetas. 'tarjetas' guarda el HTML de las
+# tarjetas de libro; por defecto es un LRU local acotado, pero también
+# puede apuntar a un backend compartido. 'analitica' guarda los agregados
+# mensuales de ventas de app_Libreria/analitica.py (sus sellos también van en
+# 'default').
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'libreria-default',
+    },
+    'tarjetas': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'libreria-tarjetas',
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {'MAX_ENTRIES': 5000, 'CULL_FREQUENCY': 10},
+    },
+    # Bloques mensuales de la analítica de ventas (app_Libreria/analitica.py)
+    'analitica': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'libreria-analitica',
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {'MAX_ENTRIES': 2000},
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -124,6 +165,25 @@ import os
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media') 
+
+# Las subidas se guardan por contenido (app_Libreria/almacenamiento.py); los
+# derivados de imágenes conservan su nombre
+STORAGES = {
+    'default': {'BACKEND': 'app_Libreria.almacenamiento.AlmacenamientoPorContenido'},
+    'derivados': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    # collectstatic: nombres con hash y variantes .gz/.br (las pruebas no corren
+    # collectstatic; settings_pruebas usa el almacenamiento simple)
+    'staticfiles': {'BACKEND': 'app_Libreria.almacenamiento.EstaticosComprimidos'},
+}
+
+# Entrega de MEDIA (app_Libreria/medios.py): 'python', 'x-sendfile' (Apache,
+# lighttpd) o 'x-accel-redirect' (nginx, con una location internal; en
+# MEDIA_ACCEL_PREFIJO que apunte a MEDIA_ROOT)
+MEDIA_ENTREGA = 'python'
+MEDIA_ACCEL_PREFIJO = '/media-interno/'
+MEDIA_MAX_AGE = 60 * 60
+# Ubicación internal; de nginx para STATIC_ROOT (None: la vista envía el archivo)
+STATIC_ACCEL_PREFIJO = None
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
@@ -139,4 +199,54 @@ CSRF_USE_SESSIONS = False
 
 # Si estás en desarrollo, también agrega:
 CSRF_COOKIE_SECURE = False  # Cambia a True en producción con HTTPS
-SESSION_COOKIE_SECURE = False  # Cambia a True en producción con HTTPS
\ No newline at end of file
+SESSION_COOKIE_SECURE = False  # Cambia a True en producción con HTTPS
+
+# Reservas de stock (app_Libreria/reservas.py): minutos que se aparta lo que
+# está en un carrito y segundos que las tarjetas confían en lo disponible
+# leído. Las vencidas se borran con `manage.py liberar_reservas`.
+RESERVA_MINUTOS = 15
+DISPONIBILIDAD_TTL = 30
+
+# Coincidencias de búsqueda (las más relevantes) que se cruzan con los conteos
+# de facetas (app_Libreria/busqueda.py); por encima los conteos son aproximados
+BUSQUEDA_LIMITE_CONTEO = 5000
+
+# Horas que se recuerda el resultado de un POST con clave de idempotencia
+# (app_Libreria/idempotencia.py); las vencidas se purgan solas
+IDEMPOTENCIA_HORAS = 24
+
+# Presupuesto de consultas SQL por vista (nombre de URL).
+# Ver app_Libreria/middleware.py
+PRESUPUESTO_CONSULTAS_DEFAULT = 20
+PRESUPUESTO_CONSULTAS = {
+    'inicio': 6,
+    'libros': 10,
+    'eventos': 5,
+    'blog': 5,
+    'detalle_blog': 5,
+    'ver_carrito': 8,
+    'mis_compras': 6,
+    'detalle_venta': 6,
+    'panel_admin': 12,
+    'admin_libros': 6,
+    'admin_ventas': 6,
+    'detalle_venta_admin': 6,
+    'admin_detalles_venta': 6,
+}
+# Una misma consulta repetida este número de veces se considera N+1
+PRESUPUESTO_CONSULTAS_REPETICIONES = 5
+# El middleware sólo mide cuando está activo (en desarrollo) o es estricto:
+# estricto lanza una excepción en lugar de registrar (settings_pruebas)
+PRESUPUESTO_CONSULTAS_ACTIVO = DEBUG
+PRESUPUESTO_CONSULTAS_ESTRICTO = False
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'app_Libreria.consultas': {'handlers': ['console'], 'level': 'WARNING'},
+    },
+}
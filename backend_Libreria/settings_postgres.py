@@ -0,0 +1,67 @@
+# backend_Libreria/settings_postgres.py
+"""
+Perfil de despliegue con PostgreSQL: pool de conexiones y réplica de lectura.
+
+    pip install "psycopg[binary,pool]"
+    export DJANGO_SETTINGS_MODULE=backend_Libreria.settings_postgres
+    python manage.py migrate
+
+Conexión (variables de entorno): ``LIBRERIA_PG_NOMBRE``, ``LIBRERIA_PG_USUARIO``,
+``LIBRERIA_PG_CONTRASENA``, ``LIBRERIA_PG_HOST`` y ``LIBRERIA_PG_PUERTO``.
+Cada proceso mantiene entre ``LIBRERIA_PG_POOL_MIN`` y ``LIBRERIA_PG_POOL_MAX``
+conexiones abiertas (``psycopg_pool``); con pool, ``CONN_MAX_AGE`` debe ser 0.
+
+Con ``LIBRERIA_PG_REPLICA_HOST`` (y opcionalmente ``LIBRERIA_PG_REPLICA_PUERTO``)
+se agrega el alias ``replica`` y las vistas públicas leen de ella
+(``app_Libreria/enrutador.py``). Para probarlo basta una segunda instancia
+local en modo standby::
+
+    pg_basebackup -D /tmp/replica -R -h localhost -p 5432 -U replicador
+    pg_ctl -D /tmp/replica -o "-p 5433" start
+    export LIBRERIA_PG_REPLICA_HOST=localhost LIBRERIA_PG_REPLICA_PUERTO=5433
+"""
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import MIDDLEWARE
+
+
+def _base_datos(host, puerto):
+    return {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ.get('LIBRERIA_PG_NOMBRE', 'libreria'),
+        'USER': os.environ.get('LIBRERIA_PG_USUARIO', 'libreria'),
+        'PASSWORD': os.environ.get('LIBRERIA_PG_CONTRASENA', ''),
+        'HOST': host,
+        'PORT': puerto,
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': False,
+        'OPTIONS': {
+            'pool': {
+                'min_size': int(os.environ.get('LIBRERIA_PG_POOL_MIN', 2)),
+                'max_size': int(os.environ.get('LIBRERIA_PG_POOL_MAX', 10)),
+                # Segundos esperando una conexión libre antes de fallar
+                'timeout': 10,
+            },
+        },
+    }
+
+
+DATABASES = {
+    'default': _base_datos(os.environ.get('LIBRERIA_PG_HOST', 'localhost'),
+                           os.environ.get('LIBRERIA_PG_PUERTO', '5432')),
+}
+
+if os.environ.get('LIBRERIA_PG_REPLICA_HOST'):
+    DATABASES['replica'] = _base_datos(os.environ['LIBRERIA_PG_REPLICA_HOST'],
+                                       os.environ.get('LIBRERIA_PG_REPLICA_PUERTO', '5432'))
+    # Las pruebas usan la base de pruebas de default también como réplica
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['app_Libreria.enrutador.EnrutadorReplica']
+
+# Decide en process_view, con la URL ya resuelta
+MIDDLEWARE = MIDDLEWARE + ['app_Libreria.enrutador.LecturaReplicaMiddleware']
+
+# Segundos que un navegador lee de la primaria después de escribir
+REPLICA_PEGADO_SEGUNDOS = 5
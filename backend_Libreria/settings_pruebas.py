@@ -0,0 +1,20 @@
+# backend_Libreria/settings_pruebas.py
+"""
+Perfil de las pruebas. ``manage.py test`` lo usa por omisión; otros
+ejecutores lo piden explícitamente::
+
+    pytest --ds=backend_Libreria.settings_pruebas
+
+Las pruebas no corren ``collectstatic``, así que los estáticos no pasan por
+el manifiesto con hash, y cualquier vista que exceda su presupuesto de
+consultas o tenga un N+1 hace fallar la prueba.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import STORAGES
+
+STORAGES = {
+    **STORAGES,
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+PRESUPUESTO_CONSULTAS_ESTRICTO = True
@@ -15,15 +15,23 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 # backend_Libreria/urls.py
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
-from django.conf.urls.static import static
+
+from app_Libreria.medios import servir_medio, servir_estatico
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('app_Libreria.urls')),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+# Archivos subidos: ETag, 304, Range y entrega por X-Sendfile/X-Accel-Redirect
+# (ver MEDIA_ENTREGA en settings y app_Libreria/medios.py)
+urlpatterns += [
+    re_path(r'^%s(?P<ruta>.+)$' % re.escape(settings.MEDIA_URL.lstrip('/')), servir_medio, name='media'),
+    # STATIC_ROOT tras collectstatic, con variantes .br/.gz (en DEBUG lo atiende runserver)
+    re_path(r'^%s(?P<ruta>.+)$' % re.escape(settings.STATIC_URL.lstrip('/')), servir_estatico, name='static'),
+]
